@@ -7,21 +7,31 @@ and latency. Supports both in-memory (L1) and Redis (L2) caching.
 from __future__ import annotations
 
 import hashlib
+import heapq
 import pickle
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+import numpy as np
 
 from src.core.config import get_settings
 from src.core.exceptions import CacheError
 from src.core.types import DocumentChunk
 
+# Header for packed little-endian float32 vectors. Pickle payloads start with
+# b"\x80", so both formats can be told apart when reading existing keys.
+_VECTOR_MAGIC = b"\x93F32"
+
 
 class CacheBackend(Protocol):
     """Protocol for cache backend implementations."""
 
     async def get(self, key: str) -> Optional[Any]: ...
     async def set(self, key: str, value: Any, ttl: int) -> None: ...
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]: ...
+    async def set_many(self, items: Dict[str, Any], ttl: int) -> None: ...
     async def delete(self, key: str) -> bool: ...
     async def clear(self) -> None: ...
 
@@ -32,7 +42,7 @@ class CacheEntry:
 
     Attributes:
         key: Cache key
-        value: Cached value (embedding vector)
+        value: Cached value (embedding vector as a compact numpy array)
         created_at: Creation timestamp
         expires_at: Expiration timestamp
         hit_count: Number of cache hits
@@ -40,7 +50,7 @@ class CacheEntry:
     """
 
     key: str
-    value: List[float]
+    value: np.ndarray
     created_at: datetime
     expires_at: datetime
     hit_count: int = 0
@@ -69,20 +79,34 @@ class CacheStats:
 
 
 class MemoryCacheBackend:
-    """In-memory LRU cache backend."""
+    """In-memory LRU cache backend.
+
+    Recency is tracked by an ``OrderedDict`` (O(1) touch and evict) and
+    expiry by a min-heap of ``(expires_at, key)`` swept on write. Vectors are
+    stored as contiguous numpy arrays (float32 by default) and sized as
+    ``len × itemsize`` instead of by pickling.
+    """
 
-    def __init__(self, max_size: int = 10000, max_memory_mb: int = 100) -> None:
+    def __init__(
+        self,
+        max_size: int = 10000,
+        max_memory_mb: int = 100,
+        dtype: Any = np.float32,
+    ) -> None:
         """Initialize memory cache.
 
         Args:
             max_size: Maximum number of entries
             max_memory_mb: Maximum memory usage in MB
+            dtype: Numpy dtype used to store vectors
         """
         self.max_size = max_size
         self.max_memory_bytes = max_memory_mb * 1024 * 1024
-        self._cache: Dict[str, CacheEntry] = {}
-        self._access_order: List[str] = []
+        self.dtype = np.dtype(dtype)
+        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._expiry_heap: List[Tuple[datetime, str]] = []
         self._current_memory = 0
+        self._evictions = 0
 
     async def get(self, key: str) -> Optional[List[float]]:
         """Get value from cache.
@@ -98,15 +122,13 @@ class MemoryCacheBackend:
             return None
 
         if datetime.utcnow() > entry.expires_at:
-            await self.delete(key)
+            self._remove(key)
             return None
 
-        # Update access order
-        self._access_order.remove(key)
-        self._access_order.append(key)
+        self._cache.move_to_end(key)
         entry.hit_count += 1
 
-        return entry.value
+        return entry.value.tolist()
 
     async def set(self, key: str, value: List[float], ttl: int) -> None:
         """Set value in cache.
@@ -116,35 +138,49 @@ class MemoryCacheBackend:
             value: Value to cache
             ttl: Time to live in seconds
         """
-        # Calculate size
-        size = len(pickle.dumps(value))
+        vector = np.asarray(value, dtype=self.dtype)
+        if vector.base is not None or not vector.flags.c_contiguous:
+            # Don't pin a caller-owned buffer in the cache
+            vector = vector.copy()
+        size = vector.nbytes
+
+        now = datetime.utcnow()
+        self._sweep_expired(now)
+
+        # Remove old entry if exists
+        if key in self._cache:
+            self._remove(key)
 
         # Check if we need to evict
-        while len(self._cache) >= self.max_size or self._current_memory + size > self.max_memory_bytes:
-            if not self._access_order:
-                break
+        while self._cache and (
+            len(self._cache) >= self.max_size or self._current_memory + size > self.max_memory_bytes
+        ):
             await self._evict_lru()
 
-        # Create entry
-        now = datetime.utcnow()
         entry = CacheEntry(
             key=key,
-            value=value,
+            value=vector,
             created_at=now,
             expires_at=now + timedelta(seconds=ttl),
             size_bytes=size,
         )
-
-        # Remove old entry if exists
-        if key in self._cache:
-            old_entry = self._cache[key]
-            self._current_memory -= old_entry.size_bytes
-            self._access_order.remove(key)
-
-        # Add new entry
         self._cache[key] = entry
-        self._access_order.append(key)
         self._current_memory += size
+        heapq.heappush(self._expiry_heap, (entry.expires_at, key))
+
+        # Overwrites and LRU evictions leave stale heap items behind
+        if len(self._expiry_heap) > 2 * len(self._cache) + 64:
+            self._expiry_heap = [(e.expires_at, k) for k, e in self._cache.items()]
+            heapq.heapify(self._expiry_heap)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[List[float]]]:
+        """Get several values; ``None`` for each missing or expired key."""
+        return [await self.get(key) for key in keys]
+
+    async def set_many(self, items: Dict[str, List[float]], ttl: int) -> None:
+        """Set several values with the same TTL."""
+        for key, value in items.items():
+            await self.set(key, value, ttl)
 
     async def delete(self, key: str) -> bool:
         """Delete entry from cache.
@@ -158,25 +194,37 @@ class MemoryCacheBackend:
         if key not in self._cache:
             return False
 
-        entry = self._cache.pop(key)
-        self._current_memory -= entry.size_bytes
-        self._access_order.remove(key)
+        self._remove(key)
         return True
 
     async def clear(self) -> None:
         """Clear all entries from cache."""
         self._cache.clear()
-        self._access_order.clear()
+        self._expiry_heap.clear()
         self._current_memory = 0
 
+    def _remove(self, key: str) -> None:
+        entry = self._cache.pop(key)
+        self._current_memory -= entry.size_bytes
+
+    def _sweep_expired(self, now: datetime) -> None:
+        """Drop every entry whose expiry has passed, oldest first."""
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            # Skip heap items left behind by overwrites or deletes
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key)
+
     async def _evict_lru(self) -> None:
         """Evict least recently used entry."""
-        if not self._access_order:
+        if not self._cache:
             return
 
-        oldest_key = self._access_order.pop(0)
-        entry = self._cache.pop(oldest_key)
+        _, entry = self._cache.popitem(last=False)
         self._current_memory -= entry.size_bytes
+        self._evictions += 1
 
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics.
@@ -189,6 +237,8 @@ class MemoryCacheBackend:
             "memory_mb": self._current_memory / (1024 * 1024),
             "max_size": self.max_size,
             "max_memory_mb": self.max_memory_bytes / (1024 * 1024),
+            "evictions": self._evictions,
+            "dtype": self.dtype.name,
         }
 
 
@@ -198,6 +248,11 @@ class RedisCacheBackend:
     Requires the ``redis`` package (``pip install redis``).
     Degrades gracefully when the package is not installed or the
     server is unreachable — operations log warnings but do not raise.
+
+    Numeric vectors are stored as packed little-endian float32 behind a
+    small magic header (4 bytes per dimension, no pickle); other values and
+    entries written by older versions fall back to pickle. ``get_many`` and
+    ``set_many`` cost one round trip each (MGET / pipelined SETEX).
     """
 
     def __init__(
@@ -252,6 +307,21 @@ class RedisCacheBackend:
     def _make_key(self, key: str) -> str:
         return f"{self.key_prefix}{key}"
 
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        """Pack numeric vectors as float32; pickle anything else."""
+        if isinstance(value, np.ndarray) and value.ndim == 1 and value.dtype.kind in "fiu":
+            return _VECTOR_MAGIC + value.astype("<f4").tobytes()
+        if isinstance(value, list) and value and all(isinstance(v, (float, int)) for v in value):
+            return _VECTOR_MAGIC + np.asarray(value, dtype="<f4").tobytes()
+        return pickle.dumps(value)
+
+    @staticmethod
+    def _decode(raw: bytes) -> Any:
+        if raw.startswith(_VECTOR_MAGIC):
+            return np.frombuffer(raw, dtype="<f4", offset=len(_VECTOR_MAGIC)).tolist()
+        return pickle.loads(raw)
+
     async def get(self, key: str) -> Optional[Any]:
         """Get value from Redis.
 
@@ -267,17 +337,46 @@ class RedisCacheBackend:
             raw = await self._client.get(self._make_key(key))
             if raw is None:
                 return None
-            return pickle.loads(raw)
+            return self._decode(raw)
         except Exception as exc:
             self._logger.warning("Redis GET failed for key %s: %s", key, exc)
             return None
 
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values in a single MGET round trip.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Values in ``keys`` order, ``None`` for misses or undecodable entries
+        """
+        if not keys or not self._available or self._client is None:
+            return [None] * len(keys)
+        try:
+            raws = await self._client.mget([self._make_key(key) for key in keys])
+        except Exception as exc:
+            self._logger.warning("Redis MGET failed for %d keys: %s", len(keys), exc)
+            return [None] * len(keys)
+
+        values: List[Optional[Any]] = []
+        for key, raw in zip(keys, raws):
+            if raw is None:
+                values.append(None)
+                continue
+            try:
+                values.append(self._decode(raw))
+            except Exception as exc:
+                self._logger.warning("Redis value for key %s could not be decoded: %s", key, exc)
+                values.append(None)
+        return values
+
     async def set(self, key: str, value: Any, ttl: int = 0) -> None:
         """Set value in Redis with expiry.
 
         Args:
             key: Cache key
-            value: Value to cache (will be pickled)
+            value: Value to cache (vectors are packed as float32, other values pickled)
             ttl: Time-to-live in seconds (0 uses default_ttl)
         """
         if not self._available or self._client is None:
@@ -287,11 +386,29 @@ class RedisCacheBackend:
             await self._client.setex(
                 self._make_key(key),
                 effective_ttl,
-                pickle.dumps(value),
+                self._encode(value),
             )
         except Exception as exc:
             self._logger.warning("Redis SET failed for key %s: %s", key, exc)
 
+    async def set_many(self, items: Dict[str, Any], ttl: int = 0) -> None:
+        """Set several values with one pipelined round trip.
+
+        Args:
+            items: Mapping of cache key to value
+            ttl: Time-to-live in seconds (0 uses default_ttl)
+        """
+        if not items or not self._available or self._client is None:
+            return
+        try:
+            effective_ttl = ttl if ttl > 0 else self.default_ttl
+            pipe = self._client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.setex(self._make_key(key), effective_ttl, self._encode(value))
+            await pipe.execute()
+        except Exception as exc:
+            self._logger.warning("Redis pipelined SET failed for %d keys: %s", len(items), exc)
+
     async def delete(self, key: str) -> bool:
         """Delete a key from Redis.
 
@@ -432,9 +549,31 @@ class EmbeddingCache:
         if not self.enabled:
             return {text: None for text in texts}
 
-        results = {}
-        for text in texts:
-            results[text] = await self.get(text)
+        self._stats.total_requests += len(texts)
+        keys = {text: self._generate_key(text) for text in texts}
+        unique_keys = list(dict.fromkeys(keys.values()))
+
+        found: Dict[str, List[float]] = {}
+        for key, value in zip(unique_keys, await self.l1.get_many(unique_keys)):
+            if value is not None:
+                found[key] = value
+
+        # One round trip to L2 for everything L1 missed
+        l1_misses = [key for key in unique_keys if key not in found]
+        if self.l2 is not None and l1_misses:
+            promoted = {}
+            for key, value in zip(l1_misses, await self.l2.get_many(l1_misses)):
+                if value is not None:
+                    found[key] = value
+                    promoted[key] = value
+            if promoted:
+                await self.l1.set_many(promoted, self.default_ttl)
+
+        results = {text: found.get(key) for text, key in keys.items()}
+        hits = sum(1 for text in texts if results[text] is not None)
+        self._stats.hits += hits
+        self._stats.misses += len(texts) - hits
+        self._update_hit_rate()
         return results
 
     async def set(
@@ -482,8 +621,15 @@ class EmbeddingCache:
                 details={"texts_count": len(texts), "embeddings_count": len(embeddings)},
             )
 
-        for text, embedding in zip(texts, embeddings):
-            await self.set(text, embedding, ttl)
+        if not self.enabled or not texts:
+            return
+
+        cache_ttl = ttl or self.default_ttl
+        items = {self._generate_key(text): embedding for text, embedding in zip(texts, embeddings)}
+
+        await self.l1.set_many(items, cache_ttl)
+        if self.l2 is not None:
+            await self.l2.set_many(items, cache_ttl)
 
     async def delete(self, text: str) -> bool:
         """Delete cached embedding.
@@ -519,6 +665,7 @@ class EmbeddingCache:
         # Update memory usage from L1
         l1_stats = self.l1.get_stats()
         self._stats.memory_usage_bytes = int(l1_stats.get("memory_mb", 0) * 1024 * 1024)
+        self._stats.evictions = l1_stats.get("evictions", self._stats.evictions)
 
         return self._stats
 
@@ -539,10 +686,8 @@ class EmbeddingCache:
         Returns:
             Dictionary mapping chunk index to embedding
         """
-        results = {}
-        for i, chunk in enumerate(chunks):
-            results[i] = await self.get(chunk.content)
-        return results
+        cached = await self.get_batch([chunk.content for chunk in chunks])
+        return {i: cached[chunk.content] for i, chunk in enumerate(chunks)}
 
     async def set_document_chunks(
         self,
@@ -555,5 +700,5 @@ class EmbeddingCache:
             chunks: List of document chunks
             embeddings: List of embedding vectors
         """
-        for chunk, embedding in zip(chunks, embeddings):
-            await self.set(chunk.content, embedding)
+        pairs = list(zip(chunks, embeddings))
+        await self.set_batch([chunk.content for chunk, _ in pairs], [embedding for _, embedding in pairs])
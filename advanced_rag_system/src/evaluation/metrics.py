@@ -19,7 +19,7 @@ import re
 from abc import ABC, abstractmethod
 from collections import Counter
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
 import numpy as np
 from pydantic import BaseModel, Field
@@ -76,7 +76,13 @@ class RAGEvaluationSample:
 
 
 class BaseMetric(ABC):
-    """Abstract base class for all metrics."""
+    """Abstract base class for all metrics.
+
+    Metrics that are pure CPU work with no awaits (e.g. BLEU/ROUGE) set
+    ``cpu_bound`` so that batch runners may evaluate them in a process pool.
+    """
+
+    cpu_bound: bool = False
 
     def __init__(self, name: str):
         self.name = name
@@ -560,9 +566,11 @@ class FaithfulnessMetric(BaseMetric):
         claim_results = []
 
         context_text = " ".join([ctx.content for ctx in contexts])
+        # Extract context terms once per sample rather than once per claim
+        context_terms = frozenset(self._extract_terms(context_text))
 
         for claim in claims:
-            is_supported = await self._check_claim_support(claim, context_text)
+            is_supported = await self._check_claim_support(claim, context_text, context_terms)
             if is_supported:
                 supported_claims += 1
             claim_results.append({"claim": claim, "supported": is_supported})
@@ -609,11 +617,13 @@ class FaithfulnessMetric(BaseMetric):
 
         return claims[:10]  # Limit to top 10 claims
 
-    async def _check_claim_support(self, claim: str, context: str) -> bool:
+    async def _check_claim_support(
+        self, claim: str, context: str, context_terms: Optional[FrozenSet[str]] = None
+    ) -> bool:
         """Check if a claim is supported by the context."""
         # Simple keyword overlap check
         claim_words = set(self._extract_terms(claim))
-        context_words = set(self._extract_terms(context))
+        context_words = context_terms if context_terms is not None else set(self._extract_terms(context))
 
         if not claim_words:
             return True  # Empty claim is vacuously supported
@@ -750,6 +760,8 @@ class BLEUMetric(BaseMetric):
     Measures n-gram overlap between generated and reference answers.
     """
 
+    cpu_bound = True
+
     def __init__(self, max_n: int = 4, weights: Optional[List[float]] = None):
         super().__init__("bleu")
         self.max_n = max_n
@@ -831,6 +843,8 @@ class ROUGEMetric(BaseMetric):
     Measures recall of n-grams in reference text.
     """
 
+    cpu_bound = True
+
     def __init__(self, n: int = 1, use_stemming: bool = False):
         super().__init__(f"rouge_{n}")
         self.n = n
@@ -1067,19 +1081,32 @@ class PrecisionAtKMetric(BaseMetric):
 class CompositeMetric(BaseMetric):
     """
     Combines multiple metrics into a single score.
+
+    Args:
+        metrics: ``(metric, weight)`` pairs
+        name: Metric name
+        max_concurrency: Maximum number of samples scored concurrently by
+            ``compute_batch``; each sample fans out to every component metric
     """
 
-    def __init__(self, metrics: List[Tuple[BaseMetric, float]], name: str = "composite"):
+    def __init__(
+        self,
+        metrics: List[Tuple[BaseMetric, float]],
+        name: str = "composite",
+        max_concurrency: int = 32,
+    ):
         super().__init__(name)
         self.metrics = metrics
+        self.max_concurrency = max_concurrency
 
     async def compute(self, sample: RAGEvaluationSample, **kwargs) -> MetricResult:
         results = []
         weighted_sum = 0.0
         total_weight = 0.0
 
-        for metric, weight in self.metrics:
-            result = await metric.compute(sample, **kwargs)
+        component_results = await asyncio.gather(*(metric.compute(sample, **kwargs) for metric, _ in self.metrics))
+
+        for (metric, weight), result in zip(self.metrics, component_results):
             results.append(
                 {
                     "metric": metric.name,
@@ -1103,19 +1130,16 @@ class CompositeMetric(BaseMetric):
 
     async def compute_batch(self, samples: List[RAGEvaluationSample], **kwargs) -> EvaluationBatch:
         """Compute batch with component metrics."""
-        # Compute composite score for each sample
-        composite_results = []
-        for sample in samples:
-            result = await self.compute(sample, **kwargs)
-            composite_results.append(result)
+        # Compute composite score for each sample, bounding the samples x metrics fan-out
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
 
-        scores = [r.score for r in composite_results]
+        async def compute(sample: RAGEvaluationSample) -> MetricResult:
+            async with semaphore:
+                return await self.compute(sample, **kwargs)
 
-        # Also compute individual metrics
-        component_batches = {}
-        for metric, _ in self.metrics:
-            batch = await metric.compute_batch(samples, **kwargs)
-            component_batches[metric.name] = batch
+        composite_results = await asyncio.gather(*(compute(sample) for sample in samples))
+
+        scores = [r.score for r in composite_results]
 
         return EvaluationBatch(
             metric_name=self.name,
@@ -0,0 +1,490 @@
+"""
+Parallel Batch Evaluation Runner
+
+Evaluates many RAG samples against many metrics in one pass:
+- Embeddings are memoised for the duration of a run, so each distinct text
+  is embedded once no matter how many metrics use it
+- Async metrics fan out across samples under a concurrency limit
+- CPU-bound metrics (BLEU/ROUGE) run in chunks on a process pool
+- Results are cached by sample hash so unchanged samples are not re-scored
+  across nightly regression runs
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from src.evaluation.metrics import (
+    BaseMetric,
+    CompositeMetric,
+    EvaluationBatch,
+    MetricResult,
+    RAGEvaluationSample,
+)
+
+EmbeddingFn = Callable[[str], Union[List[float], Awaitable[List[float]]]]
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+
+@dataclass
+class EvaluationRunnerConfig:
+    """Configuration for the batch evaluation runner.
+
+    Attributes:
+        max_concurrency: Maximum number of samples evaluated concurrently for
+            async (embedding-backed) metrics
+        process_workers: Worker processes for CPU-bound metrics (0 evaluates
+            them inline on the event loop)
+        process_chunk_size: Samples per process-pool task; larger chunks
+            amortise pickling overhead
+        cache_results: Whether to reuse results for previously seen samples
+        cache_path: Optional JSON file used to persist the results cache
+            between runs
+    """
+
+    max_concurrency: int = 32
+    process_workers: int = 0
+    process_chunk_size: int = 256
+    cache_results: bool = True
+    cache_path: Optional[str] = None
+
+
+# ============================================================================
+# Shared Artifacts
+# ============================================================================
+
+
+class SharedEmbeddings:
+    """Embedding memo shared by every metric in a run.
+
+    Concurrent requests for the same text await a single call to the
+    underlying embedding function.
+    """
+
+    def __init__(self, embedding_fn: EmbeddingFn):
+        self.embedding_fn = embedding_fn
+        self._embeddings: Dict[str, "asyncio.Future[List[float]]"] = {}
+        self.calls = 0
+        self.hits = 0
+
+    async def __call__(self, text: str) -> List[float]:
+        future = self._embeddings.get(text)
+        if future is not None:
+            self.hits += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._embeddings[text] = future
+        self.calls += 1
+        try:
+            result = self.embedding_fn(text)
+            if asyncio.iscoroutine(result):
+                result = await result
+        except Exception as e:
+            # Do not memoise failures; let the next caller retry
+            del self._embeddings[text]
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        future.set_result(result)
+        return result
+
+    @property
+    def size(self) -> int:
+        """Number of distinct texts embedded so far."""
+        return len(self._embeddings)
+
+
+def sample_fingerprint(sample: RAGEvaluationSample) -> str:
+    """Stable hash of every sample field that can influence a metric score.
+
+    Args:
+        sample: Evaluation sample
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = {
+        "query": sample.query,
+        "answer": sample.answer,
+        "ground_truth_answer": sample.ground_truth_answer,
+        "expected_doc_ids": list(sample.expected_doc_ids),
+        "contexts": [
+            [c.content, c.doc_id, c.score, c.is_relevant, c.relevance_score] for c in sample.retrieved_contexts
+        ],
+        "metadata": sample.metadata,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def metric_fingerprint(metric: BaseMetric) -> str:
+    """Identify a metric by type, name and scalar configuration.
+
+    Two ``ROUGEMetric`` instances with different ``n`` get different
+    fingerprints, so their cached results never collide.
+
+    Args:
+        metric: Metric instance
+
+    Returns:
+        Fingerprint string
+    """
+    if isinstance(metric, CompositeMetric):
+        parts = [f"{metric_fingerprint(m)}*{w}" for m, w in metric.metrics]
+        return f"{type(metric).__name__}:{metric.name}:[{','.join(parts)}]"
+
+    config = sorted(
+        (key, value)
+        for key, value in vars(metric).items()
+        if key != "name" and isinstance(value, (bool, int, float, str, tuple, list, type(None)))
+    )
+    return f"{type(metric).__name__}:{metric.name}:{config!r}"
+
+
+class ResultsCache:
+    """Metric results keyed by (metric fingerprint, sample hash)."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        if self.path is not None and self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                self._results = json.load(f)
+
+    @staticmethod
+    def _key(metric_key: str, sample_hash: str) -> str:
+        return f"{metric_key}|{sample_hash}"
+
+    def get(self, metric_key: str, sample_hash: str) -> Optional[MetricResult]:
+        data = self._results.get(self._key(metric_key, sample_hash))
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return MetricResult(**data)
+
+    def set(self, metric_key: str, sample_hash: str, result: MetricResult) -> None:
+        self._results[self._key(metric_key, sample_hash)] = result.model_dump(mode="json")
+
+    def save(self) -> None:
+        """Persist the cache to ``path`` if one was configured."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self._results, f)
+
+    def clear(self) -> None:
+        self._results.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+
+# ============================================================================
+# Process Pool Workers
+# ============================================================================
+
+
+def _compute_chunk(metric: BaseMetric, samples: List[RAGEvaluationSample]) -> List[Dict[str, Any]]:
+    """Evaluate a CPU-bound metric over a chunk of samples in a worker process."""
+    return asyncio.run(_compute_sequential(metric, samples))
+
+
+async def _compute_sequential(metric: BaseMetric, samples: List[RAGEvaluationSample]) -> List[Dict[str, Any]]:
+    results = []
+    for sample in samples:
+        try:
+            result = await metric.compute(sample)
+        except Exception as e:
+            result = MetricResult(metric_name=metric.name, score=0.0, details={"error": str(e)})
+        results.append(result.model_dump(mode="json"))
+    return results
+
+
+# ============================================================================
+# Runner
+# ============================================================================
+
+
+class EvaluationRunner:
+    """Evaluate a batch of samples against several metrics in parallel.
+
+    For the duration of each run, metrics that take an ``embedding_fn`` are
+    pointed at a single :class:`SharedEmbeddings` memo per underlying
+    function, so a query or answer is embedded once per run no matter how
+    many metrics use it. The original functions are restored and the memo
+    is released when the run finishes.
+
+    Example:
+        ```python
+        runner = EvaluationRunner(
+            [AnswerRelevanceMetric(embedding_fn=embed), BLEUMetric(), ROUGEMetric(n=2)],
+            config=EvaluationRunnerConfig(process_workers=4, cache_path="eval_cache.json"),
+        )
+        batches = await runner.run(samples)
+        runner.close()
+        ```
+    """
+
+    def __init__(
+        self,
+        metrics: List[BaseMetric],
+        config: Optional[EvaluationRunnerConfig] = None,
+        executor: Optional[Executor] = None,
+    ):
+        """Initialize the runner.
+
+        Args:
+            metrics: Metrics to evaluate; names must be unique
+            config: Runner configuration
+            executor: Optional executor for CPU-bound metrics; overrides
+                ``process_workers`` and is not shut down by :meth:`close`
+
+        Raises:
+            ValueError: If two metrics share a name
+        """
+        names = [m.name for m in metrics]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Metric names must be unique: {names}")
+
+        self.metrics = metrics
+        self.config = config or EvaluationRunnerConfig()
+        self.cache = ResultsCache(self.config.cache_path) if self.config.cache_results else None
+        self._executor = executor
+        self._owns_executor = False
+        self._embedding_stats = {"distinct_texts": 0, "calls": 0, "hits": 0}
+        self._metric_keys = {m.name: metric_fingerprint(m) for m in metrics}
+
+    def _share_embeddings(
+        self,
+        metrics: List[BaseMetric],
+        shared: Dict[EmbeddingFn, SharedEmbeddings],
+    ) -> List[Tuple[BaseMetric, EmbeddingFn]]:
+        """Point every embedding-backed metric at a shared memo.
+
+        Args:
+            metrics: Metrics to rewire
+            shared: Memos for this run, keyed by the original function. Bound
+                methods compare by instance and function, so ``embedder.embed``
+                passed to several metrics maps to one memo.
+
+        Returns:
+            ``(metric, original embedding_fn)`` pairs to restore after the run
+        """
+        originals: List[Tuple[BaseMetric, EmbeddingFn]] = []
+        for metric in metrics:
+            if isinstance(metric, CompositeMetric):
+                originals.extend(self._share_embeddings([m for m, _ in metric.metrics], shared))
+                continue
+            embedding_fn = getattr(metric, "embedding_fn", None)
+            if embedding_fn is None or isinstance(embedding_fn, SharedEmbeddings):
+                continue
+            memo = shared.get(embedding_fn)
+            if memo is None:
+                memo = SharedEmbeddings(embedding_fn)
+                shared[embedding_fn] = memo
+            originals.append((metric, embedding_fn))
+            metric.embedding_fn = memo
+        return originals
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self._executor is None and self.config.process_workers > 0:
+            self._executor = ProcessPoolExecutor(max_workers=self.config.process_workers)
+            self._owns_executor = True
+        return self._executor
+
+    def close(self) -> None:
+        """Shut down the process pool (if owned) and persist the cache."""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._owns_executor = False
+        if self.cache is not None:
+            self.cache.save()
+
+    async def run(self, samples: List[RAGEvaluationSample]) -> Dict[str, EvaluationBatch]:
+        """Evaluate all metrics over all samples.
+
+        Args:
+            samples: Evaluation samples
+
+        Returns:
+            Dictionary mapping metric names to batch results
+        """
+        per_sample = await self.run_samples(samples)
+        return {
+            metric.name: self._aggregate(metric.name, [results[metric.name] for results in per_sample])
+            for metric in self.metrics
+        }
+
+    async def run_samples(self, samples: List[RAGEvaluationSample]) -> List[Dict[str, MetricResult]]:
+        """Evaluate all metrics and return per-sample results.
+
+        Args:
+            samples: Evaluation samples
+
+        Returns:
+            One dictionary of metric name to result per sample, in input order
+        """
+        hashes = [sample_fingerprint(s) for s in samples]
+        results: List[Dict[str, MetricResult]] = [{} for _ in samples]
+
+        # Deduplicate identical samples and drop cached ones
+        todo: Dict[str, List[int]] = {}
+        for metric in self.metrics:
+            metric_key = self._metric_keys[metric.name]
+            pending: Dict[str, int] = {}
+            for i, sample_hash in enumerate(hashes):
+                cached = self.cache.get(metric_key, sample_hash) if self.cache is not None else None
+                if cached is not None:
+                    results[i][metric.name] = cached
+                elif sample_hash not in pending:
+                    pending[sample_hash] = i
+            todo[metric.name] = list(pending.values())
+
+        cpu_metrics = [m for m in self.metrics if m.cpu_bound and todo[m.name]]
+        async_metrics = [m for m in self.metrics if not m.cpu_bound and todo[m.name]]
+
+        shared: Dict[EmbeddingFn, SharedEmbeddings] = {}
+        originals = self._share_embeddings(async_metrics, shared)
+        try:
+            computed = await asyncio.gather(
+                *(self._run_cpu_metric(m, [samples[i] for i in todo[m.name]]) for m in cpu_metrics),
+                *(self._run_async_metric(m, [samples[i] for i in todo[m.name]]) for m in async_metrics),
+            )
+        finally:
+            for metric, embedding_fn in originals:
+                metric.embedding_fn = embedding_fn
+            for memo in shared.values():
+                self._embedding_stats["distinct_texts"] += memo.size
+                self._embedding_stats["calls"] += memo.calls
+                self._embedding_stats["hits"] += memo.hits
+
+        for metric, metric_results in zip(cpu_metrics + async_metrics, computed):
+            metric_key = self._metric_keys[metric.name]
+            by_hash = {}
+            for i, result in zip(todo[metric.name], metric_results):
+                by_hash[hashes[i]] = result
+                if self.cache is not None and "error" not in result.details:
+                    self.cache.set(metric_key, hashes[i], result)
+            for i, sample_hash in enumerate(hashes):
+                if metric.name not in results[i]:
+                    results[i][metric.name] = by_hash[sample_hash]
+
+        return results
+
+    async def _run_async_metric(self, metric: BaseMetric, samples: List[RAGEvaluationSample]) -> List[MetricResult]:
+        """Fan an async metric out across samples under the concurrency limit."""
+        semaphore = asyncio.Semaphore(max(1, self.config.max_concurrency))
+
+        async def compute(sample: RAGEvaluationSample) -> MetricResult:
+            async with semaphore:
+                try:
+                    return await metric.compute(sample)
+                except Exception as e:
+                    return MetricResult(metric_name=metric.name, score=0.0, details={"error": str(e)})
+
+        return list(await asyncio.gather(*(compute(s) for s in samples)))
+
+    async def _run_cpu_metric(self, metric: BaseMetric, samples: List[RAGEvaluationSample]) -> List[MetricResult]:
+        """Evaluate a CPU-bound metric in process-pool chunks, or inline without a pool."""
+        executor = self._get_executor()
+        if executor is None:
+            return [MetricResult(**r) for r in await _compute_sequential(metric, samples)]
+
+        loop = asyncio.get_running_loop()
+        size = max(1, self.config.process_chunk_size)
+        chunks = [samples[i : i + size] for i in range(0, len(samples), size)]
+        outputs = await asyncio.gather(
+            *(loop.run_in_executor(executor, _compute_chunk, metric, chunk) for chunk in chunks)
+        )
+        return [MetricResult(**r) for chunk in outputs for r in chunk]
+
+    @staticmethod
+    def _aggregate(metric_name: str, results: List[MetricResult]) -> EvaluationBatch:
+        """Build batch statistics matching ``BaseMetric.compute_batch``."""
+        scores = [r.score for r in results]
+        if not scores:
+            return EvaluationBatch(metric_name=metric_name, scores=[], aggregate_score=0.0)
+
+        return EvaluationBatch(
+            metric_name=metric_name,
+            scores=scores,
+            aggregate_score=float(np.mean(scores)),
+            statistics={
+                "mean": float(np.mean(scores)),
+                "std": float(np.std(scores)),
+                "min": float(np.min(scores)),
+                "max": float(np.max(scores)),
+                "median": float(np.median(scores)),
+                "p25": float(np.percentile(scores, 25)),
+                "p75": float(np.percentile(scores, 75)),
+                "p95": float(np.percentile(scores, 95)),
+            },
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache and embedding-sharing statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        return {
+            "results_cache": {
+                "size": len(self.cache) if self.cache is not None else 0,
+                "hits": self.cache.hits if self.cache is not None else 0,
+                "misses": self.cache.misses if self.cache is not None else 0,
+            },
+            "embeddings": dict(self._embedding_stats),
+        }
+
+
+async def run_evaluation(
+    samples: List[RAGEvaluationSample],
+    metrics: List[BaseMetric],
+    config: Optional[EvaluationRunnerConfig] = None,
+) -> Dict[str, EvaluationBatch]:
+    """
+    Evaluate samples with a one-off :class:`EvaluationRunner`.
+
+    Args:
+        samples: Evaluation samples
+        metrics: Metrics to compute
+        config: Runner configuration
+
+    Returns:
+        Dictionary mapping metric names to batch results
+    """
+    runner = EvaluationRunner(metrics, config=config)
+    try:
+        return await runner.run(samples)
+    finally:
+        runner.close()
+
+
+__all__ = [
+    "EvaluationRunnerConfig",
+    "SharedEmbeddings",
+    "ResultsCache",
+    "EvaluationRunner",
+    "sample_fingerprint",
+    "metric_fingerprint",
+    "run_evaluation",
+]
@@ -4,10 +4,12 @@ This module provides comprehensive re-ranking capabilities including:
 - Base re-ranker interface and utilities
 - Cross-encoder re-ranking using sentence-transformers models
 - Cohere API re-ranking using cloud-based service
+- Cascade re-ranking with a cheap pre-filter ahead of an expensive stage
 - Mock re-ranker for development and testing
 """
 
 from .base import BaseReRanker, MockReRanker, ReRankingConfig, ReRankingResult, ReRankingStrategy
+from .cascade import CascadeConfig, CascadeReRanker
 from .cohere_reranker import CohereConfig, CohereReRanker
 from .cross_encoder import CrossEncoderReRanker
 
@@ -23,4 +25,7 @@ __all__ = [
     # Cohere API re-ranker
     "CohereReRanker",
     "CohereConfig",
+    # Cascade re-ranker
+    "CascadeReRanker",
+    "CascadeConfig",
 ]
@@ -0,0 +1,354 @@
+"""Two-stage cascade re-ranker with a cheap pre-filter.
+
+This module provides a re-ranker that scores every candidate with inexpensive
+signals that are already available on the search results (retrieval score,
+lexical overlap, vector distance) and forwards only the top survivors to an
+expensive re-ranker such as ``CrossEncoderReRanker`` or ``CohereReRanker``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from src.core.exceptions import RetrievalError
+from src.core.types import SearchResult
+
+from .base import BaseReRanker, ReRankingConfig, ReRankingResult
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+@dataclass
+class CascadeConfig:
+    """Configuration for the cascade re-ranker.
+
+    Attributes:
+        survivors: Number of pre-filter survivors sent to the second stage
+        retrieval_weight: Weight of the incoming retrieval score, min-max
+            normalized per request so RRF, BM25 and dense scores weigh alike
+        lexical_weight: Weight of query-term overlap with the chunk text
+        similarity_weight: Weight of the vector similarity derived from distance
+        prefilter_budget_ms: Latency budget for the pre-filter stage; if the
+            lexical-overlap pass (the only signal that tokenizes chunk text)
+            overruns it, that signal is dropped for the request
+        rerank_budget_ms: Latency budget for the second stage; on timeout the
+            pre-filter ordering is returned (None disables the budget)
+        recall_sample_rate: Fraction of requests that also re-rank the full
+            candidate list in the background to measure pre-filter recall
+            (0.0 disables sampling)
+        recall_k: Cutoff used for the sampled recall measurement
+    """
+
+    survivors: int = 25
+    retrieval_weight: float = 0.5
+    lexical_weight: float = 0.3
+    similarity_weight: float = 0.2
+    prefilter_budget_ms: float = 5.0
+    rerank_budget_ms: Optional[float] = None
+    recall_sample_rate: float = 0.0
+    recall_k: int = 10
+
+
+class CascadeReRanker(BaseReRanker):
+    """Re-ranker that prunes candidates cheaply before an expensive model.
+
+    Candidates are first ordered by a weighted blend of signals that cost
+    nothing to compute; only the top ``survivors`` are passed to the wrapped
+    re-ranker. Pruned candidates keep their pre-filter order and are appended
+    after the re-ranked survivors.
+
+    Example:
+        ```python
+        reranker = CascadeReRanker(
+            CrossEncoderReRanker(),
+            cascade_config=CascadeConfig(survivors=20, rerank_budget_ms=150),
+        )
+        await reranker.initialize()
+
+        reranked = await reranker.rerank(query, search_results)
+        await reranker.close()
+        ```
+    """
+
+    def __init__(
+        self,
+        reranker: BaseReRanker,
+        cascade_config: Optional[CascadeConfig] = None,
+        config: Optional[ReRankingConfig] = None,
+    ):
+        """Initialize cascade re-ranker.
+
+        Args:
+            reranker: Expensive second-stage re-ranker
+            cascade_config: Cascade-specific configuration
+            config: Re-ranking configuration for candidate filtering
+        """
+        super().__init__(config)
+        self.reranker = reranker
+        self.cascade_config = cascade_config or CascadeConfig()
+        self._initialized = False
+        self._random = random.Random()
+        self._recall_tasks: Set[asyncio.Task] = set()
+        self._cascade_stats = {
+            "requests": 0,
+            "candidates": 0,
+            "reranked_candidates": 0,
+            "prefilter_time_ms": 0.0,
+            "rerank_time_ms": 0.0,
+            "prefilter_budget_exceeded": 0,
+            "lexical_skipped": 0,
+            "rerank_timeouts": 0,
+            "recall_samples": 0,
+            "recall_errors": 0,
+            "recall_sum": 0.0,
+        }
+
+    async def initialize(self) -> None:
+        """Initialize the wrapped re-ranker.
+
+        Raises:
+            RetrievalError: If initialization fails
+        """
+        if self._initialized:
+            return
+        await self.reranker.initialize()
+        self._initialized = True
+
+    async def close(self) -> None:
+        """Cancel pending recall measurements and clean up the wrapped re-ranker."""
+        for task in self._recall_tasks:
+            task.cancel()
+        await asyncio.gather(*self._recall_tasks, return_exceptions=True)
+        self._recall_tasks.clear()
+        await self.reranker.close()
+        self._initialized = False
+
+    def get_model_info(self) -> Dict[str, Any]:
+        """Get information about both cascade stages.
+
+        Returns:
+            Dictionary with model information
+        """
+        return {
+            "name": "CascadeReRanker",
+            "type": "cascade",
+            "survivors": self.cascade_config.survivors,
+            "stage_two": self.reranker.get_model_info(),
+        }
+
+    async def rerank(self, query: str, results: List[SearchResult]) -> ReRankingResult:
+        """Pre-filter candidates cheaply, then re-rank the survivors.
+
+        Args:
+            query: Search query
+            results: Search results to re-rank
+
+        Returns:
+            Re-ranking result with survivors re-ranked ahead of pruned candidates
+
+        Raises:
+            RetrievalError: If re-ranking fails
+        """
+        if not self._initialized:
+            raise RetrievalError("CascadeReRanker not initialized. Call initialize() first.")
+
+        start_time = time.time()
+
+        if not results:
+            return ReRankingResult(
+                results=[],
+                original_count=0,
+                reranked_count=0,
+                processing_time_ms=0.0,
+                model_info=self.get_model_info(),
+                scores_changed=False,
+            )
+
+        filtered_results = self._filter_results(results)
+        remaining_results = results[len(filtered_results) :]
+        self._cascade_stats["requests"] += 1
+        self._cascade_stats["candidates"] += len(filtered_results)
+
+        # Stage 1: cheap pre-filter
+        prefilter_start = time.time()
+        cheap_scores = self._prefilter_scores(query, filtered_results, prefilter_start)
+        order = sorted(range(len(filtered_results)), key=lambda i: cheap_scores[i], reverse=True)
+        survivor_count = min(self.cascade_config.survivors, len(filtered_results))
+        survivors = [filtered_results[i] for i in order[:survivor_count]]
+        pruned = [filtered_results[i] for i in order[survivor_count:]]
+        prefilter_ms = (time.time() - prefilter_start) * 1000
+        self._cascade_stats["prefilter_time_ms"] += prefilter_ms
+        if prefilter_ms > self.cascade_config.prefilter_budget_ms:
+            self._cascade_stats["prefilter_budget_exceeded"] += 1
+
+        # Stage 2: expensive re-ranker on survivors only
+        rerank_start = time.time()
+        stage_two = await self._rerank_survivors(query, survivors)
+        self._cascade_stats["rerank_time_ms"] += (time.time() - rerank_start) * 1000
+
+        if stage_two is None:
+            ranked_survivors = survivors
+            reranked_count = 0
+            scores_changed = False
+        else:
+            ranked_survivors = stage_two.results
+            reranked_count = stage_two.reranked_count
+            scores_changed = stage_two.scores_changed
+            self._cascade_stats["reranked_candidates"] += reranked_count
+            if pruned and self._should_sample_recall():
+                self._schedule_recall(query, filtered_results, ranked_survivors)
+
+        final_results = self._update_ranks(ranked_survivors + pruned + remaining_results)
+
+        return ReRankingResult(
+            results=final_results,
+            original_count=len(results),
+            reranked_count=reranked_count,
+            processing_time_ms=(time.time() - start_time) * 1000,
+            model_info=self.get_model_info(),
+            scores_changed=scores_changed,
+        )
+
+    def _prefilter_scores(
+        self, query: str, results: List[SearchResult], start_time: Optional[float] = None
+    ) -> List[float]:
+        """Score candidates with signals already present on the results.
+
+        Retrieval scores are min-max normalized across ``results`` so their
+        weight does not depend on the upstream retriever's score scale. The
+        lexical signal is dropped for every candidate if computing it would
+        exceed ``prefilter_budget_ms`` measured from ``start_time``.
+
+        Args:
+            query: Search query
+            results: Candidates to score
+            start_time: ``time.time()`` at which the pre-filter started
+
+        Returns:
+            Cheap relevance scores aligned with ``results``
+        """
+        cfg = self.cascade_config
+        deadline = (start_time if start_time is not None else time.time()) + cfg.prefilter_budget_ms / 1000
+
+        raw_scores = [result.score for result in results]
+        low, high = min(raw_scores), max(raw_scores)
+        score_range = high - low
+        retrieval = [(score - low) / score_range if score_range > 0 else 1.0 for score in raw_scores]
+
+        lexical = self._lexical_overlap(query, results, deadline) if cfg.lexical_weight else None
+
+        scores = []
+        for i, result in enumerate(results):
+            similarity = max(0.0, 1.0 - result.distance)
+            score = cfg.retrieval_weight * retrieval[i] + cfg.similarity_weight * similarity
+            if lexical is not None:
+                score += cfg.lexical_weight * lexical[i]
+            scores.append(score)
+
+        return scores
+
+    def _lexical_overlap(self, query: str, results: List[SearchResult], deadline: float) -> Optional[List[float]]:
+        """Fraction of query terms present in each candidate.
+
+        Args:
+            query: Search query
+            results: Candidates to score
+            deadline: ``time.time()`` after which the pass is abandoned
+
+        Returns:
+            Overlap scores aligned with ``results``, or None if the deadline passed
+        """
+        query_terms = set(_TOKEN_PATTERN.findall(query.lower()))
+        if not query_terms:
+            return [0.0] * len(results)
+
+        overlap = []
+        for i, result in enumerate(results):
+            if i % 16 == 0 and time.time() > deadline:
+                self._cascade_stats["lexical_skipped"] += 1
+                return None
+            content_terms = set(_TOKEN_PATTERN.findall(result.chunk.content.lower()))
+            overlap.append(len(query_terms & content_terms) / len(query_terms))
+        return overlap
+
+    async def _rerank_survivors(self, query: str, survivors: List[SearchResult]) -> Optional[ReRankingResult]:
+        """Run the second stage within its latency budget.
+
+        Args:
+            query: Search query
+            survivors: Pre-filter survivors
+
+        Returns:
+            Second-stage result, or None if the budget was exceeded
+        """
+        budget_ms = self.cascade_config.rerank_budget_ms
+        if budget_ms is None:
+            return await self.reranker.rerank(query, survivors)
+
+        try:
+            return await asyncio.wait_for(self.reranker.rerank(query, survivors), timeout=budget_ms / 1000)
+        except asyncio.TimeoutError:
+            self._cascade_stats["rerank_timeouts"] += 1
+            return None
+
+    def _should_sample_recall(self) -> bool:
+        """Decide whether this request contributes to recall telemetry."""
+        rate = self.cascade_config.recall_sample_rate
+        return rate > 0 and self._random.random() < rate
+
+    def _schedule_recall(
+        self, query: str, candidates: List[SearchResult], ranked_survivors: List[SearchResult]
+    ) -> None:
+        """Measure recall in a background task so the full re-rank stays off the request path."""
+        task = asyncio.get_running_loop().create_task(
+            self._measure_recall(query, list(candidates), list(ranked_survivors))
+        )
+        self._recall_tasks.add(task)
+        task.add_done_callback(self._recall_tasks.discard)
+
+    async def _measure_recall(
+        self, query: str, candidates: List[SearchResult], ranked_survivors: List[SearchResult]
+    ) -> None:
+        """Compare the cascade top-k with a full second-stage re-rank.
+
+        Args:
+            query: Search query
+            candidates: Full pre-filter input
+            ranked_survivors: Second-stage ordering of the survivors
+        """
+        k = self.cascade_config.recall_k
+        try:
+            full = await self.reranker.rerank(query, candidates)
+        except Exception:
+            # Telemetry only; a failed sample must not surface anywhere
+            self._cascade_stats["recall_errors"] += 1
+            return
+        reference = {r.chunk.id for r in full.results[:k]}
+        if not reference:
+            return
+        retained = {r.chunk.id for r in ranked_survivors[:k]}
+        self._cascade_stats["recall_samples"] += 1
+        self._cascade_stats["recall_sum"] += len(reference & retained) / len(reference)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get re-ranker statistics including per-stage latency and recall.
+
+        Returns:
+            Dictionary with statistics
+        """
+        stats = super().get_stats()
+        cascade = dict(self._cascade_stats)
+        requests = cascade["requests"]
+        cascade["avg_prefilter_time_ms"] = cascade["prefilter_time_ms"] / requests if requests else 0.0
+        cascade["avg_rerank_time_ms"] = cascade["rerank_time_ms"] / requests if requests else 0.0
+        candidates = cascade["candidates"]
+        cascade["rerank_fraction"] = cascade["reranked_candidates"] / candidates if candidates else 0.0
+        samples = cascade["recall_samples"]
+        cascade["mean_recall_at_k"] = cascade.pop("recall_sum") / samples if samples else None
+        stats["cascade"] = cascade
+        return stats
@@ -7,9 +7,12 @@ that can directly score query-document pairs for improved relevance ranking.
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import math
 import time
 import warnings
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 from src.core.exceptions import RetrievalError
 from src.core.types import SearchResult
@@ -36,6 +39,10 @@ class CrossEncoderReRanker(BaseReRanker):
     are specifically designed for ranking tasks and often provide
     better results than bi-encoder approaches.
 
+    Model scores are memoised per (query, chunk id) in a bounded LRU cache,
+    identical chunk texts within a request are scored once, and concurrent
+    ``rerank`` calls are coalesced into a single model forward pass.
+
     Example:
         ```python
         config = ReRankingConfig(top_k=50)
@@ -57,6 +64,9 @@ class CrossEncoderReRanker(BaseReRanker):
         config: Optional[ReRankingConfig] = None,
         device: Optional[str] = None,
         max_length: int = 512,
+        score_cache_size: int = 10000,
+        coalesce_window_ms: float = 2.0,
+        max_coalesced_pairs: int = 256,
     ):
         """Initialize cross-encoder re-ranker.
 
@@ -65,15 +75,35 @@ class CrossEncoderReRanker(BaseReRanker):
             config: Re-ranking configuration
             device: Device to run the model on ('cpu', 'cuda', 'auto')
             max_length: Maximum input sequence length
+            score_cache_size: Maximum number of cached (query, chunk) scores
+                (0 disables the cache)
+            coalesce_window_ms: How long to wait for concurrent requests to
+                join a forward pass
+            max_coalesced_pairs: Upper bound on pairs sent in one forward pass
         """
         super().__init__(config)
         self.model_name = model_name
         self.max_length = max_length
         self.device = device or self._get_device()
+        self.score_cache_size = score_cache_size
+        self.coalesce_window_ms = coalesce_window_ms
+        self.max_coalesced_pairs = max(1, max_coalesced_pairs)
 
         self.model: Optional[CrossEncoder] = None
         self._initialized = False
 
+        self._score_cache: OrderedDict[Tuple[str, str], float] = OrderedDict()
+        self._pending: Deque[Tuple[List[List[str]], asyncio.Future]] = deque()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._scoring_stats = {
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "deduplicated_pairs": 0,
+            "forward_passes": 0,
+            "coalesced_requests": 0,
+            "scored_pairs": 0,
+        }
+
         # Check availability
         if not SENTENCE_TRANSFORMERS_AVAILABLE:
             warnings.warn(
@@ -138,6 +168,14 @@ class CrossEncoderReRanker(BaseReRanker):
 
     async def close(self) -> None:
         """Clean up resources."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        for _, future in self._pending:
+            if not future.done():
+                future.set_exception(RetrievalError("CrossEncoderReRanker closed before scoring completed"))
+        self._pending.clear()
+
         if self.model is not None and hasattr(self.model, "to"):
             # Move model to CPU to free GPU memory
             self.model.to("cpu")
@@ -162,6 +200,7 @@ class CrossEncoderReRanker(BaseReRanker):
             "device": self.device,
             "initialized": self._initialized,
             "sentence_transformers_available": SENTENCE_TRANSFORMERS_AVAILABLE,
+            "score_cache_entries": len(self._score_cache),
         }
 
         if self.model is not None and hasattr(self.model, "config"):
@@ -256,6 +295,9 @@ class CrossEncoderReRanker(BaseReRanker):
     async def _score_pairs(self, query: str, results: List[SearchResult]) -> List[float]:
         """Score query-document pairs using the cross-encoder.
 
+        Cached scores are reused, identical chunk texts are scored once and
+        the remaining pairs are submitted to the shared micro-batch queue.
+
         Args:
             query: Search query
             results: Search results to score
@@ -271,66 +313,195 @@ class CrossEncoderReRanker(BaseReRanker):
             return await self._fallback_scoring(query, results)
 
         try:
-            # Prepare query-document pairs
-            pairs = []
-            for result in results:
+            query_key = hashlib.sha256(query.encode("utf-8")).hexdigest()
+            scores: List[float] = [0.0] * len(results)
+            positions_by_text: Dict[str, List[int]] = {}
+
+            for i, result in enumerate(results):
+                cached = self._get_cached_score((query_key, str(result.chunk.id)))
+                if cached is not None:
+                    scores[i] = cached
+                    continue
+
                 # Truncate document if too long
                 content = result.chunk.content
                 if len(content) > 1000:  # Simple character-based truncation
                     content = content[:1000] + "..."
+                positions_by_text.setdefault(content, []).append(i)
+
+            if not positions_by_text:
+                return scores
 
-                pairs.append([query, content])
+            texts = list(positions_by_text)
+            missed = sum(len(positions) for positions in positions_by_text.values())
+            self._scoring_stats["deduplicated_pairs"] += missed - len(texts)
 
-            # Process in batches to manage memory
-            all_scores = []
-            batch_size = self.config.batch_size
+            try:
+                text_scores = await self._submit_pairs([[query, text] for text in texts])
+                cacheable = True
+            except RetrievalError:
+                raise
+            except Exception as e:
+                # Return neutral scores if the forward pass fails, but never cache them
+                warnings.warn(f"Batch scoring failed: {e}")
+                text_scores = [0.5] * len(texts)
+                cacheable = False
+
+            for text, score in zip(texts, text_scores):
+                for i in positions_by_text[text]:
+                    scores[i] = score
+                    if cacheable:
+                        self._set_cached_score((query_key, str(results[i].chunk.id)), score)
+
+            return scores
+
+        except Exception as e:
+            # Fallback to simple scoring if cross-encoder fails
+            warnings.warn(f"Cross-encoder scoring failed, using fallback: {e}")
+            return await self._fallback_scoring(query, results)
 
-            for i in range(0, len(pairs), batch_size):
-                batch_pairs = pairs[i : i + batch_size]
+    def _get_cached_score(self, key: Tuple[str, str]) -> Optional[float]:
+        """Look up a cached score and mark it as recently used.
 
-                # Run scoring in executor to avoid blocking
-                loop = asyncio.get_event_loop()
-                batch_scores = await loop.run_in_executor(None, self._score_batch, batch_pairs)
+        Args:
+            key: (query hash, chunk id) cache key
 
-                all_scores.extend(batch_scores)
+        Returns:
+            Cached score or None on a miss
+        """
+        score = self._score_cache.get(key)
+        if score is None:
+            self._scoring_stats["cache_misses"] += 1
+            return None
+        self._score_cache.move_to_end(key)
+        self._scoring_stats["cache_hits"] += 1
+        return score
+
+    def _set_cached_score(self, key: Tuple[str, str], score: float) -> None:
+        """Store a score, evicting the least recently used entries when full.
+
+        Args:
+            key: (query hash, chunk id) cache key
+            score: Normalized relevance score
+        """
+        if self.score_cache_size <= 0:
+            return
+        self._score_cache[key] = score
+        self._score_cache.move_to_end(key)
+        while len(self._score_cache) > self.score_cache_size:
+            self._score_cache.popitem(last=False)
 
-                # Small delay between batches to prevent overwhelming
-                if i + batch_size < len(pairs):
-                    await asyncio.sleep(0.01)
+    def clear_score_cache(self) -> None:
+        """Drop all cached (query, chunk) scores."""
+        self._score_cache.clear()
 
-            return all_scores
+    async def _submit_pairs(self, pairs: List[List[str]]) -> List[float]:
+        """Queue pairs for the next coalesced forward pass.
 
+        Args:
+            pairs: List of [query, document] pairs from one request
+
+        Returns:
+            Normalized scores in the same order as ``pairs``
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((pairs, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._drain_pending())
+        return await future
+
+    async def _drain_pending(self) -> None:
+        """Run forward passes until the pending queue is empty.
+
+        Waits ``coalesce_window_ms`` so concurrent requests can join the first
+        pass; requests that arrive while a pass is running join the next one.
+        """
+        try:
+            if self.coalesce_window_ms > 0:
+                await asyncio.sleep(self.coalesce_window_ms / 1000)
+
+            while self._pending:
+                batch: List[Tuple[List[List[str]], asyncio.Future]] = []
+                batch_pairs = 0
+                while self._pending and (
+                    not batch or batch_pairs + len(self._pending[0][0]) <= self.max_coalesced_pairs
+                ):
+                    request_pairs, future = self._pending.popleft()
+                    batch.append((request_pairs, future))
+                    batch_pairs += len(request_pairs)
+                await self._run_batch(batch)
+        finally:
+            # close() may already have replaced this task with a new one
+            if self._flush_task is asyncio.current_task():
+                self._flush_task = None
+
+    async def _run_batch(self, batch: List[Tuple[List[List[str]], asyncio.Future]]) -> None:
+        """Score a coalesced batch in one forward pass and fan results out.
+
+        Args:
+            batch: Queued (pairs, future) entries from one or more requests
+        """
+        pairs = [pair for request_pairs, _ in batch for pair in request_pairs]
+
+        try:
+            # Run scoring in executor to avoid blocking
+            loop = asyncio.get_running_loop()
+            scores = await loop.run_in_executor(None, self._predict_batch, pairs)
+        except asyncio.CancelledError:
+            # close() cancelled the drain task mid-pass; the batch has already
+            # left the pending queue, so its callers must be failed here.
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(RetrievalError("CrossEncoderReRanker closed before scoring completed"))
+            raise
         except Exception as e:
-            # Fallback to simple scoring if cross-encoder fails
-            warnings.warn(f"Cross-encoder scoring failed, using fallback: {e}")
-            return await self._fallback_scoring(query, results)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
 
-    def _score_batch(self, pairs: List[List[str]]) -> List[float]:
-        """Score a batch of query-document pairs synchronously.
+        self._scoring_stats["forward_passes"] += 1
+        self._scoring_stats["coalesced_requests"] += len(batch)
+        self._scoring_stats["scored_pairs"] += len(pairs)
+
+        offset = 0
+        for request_pairs, future in batch:
+            if not future.done():
+                future.set_result(scores[offset : offset + len(request_pairs)])
+            offset += len(request_pairs)
+
+    def _predict_batch(self, pairs: List[List[str]]) -> List[float]:
+        """Run the model over a batch of pairs and normalize with a sigmoid.
 
         Args:
             pairs: List of [query, document] pairs
 
         Returns:
-            List of relevance scores
+            List of relevance scores in [0, 1]
+
+        Raises:
+            Exception: Any error raised by the underlying model
         """
-        try:
-            scores = self.model.predict(pairs)
+        scores = self.model.predict(pairs, batch_size=self.config.batch_size)
 
-            # Convert to list and ensure scores are in reasonable range
-            if hasattr(scores, "tolist"):
-                scores = scores.tolist()
+        # Convert to list and ensure scores are in reasonable range
+        if hasattr(scores, "tolist"):
+            scores = scores.tolist()
 
-            # Normalize scores to [0, 1] range using sigmoid
-            import math
+        # Apply sigmoid to normalize to [0, 1]
+        return [float(1 / (1 + math.exp(-score))) for score in scores]
 
-            normalized_scores = []
-            for score in scores:
-                # Apply sigmoid to normalize to [0, 1]
-                normalized = 1 / (1 + math.exp(-score))
-                normalized_scores.append(float(normalized))
+    def _score_batch(self, pairs: List[List[str]]) -> List[float]:
+        """Score a batch of query-document pairs synchronously.
 
-            return normalized_scores
+        Args:
+            pairs: List of [query, document] pairs
+
+        Returns:
+            List of relevance scores
+        """
+        try:
+            return self._predict_batch(pairs)
 
         except Exception as e:
             # Return neutral scores if batch scoring fails
@@ -389,6 +560,20 @@ class CrossEncoderReRanker(BaseReRanker):
         else:
             return min(24, num_results)
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Get re-ranker statistics including cache and batching counters.
+
+        Returns:
+            Dictionary with statistics
+        """
+        stats = super().get_stats()
+        stats["scoring"] = {
+            **self._scoring_stats,
+            "score_cache_entries": len(self._score_cache),
+            "score_cache_size": self.score_cache_size,
+        }
+        return stats
+
 
 # Alias for easier imports
 CrossEncoderReranker = CrossEncoderReRanker
@@ -27,13 +27,17 @@ Example:
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
+import numpy as np
+
 from src.core.types import DocumentChunk, SearchResult
 
 logger = logging.getLogger(__name__)
@@ -122,6 +126,57 @@ class CompressedDocument:
     relevance_score: float = 0.0
 
 
+@dataclass
+class SentenceBatch:
+    """Sentences of several documents, split once and scored as arrays.
+
+    Sentence ``j`` of document ``i`` lives at ``doc_offsets[i] + j`` in the
+    flat arrays; only non-empty sentences are stored.
+
+    Attributes:
+        sentences: Stripped, non-empty sentence texts
+        positions: Index of each sentence in its document's raw split
+        doc_offsets: Start offset of each document (length n_docs + 1)
+        raw_counts: Number of raw split segments per document
+        scores: Relevance score of each sentence
+        token_counts: Token count of each sentence
+        document_scores: Overall relevance score of each document
+        method: Scoring method used
+    """
+
+    sentences: List[str]
+    positions: np.ndarray
+    doc_offsets: np.ndarray
+    raw_counts: List[int]
+    scores: np.ndarray
+    token_counts: np.ndarray
+    document_scores: np.ndarray
+    method: ScoringMethod = ScoringMethod.KEYWORD
+
+    def relevance_scores(self, documents: Sequence[DocumentChunk]) -> List[RelevanceScore]:
+        """Materialize per-document relevance scores.
+
+        Args:
+            documents: Documents the batch was built from, in order
+
+        Returns:
+            One relevance score per document
+        """
+        scores = self.scores.tolist()
+        results = []
+        for i, doc in enumerate(documents):
+            start, end = int(self.doc_offsets[i]), int(self.doc_offsets[i + 1])
+            results.append(
+                RelevanceScore(
+                    document_id=doc.id,
+                    overall_score=float(self.document_scores[i]),
+                    segment_scores=list(zip(self.sentences[start:end], scores[start:end])),
+                    method=self.method,
+                )
+            )
+        return results
+
+
 @dataclass
 class CompressionResult:
     """Result of compression operation.
@@ -156,6 +211,8 @@ class CompressionConfig:
         min_relevance_threshold: Minimum relevance to include
         preserve_structure: Whether to preserve document structure
         context_window: Context sentences around selected segments
+        batch_scoring: Score all sentences of all documents in one pass for
+            extractive compression
     """
 
     default_strategy: CompressionStrategy = CompressionStrategy.EXTRACTIVE
@@ -164,6 +221,7 @@ class CompressionConfig:
     min_relevance_threshold: float = 0.3
     preserve_structure: bool = True
     context_window: int = 1
+    batch_scoring: bool = True
 
 
 # ============================================================================
@@ -172,18 +230,67 @@ class CompressionConfig:
 
 
 class TokenCounter:
-    """Simple token counter using word-based approximation.
+    """Token counter backed by an exact tokenizer, or a word approximation.
+
+    Any tokenizer exposing ``encode`` (and optionally ``encode_batch``) can be
+    plugged in, e.g. a ``tiktoken.Encoding`` or a local
+    ``tokenizers.Tokenizer`` loaded with ``from_tokenizer_file``. Exact counts
+    are memoised in an LRU cache keyed by a hash of the text.
 
-    For production, this should use the actual tokenizer used by the LLM.
+    Example:
+        ```python
+        counter = TokenCounter.from_tokenizer_file("models/tokenizer.json")
+        counts = counter.count_batch(["first chunk", "second chunk"])
+        ```
     """
 
-    def __init__(self, tokens_per_word: float = 1.3) -> None:
+    def __init__(
+        self,
+        tokens_per_word: float = 1.3,
+        tokenizer: Optional[Any] = None,
+        cache_size: int = 8192,
+    ) -> None:
         """Initialize token counter.
 
         Args:
-            tokens_per_word: Approximate tokens per word
+            tokens_per_word: Approximate tokens per word when no tokenizer is set
+            tokenizer: Optional exact tokenizer with an ``encode`` method
+            cache_size: Maximum cached counts for the exact tokenizer (0 disables)
         """
         self.tokens_per_word = tokens_per_word
+        self.tokenizer = tokenizer
+        self.cache_size = cache_size
+        self._cache: OrderedDict[bytes, int] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @classmethod
+    def from_tokenizer_file(cls, path: str, cache_size: int = 8192) -> "TokenCounter":
+        """Create a counter from a local ``tokenizer.json`` BPE definition.
+
+        The file is read from disk, so no network access is needed.
+
+        Args:
+            path: Path to a Hugging Face ``tokenizer.json`` file
+            cache_size: Maximum cached counts
+
+        Returns:
+            Token counter using the exact tokenizer
+
+        Raises:
+            ImportError: If the ``tokenizers`` package is not installed
+        """
+        try:
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError("tokenizers is required for TokenCounter.from_tokenizer_file") from e
+
+        return cls(tokenizer=Tokenizer.from_file(path), cache_size=cache_size)
+
+    @property
+    def is_exact(self) -> bool:
+        """Whether counts come from a real tokenizer."""
+        return self.tokenizer is not None
 
     def count(self, text: str) -> int:
         """Count tokens in text.
@@ -192,21 +299,81 @@ class TokenCounter:
             text: Text to count
 
         Returns:
-            Estimated token count
+            Token count (exact when a tokenizer is configured)
         """
-        words = len(text.split())
-        return int(words * self.tokens_per_word)
+        return self.count_batch([text])[0]
 
     def count_batch(self, texts: List[str]) -> List[int]:
         """Count tokens for multiple texts.
 
+        With a tokenizer, cache misses are deduplicated and encoded in a single
+        ``encode_batch`` call when the tokenizer supports it.
+
         Args:
             texts: Texts to count
 
         Returns:
             List of token counts
         """
-        return [self.count(t) for t in texts]
+        if self.tokenizer is None:
+            return [int(len(t.split()) * self.tokens_per_word) for t in texts]
+
+        keys = [hashlib.blake2b(t.encode("utf-8"), digest_size=16).digest() for t in texts]
+        counts: List[Optional[int]] = [None] * len(texts)
+        missing: Dict[bytes, str] = {}
+
+        for i, key in enumerate(keys):
+            cached = self._cache.get(key)
+            if cached is None:
+                missing.setdefault(key, texts[i])
+            else:
+                self._cache.move_to_end(key)
+                counts[i] = cached
+                self._hits += 1
+
+        if missing:
+            self._misses += len(missing)
+            fresh = dict(zip(missing, self._encode_lengths(list(missing.values()))))
+            for key, length in fresh.items():
+                self._remember(key, length)
+            counts = [fresh[key] if count is None else count for key, count in zip(keys, counts)]
+
+        return counts
+
+    def _encode_lengths(self, texts: List[str]) -> List[int]:
+        """Encode texts with the tokenizer and return their lengths."""
+        tokenizer = self.tokenizer
+        # tiktoken's *_ordinary variants do not reject special-token text
+        for name in ("encode_ordinary_batch", "encode_batch"):
+            encode_batch = getattr(tokenizer, name, None)
+            if encode_batch is not None:
+                return [len(encoded) for encoded in encode_batch(texts)]
+
+        encode = getattr(tokenizer, "encode_ordinary", None) or tokenizer.encode
+        return [len(encode(t)) for t in texts]
+
+    def _remember(self, key: bytes, count: int) -> None:
+        """Cache a count, evicting the least recently used entries."""
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = count
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tokenizer cache statistics.
+
+        Returns:
+            Dictionary with cache statistics
+        """
+        lookups = self._hits + self._misses
+        return {
+            "exact": self.is_exact,
+            "cache_size": len(self._cache),
+            "cache_hits": self._hits,
+            "cache_misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+        }
 
 
 # ============================================================================
@@ -545,15 +712,20 @@ class ExtractiveCompressor:
         self,
         context_window: int = 1,
         token_counter: Optional[TokenCounter] = None,
+        sentence_encoder: Optional[Callable[[List[str]], Any]] = None,
     ) -> None:
         """Initialize extractive compressor.
 
         Args:
             context_window: Sentences to include around selected ones
             token_counter: Token counter instance
+            sentence_encoder: Optional callable mapping texts to an embedding
+                matrix; when set, batched scoring uses cosine similarity
+                instead of keyword overlap
         """
         self.context_window = context_window
         self.token_counter = token_counter or TokenCounter()
+        self.sentence_encoder = sentence_encoder
 
     async def compress(
         self,
@@ -618,6 +790,192 @@ class ExtractiveCompressor:
             relevance_score=relevance_score.overall_score,
         )
 
+    def score_batch(self, documents: Sequence[DocumentChunk], query: str) -> SentenceBatch:
+        """Split all documents once and score every sentence against the query.
+
+        Keyword scoring builds a sentence x query-term incidence matrix, so
+        each score is a row mean; with a ``sentence_encoder`` the query and all
+        sentences are embedded in one call and scored with a single matmul.
+
+        Args:
+            documents: Documents to score
+            query: Query string
+
+        Returns:
+            Sentence batch with per-sentence and per-document scores
+        """
+        sentences: List[str] = []
+        positions: List[int] = []
+        offsets = [0]
+        raw_counts: List[int] = []
+
+        for doc in documents:
+            raw = re.split(r"[.!?]+", doc.content)
+            raw_counts.append(len(raw))
+            for i, sentence in enumerate(raw):
+                sentence = sentence.strip()
+                if sentence:
+                    sentences.append(sentence)
+                    positions.append(i)
+            offsets.append(len(sentences))
+
+        doc_offsets = np.asarray(offsets, dtype=np.int64)
+        query_terms = {term: i for i, term in enumerate(dict.fromkeys(query.lower().split()))}
+
+        # Document-level overlap mirrors RelevanceScorer._keyword_score
+        document_scores = self._coverage([doc.content for doc in documents], query_terms)
+
+        if self.sentence_encoder is not None and sentences:
+            scores = self._embedding_scores(query, sentences)
+            method = ScoringMethod.EMBEDDING
+        else:
+            scores = self._coverage(sentences, query_terms)
+            method = ScoringMethod.KEYWORD
+
+        return SentenceBatch(
+            sentences=sentences,
+            positions=np.asarray(positions, dtype=np.int64),
+            doc_offsets=doc_offsets,
+            raw_counts=raw_counts,
+            scores=scores,
+            token_counts=np.asarray(self.token_counter.count_batch(sentences), dtype=np.int64),
+            document_scores=document_scores,
+            method=method,
+        )
+
+    async def compress_batch(
+        self,
+        documents: Sequence[DocumentChunk],
+        batch: SentenceBatch,
+        token_budgets: Sequence[int],
+        relevance_threshold: Optional[float] = None,
+    ) -> List[CompressedDocument]:
+        """Compress several documents from a pre-scored sentence batch.
+
+        Sentences are addressed by position, so no per-sentence string scans
+        or re-splitting of the content are needed.
+
+        Args:
+            documents: Documents the batch was built from, in order
+            batch: Output of ``score_batch``
+            token_budgets: Token budget per document
+            relevance_threshold: Skip documents scoring below this value
+
+        Returns:
+            Compressed documents for the documents that were kept
+        """
+        compressed = []
+        for i, (doc, budget) in enumerate(zip(documents, token_budgets)):
+            overall = float(batch.document_scores[i])
+            if relevance_threshold is not None and overall < relevance_threshold:
+                continue
+
+            start, end = int(batch.doc_offsets[i]), int(batch.doc_offsets[i + 1])
+            selected, current_tokens = self._select_sentences(
+                batch.scores[start:end],
+                batch.positions[start:end],
+                batch.token_counts[start:end],
+                batch.raw_counts[i],
+                budget,
+            )
+            by_position = dict(zip(batch.positions[start:end].tolist(), batch.sentences[start:end]))
+            selected_text = [by_position[idx] for idx in selected]
+
+            compressed.append(
+                CompressedDocument(
+                    original_id=doc.id,
+                    content=". ".join(selected_text) + "." if selected_text else "",
+                    token_count=current_tokens,
+                    compression_method="extractive",
+                    preserved_segments=selected,
+                    relevance_score=overall,
+                )
+            )
+        return compressed
+
+    def _select_sentences(
+        self,
+        scores: np.ndarray,
+        positions: np.ndarray,
+        token_counts: np.ndarray,
+        raw_count: int,
+        token_budget: int,
+    ) -> Tuple[List[int], int]:
+        """Greedily pick sentences (plus context) by score within a budget.
+
+        Args:
+            scores: Scores of the document's non-empty sentences
+            positions: Raw split index of each sentence
+            token_counts: Token count of each sentence
+            raw_count: Number of raw split segments in the document
+            token_budget: Maximum tokens to select
+
+        Returns:
+            Sorted selected raw indices and their total token count
+        """
+        # Empty segments have no entry and are never selected
+        tokens_at = np.full(raw_count, -1, dtype=np.int64)
+        tokens_at[positions] = token_counts
+
+        selected = set()
+        current_tokens = 0
+        for pos in np.argsort(-scores, kind="stable").tolist():
+            if current_tokens >= token_budget:
+                break
+
+            idx = int(positions[pos])
+            for ctx_idx in range(max(0, idx - self.context_window), min(raw_count, idx + self.context_window + 1)):
+                tokens = int(tokens_at[ctx_idx])
+                if tokens < 0 or ctx_idx in selected:
+                    continue
+                if current_tokens + tokens <= token_budget:
+                    selected.add(ctx_idx)
+                    current_tokens += tokens
+
+        return sorted(selected), current_tokens
+
+    @staticmethod
+    def _coverage(texts: Sequence[str], query_terms: Dict[str, int]) -> np.ndarray:
+        """Fraction of query terms present in each text.
+
+        Args:
+            texts: Texts to score
+            query_terms: Query term to column mapping
+
+        Returns:
+            Coverage score per text
+        """
+        if not query_terms or not texts:
+            return np.zeros(len(texts), dtype=np.float64)
+
+        rows: List[int] = []
+        cols: List[int] = []
+        for row, text in enumerate(texts):
+            for term in text.lower().split():
+                col = query_terms.get(term)
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+
+        incidence = np.zeros((len(texts), len(query_terms)), dtype=bool)
+        incidence[rows, cols] = True
+        return incidence.mean(axis=1)
+
+    def _embedding_scores(self, query: str, sentences: List[str]) -> np.ndarray:
+        """Cosine similarity of every sentence to the query, clipped to [0, 1].
+
+        Args:
+            query: Query string
+            sentences: Sentences to score
+
+        Returns:
+            Similarity score per sentence
+        """
+        vectors = np.asarray(self.sentence_encoder([query] + sentences), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1.0, norms)
+        return np.clip(vectors[1:] @ vectors[0], 0.0, 1.0).astype(np.float64)
+
     def _find_sentence_index(self, content: str, sentence: str) -> Optional[int]:
         """Find the index of a sentence in content."""
         sentences = re.split(r"[.!?]+", content)
@@ -794,6 +1152,7 @@ class ContextualCompressor:
         default_strategy: CompressionStrategy = CompressionStrategy.EXTRACTIVE,
         token_budget: int = 4000,
         config: Optional[CompressionConfig] = None,
+        token_counter: Optional[TokenCounter] = None,
     ) -> None:
         """Initialize contextual compressor.
 
@@ -802,19 +1161,22 @@ class ContextualCompressor:
             default_strategy: Default compression strategy
             token_budget: Total token budget
             config: Compression configuration
+            token_counter: Token counter shared by all compression stages
         """
         self.config = config or CompressionConfig(
             default_strategy=default_strategy,
             token_budget=token_budget,
         )
         self.llm_client = llm_client
+        self.token_counter = token_counter or TokenCounter()
         self.relevance_scorer = RelevanceScorer(llm_client)
         self.budget_manager = TokenBudgetManager(token_budget)
+        self.budget_manager.token_counter = self.token_counter
         self.extractive = ExtractiveCompressor(
             context_window=self.config.context_window,
+            token_counter=self.token_counter,
         )
-        self.abstractive = AbstractiveCompressor(llm_client)
-        self.token_counter = TokenCounter()
+        self.abstractive = AbstractiveCompressor(llm_client, token_counter=self.token_counter)
 
     async def compress(
         self,
@@ -845,6 +1207,9 @@ class ContextualCompressor:
 
         strategy = strategy or self.config.default_strategy
 
+        if strategy == CompressionStrategy.EXTRACTIVE and self.config.batch_scoring:
+            return await self._compress_extractive_batch(documents, query)
+
         # Score relevance
         relevance_scores = await self.relevance_scorer.score_documents(documents, query, ScoringMethod.KEYWORD)
 
@@ -881,6 +1246,36 @@ class ContextualCompressor:
             relevance_scores=relevance_scores,
         )
 
+    async def _compress_extractive_batch(
+        self,
+        documents: List[DocumentChunk],
+        query: str,
+    ) -> CompressionResult:
+        """Extractive compression with one split/score pass over all documents."""
+        batch = self.extractive.score_batch(documents, query)
+        original_tokens = sum(self.token_counter.count_batch([doc.content for doc in documents]))
+
+        allocations = self.budget_manager.allocate(batch.document_scores.tolist(), self.config.allocation_strategy)
+        compressed_docs = await self.extractive.compress_batch(
+            documents,
+            batch,
+            allocations,
+            relevance_threshold=self.config.min_relevance_threshold,
+        )
+
+        compressed_tokens = sum(doc.token_count for doc in compressed_docs)
+        ratio = compressed_tokens / original_tokens if original_tokens > 0 else 1.0
+
+        return CompressionResult(
+            original_documents=documents,
+            compressed_documents=compressed_docs,
+            original_token_count=original_tokens,
+            compressed_token_count=compressed_tokens,
+            compression_ratio=ratio,
+            strategy_used=CompressionStrategy.EXTRACTIVE,
+            relevance_scores=batch.relevance_scores(documents),
+        )
+
     async def compress_results(
         self,
         results: List[SearchResult],
@@ -1,18 +1,19 @@
 """BM25 sparse retrieval implementation.
 
-This module implements BM25 (Best Matching 25) sparse retrieval using
-rank-bm25 library with custom preprocessing and integration with the
-Advanced RAG System type system.
+This module implements BM25 (Best Matching 25) sparse retrieval on an
+incremental inverted index with custom preprocessing and integration with
+the Advanced RAG System type system.
 """
 
 from __future__ import annotations
 
+import math
 import re
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 from uuid import UUID
 
-from rank_bm25 import BM25Okapi
+import numpy as np
 
 from src.core.exceptions import RetrievalError
 from src.core.types import DocumentChunk, SearchResult
@@ -29,6 +30,10 @@ class BM25Config:
         lowercase: Whether to convert text to lowercase (default: True)
         remove_stopwords: Whether to remove stopwords (default: True)
         min_token_length: Minimum token length to include (default: 2)
+        epsilon: Floor for negative IDFs as a fraction of the average IDF (default: 0.25)
+        enable_pruning: Use MaxScore dynamic pruning to skip documents that
+            cannot enter the top-k (default: False). Scores are then
+            normalized against [0, max] instead of the full score range.
     """
 
     k1: float = 1.5
@@ -37,6 +42,8 @@ class BM25Config:
     lowercase: bool = True
     remove_stopwords: bool = True
     min_token_length: int = 2
+    epsilon: float = 0.25
+    enable_pruning: bool = False
 
 
 class TextPreprocessor:
@@ -170,13 +177,55 @@ class TextPreprocessor:
         }
 
 
+class _Postings:
+    """Growable postings list for one term: parallel doc-slot and tf arrays.
+
+    Slots are appended in increasing order, so ``docs`` stays sorted. ``max_tf``
+    and ``min_len`` bound the term's score contribution for pruning; they are
+    not tightened on delete, which keeps them valid (if looser) upper bounds.
+    """
+
+    __slots__ = ("docs", "tfs", "size", "max_tf", "min_len")
+
+    def __init__(self) -> None:
+        self.docs = np.empty(4, dtype=np.int32)
+        self.tfs = np.empty(4, dtype=np.float32)
+        self.size = 0
+        self.max_tf = 0
+        self.min_len = math.inf
+
+    def append(self, slot: int, tf: int, doc_len: int) -> None:
+        if self.size == len(self.docs):
+            self.docs = np.resize(self.docs, 2 * self.size)
+            self.tfs = np.resize(self.tfs, 2 * self.size)
+        self.docs[self.size] = slot
+        self.tfs[self.size] = tf
+        self.size += 1
+        self.max_tf = max(self.max_tf, tf)
+        self.min_len = min(self.min_len, doc_len)
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.docs[: self.size], self.tfs[: self.size]
+
+
 class BM25Index:
     """BM25 sparse retrieval index.
 
-    This class implements BM25 ranking using the rank-bm25 library with
-    custom preprocessing and integration with DocumentChunk types.
+    An in-house inverted index implementing Okapi BM25 with the same IDF
+    floor as ``rank_bm25.BM25Okapi`` (negative IDFs are replaced by
+    ``epsilon * average_idf``). Each term keeps a postings array of document
+    slots and term frequencies; document lengths, ``avgdl`` and document
+    frequencies are maintained incrementally, so adding or deleting
+    documents never rebuilds the index and a query only scores documents
+    that appear in its terms' postings.
+
+    Deleted documents are tombstoned and dropped from postings lazily by
+    compaction once they make up a quarter of the slots.
     """
 
+    _COMPACTION_RATIO = 0.25
+    _COMPACTION_MIN_SLOTS = 1024
+
     def __init__(self, config: Optional[BM25Config] = None):
         """Initialize BM25 index.
 
@@ -185,16 +234,33 @@ class BM25Index:
         """
         self.config = config or BM25Config()
         self.preprocessor = TextPreprocessor(self.config)
-
-        # Internal storage
-        self._corpus: List[List[str]] = []
-        self._documents: List[DocumentChunk] = []
+        self._reset()
+
+    def _reset(self) -> None:
+        # Per-slot storage; deleted slots hold None and are not live
+        self._corpus: List[Optional[List[str]]] = []
+        self._documents: List[Optional[DocumentChunk]] = []
+        self._doc_terms: List[Optional[Dict[int, int]]] = []
+        self._doc_len = np.empty(0, dtype=np.float32)
+        self._live = np.zeros(0, dtype=bool)
+        self._slot_of: Dict[UUID, int] = {}
         self._document_map: Dict[UUID, DocumentChunk] = {}
-        self._bm25: Optional[BM25Okapi] = None
+
+        # Inverted index
+        self._term_ids: Dict[str, int] = {}
+        self._postings: List[_Postings] = []
+        self._df = np.zeros(0, dtype=np.int64)
+
+        self._live_count = 0
+        self._total_len = 0
+        self._tombstones = 0
+        self._average_idf: Optional[float] = None
 
     def add_documents(self, chunks: List[DocumentChunk]) -> None:
         """Add documents to the BM25 index.
 
+        Re-adding a chunk id replaces the previously indexed version.
+
         Args:
             chunks: List of document chunks to index
 
@@ -205,23 +271,44 @@ class BM25Index:
             return
 
         try:
-            for chunk in chunks:
-                # Preprocess content
-                tokens = self.preprocessor.preprocess(chunk.content)
+            # Tokenize the whole batch first so a bad chunk leaves the index unchanged
+            tokenized = [(chunk, self.preprocessor.preprocess(chunk.content)) for chunk in chunks]
 
-                # Add to corpus and storage
-                self._corpus.append(tokens)
-                self._documents.append(chunk)
-                self._document_map[chunk.id] = chunk
+            self._ensure_slot_capacity(len(tokenized))
+            for chunk, tokens in tokenized:
+                if chunk.id in self._slot_of:
+                    self._remove_slot(self._slot_of[chunk.id])
+                self._add_slot(chunk, tokens)
 
-            # Rebuild BM25 index
-            self._rebuild_index()
+            self._average_idf = None
+            self._maybe_compact()
 
         except Exception as e:
             raise RetrievalError(
                 message=f"Failed to add documents to BM25 index: {str(e)}", error_code="BM25_INDEX_ERROR"
             ) from e
 
+    def delete_documents(self, chunk_ids: List[UUID]) -> int:
+        """Remove documents from the index without rebuilding it.
+
+        Args:
+            chunk_ids: IDs of the chunks to remove; unknown IDs are ignored
+
+        Returns:
+            Number of documents removed
+        """
+        removed = 0
+        for chunk_id in chunk_ids:
+            slot = self._slot_of.get(chunk_id)
+            if slot is not None:
+                self._remove_slot(slot)
+                removed += 1
+
+        if removed:
+            self._average_idf = None
+            self._maybe_compact()
+        return removed
+
     def search(self, query: str, top_k: Optional[int] = None) -> List[SearchResult]:
         """Search the BM25 index for relevant documents.
 
@@ -240,7 +327,7 @@ class BM25Index:
         if not query or not query.strip():
             raise ValueError("Query cannot be empty")
 
-        if not self._bm25:
+        if not self._live_count:
             return []  # No documents indexed
 
         try:
@@ -249,41 +336,49 @@ class BM25Index:
             if not query_tokens:
                 return []
 
-            # Get BM25 scores
-            scores = self._bm25.get_scores(query_tokens)
-
-            # Create ranked results
             top_k = top_k or self.config.top_k
-            doc_scores = list(enumerate(scores))
 
-            # Sort by score (descending) and take top_k
-            doc_scores.sort(key=lambda x: x[1], reverse=True)
-            doc_scores = doc_scores[:top_k]
+            # Score only documents in the query terms' postings
+            if self.config.enable_pruning:
+                slots, scores = self._score_pruned(query_tokens, top_k)
+            else:
+                slots, scores = self._score_postings(query_tokens)
+            if len(slots) == 0:
+                return []
+
+            # Documents outside the postings score 0 and bound the range; the
+            # pruned path never sees the full matched set, so it always does
+            has_unmatched = self.config.enable_pruning or len(slots) < self._live_count
+            max_score = float(scores.max())
+            min_score = float(scores.min())
+            if has_unmatched:
+                max_score = max(max_score, 0.0)
+                min_score = min(min_score, 0.0)
+
+            order = self._top_k_order(slots, scores, top_k)
 
             # Filter out very low scores (keep negative scores as they may be meaningful)
-            min_score = max(-1.0, min(scores) * 0.1) if scores.size > 0 else -1.0
-            doc_scores = [(idx, score) for idx, score in doc_scores if score > min_score]
+            cutoff = max(-1.0, min_score * 0.1)
+            order = order[scores[order] > cutoff]
 
             # Convert to SearchResult objects
             results = []
-            max_score = max(scores) if scores.size > 0 else 1.0
-            min_score = min(scores) if scores.size > 0 else 0.0
             score_range = max_score - min_score if max_score != min_score else 1.0
 
-            for rank, (doc_idx, score) in enumerate(doc_scores, 1):
-                if doc_idx < len(self._documents):
-                    # Normalize score to 0-1 range
-                    normalized_score = (score - min_score) / score_range if score_range > 0 else 0.5
-                    normalized_score = max(0.0, min(1.0, normalized_score))
-
-                    result = SearchResult(
-                        chunk=self._documents[doc_idx],
-                        score=normalized_score,
-                        rank=rank,
-                        distance=1.0 - normalized_score,
-                        explanation=f"BM25 score: {score:.4f}, matched tokens: {len(query_tokens)}",
-                    )
-                    results.append(result)
+            for rank, idx in enumerate(order, 1):
+                score = float(scores[idx])
+                # Normalize score to 0-1 range
+                normalized_score = (score - min_score) / score_range if score_range > 0 else 0.5
+                normalized_score = max(0.0, min(1.0, normalized_score))
+
+                result = SearchResult(
+                    chunk=self._documents[slots[idx]],
+                    score=normalized_score,
+                    rank=rank,
+                    distance=1.0 - normalized_score,
+                    explanation=f"BM25 score: {score:.4f}, matched tokens: {len(query_tokens)}",
+                )
+                results.append(result)
 
             return results
 
@@ -303,10 +398,7 @@ class BM25Index:
 
     def clear(self) -> None:
         """Clear all documents from the index."""
-        self._corpus.clear()
-        self._documents.clear()
-        self._document_map.clear()
-        self._bm25 = None
+        self._reset()
 
     def get_corpus(self) -> List[List[str]]:
         """Get the preprocessed corpus.
@@ -314,7 +406,7 @@ class BM25Index:
         Returns:
             List of tokenized documents
         """
-        return self._corpus.copy()
+        return [tokens for tokens in self._corpus if tokens is not None]
 
     @property
     def document_count(self) -> int:
@@ -323,12 +415,247 @@ class BM25Index:
         Returns:
             Number of indexed documents
         """
-        return len(self._documents)
+        return self._live_count
+
+    @property
+    def vocabulary_size(self) -> int:
+        """Number of distinct terms present in at least one live document."""
+        return int(np.count_nonzero(self._df))
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def _ensure_slot_capacity(self, extra: int) -> None:
+        needed = len(self._documents) + extra
+        capacity = len(self._doc_len)
+        if needed <= capacity:
+            return
+        new_capacity = max(capacity, 64)
+        while new_capacity < needed:
+            new_capacity *= 2
+        doc_len = np.zeros(new_capacity, dtype=np.float32)
+        doc_len[:capacity] = self._doc_len
+        live = np.zeros(new_capacity, dtype=bool)
+        live[:capacity] = self._live
+        self._doc_len = doc_len
+        self._live = live
+
+    def _term_id(self, term: str) -> int:
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            term_id = len(self._postings)
+            self._term_ids[term] = term_id
+            self._postings.append(_Postings())
+            if term_id >= len(self._df):
+                df = np.zeros(max(64, 2 * len(self._df)), dtype=np.int64)
+                df[: len(self._df)] = self._df
+                self._df = df
+        return term_id
+
+    def _add_slot(self, chunk: DocumentChunk, tokens: List[str]) -> None:
+        slot = len(self._documents)
+        self._ensure_slot_capacity(1)
+
+        term_freqs: Dict[int, int] = {}
+        for token in tokens:
+            term_id = self._term_id(token)
+            term_freqs[term_id] = term_freqs.get(term_id, 0) + 1
+        for term_id, tf in term_freqs.items():
+            self._postings[term_id].append(slot, tf, len(tokens))
+            self._df[term_id] += 1
+
+        self._corpus.append(tokens)
+        self._documents.append(chunk)
+        self._doc_terms.append(term_freqs)
+        self._doc_len[slot] = len(tokens)
+        self._live[slot] = True
+        self._slot_of[chunk.id] = slot
+        self._document_map[chunk.id] = chunk
+        self._live_count += 1
+        self._total_len += len(tokens)
+
+    def _remove_slot(self, slot: int) -> None:
+        chunk = self._documents[slot]
+        for term_id in self._doc_terms[slot]:
+            self._df[term_id] -= 1
+
+        self._total_len -= int(self._doc_len[slot])
+        self._live[slot] = False
+        self._corpus[slot] = None
+        self._documents[slot] = None
+        self._doc_terms[slot] = None
+        del self._slot_of[chunk.id]
+        del self._document_map[chunk.id]
+        self._live_count -= 1
+        self._tombstones += 1
+
+    def _maybe_compact(self) -> None:
+        if len(self._documents) < self._COMPACTION_MIN_SLOTS:
+            return
+        if self._tombstones > len(self._documents) * self._COMPACTION_RATIO:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drop tombstoned slots and purge them from every postings list."""
+        live = [(self._documents[slot], self._corpus[slot]) for slot in range(len(self._documents)) if self._live[slot]]
+        self._reset()
+        self._ensure_slot_capacity(len(live))
+        for chunk, tokens in live:
+            self._add_slot(chunk, tokens)
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    def _idf(self, term_id: int) -> float:
+        """Okapi IDF with the ``epsilon * average_idf`` floor used by rank_bm25."""
+        df = int(self._df[term_id])
+        idf = math.log(self._live_count - df + 0.5) - math.log(df + 0.5)
+        if idf < 0:
+            return self.config.epsilon * self._get_average_idf()
+        return idf
+
+    def _get_average_idf(self) -> float:
+        # Depends on every term's df, so it is recomputed (vectorized) at most
+        # once per index mutation rather than maintained per add.
+        if self._average_idf is None:
+            df = self._df[: len(self._postings)]
+            df = df[df > 0].astype(np.float64)
+            if len(df) == 0:
+                self._average_idf = 0.0
+            else:
+                idf = np.log(self._live_count - df + 0.5) - np.log(df + 0.5)
+                self._average_idf = float(idf.mean())
+        return self._average_idf
+
+    def _query_weights(self, query_tokens: List[str]) -> Dict[int, float]:
+        """Map each known query term to ``query_tf * idf``.
+
+        A term repeated in the query contributes once per occurrence.
+        """
+        query_counts: Dict[int, int] = {}
+        for token in query_tokens:
+            term_id = self._term_ids.get(token)
+            if term_id is not None and self._df[term_id] > 0:
+                query_counts[term_id] = query_counts.get(term_id, 0) + 1
+        return {term_id: qtf * self._idf(term_id) for term_id, qtf in query_counts.items()}
+
+    def _avgdl(self) -> float:
+        return self._total_len / self._live_count if self._total_len else 1.0
+
+    def _tf_component(self, tfs: np.ndarray, doc_len: np.ndarray, avgdl: float) -> np.ndarray:
+        k1 = self.config.k1
+        b = self.config.b
+        return tfs * (k1 + 1) / (tfs + k1 * (1 - b + b * doc_len / avgdl))
+
+    def _live_postings(self, term_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        docs, tfs = self._postings[term_id].arrays()
+        if self._tombstones:
+            keep = self._live[docs]
+            docs = docs[keep]
+            tfs = tfs[keep]
+        return docs, tfs
+
+    def _score_postings(self, query_tokens: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Accumulate BM25 scores over the postings of the query terms.
+
+        Returns:
+            Tuple of (document slots in ascending order, BM25 scores)
+        """
+        weights = self._query_weights(query_tokens)
+        if not weights:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+
+        avgdl = self._avgdl()
+        slot_parts = []
+        score_parts = []
+        for term_id, weight in weights.items():
+            docs, tfs = self._live_postings(term_id)
+            slot_parts.append(docs)
+            score_parts.append(weight * self._tf_component(tfs.astype(np.float64), self._doc_len[docs], avgdl))
+
+        all_slots = np.concatenate(slot_parts)
+        all_scores = np.concatenate(score_parts)
+        if len(slot_parts) == 1:
+            return all_slots, all_scores
+
+        slots, inverse = np.unique(all_slots, return_inverse=True)
+        return slots, np.bincount(inverse, weights=all_scores, minlength=len(slots))
+
+    def _score_docs(self, docs: np.ndarray, weights: Dict[int, float], avgdl: float) -> np.ndarray:
+        """Exact BM25 scores for specific slots, looking tfs up by binary search."""
+        scores = np.zeros(len(docs), dtype=np.float64)
+        doc_len = self._doc_len[docs]
+        for term_id, weight in weights.items():
+            p_docs, p_tfs = self._postings[term_id].arrays()
+            pos = np.searchsorted(p_docs, docs)
+            pos = np.minimum(pos, len(p_docs) - 1)
+            tfs = np.where(p_docs[pos] == docs, p_tfs[pos], 0.0).astype(np.float64)
+            scores += weight * self._tf_component(tfs, doc_len, avgdl)
+        return scores
+
+    def _score_pruned(self, query_tokens: List[str], top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Score with MaxScore-style dynamic pruning.
+
+        Terms are visited in decreasing order of their score upper bound.
+        Each new term contributes its not-yet-scored postings as candidates,
+        which are scored exactly across all query terms. Once the summed
+        upper bounds of the unvisited terms cannot beat the current k-th best
+        score, no unscored document can enter the top-k and scoring stops —
+        documents matching only low-impact (common) terms are never touched.
+
+        Returns:
+            Tuple of (scored document slots, BM25 scores); includes the exact top-k
+        """
+        weights = self._query_weights(query_tokens)
+        if not weights:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+
+        avgdl = self._avgdl()
+        bounds = []
+        for term_id, weight in weights.items():
+            postings = self._postings[term_id]
+            # A negative weight (the IDF floor goes negative on small corpora
+            # where most terms are in over half the documents) can only lower
+            # a score, so the term's upper bound is 0, not weight * max_tf.
+            bound = max(weight, 0.0) * self._tf_component(
+                np.float64(postings.max_tf), np.float64(postings.min_len), avgdl
+            )
+            bounds.append((float(bound), term_id))
+        bounds.sort(reverse=True)
+        remaining = np.cumsum([bound for bound, _ in bounds][::-1])[::-1]
+
+        slot_parts: List[np.ndarray] = []
+        score_parts: List[np.ndarray] = []
+        scored = np.empty(0, dtype=np.int32)
+        threshold = -math.inf
+        for i, (_, term_id) in enumerate(bounds):
+            if len(scored) >= top_k and remaining[i] <= threshold:
+                break
+
+            docs, _ = self._live_postings(term_id)
+            if len(scored):
+                docs = docs[~np.isin(docs, scored)]
+            if len(docs) == 0:
+                continue
 
-    def _rebuild_index(self) -> None:
-        """Rebuild the BM25 index with current corpus."""
-        if self._corpus:
-            # Create BM25 index with custom parameters
-            self._bm25 = BM25Okapi(self._corpus, k1=self.config.k1, b=self.config.b)
+            slot_parts.append(docs)
+            score_parts.append(self._score_docs(docs, weights, avgdl))
+            scored = np.concatenate(slot_parts)
+            if len(scored) >= top_k:
+                all_scores = np.concatenate(score_parts)
+                threshold = float(np.partition(all_scores, len(all_scores) - top_k)[len(all_scores) - top_k])
+
+        if not slot_parts:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+        return scored, np.concatenate(score_parts)
+
+    @staticmethod
+    def _top_k_order(slots: np.ndarray, scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Indices of the top_k scores, descending, ties broken by slot."""
+        if top_k < len(scores):
+            candidates = np.argpartition(-scores, top_k - 1)[:top_k]
         else:
-            self._bm25 = None
+            candidates = np.arange(len(scores))
+        return candidates[np.lexsort((slots[candidates], -scores[candidates]))]
@@ -4,7 +4,6 @@ Provides capabilities for loading, querying, and searching structured data
 including CSV, Excel, and JSON tables with SQL-like query support.
 """
 
-from src.structured_data.hybrid_searcher import StructuredHybridSearcher
 from src.structured_data.sql_engine import QueryResult, SQLQueryEngine
 from src.structured_data.table_loader import TableLoader, TableLoadOptions
 
@@ -13,5 +12,4 @@ __all__ = [
     "TableLoadOptions",
     "SQLQueryEngine",
     "QueryResult",
-    "StructuredHybridSearcher",
 ]
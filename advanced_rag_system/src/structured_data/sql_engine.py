@@ -8,8 +8,11 @@ from __future__ import annotations
 
 import logging
 import re
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 from uuid import uuid4
 
 import pandas as pd
@@ -52,6 +55,9 @@ class SQLQueryEngine:
     - Support for complex WHERE clauses
     - Aggregation functions (COUNT, AVG, SUM, etc.)
     - Result conversion to DocumentChunk objects
+    - Persistent DuckDB connection with tables registered once
+    - Native parameter binding and a prepared-statement cache for repeated queries
+    - Streaming results as Arrow record batches
 
     Example:
         ```python
@@ -65,6 +71,13 @@ class SQLQueryEngine:
             "SELECT * FROM products WHERE price > 100 ORDER BY price DESC LIMIT 10"
         )
 
+        # Parameterized query (values bound by DuckDB)
+        result = engine.execute_query("SELECT * FROM products WHERE price > ?", params=[100])
+
+        # Stream large results without building a DataFrame
+        for batch in engine.stream_query("SELECT * FROM products", batch_size=50_000):
+            process(batch)
+
         # Semantic search on columns
         results = engine.search_columns(
             "laptop computer",
@@ -74,10 +87,29 @@ class SQLQueryEngine:
         ```
     """
 
-    def __init__(self) -> None:
-        """Initialize the SQL query engine."""
+    def __init__(
+        self,
+        persistent_connection: bool = True,
+        statement_cache_size: int = 128,
+    ) -> None:
+        """Initialize the SQL query engine.
+
+        Args:
+            persistent_connection: Keep one DuckDB connection for the engine's
+                lifetime instead of connecting and re-registering per query
+            statement_cache_size: Maximum prepared statements kept on the
+                persistent connection (0 disables statement caching)
+        """
         self._tables: Dict[str, pd.DataFrame] = {}
         self._duckdb_available = self._check_duckdb()
+        self.persistent_connection = persistent_connection and self._duckdb_available
+        self.statement_cache_size = statement_cache_size
+
+        self._con: Optional[Any] = None
+        self._lock = threading.RLock()
+        self._statements: "OrderedDict[str, str]" = OrderedDict()
+        self._seen_queries: "OrderedDict[str, bool]" = OrderedDict()
+        self._statement_counter = 0
 
     def _check_duckdb(self) -> bool:
         """Check if DuckDB is available.
@@ -127,6 +159,12 @@ class SQLQueryEngine:
 
         self._tables[name] = dataframe.copy()
 
+        if self.persistent_connection:
+            with self._lock:
+                # DuckDB scans the registered DataFrame in place; no second copy
+                self._connection().register(name, self._tables[name])
+                self._clear_statements()
+
     def unregister_table(self, name: str) -> bool:
         """Unregister a table.
 
@@ -138,6 +176,10 @@ class SQLQueryEngine:
         """
         if name in self._tables:
             del self._tables[name]
+            if self._con is not None:
+                with self._lock:
+                    self._con.unregister(name)
+                    self._clear_statements()
             return True
         return False
 
@@ -160,14 +202,16 @@ class SQLQueryEngine:
         """
         return self._tables.get(name)
 
-    def execute_query(self, sql_query: str) -> QueryResult:
+    def execute_query(self, sql_query: str, params: Optional[Sequence[Any]] = None) -> QueryResult:
         """Execute a SQL query on registered tables.
 
         Supports standard SQL SELECT statements with WHERE, ORDER BY,
-        GROUP BY, LIMIT, and aggregation functions.
+        GROUP BY, LIMIT, and aggregation functions. Parameters are bound by
+        DuckDB, never rendered into the SQL text.
 
         Args:
-            sql_query: SQL query string
+            sql_query: SQL query string, optionally with ``?`` or ``$n`` placeholders
+            params: Values for the placeholders
 
         Returns:
             QueryResult containing the results
@@ -175,26 +219,21 @@ class SQLQueryEngine:
         Raises:
             ValidationError: If query is invalid or tables not found
         """
-        import time
-
         start_time = time.time()
 
-        if not sql_query or not sql_query.strip():
-            raise ValidationError(
-                message="SQL query cannot be empty",
-            )
+        self._validate_select(sql_query)
 
-        # Validate query is a SELECT statement
-        query_upper = sql_query.strip().upper()
-        if not query_upper.startswith("SELECT"):
+        if params and not self._duckdb_available:
             raise ValidationError(
-                message="Only SELECT queries are supported",
+                message="Query parameters require DuckDB",
                 details={"query": sql_query},
             )
 
         try:
-            if self._duckdb_available:
-                result_df = self._execute_with_duckdb(sql_query)
+            if self.persistent_connection:
+                result_df = self._execute_prepared(sql_query, params)
+            elif self._duckdb_available:
+                result_df = self._execute_with_duckdb(sql_query, params)
             else:
                 result_df = self._execute_with_pandas(sql_query)
 
@@ -214,11 +253,160 @@ class SQLQueryEngine:
                 details={"query": sql_query, "error": str(e)},
             )
 
-    def _execute_with_duckdb(self, sql_query: str) -> pd.DataFrame:
-        """Execute query using DuckDB.
+    def stream_query(
+        self,
+        sql_query: str,
+        params: Optional[Sequence[Any]] = None,
+        batch_size: int = 65536,
+    ) -> Iterator[Any]:
+        """Execute a query and yield results as Arrow record batches.
+
+        Rows are produced incrementally by DuckDB, so the full result is
+        never materialized as a DataFrame. Each stream runs on its own cursor
+        of the persistent connection, with the tables registered on it, so it
+        does not block other queries.
+
+        Args:
+            sql_query: SQL query string, optionally with placeholders
+            params: Values for the placeholders
+            batch_size: Maximum rows per record batch
+
+        Yields:
+            ``pyarrow.RecordBatch`` objects
+
+        Raises:
+            ValidationError: If the query is invalid or DuckDB is unavailable
+        """
+        self._validate_select(sql_query)
+
+        if not self.persistent_connection:
+            raise ValidationError(
+                message="Streaming queries require DuckDB with a persistent connection",
+                details={"query": sql_query},
+            )
+
+        with self._lock:
+            cursor = self._connection().cursor()
+            # Registered views are connection-local, so expose them on the cursor too
+            for name, df in self._tables.items():
+                cursor.register(name, df)
+
+        try:
+            try:
+                result = cursor.execute(sql_query, list(params) if params else None)
+                to_reader = getattr(result, "to_arrow_reader", None) or result.fetch_record_batch
+                reader = to_reader(batch_size)
+            except Exception as e:
+                raise ValidationError(
+                    message=f"Query execution failed: {str(e)}",
+                    details={"query": sql_query, "error": str(e)},
+                )
+
+            for batch in reader:
+                yield batch
+        finally:
+            cursor.close()
+
+    def close(self) -> None:
+        """Close the persistent DuckDB connection, if open."""
+        with self._lock:
+            if self._con is not None:
+                self._con.close()
+                self._con = None
+            self._statements.clear()
+            self._seen_queries.clear()
+
+    def _validate_select(self, sql_query: str) -> None:
+        """Ensure the query is a non-empty SELECT statement.
+
+        Args:
+            sql_query: SQL query string
+
+        Raises:
+            ValidationError: If the query is empty or not a SELECT
+        """
+        if not sql_query or not sql_query.strip():
+            raise ValidationError(
+                message="SQL query cannot be empty",
+            )
+
+        # Validate query is a SELECT statement
+        query_upper = sql_query.strip().upper()
+        if not query_upper.startswith("SELECT"):
+            raise ValidationError(
+                message="Only SELECT queries are supported",
+                details={"query": sql_query},
+            )
+
+    def _connection(self) -> Any:
+        """Return the persistent DuckDB connection, creating it on first use.
+
+        Returns:
+            DuckDB connection with all tables registered
+        """
+        if self._con is None:
+            import duckdb
+
+            self._con = duckdb.connect(database=":memory:")
+            for name, df in self._tables.items():
+                self._con.register(name, df)
+        return self._con
+
+    def _execute_prepared(self, sql_query: str, params: Optional[Sequence[Any]]) -> pd.DataFrame:
+        """Execute a query on the persistent connection.
+
+        Parameters are always bound natively by DuckDB (its SQL ``EXECUTE``
+        cannot take bound values). A parameter-free query text is PREPAREd the
+        second time it is seen and EXECUTEd from the statement cache after
+        that, so one-off ad-hoc queries still cost a single statement.
+
+        Args:
+            sql_query: SQL query string
+            params: Values for the placeholders
+
+        Returns:
+            Query result as DataFrame
+        """
+        with self._lock:
+            con = self._connection()
+
+            if params or self.statement_cache_size <= 0:
+                return con.execute(sql_query, list(params) if params else None).fetchdf()
+
+            statement = self._statements.get(sql_query)
+            if statement is not None:
+                self._statements.move_to_end(sql_query)
+                return con.execute(f"EXECUTE {statement}").fetchdf()
+
+            if self._seen_queries.pop(sql_query, None) is None:
+                self._seen_queries[sql_query] = True
+                while len(self._seen_queries) > self.statement_cache_size:
+                    self._seen_queries.popitem(last=False)
+                return con.execute(sql_query).fetchdf()
+
+            self._statement_counter += 1
+            statement = f"_rag_stmt_{self._statement_counter}"
+            con.execute(f"PREPARE {statement} AS {sql_query.strip().rstrip(';')}")
+            self._statements[sql_query] = statement
+            while len(self._statements) > self.statement_cache_size:
+                _, evicted = self._statements.popitem(last=False)
+                con.execute(f"DEALLOCATE {evicted}")
+            return con.execute(f"EXECUTE {statement}").fetchdf()
+
+    def _clear_statements(self) -> None:
+        """Drop cached prepared statements after the catalog changes."""
+        if self._con is not None:
+            for statement in self._statements.values():
+                self._con.execute(f"DEALLOCATE {statement}")
+        self._statements.clear()
+        self._seen_queries.clear()
+
+    def _execute_with_duckdb(self, sql_query: str, params: Optional[Sequence[Any]] = None) -> pd.DataFrame:
+        """Execute query using a short-lived DuckDB connection.
 
         Args:
             sql_query: SQL query string
+            params: Values for the placeholders
 
         Returns:
             Query result as DataFrame
@@ -232,7 +420,7 @@ class SQLQueryEngine:
             con.register(name, df)
 
         # Execute query
-        result = con.execute(sql_query).fetchdf()
+        result = con.execute(sql_query, list(params) if params else None).fetchdf()
         con.close()
 
         return result
@@ -535,4 +723,9 @@ class SQLQueryEngine:
 
     def clear_all_tables(self) -> None:
         """Clear all registered tables."""
+        if self._con is not None:
+            with self._lock:
+                for name in self._tables:
+                    self._con.unregister(name)
+                self._clear_statements()
         self._tables.clear()
@@ -8,9 +8,11 @@ vector storage and retrieval.
 from __future__ import annotations
 
 import json
+import logging
 from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 from uuid import UUID, uuid4
 
 import pandas as pd
@@ -18,6 +20,8 @@ import pandas as pd
 from src.core.exceptions import ValidationError
 from src.core.types import DocumentChunk, Metadata
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class TableLoadOptions:
@@ -33,6 +37,8 @@ class TableLoadOptions:
         dtype: Column data types
         parse_dates: Columns to parse as dates
         max_rows: Maximum rows to read
+        chunk_size: Rows per batch when streaming
+        schema_sample_rows: Rows sampled to infer the schema when streaming
     """
 
     encoding: str = "utf-8"
@@ -44,6 +50,8 @@ class TableLoadOptions:
     dtype: Optional[Dict[str, Any]] = None
     parse_dates: Optional[List[str]] = None
     max_rows: Optional[int] = None
+    chunk_size: int = 50_000
+    schema_sample_rows: int = 1000
 
 
 @dataclass
@@ -74,6 +82,7 @@ class TableLoader:
     - Conversion to DocumentChunk objects
     - Metadata extraction from headers
     - Configurable loading options
+    - Streaming row batches and lazy DocumentChunk generation for large files
 
     Example:
         ```python
@@ -90,9 +99,33 @@ class TableLoader:
 
         # Convert to DocumentChunks
         chunks = loader.convert_to_documents(df, source="data.csv")
+
+        # Stream a large file without loading it into memory
+        for chunk in loader.stream_documents("permits.csv"):
+            index(chunk)
         ```
     """
 
+    # Pandas dtype hints for streamed batches, keyed by inferred type
+    _STREAM_DTYPES = {
+        "integer": "Int64",
+        "float": "float64",
+        "boolean": "boolean",
+    }
+
+    # Dtype a streamed column widens to when a batch does not fit its hint
+    _WIDER_DTYPES = {
+        "Int64": "float64",
+        "float64": "object",
+        "boolean": "object",
+    }
+
+    # Schema type recorded for a widened column
+    _DTYPE_KINDS = {
+        "float64": "float",
+        "object": "string",
+    }
+
     def __init__(self) -> None:
         """Initialize the table loader."""
         self._loaded_data: Dict[str, pd.DataFrame] = {}
@@ -280,6 +313,403 @@ class TableLoader:
                 details={"path": str(path), "error": str(e)},
             )
 
+    def iter_batches(
+        self,
+        path: Union[str, Path],
+        options: Optional[TableLoadOptions] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Stream a CSV, Excel or JSON file as DataFrame batches.
+
+        Dispatches on the file suffix. Batches keep a continuous row index,
+        and the schema inferred from the first rows is recorded for the path.
+
+        Args:
+            path: Path to the data file
+            options: Loading options (``chunk_size`` controls batch rows)
+
+        Returns:
+            Iterator of DataFrame batches of at most ``options.chunk_size`` rows
+
+        Raises:
+            ValidationError: If the file doesn't exist, is invalid or unsupported
+        """
+        suffix = Path(path).suffix.lower()
+        if suffix in (".csv", ".tsv", ".txt"):
+            return self.iter_csv(path, options)
+        if suffix in (".xlsx", ".xlsm", ".xls"):
+            return self.iter_excel(path, options=options)
+        if suffix in (".json", ".jsonl", ".ndjson"):
+            return self.iter_json(path, options)
+        raise ValidationError(
+            message=f"Unsupported file type for streaming: {path}",
+            details={"path": str(path), "suffix": suffix},
+        )
+
+    def iter_csv(
+        self,
+        path: Union[str, Path],
+        options: Optional[TableLoadOptions] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Stream a CSV file in row batches.
+
+        A sample of ``options.schema_sample_rows`` rows is read first to infer
+        column types, which are applied to every batch as hints so that types
+        stay consistent across the file. A later batch that does not fit a
+        hint (e.g. ``1.5`` or ``"n/a"`` in a column sampled as integer)
+        widens that column for the rest of the stream instead of failing.
+
+        Args:
+            path: Path to the CSV file
+            options: Loading options
+
+        Yields:
+            DataFrame batches
+
+        Raises:
+            ValidationError: If file doesn't exist or is invalid
+        """
+        path = Path(path)
+        options = options or TableLoadOptions()
+        self._ensure_exists(path, "CSV")
+
+        read_kwargs = dict(
+            encoding=options.encoding,
+            delimiter=options.delimiter,
+            header=options.header_row,
+            skiprows=options.skip_rows,
+            na_values=options.na_values,
+            parse_dates=options.parse_dates,
+        )
+
+        try:
+            sample = pd.read_csv(
+                path,
+                dtype=options.dtype,
+                nrows=options.schema_sample_rows,
+                **read_kwargs,
+            )
+            schema = self.infer_schema(sample)
+            self._schemas[str(path)] = schema
+            del sample
+
+            hints = self._stream_dtypes(schema, options)
+            reader = pd.read_csv(
+                path,
+                dtype=options.dtype,
+                nrows=options.max_rows,
+                chunksize=options.chunk_size,
+                **read_kwargs,
+            )
+            with reader:
+                for batch in reader:
+                    yield self._conform_batch(batch, hints, str(path))
+
+        except pd.errors.EmptyDataError:
+            raise ValidationError(
+                message=f"CSV file is empty: {path}",
+                details={"path": str(path)},
+            )
+        except pd.errors.ParserError as e:
+            raise ValidationError(
+                message=f"Failed to parse CSV file: {path}",
+                details={"path": str(path), "error": str(e)},
+            )
+        except (TypeError, ValueError) as e:
+            raise ValidationError(
+                message=f"Failed to load CSV file: {path}",
+                details={"path": str(path), "error": str(e)},
+            )
+
+    def iter_excel(
+        self,
+        path: Union[str, Path],
+        sheet_name: Optional[Union[str, int]] = None,
+        options: Optional[TableLoadOptions] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Stream an Excel sheet in row batches.
+
+        Uses openpyxl's read-only mode so rows are read lazily; ``header_row``
+        must be a single row index. Legacy ``.xls`` files fall back to a full
+        load sliced into batches.
+
+        Args:
+            path: Path to the Excel file
+            sheet_name: Sheet name or index (overrides options.sheet_name)
+            options: Loading options
+
+        Yields:
+            DataFrame batches
+
+        Raises:
+            ValidationError: If file doesn't exist or is invalid
+        """
+        path = Path(path)
+        options = options or TableLoadOptions()
+        self._ensure_exists(path, "Excel")
+        sheet = sheet_name if sheet_name is not None else options.sheet_name
+
+        if path.suffix.lower() == ".xls":
+            yield from self._slice_batches(self.load_excel(path, sheet, options), options)
+            return
+
+        try:
+            from openpyxl import load_workbook
+        except ImportError as e:
+            raise ValidationError(
+                message="openpyxl is required to stream Excel files",
+                details={"path": str(path), "error": str(e)},
+            )
+
+        try:
+            workbook = load_workbook(path, read_only=True, data_only=True)
+        except Exception as e:
+            raise ValidationError(
+                message=f"Failed to load Excel file: {path}",
+                details={"path": str(path), "error": str(e)},
+            )
+
+        try:
+            if isinstance(sheet, int):
+                worksheet = workbook.worksheets[sheet]
+            else:
+                worksheet = workbook[sheet]
+        except (IndexError, KeyError) as e:
+            workbook.close()
+            raise ValidationError(
+                message=f"Sheet '{sheet}' not found in Excel file: {path}",
+                details={"path": str(path), "sheet": sheet, "error": str(e)},
+            )
+
+        try:
+            rows = worksheet.iter_rows(values_only=True)
+            skip = (options.skip_rows or 0) + int(options.header_row or 0)
+            header_values = next(islice(rows, skip, None), None)
+            if header_values is None:
+                return
+            header = [str(h) if h is not None else f"column_{i}" for i, h in enumerate(header_values)]
+
+            if options.max_rows is not None:
+                rows = islice(rows, options.max_rows)
+
+            yield from self._row_batches(rows, header, options, key=f"{path}#{sheet}")
+        finally:
+            workbook.close()
+
+    def iter_json(
+        self,
+        path: Union[str, Path],
+        options: Optional[TableLoadOptions] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Stream a JSON Lines file in row batches.
+
+        ``.jsonl``/``.ndjson`` files are parsed one line at a time. A single
+        JSON document cannot be parsed incrementally, so other files are
+        loaded with ``load_json`` and sliced into batches.
+
+        Args:
+            path: Path to the JSON file
+            options: Loading options
+
+        Yields:
+            DataFrame batches
+
+        Raises:
+            ValidationError: If file doesn't exist or is invalid
+        """
+        path = Path(path)
+        options = options or TableLoadOptions()
+        self._ensure_exists(path, "JSON")
+
+        if path.suffix.lower() not in (".jsonl", ".ndjson"):
+            yield from self._slice_batches(self.load_json(path, options=options), options)
+            return
+
+        def records() -> Iterator[Dict[str, Any]]:
+            with open(path, "r", encoding=options.encoding) as f:
+                for line_no, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        raise ValidationError(
+                            message=f"Invalid JSON on line {line_no} of file: {path}",
+                            details={"path": str(path), "line": line_no, "error": str(e)},
+                        )
+
+        rows = records()
+        if options.max_rows is not None:
+            rows = islice(rows, options.max_rows)
+
+        yield from self._record_batches(rows, options, key=str(path))
+
+    def stream_documents(
+        self,
+        source: Union[str, Path, Iterable[pd.DataFrame]],
+        text_columns: Optional[List[str]] = None,
+        metadata_columns: Optional[List[str]] = None,
+        document_id: Optional[UUID] = None,
+        options: Optional[TableLoadOptions] = None,
+        source_name: Optional[str] = None,
+    ) -> Iterator[DocumentChunk]:
+        """Lazily convert a file (or DataFrame batches) into DocumentChunks.
+
+        Only one batch is held in memory at a time, so the generator can feed
+        an indexer directly. Text columns default to the string columns of the
+        first batch and stay fixed for the rest of the stream.
+
+        Args:
+            source: File path, or an iterable of DataFrame batches
+            text_columns: Columns to include in the content text
+            metadata_columns: Columns to include as metadata
+            document_id: Parent document ID shared by all chunks
+            options: Loading options when ``source`` is a path
+            source_name: Source identifier (defaults to the path)
+
+        Yields:
+            DocumentChunk objects, one per row
+        """
+        if isinstance(source, (str, Path)):
+            batches: Iterable[pd.DataFrame] = self.iter_batches(source, options)
+            source_name = source_name or str(source)
+        else:
+            batches = source
+
+        doc_id = document_id or uuid4()
+        for batch in batches:
+            if batch.empty:
+                continue
+            if text_columns is None:
+                text_columns = self._default_text_columns(batch)
+            yield from self._iter_row_chunks(batch, source_name, text_columns, metadata_columns, doc_id)
+
+    def get_schema(self, key: str) -> Optional[InferredSchema]:
+        """Get the schema inferred while streaming a source.
+
+        Args:
+            key: Key used when streaming (file path or path#sheet)
+
+        Returns:
+            Inferred schema if the source has been streamed, None otherwise
+        """
+        return self._schemas.get(key)
+
+    def _ensure_exists(self, path: Path, kind: str) -> None:
+        """Raise if a source file is missing.
+
+        Args:
+            path: File path
+            kind: Human-readable file kind for the message
+
+        Raises:
+            ValidationError: If the file doesn't exist
+        """
+        if not path.exists():
+            raise ValidationError(
+                message=f"{kind} file not found: {path}",
+                details={"path": str(path)},
+            )
+
+    def _stream_dtypes(self, schema: InferredSchema, options: TableLoadOptions) -> Dict[str, Any]:
+        """Build the dtype hints applied to streamed batches.
+
+        Args:
+            schema: Schema inferred from the sample
+            options: Loading options (columns with explicit dtypes are read
+                with those and get no hint)
+
+        Returns:
+            Column to dtype mapping for numeric and boolean columns
+        """
+        skip = set(options.parse_dates or []) | set(options.dtype or {})
+        return {
+            col: self._STREAM_DTYPES[kind]
+            for col, kind in schema.columns.items()
+            if kind in self._STREAM_DTYPES and col not in skip
+        }
+
+    def _conform_batch(self, batch: pd.DataFrame, hints: Dict[str, Any], key: str) -> pd.DataFrame:
+        """Cast a streamed batch to the dtype hints, widening columns that do not fit.
+
+        A widened hint is kept for the rest of the stream and recorded in the
+        schema for ``key``; batches already yielded keep their narrower dtype.
+
+        Args:
+            batch: Batch as parsed by pandas
+            hints: Column to dtype mapping, updated in place on widening
+            key: Schema key of the source
+
+        Returns:
+            The batch with hinted columns cast
+        """
+        for col, dtype in list(hints.items()):
+            if col not in batch.columns:
+                continue
+            while True:
+                try:
+                    batch[col] = batch[col].astype(dtype)
+                    break
+                except (TypeError, ValueError):
+                    wider = self._WIDER_DTYPES.get(dtype, "object")
+                    logger.info(f"Widening column {col!r} of {key} from {dtype} to {wider} after row {batch.index[0]}")
+                    dtype = hints[col] = wider
+                    schema = self._schemas.get(key)
+                    if schema is not None:
+                        schema.columns[str(col)] = self._DTYPE_KINDS[wider]
+        return batch
+
+    def _record_batches(
+        self,
+        records: Iterable[Dict[str, Any]],
+        options: TableLoadOptions,
+        key: str,
+    ) -> Iterator[pd.DataFrame]:
+        """Group dict records into DataFrame batches with a continuous index.
+
+        Types inferred from the first batch are applied to later batches as
+        hints, the same way ``iter_csv`` does.
+        """
+        offset = 0
+        hints: Dict[str, Any] = {}
+        records = iter(records)
+        while True:
+            block = list(islice(records, options.chunk_size))
+            if not block:
+                return
+            batch = pd.DataFrame(block)
+            batch.index = pd.RangeIndex(offset, offset + len(batch))
+            if offset == 0:
+                self._schemas[key] = self.infer_schema(batch.head(options.schema_sample_rows))
+                hints = self._stream_dtypes(self._schemas[key], options)
+            offset += len(batch)
+            yield self._conform_batch(batch, hints, key)
+
+    def _row_batches(
+        self,
+        rows: Iterable[tuple],
+        header: List[str],
+        options: TableLoadOptions,
+        key: str,
+    ) -> Iterator[pd.DataFrame]:
+        """Group positional rows into DataFrame batches with a continuous index."""
+        width = len(header)
+        return self._record_batches(
+            (dict(zip(header, row[:width])) for row in rows if any(v is not None for v in row)),
+            options,
+            key,
+        )
+
+    def _slice_batches(self, data: pd.DataFrame, options: TableLoadOptions) -> Iterator[pd.DataFrame]:
+        """Yield an already-loaded DataFrame in ``chunk_size`` slices."""
+        for start in range(0, len(data), options.chunk_size):
+            yield data.iloc[start : start + options.chunk_size]
+
+    @staticmethod
+    def _default_text_columns(data: pd.DataFrame) -> List[str]:
+        """Columns used for chunk content when none are specified."""
+        return [col for col in data.columns if data[col].dtype == "object" or pd.api.types.is_string_dtype(data[col])]
+
     def infer_schema(self, data: pd.DataFrame) -> InferredSchema:
         """Infer the schema of a DataFrame.
 
@@ -341,15 +771,34 @@ class TableLoader:
 
         # Determine text columns if not specified
         if text_columns is None:
-            text_columns = [
-                col for col in data.columns if data[col].dtype == "object" or pd.api.types.is_string_dtype(data[col])
-            ]
+            text_columns = self._default_text_columns(data)
+
+        return list(self._iter_row_chunks(data, source, text_columns, metadata_columns, doc_id))
+
+    def _iter_row_chunks(
+        self,
+        data: pd.DataFrame,
+        source: Optional[str],
+        text_columns: List[str],
+        metadata_columns: Optional[List[str]],
+        doc_id: UUID,
+    ) -> Iterator[DocumentChunk]:
+        """Yield one DocumentChunk per DataFrame row.
 
+        Args:
+            data: DataFrame (or batch) to convert
+            source: Source identifier for the data
+            text_columns: Columns to include in the content text
+            metadata_columns: Columns to include as metadata (defaults to all)
+            doc_id: Parent document ID
+
+        Yields:
+            DocumentChunk objects
+        """
         # Determine metadata columns if not specified
         if metadata_columns is None:
             metadata_columns = list(data.columns)
 
-        chunks = []
         for idx, row in data.iterrows():
             # Build content from text columns
             content_parts = []
@@ -377,15 +826,12 @@ class TableLoader:
                 custom=metadata_dict,
             )
 
-            chunk = DocumentChunk(
+            yield DocumentChunk(
                 document_id=doc_id,
                 content=content,
                 metadata=metadata,
                 index=int(idx),
             )
-            chunks.append(chunk)
-
-        return chunks
 
     def get_loaded_data(self, key: str) -> Optional[pd.DataFrame]:
         """Get previously loaded data by key.
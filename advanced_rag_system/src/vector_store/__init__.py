@@ -6,12 +6,15 @@ for multiple backends and metadata filtering.
 
 from src.vector_store.base import SearchOptions, VectorStore, VectorStoreConfig
 from src.vector_store.in_memory_store import InMemoryVectorStore
+from src.vector_store.ivf_store import IVFConfig, IVFVectorStore
 
 __all__ = [
     "VectorStore",
     "VectorStoreConfig",
     "SearchOptions",
     "InMemoryVectorStore",
+    "IVFVectorStore",
+    "IVFConfig",
 ]
 
 # ChromaVectorStore import is optional due to chromadb compatibility issues
@@ -41,6 +41,8 @@ class SearchOptions:
         filters: Metadata filters
         include_embeddings: Whether to include embeddings in results
         include_metadata: Whether to include metadata in results
+        nprobe: Number of inverted lists to probe for IVF-backed stores
+            (None uses the store default; ignored by exact stores)
     """
 
     top_k: int = 10
@@ -48,6 +50,7 @@ class SearchOptions:
     filters: Optional[Dict[str, Any]] = None
     include_embeddings: bool = False
     include_metadata: bool = True
+    nprobe: Optional[int] = None
 
 
 class VectorStore(ABC):
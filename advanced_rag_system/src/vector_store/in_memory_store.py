@@ -4,22 +4,47 @@ A lightweight VectorStore implementation that does not depend on ChromaDB.
 Useful when ChromaDB has dependency conflicts (e.g. pydantic v2 on Python 3.14).
 Stores all vectors in memory using numpy arrays for fast cosine similarity search.
 
+Embeddings live in a growable, pre-normalized float32 arena: adds append rows
+(capacity doubles when full), deletes leave tombstones that are masked out at
+query time and reclaimed by periodic compaction. Searches never rebuild the
+matrix, so ingestion interleaved with queries stays amortized O(d) per chunk.
+
+Snapshots: ``save(path)`` writes the normalized matrix as a raw float32 ``.npy``
+plus a JSON Lines chunk sidecar, both named by a snapshot generation that the
+manifest points at; ``load(path, mmap=True)`` maps the matrix copy-on-write so
+worker processes share one page-cached copy.
+
+Metadata filters (ChromaDB ``where`` syntax) are resolved through an inverted
+index to a row mask before scoring, so filtered queries only score the
+matching subset.
+
 Limitations vs ChromaDB:
-- No persistence (data lost on restart)
-- No metadata-based filtering
-- Less efficient for very large datasets (>100k vectors)
+- Persistence is explicit snapshots only (no write-ahead log)
+- Less efficient for very large datasets (>100k vectors); see IVFVectorStore
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
-from uuid import UUID
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from uuid import UUID, uuid4
 
 import numpy as np
 
 from src.core.exceptions import NotFoundError, VectorStoreError
 from src.core.types import DocumentChunk, SearchResult
 from src.vector_store.base import SearchOptions, VectorStore, VectorStoreConfig
+from src.vector_store.metadata_index import MetadataIndex
+
+SNAPSHOT_FORMAT_VERSION = 2
+_MANIFEST_FILE = "manifest.json"
+_EMBEDDINGS_FILE = "embeddings.{generation}.npy"
+_CHUNKS_FILE = "chunks.{generation}.jsonl"
+_INDEX_FILE = "{name}.{generation}.npy"
+_GENERATION_RE = re.compile(r"[0-9a-f]{32}")
 
 
 class InMemoryVectorStore(VectorStore):
@@ -43,43 +68,139 @@ class InMemoryVectorStore(VectorStore):
         ```
     """
 
+    _INITIAL_CAPACITY = 64
+    _COMPACTION_RATIO = 0.25
+    _COMPACTION_MIN_ROWS = 1024
+
     def __init__(self, config: Optional[VectorStoreConfig] = None) -> None:
         super().__init__(config)
         self._chunks: Dict[str, DocumentChunk] = {}
-        self._embeddings: Dict[str, np.ndarray] = {}
-        self._embedding_matrix: Optional[np.ndarray] = None
-        self._id_index: List[str] = []
-        self._dirty = False
+        # Append-only arena of L2-normalized float32 rows. Rows [0, _size) are
+        # allocated; rows whose _live flag is False are tombstones left by
+        # deletes and are reclaimed by _compact().
+        self._matrix = np.empty((0, self.config.dimension), dtype=np.float32)
+        self._live = np.zeros(0, dtype=bool)
+        self._size = 0
+        self._tombstones = 0
+        self._row_ids: List[Optional[str]] = []
+        self._row_of: Dict[str, int] = {}
+        self._metadata_index = MetadataIndex()
+        # Values each chunk was indexed under, so replacing or deleting it
+        # removes the right postings even if its metadata was mutated in place
+        self._indexed_meta: Dict[str, Dict[str, List[Any]]] = {}
 
     async def initialize(self) -> None:
         self._initialized = True
 
     async def close(self) -> None:
-        self._chunks.clear()
-        self._embeddings.clear()
-        self._embedding_matrix = None
-        self._id_index.clear()
-        self._dirty = False
+        self._reset_arena()
         self._initialized = False
 
-    def _rebuild_matrix(self) -> None:
-        """Rebuild the embedding matrix for batch similarity search."""
-        if not self._embeddings:
-            self._embedding_matrix = None
-            self._id_index = []
-            self._dirty = False
-            return
-
-        self._id_index = list(self._embeddings.keys())
-        vectors = [self._embeddings[cid] for cid in self._id_index]
-        self._embedding_matrix = np.vstack(vectors)
+    def _reset_arena(self) -> None:
+        """Drop all chunks and release the embedding arena."""
+        self._chunks.clear()
+        self._matrix = np.empty((0, self.config.dimension), dtype=np.float32)
+        self._live = np.zeros(0, dtype=bool)
+        self._size = 0
+        self._tombstones = 0
+        self._row_ids = []
+        self._row_of = {}
+        self._metadata_index.clear()
+        self._indexed_meta = {}
+
+    def _filterable_metadata(self, chunk: DocumentChunk) -> Dict[str, Any]:
+        """Flatten chunk metadata into the fields exposed to search filters."""
+        return {
+            "document_id": str(chunk.document_id),
+            **(chunk.metadata.model_extra or {}),
+            **self._chunk_to_dict(chunk)["metadata"],
+        }
 
-        # Normalize rows for cosine similarity (dot product on unit vectors)
-        norms = np.linalg.norm(self._embedding_matrix, axis=1, keepdims=True)
-        norms = np.where(norms == 0, 1.0, norms)
-        self._embedding_matrix = self._embedding_matrix / norms
+    def _store_chunk(self, chunk_id: str, chunk: DocumentChunk, vec: np.ndarray) -> None:
+        """Insert or replace a chunk, its arena row, and its metadata postings."""
+        indexed = self._indexed_meta.get(chunk_id)
+        if indexed is not None:
+            self._metadata_index.remove(self._row_of[chunk_id], indexed)
+        self._chunks[chunk_id] = chunk
+        self._put_row(chunk_id, vec)
+        row = self._row_of[chunk_id]
+        self._indexed_meta[chunk_id] = self._metadata_index.add(row, self._filterable_metadata(chunk))
+
+    def _rebuild_metadata_index(self) -> None:
+        self._metadata_index.clear()
+        self._indexed_meta = {}
+        for row in np.flatnonzero(self._live[: self._size]):
+            chunk_id = self._row_ids[row]
+            metadata = self._filterable_metadata(self._chunks[chunk_id])
+            self._indexed_meta[chunk_id] = self._metadata_index.add(int(row), metadata)
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        """Return a unit-length float32 copy of an embedding."""
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        if norm > 0:
+            vec = vec / norm
+        return vec
+
+    def _ensure_capacity(self, extra: int) -> None:
+        """Grow the arena geometrically so ``extra`` more rows fit."""
+        needed = self._size + extra
+        capacity = self._matrix.shape[0]
+        if needed <= capacity:
+            return
 
-        self._dirty = False
+        new_capacity = max(capacity, self._INITIAL_CAPACITY)
+        while new_capacity < needed:
+            new_capacity *= 2
+
+        matrix = np.empty((new_capacity, self.config.dimension), dtype=np.float32)
+        matrix[: self._size] = self._matrix[: self._size]
+        live = np.zeros(new_capacity, dtype=bool)
+        live[: self._size] = self._live[: self._size]
+        self._matrix = matrix
+        self._live = live
+
+    def _put_row(self, chunk_id: str, vec: np.ndarray) -> None:
+        """Write a normalized vector, overwriting in place if the id exists."""
+        row = self._row_of.get(chunk_id)
+        if row is None:
+            self._ensure_capacity(1)
+            row = self._size
+            self._size += 1
+            self._row_ids.append(chunk_id)
+            self._row_of[chunk_id] = row
+            self._live[row] = True
+        self._matrix[row] = vec
+
+    def _maybe_compact(self) -> None:
+        """Compact when tombstones make up a large share of the arena."""
+        if self._size < self._COMPACTION_MIN_ROWS:
+            return
+        if self._tombstones > self._size * self._COMPACTION_RATIO:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Squeeze tombstoned rows out of the arena, preserving row order."""
+        live_rows = np.flatnonzero(self._live[: self._size])
+        count = len(live_rows)
+
+        capacity = self._INITIAL_CAPACITY
+        while capacity < count:
+            capacity *= 2
+
+        matrix = np.empty((capacity, self.config.dimension), dtype=np.float32)
+        matrix[:count] = self._matrix[live_rows]
+        live = np.zeros(capacity, dtype=bool)
+        live[:count] = True
+
+        self._row_ids = [self._row_ids[row] for row in live_rows]
+        self._row_of = {cid: row for row, cid in enumerate(self._row_ids)}
+        self._matrix = matrix
+        self._live = live
+        self._size = count
+        self._tombstones = 0
+        self._rebuild_metadata_index()
 
     async def add_chunks(self, chunks: List[DocumentChunk]) -> None:
         self._ensure_initialized()
@@ -88,6 +209,9 @@ class InMemoryVectorStore(VectorStore):
             return
 
         try:
+            # Validate and normalize the whole batch before touching the
+            # arena so a bad chunk leaves the store unchanged.
+            prepared = []
             for chunk in chunks:
                 if chunk.embedding is None:
                     raise VectorStoreError(
@@ -96,12 +220,11 @@ class InMemoryVectorStore(VectorStore):
                         store_type="in_memory",
                     )
                 self._validate_embedding(chunk.embedding)
+                prepared.append((str(chunk.id), chunk, self._normalize(chunk.embedding)))
 
-                chunk_id = str(chunk.id)
-                self._chunks[chunk_id] = chunk
-                self._embeddings[chunk_id] = np.array(chunk.embedding, dtype=np.float32)
-
-            self._dirty = True
+            self._ensure_capacity(len(prepared))
+            for chunk_id, chunk, vec in prepared:
+                self._store_chunk(chunk_id, chunk, vec)
         except VectorStoreError:
             raise
         except Exception as e:
@@ -117,9 +240,14 @@ class InMemoryVectorStore(VectorStore):
         for cid in chunk_ids:
             key = str(cid)
             self._chunks.pop(key, None)
-            self._embeddings.pop(key, None)
+            row = self._row_of.pop(key, None)
+            if row is not None:
+                self._metadata_index.remove(row, self._indexed_meta.pop(key, {}))
+                self._live[row] = False
+                self._row_ids[row] = None
+                self._tombstones += 1
 
-        self._dirty = True
+        self._maybe_compact()
 
     async def search(
         self,
@@ -133,52 +261,13 @@ class InMemoryVectorStore(VectorStore):
 
         self._validate_embedding(query_embedding)
 
-        if not self._embeddings:
+        if not self._chunks:
             return []
 
         try:
-            if self._dirty:
-                self._rebuild_matrix()
-
-            query_vec = np.array(query_embedding, dtype=np.float32)
-            norm = np.linalg.norm(query_vec)
-            if norm > 0:
-                query_vec = query_vec / norm
-
-            # Cosine similarity via dot product (vectors are pre-normalized)
-            similarities = self._embedding_matrix @ query_vec
-
-            # Get top_k indices
-            n = len(similarities)
-            top_k = min(options.top_k, n)
-
-            if top_k >= n:
-                # No partition needed — just sort everything
-                top_indices = np.argsort(-similarities)[:top_k]
-            else:
-                top_indices = np.argpartition(-similarities, top_k)[:top_k]
-                top_indices = top_indices[np.argsort(-similarities[top_indices])]
-
-            results = []
-            for rank, idx in enumerate(top_indices):
-                # Clamp to [0, 1] to handle float32 precision drift
-                score = float(np.clip(similarities[idx], 0.0, 1.0))
-                if score < options.threshold:
-                    continue
-
-                chunk_id = self._id_index[idx]
-                chunk = self._chunks[chunk_id]
-
-                results.append(
-                    SearchResult(
-                        chunk=chunk,
-                        score=score,
-                        rank=rank + 1,
-                        distance=max(0.0, 1.0 - score),
-                    )
-                )
-
-            return results
+            query_vec = self._normalize(query_embedding)
+            rows, similarities = self._score_candidates(query_vec, options)
+            return self._rank_results(rows, similarities, options)
 
         except VectorStoreError:
             raise
@@ -189,6 +278,77 @@ class InMemoryVectorStore(VectorStore):
                 store_type="in_memory",
             )
 
+    def _score_candidates(
+        self,
+        query_vec: np.ndarray,
+        options: SearchOptions,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Score candidate rows against a normalized query.
+
+        The base store scores every live row, or only the rows matching
+        ``options.filters``; index-backed subclasses narrow the candidate set
+        further before the dot product.
+
+        Returns:
+            Tuple of (arena row indices, cosine similarities)
+        """
+        if options.filters:
+            rows = np.flatnonzero(self._filter_mask(options.filters))
+            return rows, self._matrix[rows] @ query_vec
+
+        rows = np.arange(self._size)
+        # Cosine similarity via dot product (rows are pre-normalized)
+        similarities = self._matrix[: self._size] @ query_vec
+        if self._tombstones:
+            live = self._live[: self._size]
+            rows = rows[live]
+            similarities = similarities[live]
+        return rows, similarities
+
+    def _filter_mask(self, filters: Dict[str, Any]) -> np.ndarray:
+        """Boolean mask over arena rows that are live and match ``filters``."""
+        return self._metadata_index.mask(filters, self._size) & self._live[: self._size]
+
+    def _rank_results(
+        self,
+        rows: np.ndarray,
+        similarities: np.ndarray,
+        options: SearchOptions,
+    ) -> List[SearchResult]:
+        """Select the top_k candidates and convert them to search results."""
+        n = len(similarities)
+        top_k = min(options.top_k, n)
+        if top_k <= 0:
+            return []
+
+        if top_k >= n:
+            # No partition needed — just sort everything
+            top_indices = np.argsort(-similarities)[:top_k]
+        else:
+            top_indices = np.argpartition(-similarities, top_k)[:top_k]
+            top_indices = top_indices[np.argsort(-similarities[top_indices])]
+
+        results = []
+        for rank, idx in enumerate(top_indices):
+            # Clamp to [0, 1] to handle float32 precision drift
+            score = float(np.clip(similarities[idx], 0.0, 1.0))
+            if score < options.threshold:
+                continue
+
+            chunk_id = self._row_ids[rows[idx]]
+            chunk = self._chunks[chunk_id]
+
+            results.append(
+                SearchResult(
+                    chunk=chunk,
+                    score=score,
+                    rank=rank + 1,
+                    distance=max(0.0, 1.0 - score),
+                )
+            )
+
+        return results
+
     async def get_chunk(self, chunk_id: UUID) -> Optional[DocumentChunk]:
         self._ensure_initialized()
         return self._chunks.get(str(chunk_id))
@@ -212,20 +372,220 @@ class InMemoryVectorStore(VectorStore):
             )
 
         self._validate_embedding(chunk.embedding)
-        self._chunks[key] = chunk
-        self._embeddings[key] = np.array(chunk.embedding, dtype=np.float32)
-        self._dirty = True
+        self._store_chunk(key, chunk, self._normalize(chunk.embedding))
 
     async def count(self) -> int:
         return len(self._chunks)
 
     async def clear(self) -> None:
         self._ensure_initialized()
-        self._chunks.clear()
-        self._embeddings.clear()
-        self._embedding_matrix = None
-        self._id_index.clear()
-        self._dirty = False
+        self._reset_arena()
+
+    async def save(self, path: Union[str, Path]) -> Path:
+        """Write a snapshot of the store to a directory.
+
+        The snapshot holds ``embeddings.<generation>.npy`` (live rows of the
+        normalized float32 matrix, in row order), ``chunks.<generation>.jsonl``
+        (one chunk per line, without its embedding) and ``manifest.json``,
+        which names the current generation. Index-backed subclasses add their
+        own ``<name>.<generation>.npy`` arrays. Data files are written under a
+        fresh generation and the manifest is swapped in last with a single
+        rename, so readers only ever see one complete generation. The files
+        of the previous generation are kept for readers that opened its
+        manifest just before the swap; older ones are removed.
+
+        Args:
+            path: Target directory (created if missing)
+
+        Returns:
+            The snapshot directory
+
+        Raises:
+            VectorStoreError: If the snapshot cannot be written
+        """
+        self._ensure_initialized()
+        target = Path(path)
+
+        try:
+            target.mkdir(parents=True, exist_ok=True)
+
+            if self._tombstones:
+                live_rows = np.flatnonzero(self._live[: self._size])
+                matrix = self._matrix[live_rows]
+            else:
+                live_rows = np.arange(self._size)
+                matrix = self._matrix[: self._size]
+
+            previous = None
+            previous_arrays: List[str] = []
+            if (target / _MANIFEST_FILE).exists():
+                with open(target / _MANIFEST_FILE, "r", encoding="utf-8") as f:
+                    previous_manifest = json.load(f)
+                previous = previous_manifest.get("generation")
+                previous_arrays = previous_manifest.get("index_arrays", [])
+            generation = uuid4().hex
+
+            with open(target / _EMBEDDINGS_FILE.format(generation=generation), "wb") as f:
+                np.save(f, np.ascontiguousarray(matrix, dtype=np.float32))
+
+            with open(target / _CHUNKS_FILE.format(generation=generation), "w", encoding="utf-8") as f:
+                for row in live_rows:
+                    chunk = self._chunks[self._row_ids[row]]
+                    f.write(chunk.model_dump_json(exclude={"embedding"}))
+                    f.write("\n")
+
+            index_arrays = self._snapshot_index(live_rows)
+            for name, array in index_arrays.items():
+                with open(target / _INDEX_FILE.format(name=name, generation=generation), "wb") as f:
+                    np.save(f, array)
+
+            manifest = {
+                "format_version": SNAPSHOT_FORMAT_VERSION,
+                "generation": generation,
+                "collection_name": self.config.collection_name,
+                "dimension": self.config.dimension,
+                "distance_metric": self.config.distance_metric,
+                "count": len(live_rows),
+                "index_arrays": sorted(index_arrays),
+            }
+            tmp_manifest = target / f"{_MANIFEST_FILE}.{generation}.tmp"
+            with open(tmp_manifest, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_manifest, target / _MANIFEST_FILE)
+
+            self._prune_generations(
+                target,
+                keep={generation, previous},
+                stems={"embeddings", "chunks", *index_arrays, *previous_arrays},
+            )
+            return target
+
+        except Exception as e:
+            raise VectorStoreError(
+                message=f"Failed to save snapshot: {e}",
+                error_code="SNAPSHOT_SAVE_ERROR",
+                store_type="in_memory",
+                details={"path": str(target)},
+            )
+
+    @staticmethod
+    def _prune_generations(target: Path, keep: set, stems: set) -> None:
+        """Remove snapshot files of generations not in ``keep``.
+
+        Only names this class writes are touched: ``<stem>.<generation>.npy``
+        or ``.jsonl`` for a known stem, and manifests left behind as
+        ``manifest.json.<generation>.tmp`` by an interrupted save. Other
+        files in the directory (``embeddings.v2.npy``, say) are left alone.
+        """
+        for file in target.iterdir():
+            if file.name.startswith(f"{_MANIFEST_FILE}."):
+                generation, _, suffix = file.name[len(_MANIFEST_FILE) + 1 :].partition(".")
+                stale = suffix == "tmp"
+            else:
+                parts = file.name.split(".")
+                if len(parts) != 3:
+                    continue
+                stem, generation, suffix = parts
+                stale = stem in stems and suffix in ("npy", "jsonl")
+            if stale and _GENERATION_RE.fullmatch(generation) and generation not in keep:
+                file.unlink(missing_ok=True)
+
+    def _snapshot_index(self, live_rows: np.ndarray) -> Dict[str, np.ndarray]:
+        """Arrays an index-backed subclass persists alongside the matrix.
+
+        Args:
+            live_rows: Arena rows being saved, in snapshot row order
+
+        Returns:
+            Mapping of array name to array, restored by ``_restore_index``
+        """
+        return {}
+
+    def _restore_index(self, arrays: Dict[str, np.ndarray]) -> None:
+        """Restore arrays written by ``_snapshot_index`` after a load."""
+
+    async def load(self, path: Union[str, Path], mmap: bool = True) -> None:
+        """Replace the store contents with a snapshot written by ``save``.
+
+        With ``mmap=True`` the matrix is mapped copy-on-write: pages stay
+        shared with the OS page cache (and other processes mapping the same
+        file) until this process writes to them. Adding chunks beyond the
+        snapshot size moves the matrix into private memory.
+
+        Loaded chunks carry no ``embedding``; vectors live only in the matrix.
+
+        Args:
+            path: Snapshot directory
+            mmap: Memory-map the matrix instead of reading it into RAM
+
+        Raises:
+            VectorStoreError: If the snapshot is missing, corrupt, or has a
+                different dimension than this store
+        """
+        self._ensure_initialized()
+        source = Path(path)
+
+        try:
+            with open(source / _MANIFEST_FILE, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+
+            if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+                raise VectorStoreError(
+                    message=f"Unsupported snapshot format: {manifest.get('format_version')}",
+                    error_code="SNAPSHOT_FORMAT_ERROR",
+                    store_type="in_memory",
+                )
+            if manifest.get("dimension") != self.config.dimension:
+                raise VectorStoreError(
+                    message=(
+                        f"Snapshot dimension mismatch: expected {self.config.dimension}, "
+                        f"got {manifest.get('dimension')}"
+                    ),
+                    error_code="DIMENSION_MISMATCH",
+                    store_type="in_memory",
+                )
+
+            # Data files are resolved through the manifest's generation, so an
+            # embeddings file can never be paired with another save's chunks.
+            generation = manifest["generation"]
+            matrix = np.load(source / _EMBEDDINGS_FILE.format(generation=generation), mmap_mode="c" if mmap else None)
+            with open(source / _CHUNKS_FILE.format(generation=generation), "r", encoding="utf-8") as f:
+                chunks = [DocumentChunk.model_validate_json(line) for line in f if line.strip()]
+            index_arrays = {
+                name: np.load(source / _INDEX_FILE.format(name=name, generation=generation))
+                for name in manifest.get("index_arrays", [])
+            }
+
+            count = manifest.get("count")
+            if matrix.dtype != np.float32 or matrix.shape != (count, self.config.dimension) or len(chunks) != count:
+                raise VectorStoreError(
+                    message=(
+                        f"Snapshot generation {generation} is inconsistent: embeddings shape "
+                        f"{matrix.shape}, {len(chunks)} chunks, manifest count {count}"
+                    ),
+                    error_code="SNAPSHOT_CORRUPT",
+                    store_type="in_memory",
+                )
+
+            self._reset_arena()
+            self._matrix = matrix
+            self._live = np.ones(len(chunks), dtype=bool)
+            self._size = len(chunks)
+            self._row_ids = [str(chunk.id) for chunk in chunks]
+            self._row_of = {cid: row for row, cid in enumerate(self._row_ids)}
+            self._chunks = dict(zip(self._row_ids, chunks))
+            self._rebuild_metadata_index()
+            self._restore_index(index_arrays)
+
+        except VectorStoreError:
+            raise
+        except Exception as e:
+            raise VectorStoreError(
+                message=f"Failed to load snapshot: {e}",
+                error_code="SNAPSHOT_LOAD_ERROR",
+                store_type="in_memory",
+                details={"path": str(source)},
+            )
 
     async def health_check(self) -> bool:
         return self._initialized
@@ -236,7 +596,7 @@ class InMemoryVectorStore(VectorStore):
             "chunk_count": len(self._chunks),
             "dimension": self.config.dimension,
             "collection_name": self.config.collection_name,
-            "memory_estimated_mb": (
-                len(self._embeddings) * self.config.dimension * 4 / (1024 * 1024) if self._embeddings else 0.0
-            ),
+            "memory_estimated_mb": self._matrix.nbytes / (1024 * 1024),
+            "arena_capacity": self._matrix.shape[0],
+            "tombstones": self._tombstones,
         }
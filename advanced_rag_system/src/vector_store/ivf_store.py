@@ -0,0 +1,338 @@
+"""Approximate nearest-neighbour vector store using an IVF index.
+
+Extends the in-memory arena store with an inverted-file (IVF) index: a
+spherical k-means coarse quantizer partitions the normalized vectors into
+``n_lists`` cells, and a query only scores the rows in the ``nprobe`` cells
+whose centroids are closest to it. Search cost drops from O(N·d) to roughly
+O(nprobe/n_lists · N·d) at the price of some recall, tunable per query via
+``SearchOptions.nprobe``. Metadata filters are applied as a row mask inside
+the probed cells, or exactly over the matching subset when it is small.
+
+The index trains itself lazily once the store holds ``train_threshold``
+vectors and retrains when the corpus has grown by ``retrain_growth``; below
+the threshold searches fall back to exact brute force. Lazy training runs
+k-means in a worker thread so ``add_chunks`` does not block the event loop.
+Snapshots persist the centroids and row assignments, so ``load`` restores a
+trained index without reclustering. Pure numpy, no external ANN dependency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.core.types import DocumentChunk
+from src.vector_store.base import SearchOptions, VectorStoreConfig
+from src.vector_store.in_memory_store import InMemoryVectorStore
+
+
+@dataclass
+class IVFConfig:
+    """Configuration for the IVF coarse quantizer.
+
+    Attributes:
+        n_lists: Number of k-means cells (None picks ~sqrt(N) at train time)
+        nprobe: Default number of cells probed per query
+        train_threshold: Minimum vectors before the index is trained
+        retrain_growth: Retrain when the live count grows by this factor
+        kmeans_iterations: Lloyd iterations per training run
+        max_train_samples: Cap on vectors sampled for k-means training
+        seed: Random seed for centroid initialisation and sampling
+    """
+
+    n_lists: Optional[int] = None
+    nprobe: int = 8
+    train_threshold: int = 2048
+    retrain_growth: float = 4.0
+    kmeans_iterations: int = 10
+    max_train_samples: int = 50_000
+    seed: int = 42
+
+
+class IVFVectorStore(InMemoryVectorStore):
+    """Vector store with an inverted-file ANN index over the arena.
+
+    Example:
+        ```python
+        store = IVFVectorStore(
+            VectorStoreConfig(dimension=1536),
+            IVFConfig(nprobe=16),
+        )
+        await store.initialize()
+        await store.add_chunks(chunks)
+
+        # Trade latency for recall on a single query
+        results = await store.search(embedding, SearchOptions(top_k=10, nprobe=32))
+        ```
+    """
+
+    def __init__(
+        self,
+        config: Optional[VectorStoreConfig] = None,
+        ivf_config: Optional[IVFConfig] = None,
+    ) -> None:
+        super().__init__(config)
+        self.ivf_config = ivf_config or IVFConfig()
+        self._arena_epoch = 0
+        self._reset_index()
+
+    def _reset_arena(self) -> None:
+        super()._reset_arena()
+        self._reset_index()
+
+    def _reset_index(self) -> None:
+        """Discard the trained quantizer and all inverted lists."""
+        self._centroids: Optional[np.ndarray] = None
+        self._assign = np.full(self._matrix.shape[0], -1, dtype=np.int32)
+        self._lists: List[List[int]] = []
+        self._list_arrays: Dict[int, np.ndarray] = {}
+        self._trained_size = 0
+        # Bumped whenever arena rows are renumbered, so a background training
+        # run can tell its row assignment no longer applies.
+        self._arena_epoch += 1
+        self._training = False
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether the coarse quantizer has been trained."""
+        return self._centroids is not None
+
+    # ------------------------------------------------------------------
+    # Arena hooks
+    # ------------------------------------------------------------------
+
+    def _ensure_capacity(self, extra: int) -> None:
+        super()._ensure_capacity(extra)
+        capacity = self._matrix.shape[0]
+        if len(self._assign) < capacity:
+            assign = np.full(capacity, -1, dtype=np.int32)
+            assign[: len(self._assign)] = self._assign
+            self._assign = assign
+
+    def _put_row(self, chunk_id: str, vec: np.ndarray) -> None:
+        super()._put_row(chunk_id, vec)
+        if self._centroids is not None:
+            self._assign_row(self._row_of[chunk_id], vec)
+
+    def _compact(self) -> None:
+        live_rows = np.flatnonzero(self._live[: self._size])
+        assign = self._assign[live_rows]
+        super()._compact()
+        self._arena_epoch += 1
+
+        self._assign = np.full(self._matrix.shape[0], -1, dtype=np.int32)
+        self._assign[: len(assign)] = assign
+        if self._centroids is not None:
+            self._rebuild_lists()
+
+    async def add_chunks(self, chunks: List[DocumentChunk]) -> None:
+        await super().add_chunks(chunks)
+        await self._maybe_train()
+
+    async def load(self, path: Union[str, Path], mmap: bool = True) -> None:
+        await super().load(path, mmap=mmap)
+        # Snapshots written before the store was trained carry no quantizer
+        await self._maybe_train()
+
+    def _snapshot_index(self, live_rows: np.ndarray) -> Dict[str, np.ndarray]:
+        if self._centroids is None:
+            return {}
+        return {
+            "ivf_centroids": self._centroids,
+            "ivf_assign": self._assign[live_rows],
+            "ivf_trained_size": np.asarray(self._trained_size, dtype=np.int64),
+        }
+
+    def _restore_index(self, arrays: Dict[str, np.ndarray]) -> None:
+        self._assign = np.full(self._matrix.shape[0], -1, dtype=np.int32)
+        if "ivf_centroids" not in arrays:
+            return
+        self._centroids = np.asarray(arrays["ivf_centroids"], dtype=np.float32)
+        self._assign[: self._size] = arrays["ivf_assign"]
+        self._trained_size = int(arrays["ivf_trained_size"])
+        self._rebuild_lists()
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def _assign_row(self, row: int, vec: np.ndarray) -> None:
+        """Assign a single row to its nearest cell."""
+        list_id = int(np.argmax(self._centroids @ vec))
+        if self._assign[row] == list_id:
+            return
+        # The old list keeps a stale entry; searches filter on _assign.
+        self._assign[row] = list_id
+        self._lists[list_id].append(row)
+        self._list_arrays.pop(list_id, None)
+
+    def _rebuild_lists(self) -> None:
+        """Rebuild inverted lists from the per-row assignment array."""
+        assign = self._assign[: self._size]
+        rows = np.flatnonzero(assign >= 0)
+        order = np.argsort(assign[rows], kind="stable")
+        sorted_rows = rows[order]
+        bounds = np.searchsorted(assign[sorted_rows], np.arange(len(self._centroids) + 1))
+
+        self._lists = [sorted_rows[bounds[i] : bounds[i + 1]].tolist() for i in range(len(self._centroids))]
+        self._list_arrays = {}
+
+    def _needs_training(self) -> bool:
+        live = len(self._chunks)
+        if live < self.ivf_config.train_threshold:
+            return False
+        return self._centroids is None or live >= self._trained_size * self.ivf_config.retrain_growth
+
+    async def _maybe_train(self) -> None:
+        """Train in a worker thread when the corpus crosses a threshold.
+
+        Rows added while k-means runs are assigned when the result is
+        installed; if a compaction renumbers rows meanwhile the result is
+        dropped and the next ``add_chunks`` retrains.
+        """
+        if self._training or not self._needs_training():
+            return
+
+        self._training = True
+        try:
+            epoch = self._arena_epoch
+            live_rows = np.flatnonzero(self._live[: self._size])
+            centroids, labels = await asyncio.to_thread(self._fit, self._matrix, live_rows)
+            if epoch == self._arena_epoch:
+                self._install(centroids, live_rows, labels)
+        finally:
+            self._training = False
+
+    def train(self) -> None:
+        """Train the coarse quantizer on the current vectors and reassign all rows."""
+        live_rows = np.flatnonzero(self._live[: self._size])
+        if len(live_rows) == 0:
+            self._reset_index()
+            return
+        centroids, labels = self._fit(self._matrix, live_rows)
+        self._install(centroids, live_rows, labels)
+
+    def _fit(self, matrix: np.ndarray, live_rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Run spherical k-means over ``live_rows`` of ``matrix``.
+
+        Touches no store state, so it is safe to run off the event loop.
+
+        Returns:
+            Tuple of (float32 centroids, cell label per live row)
+        """
+        cfg = self.ivf_config
+        n_lists = cfg.n_lists or max(1, int(np.sqrt(len(live_rows))))
+        n_lists = min(n_lists, len(live_rows))
+
+        rng = np.random.default_rng(cfg.seed)
+        if len(live_rows) > cfg.max_train_samples:
+            sample_rows = rng.choice(live_rows, cfg.max_train_samples, replace=False)
+        else:
+            sample_rows = live_rows
+        sample = matrix[sample_rows]
+
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(cfg.kmeans_iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty cells keep their previous centroid
+            empty = norms[:, 0] == 0
+            sums[empty] = centroids[empty]
+            norms[empty] = 1.0
+            centroids = sums / norms
+        centroids = centroids.astype(np.float32)
+
+        # Assign in blocks to bound the temporary (rows × n_lists) matrix
+        labels = np.empty(len(live_rows), dtype=np.int32)
+        block = 8192
+        for start in range(0, len(live_rows), block):
+            rows = live_rows[start : start + block]
+            labels[start : start + block] = np.argmax(matrix[rows] @ centroids.T, axis=1)
+        return centroids, labels
+
+    def _install(self, centroids: np.ndarray, live_rows: np.ndarray, labels: np.ndarray) -> None:
+        """Swap in a trained quantizer and rebuild the inverted lists."""
+        self._centroids = centroids
+        self._assign[:] = -1
+        self._assign[live_rows] = labels
+
+        # Rows added since the fit started have no assignment yet
+        pending = np.flatnonzero(self._live[: self._size] & (self._assign[: self._size] < 0))
+        if len(pending):
+            self._assign[pending] = np.argmax(self._matrix[pending] @ centroids.T, axis=1)
+
+        self._rebuild_lists()
+        self._trained_size = len(self._chunks)
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _list_rows(self, list_id: int) -> np.ndarray:
+        cached = self._list_arrays.get(list_id)
+        if cached is None:
+            cached = np.asarray(self._lists[list_id], dtype=np.int64)
+            self._list_arrays[list_id] = cached
+        return cached
+
+    def _score_candidates(
+        self,
+        query_vec: np.ndarray,
+        options: SearchOptions,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if self._centroids is None:
+            return super()._score_candidates(query_vec, options)
+
+        n_lists = len(self._centroids)
+        nprobe = min(max(1, options.nprobe or self.ivf_config.nprobe), n_lists)
+
+        mask = None
+        if options.filters:
+            mask = self._filter_mask(options.filters)
+            # A selective filter leaves fewer rows than the probed cells would
+            # hold; scoring the subset exactly is cheaper and loses no recall.
+            if mask.sum() <= len(self._chunks) * nprobe / n_lists:
+                rows = np.flatnonzero(mask)
+                return rows, self._matrix[rows] @ query_vec
+
+        centroid_sims = self._centroids @ query_vec
+        if nprobe >= n_lists:
+            probe = np.arange(n_lists)
+        else:
+            probe = np.argpartition(-centroid_sims, nprobe)[:nprobe]
+
+        parts = []
+        for list_id in probe:
+            rows = self._list_rows(int(list_id))
+            if len(rows):
+                # Drop tombstones and stale entries left by reassignment
+                keep = self._live[rows] & (self._assign[rows] == list_id)
+                if mask is not None:
+                    keep &= mask[rows]
+                rows = rows[keep]
+                parts.append(rows)
+
+        if not parts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, np.empty(0, dtype=np.float32)
+
+        rows = np.unique(np.concatenate(parts))
+        return rows, self._matrix[rows] @ query_vec
+
+    async def get_stats(self) -> Dict[str, Any]:
+        stats = await super().get_stats()
+        stats.update(
+            {
+                "store_type": "ivf",
+                "index_trained": self.is_trained,
+                "n_lists": len(self._centroids) if self._centroids is not None else 0,
+                "default_nprobe": self.ivf_config.nprobe,
+            }
+        )
+        return stats
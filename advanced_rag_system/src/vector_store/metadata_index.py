@@ -0,0 +1,155 @@
+"""Inverted metadata index for pre-filtering in-memory vector search.
+
+Maps ``field -> value -> set of arena rows`` so a metadata filter resolves to
+a boolean row mask in time proportional to the matching postings rather than
+the corpus size. The store applies the mask before scoring, so filtered top-k
+only touches the matching subset of the embedding matrix.
+
+Filters use the ChromaDB ``where`` syntax already produced by
+``SelfQueryRetriever`` and accepted by ``ChromaVectorStore``:
+
+- ``{"city": "Austin"}`` (equality), ``{"city": ["Austin", "Dallas"]}`` ($in)
+- ``{"price": {"$gte": 300000, "$lt": 500000}}``
+- ``{"$and": [...]}``, ``{"$or": [...]}``
+
+List-valued metadata (e.g. ``tags``) is indexed per element, so an equality
+filter matches when any element is equal.
+"""
+
+from __future__ import annotations
+
+import operator
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Set
+
+import numpy as np
+
+from src.core.exceptions import VectorStoreError
+
+_RANGE_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le,
+}
+
+
+class MetadataIndex:
+    """Inverted index from metadata field/value to arena rows."""
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Dict[Hashable, Set[int]]] = {}
+
+    def clear(self) -> None:
+        self._postings.clear()
+
+    @staticmethod
+    def _values(value: Any) -> Iterable[Hashable]:
+        """Yield the indexable values of a metadata field."""
+        if value is None:
+            return ()
+        if isinstance(value, (list, tuple, set)):
+            return [v for v in value if v is not None and isinstance(v, Hashable)]
+        if isinstance(value, Hashable):
+            return (value,)
+        return ()
+
+    def add(self, row: int, metadata: Dict[str, Any]) -> Dict[str, List[Hashable]]:
+        """Index ``row`` under its metadata.
+
+        Returns the values indexed per field; passing them to ``remove`` undoes
+        exactly this call even if the caller's metadata has since been mutated.
+        """
+        indexed: Dict[str, List[Hashable]] = {}
+        for field, value in metadata.items():
+            values = list(self._values(value))
+            field_postings = self._postings.setdefault(field, {})
+            for v in values:
+                field_postings.setdefault(v, set()).add(row)
+            indexed[field] = values
+        return indexed
+
+    def remove(self, row: int, metadata: Dict[str, Any]) -> None:
+        for field, value in metadata.items():
+            field_postings = self._postings.get(field)
+            if not field_postings:
+                continue
+            for v in self._values(value):
+                rows = field_postings.get(v)
+                if rows is None:
+                    continue
+                rows.discard(row)
+                if not rows:
+                    del field_postings[v]
+
+    def mask(self, filters: Dict[str, Any], size: int) -> np.ndarray:
+        """Resolve a filter to a boolean mask over rows ``[0, size)``.
+
+        Raises:
+            VectorStoreError: If the filter uses an unsupported operator
+        """
+        mask = np.ones(size, dtype=bool)
+        for key, condition in filters.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self.mask(clause, size)
+            elif key == "$or":
+                union = np.zeros(size, dtype=bool)
+                for clause in condition:
+                    union |= self.mask(clause, size)
+                mask &= union
+            elif isinstance(condition, dict):
+                for op, operand in condition.items():
+                    mask &= self._field_mask(key, op, operand, size)
+            elif isinstance(condition, list):
+                mask &= self._field_mask(key, "$in", condition, size)
+            else:
+                mask &= self._field_mask(key, "$eq", condition, size)
+        return mask
+
+    def _rows_mask(self, row_sets: Iterable[Set[int]], size: int) -> np.ndarray:
+        mask = np.zeros(size, dtype=bool)
+        for rows in row_sets:
+            if rows:
+                mask[np.fromiter(rows, dtype=np.int64, count=len(rows))] = True
+        return mask
+
+    def _field_mask(self, field: str, op: str, operand: Any, size: int) -> np.ndarray:
+        field_postings = self._postings.get(field, {})
+
+        if op == "$eq":
+            return self._rows_mask(self._lookup(field_postings, [operand]), size)
+        if op == "$in":
+            return self._rows_mask(self._lookup(field_postings, operand), size)
+        if op == "$ne":
+            return ~self._rows_mask(self._lookup(field_postings, [operand]), size)
+        if op == "$nin":
+            return ~self._rows_mask(self._lookup(field_postings, operand), size)
+        if op in _RANGE_OPERATORS:
+            compare = _RANGE_OPERATORS[op]
+            matching = [rows for value, rows in field_postings.items() if self._safe_compare(compare, value, operand)]
+            return self._rows_mask(matching, size)
+        if op == "$contains":
+            needle = str(operand)
+            matching = [rows for value, rows in field_postings.items() if isinstance(value, str) and needle in value]
+            return self._rows_mask(matching, size)
+
+        raise VectorStoreError(
+            message=f"Unsupported filter operator: {op}",
+            error_code="INVALID_FILTER",
+            store_type="in_memory",
+            details={"field": field, "operator": op},
+        )
+
+    @staticmethod
+    def _lookup(field_postings: Dict[Hashable, Set[int]], values: Iterable[Any]) -> List[Set[int]]:
+        return [field_postings.get(v, set()) for v in values if isinstance(v, Hashable)]
+
+    @staticmethod
+    def _safe_compare(compare: Callable[[Any, Any], bool], value: Any, operand: Any) -> bool:
+        # Skip values of incomparable types (e.g. str vs int) instead of failing
+        if isinstance(value, bool) or isinstance(operand, bool):
+            return False
+        try:
+            return bool(compare(value, operand))
+        except TypeError:
+            return False
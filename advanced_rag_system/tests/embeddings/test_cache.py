@@ -1,5 +1,6 @@
 """Tests for embedding cache."""
 
+from unittest.mock import AsyncMock
 from uuid import uuid4
 
 import pytest
@@ -36,7 +37,7 @@ class TestMemoryCacheBackend:
         embedding = [0.1, 0.2, 0.3]
         await backend.set("key1", embedding, ttl=3600)
         result = await backend.get("key1")
-        assert result == embedding
+        assert result == pytest.approx(embedding)
 
     @pytest.mark.asyncio
     async def test_expired_entry(self, backend: MemoryCacheBackend) -> None:
@@ -92,6 +93,46 @@ class TestMemoryCacheBackend:
         assert "memory_mb" in stats
         assert "max_size" in stats
 
+    @pytest.mark.asyncio
+    async def test_stores_compact_float32(self, backend: MemoryCacheBackend) -> None:
+        """Test vectors are stored as float32 arrays and sized by nbytes."""
+        await backend.set("key1", [0.5] * 256, ttl=3600)
+        assert backend._cache["key1"].value.dtype.name == "float32"
+        assert backend._current_memory == 256 * 4
+        assert await backend.get("key1") == [0.5] * 256
+
+    @pytest.mark.asyncio
+    async def test_get_refreshes_recency(self, backend: MemoryCacheBackend) -> None:
+        """Test that a read moves the key to the most recently used end."""
+        for i in range(5):
+            await backend.set(f"key{i}", [float(i)], ttl=3600)
+        await backend.get("key0")
+        await backend.set("key5", [5.0], ttl=3600)
+
+        assert await backend.get("key0") is not None
+        assert await backend.get("key1") is None
+        assert backend.get_stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_swept_on_set(self, backend: MemoryCacheBackend) -> None:
+        """Test that expired entries are reclaimed without being read."""
+        await backend.set("stale", [0.1] * 64, ttl=0)
+        await backend.set("fresh", [0.2], ttl=3600)
+
+        assert "stale" not in backend._cache
+        assert backend._current_memory == 4
+
+    @pytest.mark.asyncio
+    async def test_memory_limit_evicts(self) -> None:
+        """Test eviction when the byte budget is exceeded."""
+        backend = MemoryCacheBackend(max_size=100, max_memory_mb=1)
+        vector = [0.0] * (128 * 1024)  # 512 KiB as float32
+        for i in range(3):
+            await backend.set(f"key{i}", vector, ttl=3600)
+
+        assert backend.get_stats()["size"] == 2
+        assert await backend.get("key0") is None
+
 
 class TestEmbeddingCache:
     """Test cases for EmbeddingCache."""
@@ -116,7 +157,7 @@ class TestEmbeddingCache:
         embedding = [0.1, 0.2, 0.3]
         await cache.set("test text", embedding)
         result = await cache.get("test text")
-        assert result == embedding
+        assert result == pytest.approx(embedding)
         assert cache.get_stats().hits == 1
 
     @pytest.mark.asyncio
@@ -125,7 +166,7 @@ class TestEmbeddingCache:
         embedding = [0.1, 0.2, 0.3]
         await cache.set("Test Text", embedding)
         result = await cache.get("test text")
-        assert result == embedding
+        assert result == pytest.approx(embedding)
 
     @pytest.mark.asyncio
     async def test_whitespace_normalization(self, cache: EmbeddingCache) -> None:
@@ -133,7 +174,7 @@ class TestEmbeddingCache:
         embedding = [0.1, 0.2, 0.3]
         await cache.set("  test text  ", embedding)
         result = await cache.get("test text")
-        assert result == embedding
+        assert result == pytest.approx(embedding)
 
     @pytest.mark.asyncio
     async def test_get_batch(self, cache: EmbeddingCache) -> None:
@@ -144,8 +185,8 @@ class TestEmbeddingCache:
         await cache.set("text2", embedding2)
 
         results = await cache.get_batch(["text1", "text2", "text3"])
-        assert results["text1"] == embedding1
-        assert results["text2"] == embedding2
+        assert results["text1"] == pytest.approx(embedding1)
+        assert results["text2"] == pytest.approx(embedding2)
         assert results["text3"] is None
 
     @pytest.mark.asyncio
@@ -155,8 +196,37 @@ class TestEmbeddingCache:
         embeddings = [[0.1, 0.2], [0.3, 0.4]]
         await cache.set_batch(texts, embeddings)
 
-        assert await cache.get("text1") == [0.1, 0.2]
-        assert await cache.get("text2") == [0.3, 0.4]
+        assert await cache.get("text1") == pytest.approx([0.1, 0.2])
+        assert await cache.get("text2") == pytest.approx([0.3, 0.4])
+
+    @pytest.mark.asyncio
+    async def test_get_batch_uses_l2_once_and_promotes(self) -> None:
+        """Test that L1 misses are fetched from L2 in one batch and promoted."""
+        l2 = AsyncMock()
+        l2.get_many = AsyncMock(return_value=[[0.5, 0.5], None])
+        cache = EmbeddingCache(l2_cache=l2)
+        await cache.l1.set(cache._generate_key("cached"), [0.1], 3600)
+
+        results = await cache.get_batch(["cached", "in l2", "missing", "in l2"])
+
+        assert results["cached"] == pytest.approx([0.1])
+        assert results["in l2"] == pytest.approx([0.5, 0.5])
+        assert results["missing"] is None
+        l2.get_many.assert_awaited_once_with([cache._generate_key("in l2"), cache._generate_key("missing")])
+        assert await cache.l1.get(cache._generate_key("in l2")) == pytest.approx([0.5, 0.5])
+        stats = cache.get_stats()
+        assert (stats.hits, stats.misses, stats.total_requests) == (3, 1, 4)
+
+    @pytest.mark.asyncio
+    async def test_set_batch_writes_l2_once(self) -> None:
+        """Test that set_batch issues a single batched L2 write."""
+        l2 = AsyncMock()
+        cache = EmbeddingCache(l2_cache=l2)
+
+        await cache.set_batch(["a", "b"], [[0.1], [0.2]])
+
+        l2.set_many.assert_awaited_once()
+        l2.set.assert_not_awaited()
 
     @pytest.mark.asyncio
     async def test_set_batch_length_mismatch(self, cache: EmbeddingCache) -> None:
@@ -185,8 +255,8 @@ class TestEmbeddingCache:
         await cache.set_document_chunks(chunks, embeddings)
         results = await cache.get_document_chunks(chunks)
 
-        assert results[0] == [0.1, 0.2]
-        assert results[1] == [0.3, 0.4]
+        assert results[0] == pytest.approx([0.1, 0.2])
+        assert results[1] == pytest.approx([0.3, 0.4])
 
     def test_get_stats(self, cache: EmbeddingCache) -> None:
         """Test getting cache statistics."""
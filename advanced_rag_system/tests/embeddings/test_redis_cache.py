@@ -1,8 +1,9 @@
 """Tests for RedisCacheBackend with mocked redis.asyncio — no running Redis needed."""
 
 import pickle
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
 
 from src.embeddings.cache import RedisCacheBackend
@@ -135,6 +136,17 @@ class TestSet:
 
         value = [0.1, 0.2]
         await backend.set("k", value, ttl=60)
+        mock_redis_client.setex.assert_awaited_once_with(
+            "test:k", 60, b"\x93F32" + np.asarray(value, dtype="<f4").tobytes()
+        )
+
+    @pytest.mark.asyncio
+    async def test_set_non_vector_is_pickled(self, backend, mock_redis_client):
+        with patch("redis.asyncio.from_url", return_value=mock_redis_client):
+            await backend.initialize()
+
+        value = {"model": "text-embedding-3-small"}
+        await backend.set("k", value, ttl=60)
         mock_redis_client.setex.assert_awaited_once_with("test:k", 60, pickle.dumps(value))
 
     @pytest.mark.asyncio
@@ -160,6 +172,58 @@ class TestSet:
         await backend.set("k", [1.0], ttl=10)
 
 
+# ---------------------------------------------------------------------------
+# Tests: Batch operations
+# ---------------------------------------------------------------------------
+
+
+class TestBatch:
+    @pytest.mark.asyncio
+    async def test_packed_vector_round_trip(self, backend):
+        encoded = backend._encode([0.5, -1.25, 3.0])
+        assert len(encoded) == 4 + 3 * 4
+        assert backend._decode(encoded) == [0.5, -1.25, 3.0]
+
+    @pytest.mark.asyncio
+    async def test_get_many_single_mget(self, backend, mock_redis_client):
+        mock_redis_client.mget = AsyncMock(return_value=[backend._encode([1.0, 2.0]), None, pickle.dumps([3.0])])
+        with patch("redis.asyncio.from_url", return_value=mock_redis_client):
+            await backend.initialize()
+
+        result = await backend.get_many(["a", "b", "c"])
+        assert result == [[1.0, 2.0], None, [3.0]]
+        mock_redis_client.mget.assert_awaited_once_with(["test:a", "test:b", "test:c"])
+
+    @pytest.mark.asyncio
+    async def test_get_many_error_returns_misses(self, backend, mock_redis_client):
+        mock_redis_client.mget = AsyncMock(side_effect=Exception("timeout"))
+        with patch("redis.asyncio.from_url", return_value=mock_redis_client):
+            await backend.initialize()
+
+        assert await backend.get_many(["a", "b"]) == [None, None]
+
+    @pytest.mark.asyncio
+    async def test_set_many_pipelines(self, backend, mock_redis_client):
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[True, True])
+        mock_redis_client.pipeline = MagicMock(return_value=pipe)
+        with patch("redis.asyncio.from_url", return_value=mock_redis_client):
+            await backend.initialize()
+
+        await backend.set_many({"a": [1.0], "b": [2.0]}, ttl=0)
+
+        mock_redis_client.pipeline.assert_called_once_with(transaction=False)
+        assert pipe.setex.call_count == 2
+        pipe.setex.assert_any_call("test:a", 300, backend._encode([1.0]))
+        pipe.execute.assert_awaited_once()
+        mock_redis_client.setex.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_batch_when_unavailable(self, backend):
+        assert await backend.get_many(["a"]) == [None]
+        await backend.set_many({"a": [1.0]})  # Should not raise
+
+
 # ---------------------------------------------------------------------------
 # Tests: DELETE
 # ---------------------------------------------------------------------------
@@ -0,0 +1,185 @@
+"""Tests for the parallel batch evaluation runner."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.evaluation.metrics import (
+    AnswerRelevanceMetric,
+    BaseMetric,
+    BLEUMetric,
+    CompositeMetric,
+    FaithfulnessMetric,
+    RAGEvaluationSample,
+    RetrievedContext,
+    ROUGEMetric,
+)
+from src.evaluation.runner import (
+    EvaluationRunner,
+    EvaluationRunnerConfig,
+    ResultsCache,
+    metric_fingerprint,
+    sample_fingerprint,
+)
+
+
+def _sample(answer: str = "Paris is the capital of France") -> RAGEvaluationSample:
+    return RAGEvaluationSample(
+        query="What is the capital of France?",
+        answer=answer,
+        retrieved_contexts=[RetrievedContext(content="Paris is the capital city of France.", doc_id="d1", score=0.9)],
+        ground_truth_answer="The capital of France is Paris",
+    )
+
+
+class _CountingEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, text):
+        self.calls.append(text)
+        return [float(len(text)), 1.0, 0.5]
+
+
+class _ConcurrencyProbe(BaseMetric):
+    def __init__(self):
+        super().__init__("probe")
+        self.active = 0
+        self.peak = 0
+
+    async def compute(self, sample, **kwargs):
+        from src.evaluation.metrics import MetricResult
+
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0)
+        self.active -= 1
+        return MetricResult(metric_name=self.name, score=1.0)
+
+
+class TestEvaluationRunner:
+    @pytest.mark.asyncio
+    async def test_matches_sequential_compute_batch(self):
+        samples = [_sample(), _sample("Lyon is a city in France"), _sample("")]
+        metrics = [BLEUMetric(), ROUGEMetric(n=1), FaithfulnessMetric()]
+
+        runner = EvaluationRunner(metrics, config=EvaluationRunnerConfig(cache_results=False))
+        batches = await runner.run(samples)
+
+        for metric in [BLEUMetric(), ROUGEMetric(n=1), FaithfulnessMetric()]:
+            expected = await metric.compute_batch(samples)
+            assert batches[metric.name].scores == pytest.approx(expected.scores)
+            assert batches[metric.name].aggregate_score == pytest.approx(expected.aggregate_score)
+
+    @pytest.mark.asyncio
+    async def test_embeddings_shared_across_metrics(self):
+        embedder = _CountingEmbedder()
+        metrics = [
+            AnswerRelevanceMetric(embedding_fn=embedder),
+            AnswerRelevanceMetric(embedding_fn=embedder, semantic_weight=0.8),
+        ]
+        metrics[1].name = "answer_relevance_semantic"
+
+        runner = EvaluationRunner(metrics)
+        await runner.run([_sample(), _sample()])
+
+        # One query + one answer, embedded once despite 2 metrics x 2 samples
+        assert sorted(embedder.calls) == sorted(["what is the capital of france?", "paris is the capital of france"])
+        assert runner.get_stats()["embeddings"]["hits"] > 0
+
+    @pytest.mark.asyncio
+    async def test_same_bound_method_shares_one_memo(self):
+        class Embedder:
+            def __init__(self):
+                self.calls = []
+
+            async def embed(self, text):
+                self.calls.append(text)
+                return [float(len(text)), 1.0, 0.5]
+
+        embedder = Embedder()
+        # Each attribute access creates a new bound-method object
+        metrics = [
+            AnswerRelevanceMetric(embedding_fn=embedder.embed),
+            AnswerRelevanceMetric(embedding_fn=embedder.embed, semantic_weight=0.8),
+        ]
+        metrics[1].name = "answer_relevance_semantic"
+
+        runner = EvaluationRunner(metrics, config=EvaluationRunnerConfig(cache_results=False))
+        await runner.run([_sample(), _sample()])
+
+        assert sorted(embedder.calls) == sorted(["what is the capital of france?", "paris is the capital of france"])
+
+    @pytest.mark.asyncio
+    async def test_embedding_fn_restored_and_memo_released_after_run(self):
+        embedder = _CountingEmbedder()
+        metric = AnswerRelevanceMetric(embedding_fn=embedder)
+
+        runner = EvaluationRunner([metric], config=EvaluationRunnerConfig(cache_results=False))
+        await runner.run([_sample()])
+        assert metric.embedding_fn is embedder
+
+        # The memo lives for one run only, so a second run embeds again
+        await runner.run([_sample()])
+        assert len(embedder.calls) == 4
+        assert runner.get_stats()["embeddings"]["calls"] == 4
+
+    @pytest.mark.asyncio
+    async def test_results_cache_skips_known_samples(self, tmp_path):
+        cache_path = str(tmp_path / "results.json")
+        samples = [_sample(), _sample("Lyon is a city in France")]
+
+        runner = EvaluationRunner([BLEUMetric()], config=EvaluationRunnerConfig(cache_path=cache_path))
+        first = await runner.run(samples)
+        runner.close()
+
+        rerun = EvaluationRunner([BLEUMetric()], config=EvaluationRunnerConfig(cache_path=cache_path))
+        second = await rerun.run(samples)
+
+        assert second["bleu"].scores == first["bleu"].scores
+        assert rerun.get_stats()["results_cache"]["hits"] == 2
+        assert rerun.get_stats()["results_cache"]["misses"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cpu_metrics_use_executor_chunks(self):
+        samples = [_sample(f"Paris answer {i}") for i in range(5)]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            runner = EvaluationRunner(
+                [ROUGEMetric(n=2)],
+                config=EvaluationRunnerConfig(process_chunk_size=2, cache_results=False),
+                executor=executor,
+            )
+            batches = await runner.run(samples)
+
+        expected = await ROUGEMetric(n=2).compute_batch(samples)
+        assert batches["rouge_2"].scores == pytest.approx(expected.scores)
+
+    def test_duplicate_metric_names_rejected(self):
+        with pytest.raises(ValueError):
+            EvaluationRunner([BLEUMetric(), BLEUMetric()])
+
+    def test_fingerprints(self):
+        assert sample_fingerprint(_sample()) == sample_fingerprint(_sample())
+        assert sample_fingerprint(_sample()) != sample_fingerprint(_sample("other"))
+        assert metric_fingerprint(ROUGEMetric(n=1)) != metric_fingerprint(ROUGEMetric(n=1, use_stemming=True))
+
+    def test_results_cache_round_trip(self, tmp_path):
+        from src.evaluation.metrics import MetricResult
+
+        cache = ResultsCache(str(tmp_path / "c.json"))
+        cache.set("m", "h", MetricResult(metric_name="m", score=0.25))
+        cache.save()
+
+        assert ResultsCache(str(tmp_path / "c.json")).get("m", "h").score == 0.25
+
+
+class TestCompositeMetric:
+    @pytest.mark.asyncio
+    async def test_compute_batch_bounds_concurrency(self):
+        probe = _ConcurrencyProbe()
+        composite = CompositeMetric([(probe, 1.0)], max_concurrency=3)
+
+        batch = await composite.compute_batch([_sample() for _ in range(10)])
+
+        assert batch.scores == [1.0] * 10
+        assert probe.peak == 3
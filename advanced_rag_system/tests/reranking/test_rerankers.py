@@ -1,12 +1,16 @@
 """Tests for re-ranking components: MockReRanker, BaseReRanker utilities,
-CrossEncoderReRanker, and CohereReRanker.
+CrossEncoderReRanker, CohereReRanker, and CascadeReRanker.
 """
 
+import asyncio
+import threading
 from typing import List
+from unittest.mock import MagicMock, patch
 from uuid import uuid4
 
 import pytest
 
+from src.core.exceptions import RetrievalError
 from src.core.types import DocumentChunk, SearchResult
 from src.reranking.base import (
     MockReRanker,
@@ -14,6 +18,7 @@ from src.reranking.base import (
     ReRankingResult,
     ReRankingStrategy,
 )
+from src.reranking.cascade import CascadeConfig, CascadeReRanker
 from src.reranking.cohere_reranker import CohereConfig, CohereReRanker
 from src.reranking.cross_encoder import CrossEncoderReRanker
 
@@ -255,6 +260,134 @@ class TestCrossEncoderReRanker:
         assert ranker.batch_size_recommendation(100) <= 100
 
 
+class TestCrossEncoderScoring:
+    """Score cache, per-request dedupe and micro-batching with a mocked model."""
+
+    @staticmethod
+    def _ranker(**kwargs) -> CrossEncoderReRanker:
+        ranker = CrossEncoderReRanker(device="cpu", **kwargs)
+        ranker.model = MagicMock()
+        ranker.model.predict = MagicMock(side_effect=lambda pairs, **_: [float(len(p[1])) / 10 for p in pairs])
+        ranker._initialized = True
+        return ranker
+
+    @pytest.mark.asyncio
+    async def test_repeat_query_served_from_cache(self, sample_results):
+        ranker = self._ranker()
+        with patch("src.reranking.cross_encoder.SENTENCE_TRANSFORMERS_AVAILABLE", True):
+            first = await ranker._score_pairs("python", sample_results)
+            second = await ranker._score_pairs("python", sample_results)
+
+        assert first == second
+        assert ranker.model.predict.call_count == 1
+        stats = ranker.get_stats()["scoring"]
+        assert stats["cache_hits"] == 3
+        assert stats["score_cache_entries"] == 3
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded(self, sample_results):
+        ranker = self._ranker(score_cache_size=2)
+        with patch("src.reranking.cross_encoder.SENTENCE_TRANSFORMERS_AVAILABLE", True):
+            await ranker._score_pairs("python", sample_results)
+        assert len(ranker._score_cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_identical_texts_scored_once(self):
+        doc_id = uuid4()
+        results = [
+            SearchResult(
+                chunk=DocumentChunk(document_id=doc_id, content="same text", index=i),
+                score=0.5,
+                rank=i + 1,
+                distance=0.5,
+            )
+            for i in range(4)
+        ]
+        ranker = self._ranker()
+        with patch("src.reranking.cross_encoder.SENTENCE_TRANSFORMERS_AVAILABLE", True):
+            scores = await ranker._score_pairs("q", results)
+
+        assert len(set(scores)) == 1
+        (pairs,), _ = ranker.model.predict.call_args
+        assert pairs == [["q", "same text"]]
+        assert ranker.get_stats()["scoring"]["deduplicated_pairs"] == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_forward_pass(self, sample_results):
+        ranker = self._ranker(coalesce_window_ms=20)
+        with patch("src.reranking.cross_encoder.SENTENCE_TRANSFORMERS_AVAILABLE", True):
+            first, second = await asyncio.gather(
+                ranker._score_pairs("python", sample_results),
+                ranker._score_pairs("databases", sample_results),
+            )
+
+        assert ranker.model.predict.call_count == 1
+        assert len(ranker.model.predict.call_args[0][0]) == 6
+        assert len(first) == len(second) == 3
+        assert ranker.get_stats()["scoring"]["coalesced_requests"] == 2
+
+    @pytest.mark.asyncio
+    async def test_max_coalesced_pairs_splits_passes(self, sample_results):
+        ranker = self._ranker(coalesce_window_ms=20, max_coalesced_pairs=3)
+        with patch("src.reranking.cross_encoder.SENTENCE_TRANSFORMERS_AVAILABLE", True):
+            await asyncio.gather(
+                ranker._score_pairs("python", sample_results),
+                ranker._score_pairs("databases", sample_results),
+            )
+        assert ranker.model.predict.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_pass_is_neutral_and_not_cached(self, sample_results):
+        ranker = self._ranker()
+        ranker.model.predict = MagicMock(side_effect=RuntimeError("model error"))
+        with patch("src.reranking.cross_encoder.SENTENCE_TRANSFORMERS_AVAILABLE", True):
+            with pytest.warns(UserWarning, match="Batch scoring failed"):
+                scores = await ranker._score_pairs("python", sample_results)
+
+        assert scores == [0.5, 0.5, 0.5]
+        assert len(ranker._score_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_close_fails_in_flight_batch(self):
+        ranker = self._ranker(coalesce_window_ms=0)
+        started, release = threading.Event(), threading.Event()
+
+        def _blocking_predict(pairs, **_):
+            started.set()
+            release.wait(5)
+            return [0.0] * len(pairs)
+
+        ranker.model.predict = MagicMock(side_effect=_blocking_predict)
+        pending = asyncio.ensure_future(ranker._submit_pairs([["q", "doc"]]))
+        await asyncio.to_thread(started.wait, 5)
+
+        await ranker.close()
+        with pytest.raises(RetrievalError, match="closed before scoring completed"):
+            await asyncio.wait_for(pending, timeout=1)
+        release.set()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_drain_does_not_clear_its_replacement(self):
+        ranker = self._ranker(coalesce_window_ms=50)
+        before = asyncio.ensure_future(ranker._submit_pairs([["q", "doc"]]))
+        await asyncio.sleep(0.01)  # let the drain task start its coalescing window
+        cancelled = ranker._flush_task
+
+        # A request queued in the same tick as close() starts the replacement
+        # drain before the cancelled one unwinds
+        after = asyncio.ensure_future(ranker._submit_pairs([["q", "doc"]]))
+        await ranker.close()
+        ranker.model = self._ranker().model
+        await asyncio.sleep(0)
+        replacement = ranker._flush_task
+        await asyncio.gather(cancelled, return_exceptions=True)
+
+        assert replacement is not None and ranker._flush_task is replacement
+        assert len(await asyncio.wait_for(after, timeout=1)) == 1
+        with pytest.raises(RetrievalError, match="closed before scoring completed"):
+            await before
+
+
 # ===========================================================================
 # CohereReRanker tests (fallback mode — no cohere package)
 # ===========================================================================
@@ -327,3 +460,153 @@ class TestCohereReRanker:
         assert cost["search_units"] == 1000
         assert cost["estimated_cost_usd"] > 0
         assert "currency" in cost
+
+
+# ===========================================================================
+# CascadeReRanker tests
+# ===========================================================================
+
+
+def _candidates(n: int) -> List[SearchResult]:
+    doc_id = uuid4()
+    return [
+        SearchResult(
+            chunk=DocumentChunk(document_id=doc_id, content=f"candidate number {i} text", index=i),
+            score=1.0 - i / n,
+            rank=i + 1,
+            distance=i / n,
+        )
+        for i in range(n)
+    ]
+
+
+class _SlowReRanker(MockReRanker):
+    async def rerank(self, query, results):
+        await asyncio.sleep(0.2)
+        return await super().rerank(query, results)
+
+
+class TestCascadeReRanker:
+    @pytest.mark.asyncio
+    async def test_only_survivors_reach_second_stage(self):
+        inner = MockReRanker()
+        inner.rerank = MagicMock(wraps=inner.rerank)
+        ranker = CascadeReRanker(inner, CascadeConfig(survivors=10))
+        await ranker.initialize()
+
+        candidates = _candidates(100)
+        result = await ranker.rerank("candidate 3", candidates)
+
+        (_, survivors), _ = inner.rerank.call_args
+        assert len(survivors) == 10
+        assert result.reranked_count == 10
+        assert len(result.results) == 100
+        assert [r.rank for r in result.results] == list(range(1, 101))
+        assert {r.chunk.id for r in result.results} == {c.chunk.id for c in candidates}
+
+    @pytest.mark.asyncio
+    async def test_prefilter_prefers_lexical_matches(self):
+        candidates = _candidates(30)
+        doc_id = uuid4()
+        match = SearchResult(
+            chunk=DocumentChunk(document_id=doc_id, content="zoning permit rules", index=0),
+            score=0.05,
+            rank=31,
+            distance=0.9,
+        )
+        ranker = CascadeReRanker(
+            MockReRanker(),
+            CascadeConfig(survivors=5, retrieval_weight=0.1, lexical_weight=0.9, similarity_weight=0.0),
+        )
+        await ranker.initialize()
+
+        result = await ranker.rerank("zoning permit", candidates + [match])
+        assert match.chunk.id in {r.chunk.id for r in result.results[:5]}
+
+    @pytest.mark.asyncio
+    async def test_rerank_budget_falls_back_to_prefilter_order(self):
+        ranker = CascadeReRanker(_SlowReRanker(), CascadeConfig(survivors=5, rerank_budget_ms=10))
+        await ranker.initialize()
+
+        result = await ranker.rerank("candidate", _candidates(20))
+
+        assert result.reranked_count == 0
+        assert result.scores_changed is False
+        assert len(result.results) == 20
+        assert ranker.get_stats()["cascade"]["rerank_timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_recall_telemetry_sampled(self):
+        ranker = CascadeReRanker(MockReRanker(), CascadeConfig(survivors=10, recall_sample_rate=1.0, recall_k=5))
+        await ranker.initialize()
+
+        await ranker.rerank("candidate number", _candidates(40))
+        await asyncio.gather(*ranker._recall_tasks)
+
+        stats = ranker.get_stats()["cascade"]
+        assert stats["recall_samples"] == 1
+        assert 0.0 <= stats["mean_recall_at_k"] <= 1.0
+        assert stats["rerank_fraction"] == pytest.approx(0.25)
+
+    @pytest.mark.asyncio
+    async def test_recall_measurement_runs_off_request_path(self):
+        class _SlowFullReRanker(MockReRanker):
+            async def rerank(self, query, results):
+                if len(results) > 10:
+                    await asyncio.sleep(0.5)
+                return await super().rerank(query, results)
+
+        ranker = CascadeReRanker(_SlowFullReRanker(), CascadeConfig(survivors=10, recall_sample_rate=1.0))
+        await ranker.initialize()
+
+        result = await asyncio.wait_for(ranker.rerank("candidate", _candidates(40)), timeout=0.25)
+
+        assert result.reranked_count == 10
+        assert len(ranker._recall_tasks) == 1
+        await ranker.close()
+        assert ranker.get_stats()["cascade"]["recall_samples"] == 0
+
+    @pytest.mark.asyncio
+    async def test_prefilter_ignores_retrieval_score_scale(self):
+        ranker = CascadeReRanker(MockReRanker(), CascadeConfig(survivors=5))
+        candidates = _candidates(20)
+        rrf_scaled = [
+            SearchResult(chunk=c.chunk, score=c.score * 0.03, rank=c.rank, distance=c.distance) for c in candidates
+        ]
+
+        assert ranker._prefilter_scores("candidate 7", rrf_scaled) == pytest.approx(
+            ranker._prefilter_scores("candidate 7", candidates)
+        )
+
+    def test_prefilter_budget_drops_lexical_signal(self):
+        ranker = CascadeReRanker(MockReRanker(), CascadeConfig(prefilter_budget_ms=0.0))
+        candidates = _candidates(20)
+
+        scores = ranker._prefilter_scores("candidate 7", candidates, start_time=0.0)
+        cfg = ranker.cascade_config
+        expected = [cfg.retrieval_weight * (1.0 - i / 19) + cfg.similarity_weight * (1.0 - i / 20) for i in range(20)]
+
+        assert scores == pytest.approx(expected)
+        assert ranker.get_stats()["cascade"]["lexical_skipped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_not_initialized_raises(self, sample_results):
+        from src.core.exceptions import RetrievalError
+
+        ranker = CascadeReRanker(MockReRanker())
+        with pytest.raises(RetrievalError, match="not initialized"):
+            await ranker.rerank("test", sample_results)
+
+    @pytest.mark.asyncio
+    async def test_empty_and_lifecycle(self):
+        inner = MockReRanker()
+        ranker = CascadeReRanker(inner)
+        await ranker.initialize()
+        assert inner._initialized is True
+
+        result = await ranker.rerank("q", [])
+        assert result.results == []
+        assert ranker.get_model_info()["stage_two"]["name"] == "MockReRanker"
+
+        await ranker.close()
+        assert inner._initialized is False
@@ -3,6 +3,7 @@
 from typing import List
 from uuid import uuid4
 
+import numpy as np
 import pytest
 
 from src.core.types import DocumentChunk, SearchResult
@@ -121,6 +122,79 @@ class TestTokenCounter:
         assert counts[2] == 2  # 1 word
 
 
+class _CharTokenizer:
+    """Deterministic stand-in for an exact tokenizer: one token per character."""
+
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, text):
+        return list(text)
+
+    def encode_batch(self, texts):
+        self.batches.append(list(texts))
+        return [list(t) for t in texts]
+
+
+class TestExactTokenCounter:
+    """Test cases for the tokenizer-backed TokenCounter."""
+
+    def test_counts_come_from_tokenizer(self):
+        """Exact counts replace the word approximation."""
+        counter = TokenCounter(tokenizer=_CharTokenizer())
+
+        assert counter.is_exact
+        assert counter.count("Hello world") == 11
+        assert counter.count_batch(["ab", "abc", ""]) == [2, 3, 0]
+
+    def test_count_batch_single_call_and_dedupe(self):
+        """Misses are deduplicated and encoded in one batch call."""
+        tokenizer = _CharTokenizer()
+        counter = TokenCounter(tokenizer=tokenizer)
+
+        counts = counter.count_batch(["aa", "bbb", "aa"])
+
+        assert counts == [2, 3, 2]
+        assert tokenizer.batches == [["aa", "bbb"]]
+
+    def test_lru_cache_hits_and_bound(self):
+        """Cached counts are reused and the cache stays bounded."""
+        tokenizer = _CharTokenizer()
+        counter = TokenCounter(tokenizer=tokenizer, cache_size=2)
+
+        counter.count_batch(["a", "bb"])
+        counter.count("a")
+        assert len(tokenizer.batches) == 1
+
+        counter.count("ccc")  # evicts "bb"
+        counter.count("bb")
+        assert tokenizer.batches[-1] == ["bb"]
+
+        stats = counter.get_stats()
+        assert stats["cache_size"] == 2
+        assert stats["cache_hits"] == 1
+        assert stats["cache_misses"] == 4
+
+    def test_encode_fallback_without_batch(self):
+        """Tokenizers without encode_batch are called per text."""
+
+        class _Simple:
+            def encode(self, text):
+                return text.split()
+
+        counter = TokenCounter(tokenizer=_Simple())
+        assert counter.count_batch(["one two", "three"]) == [2, 1]
+
+    def test_compressor_shares_counter(self):
+        """The contextual compressor threads one counter through every stage."""
+        counter = TokenCounter(tokenizer=_CharTokenizer())
+        compressor = ContextualCompressor(token_counter=counter)
+
+        assert compressor.extractive.token_counter is counter
+        assert compressor.abstractive.token_counter is counter
+        assert compressor.budget_manager.token_counter is counter
+
+
 # ============================================================================
 # RelevanceScorer Tests
 # ============================================================================
@@ -322,6 +396,84 @@ class TestExtractiveCompressor:
         assert first_pos < third_pos
 
 
+class TestBatchedExtractiveCompression:
+    """Test cases for the batched extractive path."""
+
+    def test_score_batch_splits_once(self, extractive_compressor, sample_documents):
+        """Sentence arrays line up with document offsets."""
+        batch = extractive_compressor.score_batch(sample_documents, "python syntax")
+
+        assert batch.doc_offsets.tolist() == [0, 3, 6, 9]
+        assert len(batch.sentences) == len(batch.scores) == len(batch.token_counts) == 9
+        assert batch.scores[2] == pytest.approx(1.0)  # "Python has a simple syntax"
+        assert batch.scores[3] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_document_scores_match_scorer(self, extractive_compressor, relevance_scorer, sample_documents):
+        """Batched document scores equal the per-document keyword scores."""
+        query = "python is easy"
+        batch = extractive_compressor.score_batch(sample_documents, query)
+        expected = await relevance_scorer.score_documents(sample_documents, query, ScoringMethod.KEYWORD)
+
+        assert batch.document_scores.tolist() == pytest.approx([s.overall_score for s in expected])
+        for relevance, exp in zip(batch.relevance_scores(sample_documents), expected):
+            assert [seg for seg, _ in relevance.segment_scores] == [seg for seg, _ in exp.segment_scores]
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_single_compression(self, extractive_compressor, relevance_scorer, sample_documents):
+        """Batched compression selects the same sentences as per-document compression."""
+        query = "python learn"
+        batch = extractive_compressor.score_batch(sample_documents, query)
+        batched = await extractive_compressor.compress_batch(sample_documents, batch, [12, 12, 12])
+
+        for doc, compressed in zip(sample_documents, batched):
+            relevance = await relevance_scorer.score_document(doc, query)
+            single = await extractive_compressor.compress(doc, relevance, 12)
+            assert compressed.content == single.content
+            assert compressed.preserved_segments == single.preserved_segments
+            assert compressed.token_count <= 12
+
+    @pytest.mark.asyncio
+    async def test_compress_batch_threshold(self, extractive_compressor, sample_documents):
+        """Documents below the relevance threshold are skipped."""
+        batch = extractive_compressor.score_batch(sample_documents, "javascript browsers")
+        compressed = await extractive_compressor.compress_batch(
+            sample_documents, batch, [100, 100, 100], relevance_threshold=0.5
+        )
+
+        assert [c.original_id for c in compressed] == [sample_documents[1].id]
+
+    def test_sentence_encoder_scores(self, token_counter, sample_documents):
+        """A sentence encoder is called once for the query and all sentences."""
+        calls = []
+
+        def encoder(texts):
+            calls.append(len(texts))
+            return np.array([[1.0, 0.0] if "python" in t.lower() else [0.0, 1.0] for t in texts])
+
+        compressor = ExtractiveCompressor(token_counter=token_counter, sentence_encoder=encoder)
+        batch = compressor.score_batch(sample_documents, "python")
+
+        assert calls == [10]
+        assert batch.method == ScoringMethod.EMBEDDING
+        assert batch.scores[:3].tolist() == pytest.approx([1.0, 0.0, 1.0])
+
+    @pytest.mark.asyncio
+    async def test_contextual_compressor_batch_matches_sequential(self, sample_documents):
+        """The batched pipeline reports the same totals as the sequential one."""
+        batched = ContextualCompressor(config=CompressionConfig(token_budget=500, min_relevance_threshold=0.0))
+        sequential = ContextualCompressor(
+            config=CompressionConfig(token_budget=500, min_relevance_threshold=0.0, batch_scoring=False)
+        )
+
+        a = await batched.compress(sample_documents, "python programming")
+        b = await sequential.compress(sample_documents, "python programming")
+
+        assert [d.content for d in a.compressed_documents] == [d.content for d in b.compressed_documents]
+        assert a.compressed_token_count == b.compressed_token_count
+        assert a.original_token_count == b.original_token_count
+
+
 # ============================================================================
 # AbstractiveCompressor Tests
 # ============================================================================
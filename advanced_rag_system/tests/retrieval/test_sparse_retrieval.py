@@ -7,6 +7,7 @@ including document indexing, search ranking, and performance benchmarks.
 from typing import List
 from uuid import uuid4
 
+import numpy as np
 import pytest
 
 from src.core.types import DocumentChunk, Metadata, SearchResult
@@ -222,6 +223,193 @@ class TestBM25Index:
         assert len(results) > 0
 
 
+class TestBM25IncrementalIndex:
+    """Tests for incremental add/delete on the inverted index."""
+
+    @staticmethod
+    def _chunks(texts: List[str]) -> List[DocumentChunk]:
+        doc_id = uuid4()
+        return [DocumentChunk(document_id=doc_id, content=text, index=i) for i, text in enumerate(texts)]
+
+    @pytest.fixture
+    def corpus_texts(self) -> List[str]:
+        return [
+            "Spacious ranch home with pool and large backyard in Austin",
+            "Downtown condo with rooftop pool and gym access",
+            "Family home near top rated schools with large garage",
+            "Pool house with guest suite and outdoor kitchen",
+            "Modern townhouse close to downtown shopping and dining",
+            "Historic bungalow with original hardwood floors",
+        ]
+
+    def test_scores_match_rank_bm25(self, corpus_texts: List[str]):
+        """Incrementally built scores equal a full BM25Okapi build."""
+        rank_bm25 = pytest.importorskip("rank_bm25")
+        chunks = self._chunks(corpus_texts)
+        index = BM25Index()
+        for chunk in chunks:
+            index.add_documents([chunk])
+
+        query_tokens = index.preprocessor.preprocess("pool home downtown pool")
+        reference = rank_bm25.BM25Okapi(index.get_corpus(), k1=1.5, b=0.75).get_scores(query_tokens)
+
+        slots, scores = index._score_postings(query_tokens)
+        dense = [0.0] * len(chunks)
+        for slot, score in zip(slots.tolist(), scores.tolist()):
+            dense[slot] = score
+        assert dense == pytest.approx(list(reference))
+
+    def test_delete_documents(self, corpus_texts: List[str]):
+        """Deleted documents disappear from results and counts."""
+        chunks = self._chunks(corpus_texts)
+        index = BM25Index()
+        index.add_documents(chunks)
+
+        assert index.delete_documents([chunks[1].id, uuid4()]) == 1
+        assert index.document_count == 5
+        assert index.get_document_by_id(chunks[1].id) is None
+        assert all(r.chunk.id != chunks[1].id for r in index.search("rooftop pool gym"))
+
+    def test_delete_matches_fresh_index(self, corpus_texts: List[str]):
+        """Scores after a delete equal an index built without the document."""
+        chunks = self._chunks(corpus_texts)
+        index = BM25Index()
+        index.add_documents(chunks)
+        index.delete_documents([chunks[0].id])
+
+        fresh = BM25Index()
+        fresh.add_documents(chunks[1:])
+
+        actual = [(r.chunk.id, r.score) for r in index.search("pool home")]
+        expected = [(r.chunk.id, r.score) for r in fresh.search("pool home")]
+        assert [cid for cid, _ in actual] == [cid for cid, _ in expected]
+        assert [s for _, s in actual] == pytest.approx([s for _, s in expected])
+
+    def test_readding_replaces_document(self, corpus_texts: List[str]):
+        """Adding an existing chunk id replaces the indexed content."""
+        chunks = self._chunks(corpus_texts)
+        index = BM25Index()
+        index.add_documents(chunks)
+
+        updated = chunks[5].model_copy(update={"content": "Lakefront cabin with private dock"})
+        index.add_documents([updated])
+
+        assert index.document_count == 6
+        assert index.search("lakefront dock")[0].chunk.id == chunks[5].id
+        assert index.search("historic bungalow hardwood") == []
+
+    def test_compaction_preserves_results(self, corpus_texts: List[str], monkeypatch):
+        """Compaction purges tombstones without changing results."""
+        monkeypatch.setattr(BM25Index, "_COMPACTION_MIN_SLOTS", 4)
+        chunks = self._chunks(corpus_texts)
+        index = BM25Index()
+        index.add_documents(chunks)
+        index.delete_documents([chunks[0].id, chunks[2].id])
+
+        fresh = BM25Index()
+        fresh.add_documents([c for i, c in enumerate(chunks) if i not in (0, 2)])
+
+        assert index._tombstones == 0
+        assert index.get_corpus() == fresh.get_corpus()
+        assert [r.chunk.id for r in index.search("pool downtown")] == [
+            r.chunk.id for r in fresh.search("pool downtown")
+        ]
+
+
+class TestBM25Pruning:
+    """Tests for MaxScore pruning and top-k selection."""
+
+    @pytest.fixture
+    def synthetic_chunks(self) -> List[DocumentChunk]:
+        """Zipf-distributed vocabulary so common terms have low impact."""
+        import random
+
+        rng = random.Random(7)
+        vocab = [f"term{chr(97 + i // 26)}{chr(97 + i % 26)}" for i in range(300)]
+        weights = [1.0 / (rank + 1) for rank in range(len(vocab))]
+        doc_id = uuid4()
+        return [
+            DocumentChunk(
+                document_id=doc_id,
+                content=" ".join(rng.choices(vocab, weights=weights, k=rng.randint(5, 40))),
+                index=i,
+            )
+            for i in range(600)
+        ]
+
+    @pytest.mark.parametrize("top_k", [1, 5, 20])
+    def test_pruned_top_k_matches_exhaustive(self, synthetic_chunks: List[DocumentChunk], top_k: int):
+        exhaustive = BM25Index(BM25Config(remove_stopwords=False))
+        pruned = BM25Index(BM25Config(remove_stopwords=False, enable_pruning=True))
+        exhaustive.add_documents(synthetic_chunks)
+        pruned.add_documents(synthetic_chunks)
+
+        for query in ["termaa termab termkz", "termba termaa", "termlm termaa termac termaz"]:
+            tokens = exhaustive.preprocessor.preprocess(query)
+            slots, scores = exhaustive._score_postings(tokens)
+            expected = sorted(scores.tolist(), reverse=True)[:top_k]
+
+            p_slots, p_scores = pruned._score_pruned(tokens, top_k)
+            assert sorted(p_scores.tolist(), reverse=True)[:top_k] == pytest.approx(expected)
+            assert [r.chunk.id for r in pruned.search(query, top_k=top_k)][:1] == [
+                r.chunk.id for r in exhaustive.search(query, top_k=top_k)
+            ][:1]
+
+    @pytest.mark.parametrize("top_k", [1, 2, 5])
+    def test_pruned_top_k_matches_exhaustive_with_negative_weights(self, top_k: int):
+        """Most terms are in over half the documents, so the IDF floor is negative."""
+        texts = [
+            "alpha gamma omega beta",
+            "beta gamma delta omega omega gamma",
+            "alpha beta gamma delta omega gamma alpha",
+            "alpha beta alpha omega",
+            "beta delta",
+            "alpha gamma delta",
+            "alpha beta gamma alpha omega omega",
+            "beta gamma delta omega omega gamma",
+            "beta gamma delta beta beta alpha",
+            "beta delta omega omega",
+        ]
+        doc_id = uuid4()
+        chunks = [DocumentChunk(document_id=doc_id, content=text, index=i) for i, text in enumerate(texts)]
+        exhaustive = BM25Index(BM25Config(remove_stopwords=False))
+        pruned = BM25Index(BM25Config(remove_stopwords=False, enable_pruning=True))
+        exhaustive.add_documents(chunks)
+        pruned.add_documents(chunks)
+
+        for query in ["alpha omega", "beta gamma omega", "alpha beta gamma delta omega"]:
+            tokens = exhaustive.preprocessor.preprocess(query)
+            assert min(pruned._query_weights(tokens).values()) < 0
+            _, scores = exhaustive._score_postings(tokens)
+            expected = sorted(scores.tolist(), reverse=True)[:top_k]
+
+            _, p_scores = pruned._score_pruned(tokens, top_k)
+            assert sorted(p_scores.tolist(), reverse=True)[:top_k] == pytest.approx(expected)
+
+    def test_pruning_skips_documents(self, synthetic_chunks: List[DocumentChunk]):
+        index = BM25Index(BM25Config(remove_stopwords=False, enable_pruning=True))
+        index.add_documents(synthetic_chunks)
+
+        tokens = index.preprocessor.preprocess("termlm termaa")
+        all_slots, _ = index._score_postings(tokens)
+        pruned_slots, _ = index._score_pruned(tokens, 3)
+        assert len(pruned_slots) < len(all_slots)
+
+    def test_pruning_respects_deletes(self, synthetic_chunks: List[DocumentChunk]):
+        index = BM25Index(BM25Config(remove_stopwords=False, enable_pruning=True))
+        index.add_documents(synthetic_chunks)
+        top = index.search("termlm termaa", top_k=1)[0].chunk.id
+
+        index.delete_documents([top])
+        assert all(r.chunk.id != top for r in index.search("termlm termaa", top_k=10))
+
+    def test_top_k_order_breaks_ties_by_slot(self):
+        slots = np.array([4, 1, 3, 2])
+        scores = np.array([1.0, 2.0, 2.0, 0.5])
+        order = BM25Index._top_k_order(slots, scores, 3)
+        assert slots[order].tolist() == [1, 3, 4]
+
+
 class TestBM25Integration:
     """Integration tests for BM25 with other components."""
 
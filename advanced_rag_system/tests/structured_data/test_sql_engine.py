@@ -0,0 +1,169 @@
+"""Tests for the SQL query engine.
+
+Tests cover:
+- Parity between the persistent connection and short-lived connections
+- Date, timestamp and decimal parameters bound natively by DuckDB
+- Prepared-statement cache for repeated queries, LRU eviction and DEALLOCATE
+  on catalog change
+- Streaming results as Arrow record batches
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pyarrow")
+
+from src.core.exceptions import ValidationError
+from src.structured_data.sql_engine import SQLQueryEngine
+
+
+@pytest.fixture
+def listings() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": list(range(1, 7)),
+            "city": ["Austin", "Dallas", "Austin", "Houston", "Austin", "Dallas"],
+            "price": [350000.0, 420000.0, 515000.5, 289000.0, 610000.0, 455000.0],
+            "listed": pd.to_datetime(
+                ["2026-01-05", "2026-02-10", "2026-03-15", "2026-04-20", "2026-05-25", "2026-06-30"]
+            ),
+        }
+    )
+
+
+@pytest.fixture
+def engine(listings: pd.DataFrame):
+    engine = SQLQueryEngine()
+    engine.register_table("listings", listings)
+    yield engine
+    engine.close()
+
+
+def _statement_exists(engine: SQLQueryEngine, statement: str) -> bool:
+    try:
+        engine._con.execute(f"EXECUTE {statement}")
+    except Exception as e:
+        return "not found" not in str(e).lower() and "does not exist" not in str(e).lower()
+    return True
+
+
+class TestPreparedParameters:
+    @pytest.mark.parametrize(
+        "sql, params",
+        [
+            ("SELECT id FROM listings WHERE listed >= ? ORDER BY id", [date(2026, 3, 1)]),
+            ("SELECT id FROM listings WHERE listed < ? ORDER BY id", [datetime(2026, 4, 1, 12, 30)]),
+            ("SELECT id FROM listings WHERE price > ? ORDER BY id", [Decimal("420000.25")]),
+            ("SELECT id FROM listings WHERE city = ? AND price < ? ORDER BY id", ["Austin", 600000]),
+            ("SELECT id FROM listings WHERE city = ? ORDER BY id", ["O'Neil"]),
+        ],
+    )
+    def test_matches_short_lived_connection(self, listings: pd.DataFrame, sql, params):
+        persistent = SQLQueryEngine()
+        short_lived = SQLQueryEngine(persistent_connection=False)
+        for engine in (persistent, short_lived):
+            engine.register_table("listings", listings)
+
+        expected = short_lived.execute_query(sql, params=params).data
+        actual = persistent.execute_query(sql, params=params).data
+        persistent.close()
+
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_timezone_aware_timestamp(self, engine: SQLQueryEngine):
+        cutoff = datetime(2026, 2, 1, tzinfo=timezone.utc)
+        result = engine.execute_query("SELECT COUNT(*) AS n FROM listings WHERE listed::TIMESTAMPTZ > ?", [cutoff])
+
+        assert result.data["n"].iloc[0] == 5
+
+    def test_list_parameter(self, engine: SQLQueryEngine):
+        result = engine.execute_query("SELECT id FROM listings WHERE list_contains(?, id) ORDER BY id", [[2, 4]])
+
+        assert result.data["id"].tolist() == [2, 4]
+
+    def test_parameters_are_bound_not_prepared(self, engine: SQLQueryEngine):
+        sql = "SELECT id FROM listings WHERE price > ? ORDER BY id"
+
+        first = engine.execute_query(sql, [400000]).data["id"].tolist()
+        second = engine.execute_query(sql, [500000]).data["id"].tolist()
+
+        assert first == [2, 3, 5, 6]
+        assert second == [3, 5]
+        assert engine._statements == {}
+
+
+class TestStatementCache:
+    def test_query_prepared_on_second_sighting(self, engine: SQLQueryEngine):
+        sql = "SELECT id FROM listings WHERE price > 400000 ORDER BY id"
+
+        first = engine.execute_query(sql).data["id"].tolist()
+        assert engine._statements == {}
+        second = engine.execute_query(sql).data["id"].tolist()
+        statement = engine._statements[sql]
+        third = engine.execute_query(sql).data["id"].tolist()
+
+        assert first == second == third == [2, 3, 5, 6]
+        assert engine._statements == {sql: statement}
+
+    def test_lru_eviction_deallocates(self, listings: pd.DataFrame):
+        engine = SQLQueryEngine(statement_cache_size=2)
+        engine.register_table("listings", listings)
+        queries = [f"SELECT id FROM listings WHERE id > {i}" for i in range(3)]
+
+        for query in queries:
+            engine.execute_query(query)
+            engine.execute_query(query)
+            if query == queries[0]:
+                evicted = engine._statements[queries[0]]
+
+        assert list(engine._statements) == queries[1:]
+        assert not _statement_exists(engine, evicted)
+        engine.close()
+
+    def test_catalog_change_deallocates_and_sees_new_data(self, engine: SQLQueryEngine, listings: pd.DataFrame):
+        sql = "SELECT COUNT(*) AS n FROM listings"
+        engine.execute_query(sql)
+        assert engine.execute_query(sql).data["n"].iloc[0] == 6
+        statement = engine._statements[sql]
+
+        engine.register_table("listings", listings.head(2))
+
+        assert engine._statements == {}
+        assert not _statement_exists(engine, statement)
+        assert engine.execute_query(sql).data["n"].iloc[0] == 2
+
+    def test_unregister_clears_statements(self, engine: SQLQueryEngine):
+        engine.execute_query("SELECT * FROM listings")
+        engine.execute_query("SELECT * FROM listings")
+
+        assert engine.unregister_table("listings") is True
+        assert engine._statements == {}
+        with pytest.raises(ValidationError):
+            engine.execute_query("SELECT * FROM listings")
+
+
+class TestStreamQuery:
+    def test_batches_cover_all_rows(self, engine: SQLQueryEngine):
+        batches = list(engine.stream_query("SELECT * FROM listings ORDER BY id", batch_size=4))
+
+        assert sum(batch.num_rows for batch in batches) == 6
+        assert all(batch.num_rows <= 4 for batch in batches)
+        assert [v for batch in batches for v in batch.column("id").to_pylist()] == list(range(1, 7))
+
+    def test_stream_with_params(self, engine: SQLQueryEngine):
+        batches = engine.stream_query("SELECT id FROM listings WHERE city = ?", params=["Austin"])
+
+        assert sorted(v for batch in batches for v in batch.column("id").to_pylist()) == [1, 3, 5]
+
+    def test_stream_requires_persistent_connection(self, listings: pd.DataFrame):
+        engine = SQLQueryEngine(persistent_connection=False)
+        engine.register_table("listings", listings)
+
+        with pytest.raises(ValidationError):
+            list(engine.stream_query("SELECT * FROM listings"))
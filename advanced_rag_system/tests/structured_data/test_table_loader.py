@@ -0,0 +1,137 @@
+"""Tests for streaming in the table loader.
+
+Tests cover:
+- Batch sizes and continuous row indexes across chunk boundaries
+- Schema drift after the sample window (widening instead of failing)
+- Streamed Excel and JSON matching load_excel and load_json
+- Lazy DocumentChunk generation
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.core.exceptions import ValidationError
+from src.structured_data.table_loader import TableLoader, TableLoadOptions
+
+
+def _write_csv(path: Path, rows: int, tail: str = "") -> Path:
+    lines = ["id,price,active,city"]
+    lines += [f"{i},{i * 1.5},{'true' if i % 2 else 'false'},City {i % 7}" for i in range(rows)]
+    path.write_text("\n".join(lines) + "\n" + tail)
+    return path
+
+
+@pytest.fixture
+def loader() -> TableLoader:
+    return TableLoader()
+
+
+class TestCsvStreaming:
+    def test_chunk_boundaries(self, loader: TableLoader, tmp_path: Path):
+        path = _write_csv(tmp_path / "rows.csv", 25)
+
+        batches = list(loader.iter_csv(path, TableLoadOptions(chunk_size=10)))
+
+        assert [len(b) for b in batches] == [10, 10, 5]
+        assert pd.concat(batches).index.tolist() == list(range(25))
+        assert all(b["id"].dtype == "Int64" for b in batches)
+
+    def test_matches_load_csv(self, loader: TableLoader, tmp_path: Path):
+        path = _write_csv(tmp_path / "rows.csv", 40)
+
+        streamed = pd.concat(loader.iter_csv(path, TableLoadOptions(chunk_size=7)))
+
+        pd.testing.assert_frame_equal(streamed, loader.load_csv(path), check_dtype=False)
+
+    def test_max_rows(self, loader: TableLoader, tmp_path: Path):
+        path = _write_csv(tmp_path / "rows.csv", 30)
+
+        batches = list(loader.iter_csv(path, TableLoadOptions(chunk_size=8, max_rows=20)))
+
+        assert sum(len(b) for b in batches) == 20
+
+    @pytest.mark.parametrize(
+        "tail, column, dtype, kind",
+        [
+            ("1500,2.5,true,Austin\n1501,oops,true,Austin\n", "price", object, "string"),
+            ("1.5,2.5,true,Austin\n1501,3.0,true,Austin\n", "id", "float64", "float"),
+            ("n/a,2.5,true,Austin\n1501,3.0,maybe,Austin\n", "active", object, "string"),
+        ],
+    )
+    def test_schema_drift_after_sample_widens(
+        self, loader: TableLoader, tmp_path: Path, tail: str, column: str, dtype, kind: str
+    ):
+        path = _write_csv(tmp_path / "drift.csv", 1500, tail)
+        options = TableLoadOptions(chunk_size=500, schema_sample_rows=1000)
+
+        batches = list(loader.iter_csv(path, options))
+
+        assert sum(len(b) for b in batches) == 1502 == len(loader.load_csv(path))
+        assert batches[-1][column].dtype == dtype
+        assert loader.get_schema(str(path)).columns[column] == kind
+
+    def test_drift_does_not_abort_document_stream(self, loader: TableLoader, tmp_path: Path):
+        path = _write_csv(tmp_path / "drift.csv", 1500, "1500,oops,true,Austin\n1501,1.0,true,Austin\n")
+
+        chunks = list(loader.stream_documents(path, text_columns=["city"], options=TableLoadOptions(chunk_size=1)))
+
+        assert len(chunks) == 1502
+
+    def test_missing_file(self, loader: TableLoader, tmp_path: Path):
+        with pytest.raises(ValidationError):
+            list(loader.iter_csv(tmp_path / "missing.csv"))
+
+
+class TestJsonStreaming:
+    @pytest.fixture
+    def records(self):
+        return [{"id": i, "score": None if i == 13 else i / 2, "name": f"lead {i}"} for i in range(30)]
+
+    def test_jsonl_matches_load_json(self, loader: TableLoader, tmp_path: Path, records):
+        jsonl = tmp_path / "leads.jsonl"
+        jsonl.write_text("\n".join(json.dumps(r) for r in records) + "\n")
+        array = tmp_path / "leads.json"
+        array.write_text(json.dumps(records))
+
+        batches = list(loader.iter_json(jsonl, TableLoadOptions(chunk_size=8)))
+
+        assert [len(b) for b in batches] == [8, 8, 8, 6]
+        pd.testing.assert_frame_equal(pd.concat(batches), loader.load_json(array), check_dtype=False)
+        assert batches[1]["score"].dtype == batches[0]["score"].dtype
+
+    def test_json_array_is_sliced(self, loader: TableLoader, tmp_path: Path, records):
+        path = tmp_path / "leads.json"
+        path.write_text(json.dumps(records))
+
+        batches = list(loader.iter_batches(path, TableLoadOptions(chunk_size=12)))
+
+        assert [len(b) for b in batches] == [12, 12, 6]
+        pd.testing.assert_frame_equal(pd.concat(batches), loader.load_json(path))
+
+    def test_invalid_line(self, loader: TableLoader, tmp_path: Path):
+        path = tmp_path / "bad.jsonl"
+        path.write_text('{"id": 1}\n{not json}\n')
+
+        with pytest.raises(ValidationError, match="line 2"):
+            list(loader.iter_json(path))
+
+
+class TestExcelStreaming:
+    def test_matches_load_excel(self, loader: TableLoader, tmp_path: Path):
+        pytest.importorskip("openpyxl")
+        path = tmp_path / "listings.xlsx"
+        frame = pd.DataFrame(
+            {"id": range(23), "price": [i * 1000.5 for i in range(23)], "city": [f"City {i}" for i in range(23)]}
+        )
+        frame.to_excel(path, index=False)
+
+        batches = list(loader.iter_excel(path, options=TableLoadOptions(chunk_size=10)))
+
+        assert [len(b) for b in batches] == [10, 10, 3]
+        pd.testing.assert_frame_equal(pd.concat(batches), loader.load_excel(path), check_dtype=False)
+        assert loader.get_schema(f"{path}#0").columns["price"] == "float"
@@ -4,6 +4,7 @@ Validates the numpy-based in-memory vector store that serves as a
 fallback when ChromaDB is unavailable (pydantic v2 on Python 3.14).
 """
 
+import json
 from typing import List
 from uuid import uuid4
 
@@ -245,3 +246,258 @@ class TestInMemoryVectorStoreStats:
         assert stats["chunk_count"] == 10
         assert stats["dimension"] == 8
         assert stats["memory_estimated_mb"] > 0
+
+
+class TestInMemoryVectorStoreArena:
+    """Test the incremental embedding arena (growth, tombstones, compaction)."""
+
+    @pytest.mark.asyncio
+    async def test_interleaved_add_and_search(self):
+        store = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await store.initialize()
+        chunks = _make_chunks(200)
+
+        for chunk in chunks:
+            await store.add_chunks([chunk])
+            results = await store.search(chunk.embedding, SearchOptions(top_k=1))
+            assert results[0].chunk.id == chunk.id
+
+        stats = await store.get_stats()
+        assert stats["arena_capacity"] >= 200
+
+    @pytest.mark.asyncio
+    async def test_deleted_chunks_not_returned(self):
+        store = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await store.initialize()
+        chunks = _make_chunks(10)
+        await store.add_chunks(chunks)
+
+        await store.delete_chunks([chunks[0].id])
+        results = await store.search(chunks[0].embedding, SearchOptions(top_k=10))
+        assert len(results) <= 9
+        assert all(r.chunk.id != chunks[0].id for r in results)
+
+    @pytest.mark.asyncio
+    async def test_compaction_reclaims_tombstones(self, monkeypatch):
+        monkeypatch.setattr(InMemoryVectorStore, "_COMPACTION_MIN_ROWS", 4)
+        store = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await store.initialize()
+        chunks = _make_chunks(20)
+        await store.add_chunks(chunks)
+
+        await store.delete_chunks([c.id for c in chunks[:10]])
+        stats = await store.get_stats()
+        assert stats["tombstones"] == 0
+        assert await store.count() == 10
+
+        results = await store.search(chunks[15].embedding, SearchOptions(top_k=1))
+        assert results[0].chunk.id == chunks[15].id
+
+    @pytest.mark.asyncio
+    async def test_update_overwrites_row_in_place(self):
+        store = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await store.initialize()
+        chunks = _make_chunks(5)
+        await store.add_chunks(chunks)
+
+        target = chunks[0]
+        target.embedding = chunks[4].embedding
+        await store.update_chunk(target)
+
+        stats = await store.get_stats()
+        assert stats["chunk_count"] == 5
+        assert stats["tombstones"] == 0
+        results = await store.search(chunks[4].embedding, SearchOptions(top_k=2))
+        assert {r.chunk.id for r in results} == {chunks[0].id, chunks[4].id}
+
+
+class TestInMemoryVectorStoreSnapshot:
+    """Test save/load snapshots."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mmap", [True, False])
+    async def test_round_trip(self, tmp_path, mmap):
+        store = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await store.initialize()
+        chunks = _make_chunks(10)
+        await store.add_chunks(chunks)
+        await store.delete_chunks([chunks[0].id])
+        await store.save(tmp_path / "snap")
+
+        restored = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await restored.initialize()
+        await restored.load(tmp_path / "snap", mmap=mmap)
+
+        assert await restored.count() == 9
+        assert await restored.get_chunk(chunks[0].id) is None
+        retrieved = await restored.get_chunk(chunks[3].id)
+        assert retrieved.content == chunks[3].content
+        assert retrieved.embedding is None
+
+        results = await restored.search(chunks[3].embedding, SearchOptions(top_k=1))
+        assert results[0].chunk.id == chunks[3].id
+        assert results[0].score == pytest.approx(1.0, abs=0.001)
+
+    @pytest.mark.asyncio
+    async def test_mmap_load_is_mutable(self, tmp_path):
+        store = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await store.initialize()
+        chunks = _make_chunks(5)
+        await store.add_chunks(chunks)
+        await store.save(tmp_path)
+
+        restored = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await restored.initialize()
+        await restored.load(tmp_path, mmap=True)
+
+        extra = _make_chunk("added after load")
+        await restored.add_chunks([extra])
+        await restored.delete_chunks([chunks[1].id])
+        results = await restored.search(extra.embedding, SearchOptions(top_k=1))
+        assert results[0].chunk.id == extra.id
+        assert await restored.count() == 5
+
+    @pytest.mark.asyncio
+    async def test_resave_swaps_generation(self, tmp_path):
+        store = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await store.initialize()
+        chunks = _make_chunks(6)
+        await store.add_chunks(chunks[:3])
+        await store.save(tmp_path)
+        first = json.loads((tmp_path / "manifest.json").read_text())["generation"]
+        await store.add_chunks(chunks[3:])
+        await store.save(tmp_path)
+        await store.save(tmp_path)
+
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        assert manifest["generation"] != first
+        assert len(list(tmp_path.glob("embeddings.*.npy"))) == 2
+        assert len(list(tmp_path.glob("chunks.*.jsonl"))) == 2
+        assert not list(tmp_path.glob(f"*.{first}.*"))
+
+        restored = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await restored.initialize()
+        await restored.load(tmp_path)
+        assert await restored.count() == 6
+
+    @pytest.mark.asyncio
+    async def test_resave_prunes_only_snapshot_files(self, tmp_path):
+        store = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await store.initialize()
+        await store.add_chunks(_make_chunks(3))
+        stale = "0" * 32
+        (tmp_path / "embeddings.v2.npy").write_bytes(b"user data")
+        (tmp_path / "notes.backup.jsonl").write_text("{}")
+        (tmp_path / f"manifest.json.{stale}.tmp").write_text("{}")
+
+        await store.save(tmp_path)
+        await store.save(tmp_path)
+        await store.save(tmp_path)
+
+        assert (tmp_path / "embeddings.v2.npy").read_bytes() == b"user data"
+        assert (tmp_path / "notes.backup.jsonl").exists()
+        assert not (tmp_path / f"manifest.json.{stale}.tmp").exists()
+        assert len(list(tmp_path.glob("embeddings.*.npy"))) == 3
+
+    @pytest.mark.asyncio
+    async def test_load_rejects_mismatched_generation_files(self, tmp_path):
+        store = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await store.initialize()
+        await store.add_chunks(_make_chunks(3))
+        await store.save(tmp_path)
+
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        manifest["count"] = 2
+        (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+
+        restored = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await restored.initialize()
+        with pytest.raises(VectorStoreError, match="inconsistent"):
+            await restored.load(tmp_path)
+
+    @pytest.mark.asyncio
+    async def test_load_dimension_mismatch_raises(self, tmp_path):
+        store = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await store.initialize()
+        await store.add_chunks(_make_chunks(3))
+        await store.save(tmp_path)
+
+        other = InMemoryVectorStore(VectorStoreConfig(dimension=16))
+        await other.initialize()
+        with pytest.raises(VectorStoreError, match="mismatch"):
+            await other.load(tmp_path)
+
+    @pytest.mark.asyncio
+    async def test_load_missing_snapshot_raises(self, tmp_path):
+        store = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await store.initialize()
+        with pytest.raises(VectorStoreError, match="Failed to load snapshot"):
+            await store.load(tmp_path / "missing")
+
+
+class TestInMemoryVectorStoreFilters:
+    """Test metadata pre-filtering in search."""
+
+    @staticmethod
+    def _listing_chunks(n: int) -> List[DocumentChunk]:
+        chunks = _make_chunks(n)
+        cities = ["Austin", "Dallas", "Houston"]
+        for i, chunk in enumerate(chunks):
+            chunk.metadata = Metadata(
+                tags=["pool"] if i % 2 == 0 else [],
+                custom={"city": cities[i % 3], "price": 100000 * (i + 1)},
+            )
+        return chunks
+
+    @pytest.mark.asyncio
+    async def test_search_with_filters(self):
+        store = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await store.initialize()
+        chunks = self._listing_chunks(30)
+        await store.add_chunks(chunks)
+
+        filters = {"city": "Austin", "price": {"$lte": 1500000}, "tags": "pool"}
+        results = await store.search(chunks[0].embedding, SearchOptions(top_k=30, filters=filters))
+
+        expected = {c.id for i, c in enumerate(chunks) if i % 3 == 0 and i < 15 and i % 2 == 0}
+        assert {r.chunk.id for r in results} == expected
+        assert results[0].chunk.id == chunks[0].id
+
+    @pytest.mark.asyncio
+    async def test_filters_track_updates_and_deletes(self):
+        store = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await store.initialize()
+        chunks = self._listing_chunks(6)
+        await store.add_chunks(chunks)
+
+        await store.delete_chunks([chunks[0].id])
+        chunks[1].metadata = Metadata(custom={"city": "Austin"})
+        await store.update_chunk(chunks[1])
+
+        results = await store.search(chunks[1].embedding, SearchOptions(top_k=10, filters={"city": "Austin"}))
+        assert {r.chunk.id for r in results} == {chunks[1].id, chunks[3].id}
+
+    @pytest.mark.asyncio
+    async def test_in_place_metadata_mutation_then_readd(self):
+        store = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await store.initialize()
+        chunks = self._listing_chunks(6)
+        await store.add_chunks(chunks)
+
+        chunks[0].metadata.custom["city"] = "Dallas"
+        await store.add_chunks([chunks[0]])
+
+        austin = await store.search(chunks[0].embedding, SearchOptions(top_k=10, filters={"city": "Austin"}))
+        dallas = await store.search(chunks[0].embedding, SearchOptions(top_k=10, filters={"city": "Dallas"}))
+        assert {r.chunk.id for r in austin} == {chunks[3].id}
+        assert chunks[0].id in {r.chunk.id for r in dallas}
+
+    @pytest.mark.asyncio
+    async def test_filter_matching_nothing_returns_empty(self):
+        store = InMemoryVectorStore(VectorStoreConfig(dimension=8))
+        await store.initialize()
+        chunks = self._listing_chunks(6)
+        await store.add_chunks(chunks)
+
+        results = await store.search(chunks[0].embedding, SearchOptions(top_k=5, filters={"city": "Boston"}))
+        assert results == []
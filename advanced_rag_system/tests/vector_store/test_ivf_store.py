@@ -0,0 +1,198 @@
+"""Tests for IVFVectorStore.
+
+Validates the IVF approximate nearest-neighbour index layered on the
+in-memory arena store: lazy training, nprobe recall knob, and consistency
+under deletes, updates, and compaction.
+"""
+
+from typing import List
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from src.core.types import DocumentChunk, Metadata
+from src.vector_store.base import SearchOptions, VectorStoreConfig
+from src.vector_store.in_memory_store import InMemoryVectorStore
+from src.vector_store.ivf_store import IVFConfig, IVFVectorStore
+
+DIM = 16
+
+
+def _make_clustered_chunks(n: int, n_clusters: int = 8, seed: int = 0) -> List[DocumentChunk]:
+    """Create chunks whose embeddings form well-separated clusters."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, DIM))
+    chunks = []
+    for i in range(n):
+        vec = centers[i % n_clusters] + 0.1 * rng.standard_normal(DIM)
+        chunk = DocumentChunk(document_id=uuid4(), content=f"chunk {i}", index=i, metadata=Metadata())
+        chunk.embedding = (vec / np.linalg.norm(vec)).tolist()
+        chunks.append(chunk)
+    return chunks
+
+
+async def _make_store(ivf_config: IVFConfig) -> IVFVectorStore:
+    store = IVFVectorStore(VectorStoreConfig(dimension=DIM), ivf_config)
+    await store.initialize()
+    return store
+
+
+class TestIVFTraining:
+    """Test lazy training of the coarse quantizer."""
+
+    @pytest.mark.asyncio
+    async def test_untrained_below_threshold_is_exact(self):
+        store = await _make_store(IVFConfig(train_threshold=100))
+        chunks = _make_clustered_chunks(50)
+        await store.add_chunks(chunks)
+
+        assert store.is_trained is False
+        results = await store.search(chunks[3].embedding, SearchOptions(top_k=1))
+        assert results[0].chunk.id == chunks[3].id
+
+    @pytest.mark.asyncio
+    async def test_trains_at_threshold(self):
+        store = await _make_store(IVFConfig(train_threshold=100, n_lists=8))
+        await store.add_chunks(_make_clustered_chunks(200))
+
+        stats = await store.get_stats()
+        assert store.is_trained is True
+        assert stats["store_type"] == "ivf"
+        assert stats["n_lists"] == 8
+
+    @pytest.mark.asyncio
+    async def test_clear_resets_index(self):
+        store = await _make_store(IVFConfig(train_threshold=100))
+        await store.add_chunks(_make_clustered_chunks(200))
+        await store.clear()
+
+        assert store.is_trained is False
+        assert await store.count() == 0
+
+
+class TestIVFSearch:
+    """Test approximate search quality and the nprobe knob."""
+
+    @pytest.mark.asyncio
+    async def test_self_match_after_training(self):
+        store = await _make_store(IVFConfig(train_threshold=100, n_lists=8, nprobe=2))
+        chunks = _make_clustered_chunks(400)
+        await store.add_chunks(chunks)
+
+        for chunk in chunks[:20]:
+            results = await store.search(chunk.embedding, SearchOptions(top_k=1))
+            assert results[0].chunk.id == chunk.id
+
+    @pytest.mark.asyncio
+    async def test_full_probe_matches_exact_search(self):
+        chunks = _make_clustered_chunks(300, seed=1)
+        exact = InMemoryVectorStore(VectorStoreConfig(dimension=DIM))
+        await exact.initialize()
+        await exact.add_chunks(chunks)
+        store = await _make_store(IVFConfig(train_threshold=100, n_lists=8, nprobe=1))
+        await store.add_chunks(chunks)
+
+        query = chunks[7].embedding
+        expected = [r.chunk.id for r in await exact.search(query, SearchOptions(top_k=10))]
+        actual = [r.chunk.id for r in await store.search(query, SearchOptions(top_k=10, nprobe=8))]
+        assert actual == expected
+
+    @pytest.mark.asyncio
+    async def test_added_after_training_is_searchable(self):
+        store = await _make_store(IVFConfig(train_threshold=100, n_lists=8, nprobe=2))
+        await store.add_chunks(_make_clustered_chunks(200))
+        late = _make_clustered_chunks(1, seed=99)[0]
+        await store.add_chunks([late])
+
+        results = await store.search(late.embedding, SearchOptions(top_k=1))
+        assert results[0].chunk.id == late.id
+
+    @pytest.mark.asyncio
+    async def test_deleted_and_updated_rows(self, monkeypatch):
+        monkeypatch.setattr(InMemoryVectorStore, "_COMPACTION_MIN_ROWS", 16)
+        store = await _make_store(IVFConfig(train_threshold=100, n_lists=8, nprobe=8))
+        chunks = _make_clustered_chunks(200)
+        await store.add_chunks(chunks)
+
+        moved = chunks[0]
+        moved.embedding = chunks[1].embedding
+        await store.update_chunk(moved)
+        await store.delete_chunks([c.id for c in chunks[100:]])
+
+        assert (await store.get_stats())["tombstones"] == 0
+        results = await store.search(chunks[1].embedding, SearchOptions(top_k=2))
+        assert {r.chunk.id for r in results} == {chunks[0].id, chunks[1].id}
+        results = await store.search(chunks[150].embedding, SearchOptions(top_k=50))
+        assert all(r.chunk.id not in {c.id for c in chunks[100:]} for r in results)
+
+    @pytest.mark.asyncio
+    async def test_load_snapshot_restores_index(self, tmp_path, monkeypatch):
+        store = await _make_store(IVFConfig(train_threshold=100, n_lists=8))
+        chunks = _make_clustered_chunks(200)
+        await store.add_chunks(chunks)
+        await store.delete_chunks([chunks[0].id])
+        await store.save(tmp_path)
+
+        def _no_fit(*args, **kwargs):
+            raise AssertionError("load must not retrain a persisted index")
+
+        restored = await _make_store(IVFConfig(train_threshold=100, n_lists=8))
+        monkeypatch.setattr(restored, "_fit", _no_fit)
+        await restored.load(tmp_path)
+
+        assert restored.is_trained is True
+        np.testing.assert_array_equal(restored._centroids, store._centroids)
+        results = await restored.search(chunks[5].embedding, SearchOptions(top_k=1))
+        assert results[0].chunk.id == chunks[5].id
+
+    @pytest.mark.asyncio
+    async def test_load_untrained_snapshot_trains(self, tmp_path):
+        store = await _make_store(IVFConfig(train_threshold=1000))
+        chunks = _make_clustered_chunks(200)
+        await store.add_chunks(chunks)
+        await store.save(tmp_path)
+
+        restored = await _make_store(IVFConfig(train_threshold=100, n_lists=8))
+        await restored.load(tmp_path)
+
+        assert restored.is_trained is True
+        results = await restored.search(chunks[5].embedding, SearchOptions(top_k=1))
+        assert results[0].chunk.id == chunks[5].id
+
+    @pytest.mark.asyncio
+    async def test_rows_added_during_training_are_assigned(self):
+        store = await _make_store(IVFConfig(train_threshold=100, n_lists=8, nprobe=8))
+        chunks = _make_clustered_chunks(200)
+        late = _make_clustered_chunks(1, seed=99)[0]
+        fit = store._fit
+
+        def _fit_then_add(matrix, live_rows):
+            result = fit(matrix, live_rows)
+            # Simulate an add landing on the loop while k-means runs
+            store._put_row(str(late.id), store._normalize(late.embedding))
+            store._chunks[str(late.id)] = late
+            return result
+
+        store._fit = _fit_then_add
+        await store.add_chunks(chunks)
+
+        assert store.is_trained is True
+        assert store._assign[store._row_of[str(late.id)]] >= 0
+        results = await store.search(late.embedding, SearchOptions(top_k=1))
+        assert results[0].chunk.id == late.id
+
+    @pytest.mark.asyncio
+    async def test_filtered_search(self):
+        store = await _make_store(IVFConfig(train_threshold=100, n_lists=8, nprobe=2))
+        chunks = _make_clustered_chunks(400)
+        for i, chunk in enumerate(chunks):
+            chunk.metadata = Metadata(custom={"bucket": i % 4})
+        await store.add_chunks(chunks)
+
+        results = await store.search(chunks[8].embedding, SearchOptions(top_k=5, filters={"bucket": 0}))
+        assert results[0].chunk.id == chunks[8].id
+        assert all(r.chunk.metadata.custom["bucket"] == 0 for r in results)
+
+        results = await store.search(chunks[9].embedding, SearchOptions(top_k=5, filters={"bucket": {"$in": [1, 2]}}))
+        assert all(r.chunk.metadata.custom["bucket"] in (1, 2) for r in results)
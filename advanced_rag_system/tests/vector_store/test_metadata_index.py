@@ -0,0 +1,55 @@
+"""Tests for the inverted metadata index used by in-memory stores."""
+
+import numpy as np
+import pytest
+
+from src.core.exceptions import VectorStoreError
+from src.vector_store.metadata_index import MetadataIndex
+
+
+@pytest.fixture
+def index():
+    idx = MetadataIndex()
+    idx.add(0, {"city": "Austin", "price": 300000, "tags": ["pool", "garage"]})
+    idx.add(1, {"city": "Dallas", "price": 450000, "tags": ["garage"]})
+    idx.add(2, {"city": "Austin", "price": 650000, "tags": []})
+    idx.add(3, {"city": "Houston", "price": None, "tags": ["pool"]})
+    return idx
+
+
+def _rows(mask: np.ndarray):
+    return np.flatnonzero(mask).tolist()
+
+
+class TestMetadataIndex:
+    def test_equality(self, index):
+        assert _rows(index.mask({"city": "Austin"}, 4)) == [0, 2]
+
+    def test_list_is_in(self, index):
+        assert _rows(index.mask({"city": ["Dallas", "Houston"]}, 4)) == [1, 3]
+
+    def test_list_valued_field_matches_any_element(self, index):
+        assert _rows(index.mask({"tags": "pool"}, 4)) == [0, 3]
+
+    def test_range(self, index):
+        assert _rows(index.mask({"price": {"$gte": 300000, "$lt": 600000}}, 4)) == [0, 1]
+
+    def test_negation(self, index):
+        assert _rows(index.mask({"city": {"$ne": "Austin"}}, 4)) == [1, 3]
+        assert _rows(index.mask({"city": {"$nin": ["Austin", "Dallas"]}}, 4)) == [3]
+
+    def test_and_or(self, index):
+        filters = {"$or": [{"city": "Dallas"}, {"$and": [{"city": "Austin"}, {"tags": "pool"}]}]}
+        assert _rows(index.mask(filters, 4)) == [0, 1]
+
+    def test_missing_field_matches_nothing(self, index):
+        assert _rows(index.mask({"beds": 3}, 4)) == []
+
+    def test_remove(self, index):
+        index.remove(0, {"city": "Austin", "price": 300000, "tags": ["pool", "garage"]})
+        assert _rows(index.mask({"city": "Austin"}, 4)) == [2]
+        assert _rows(index.mask({"tags": "pool"}, 4)) == [3]
+
+    def test_unsupported_operator_raises(self, index):
+        with pytest.raises(VectorStoreError, match="Unsupported filter operator"):
+            index.mask({"city": {"$regex": "A.*"}}, 4)
@@ -451,6 +451,14 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    # Shutdown logic - persist unsaved semantic cache index entries
+    try:
+        from ghl_real_estate_ai.services.semantic_vector_index import flush_semantic_indexes
+
+        await flush_semantic_indexes()
+    except Exception as e:
+        logger.warning(f"Semantic cache index flush error: {e}")
+
     # Shutdown logic - Redis handoff repository
     if redis_handoff_repo is not None:
         try:
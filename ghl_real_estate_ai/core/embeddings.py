@@ -2,9 +2,19 @@
 Embedding model wrapper for sentence transformers.
 
 Provides a simple interface for generating embeddings using sentence-transformers.
+
+Async callers should use ``aembed_query``: concurrent single-text requests are
+coalesced into micro-batches (bounded by ``max_batch_size`` / ``max_wait_ms``)
+and encoded on a dedicated worker thread, so the event loop is never blocked
+by a forward pass. Query embeddings are kept in a bounded LRU shared by the
+sync and async paths.
 """
 
-from typing import List
+import asyncio
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 from ghl_real_estate_ai.ghl_utils.logger import get_logger
 
@@ -24,26 +34,85 @@ class EmbeddingModel:
     Wrapper around sentence-transformers for generating embeddings.
     """
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        cache_size: int = 4096,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
         """
         Initialize the embedding model (lazy-loaded on first use).
 
         Args:
             model_name: Name of the sentence-transformers model to use
+            cache_size: Maximum number of query embeddings kept in the LRU (0 disables)
+            max_batch_size: Maximum number of texts per coalesced forward pass
+            max_wait_ms: How long the first queued request waits for others to join its batch
         """
         self.model_name = model_name
+        self.cache_size = cache_size
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
         self._model = None
+        self._model_lock = threading.Lock()
+
+        # Bounded text -> vector LRU shared by sync and async callers. Vectors are
+        # stored as tuples and handed out as fresh lists, so callers cannot
+        # mutate a cached entry.
+        self._cache: "OrderedDict[str, Tuple[float, ...]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # Micro-batch coalescing state (event-loop side)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Deque[Tuple[str, asyncio.Future]] = deque()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._batch_full: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+        self.stats = {"cache_hits": 0, "cache_misses": 0, "batches": 0, "batched_texts": 0, "coalesced": 0}
+
         if not SENTENCE_TRANSFORMERS_AVAILABLE:
             logger.warning("Embedding model initialized in DUMMY mode")
 
     @property
     def model(self):
         if self._model is None and SENTENCE_TRANSFORMERS_AVAILABLE:
-            logger.info(f"Loading embedding model: {self.model_name}")
-            self._model = SentenceTransformer(self.model_name)
-            logger.info("Embedding model loaded successfully")
+            with self._model_lock:
+                if self._model is None:
+                    logger.info(f"Loading embedding model: {self.model_name}")
+                    self._model = SentenceTransformer(self.model_name)
+                    logger.info("Embedding model loaded successfully")
         return self._model
 
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        """Run one forward pass (blocking)."""
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            # Return dummy embeddings (zero vectors of typical size 384)
+            return [[0.0] * 384 for _ in texts]
+
+        embeddings = self.model.encode(texts, convert_to_numpy=True, batch_size=self.max_batch_size)
+        return embeddings.tolist()
+
+    def _get_cached(self, text: str) -> Optional[List[float]]:
+        with self._cache_lock:
+            embedding = self._cache.get(text)
+            if embedding is None:
+                self.stats["cache_misses"] += 1
+                return None
+            self._cache.move_to_end(text)
+            self.stats["cache_hits"] += 1
+            return list(embedding)
+
+    def _remember(self, text: str, embedding: List[float]) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[text] = tuple(embedding)
+            self._cache.move_to_end(text)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for a list of documents.
@@ -54,25 +123,161 @@ class EmbeddingModel:
         Returns:
             List of embeddings (each embedding is a list of floats)
         """
-        if not SENTENCE_TRANSFORMERS_AVAILABLE:
-            # Return dummy embeddings (zero vectors of typical size 384)
-            return [[0.0] * 384 for _ in texts]
-
-        embeddings = self.model.encode(texts, convert_to_numpy=True)
-        return embeddings.tolist()
+        return self._encode(texts)
 
     def embed_query(self, query: str) -> List[float]:
         """
         Generate embedding for a single query.
 
+        Blocks the calling thread; coroutines should use ``aembed_query``.
+
         Args:
             query: Text query to embed
 
         Returns:
             Embedding vector as list of floats
         """
-        if not SENTENCE_TRANSFORMERS_AVAILABLE:
-            return [0.0] * 384
+        cached = self._get_cached(query)
+        if cached is not None:
+            return cached
+
+        embedding = self._encode([query])[0]
+        self._remember(query, embedding)
+        return embedding
+
+    # ------------------------------------------------------------------
+    # Async API
+    # ------------------------------------------------------------------
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            # A single worker keeps forward passes serialized and off the event loop
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding")
+        return self._executor
+
+    async def aembed_query(self, query: str) -> List[float]:
+        """
+        Generate embedding for a single query without blocking the event loop.
+
+        Concurrent calls are coalesced into one forward pass; identical texts
+        in flight share a single result.
+
+        Args:
+            query: Text query to embed
+
+        Returns:
+            Embedding vector as list of floats
+        """
+        cached = self._get_cached(query)
+        if cached is not None:
+            return cached
+
+        future = self._in_flight.get(query)
+        if future is not None:
+            self.stats["coalesced"] += 1
+            return list(await asyncio.shield(future))
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._in_flight[query] = future
+        self._pending.append((query, future))
+
+        if self._batch_full is None:
+            self._batch_full = asyncio.Event()
+        if len(self._pending) >= self.max_batch_size:
+            self._batch_full.set()
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._drain_pending())
+
+        return await asyncio.shield(future)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for documents on the worker thread.
+
+        Args:
+            texts: List of text documents to embed
+
+        Returns:
+            List of embeddings (each embedding is a list of floats)
+        """
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self._encode, texts)
+
+    async def _drain_pending(self) -> None:
+        """Encode queued texts in micro-batches until the queue is empty.
+
+        The first request waits up to ``max_wait_ms`` (or until a full batch
+        is queued) so that concurrent requests share its forward pass.
+        """
+        try:
+            if self.max_wait_ms > 0 and len(self._pending) < self.max_batch_size:
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), timeout=self.max_wait_ms / 1000)
+                except asyncio.TimeoutError:
+                    pass
+
+            while self._pending:
+                self._batch_full.clear()
+                batch = [self._pending.popleft() for _ in range(min(self.max_batch_size, len(self._pending)))]
+                await self._run_batch(batch)
+        finally:
+            # close() may already have replaced this task with a new one
+            if self._flush_task is asyncio.current_task():
+                self._flush_task = None
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Encode one micro-batch on the worker thread and resolve its futures."""
+        texts = [text for text, _ in batch]
+        self.stats["batches"] += 1
+        self.stats["batched_texts"] += len(texts)
+
+        try:
+            loop = asyncio.get_running_loop()
+            embeddings = await loop.run_in_executor(self._get_executor(), self._encode, texts)
+        except asyncio.CancelledError:
+            # close() cancelled the drain task mid-pass; the batch has already
+            # left the pending queue, so its callers must be failed here.
+            for text, future in batch:
+                self._in_flight.pop(text, None)
+                if not future.done():
+                    future.set_exception(RuntimeError("EmbeddingModel closed"))
+            raise
+        except Exception as e:
+            logger.error(f"Batched embedding failed for {len(texts)} texts: {e}")
+            for text, future in batch:
+                self._in_flight.pop(text, None)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (text, future), embedding in zip(batch, embeddings):
+            self._remember(text, embedding)
+            self._in_flight.pop(text, None)
+            if not future.done():
+                future.set_result(embedding)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache and batching statistics."""
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "cache_size": len(self._cache),
+            "avg_batch_size": self.stats["batched_texts"] / batches if batches else 0.0,
+        }
 
-        embedding = self.model.encode([query], convert_to_numpy=True)
-        return embedding[0].tolist()
+    async def close(self) -> None:
+        """Fail pending requests and stop the worker thread."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        while self._pending:
+            text, future = self._pending.popleft()
+            self._in_flight.pop(text, None)
+            if not future.done():
+                future.set_exception(RuntimeError("EmbeddingModel closed"))
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
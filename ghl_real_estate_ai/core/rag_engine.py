@@ -4,13 +4,20 @@ RAG Engine - Vector Database and Retrieval Logic.
 Demonstrates:
 - ChromaDB integration
 - Semantic search implementation
+- Per-location BM25 inverted index with reciprocal rank fusion (hybrid search)
 - Document management
 """
 
+import asyncio
+import heapq
+import math
+import operator
+import re
 import uuid
+from collections import Counter, defaultdict
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from ghl_real_estate_ai.core.embeddings import EmbeddingModel
 from ghl_real_estate_ai.ghl_utils.logger import get_logger
@@ -37,6 +44,143 @@ class SearchResult:
     id: str
     distance: float
     metadata: Dict[str, Any]
+    score: Optional[float] = None  # Fused (hybrid) or BM25 (keyword) relevance; higher is better
+
+
+_TOKEN_PATTERN = re.compile(r"\b\w+\b")
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+_WHERE_OPERATORS = {
+    "$eq": operator.eq,
+    "$ne": operator.ne,
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le,
+    "$in": lambda value, operand: value in operand,
+    "$nin": lambda value, operand: value not in operand,
+}
+
+
+def _matches_where(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """Evaluate a Chroma-style ``where`` filter against document metadata.
+
+    Range operators never match a missing or incomparable value. An unknown
+    operator raises ``ValueError``, as Chroma does, rather than matching
+    everything.
+    """
+    if not where:
+        return True
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(_matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(_matches_where(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for op, operand in condition.items():
+                compare = _WHERE_OPERATORS.get(op)
+                if compare is None:
+                    raise ValueError(f"Unsupported where operator: {op}")
+                try:
+                    if not compare(value, operand):
+                        return False
+                except TypeError:
+                    return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+class KeywordIndex:
+    """
+    Incremental BM25 inverted index for one location's documents.
+
+    Postings map each term to ``{doc_id: term_frequency}``, so a query only
+    touches documents that contain at least one query term.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self.documents: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add(self, doc_id: str, text: str, metadata: Dict[str, Any]) -> None:
+        """Index a document, replacing any previous version with the same ID."""
+        if doc_id in self.documents:
+            self.remove(doc_id)
+
+        terms = Counter(_tokenize(text))
+        for term, tf in terms.items():
+            self.postings[term][doc_id] = tf
+        self.documents[doc_id] = (text, metadata)
+        self._doc_terms[doc_id] = terms
+        self._doc_lengths[doc_id] = sum(terms.values())
+        self._total_length += self._doc_lengths[doc_id]
+
+    def remove(self, doc_id: str) -> None:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self.postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self.postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        del self.documents[doc_id]
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        where: Optional[Dict[str, Any]] = None,
+        corpus: Optional[Sequence["KeywordIndex"]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Score documents containing any query term with BM25.
+
+        Args:
+            corpus: Indexes searched together with this one (including it).
+                IDF and average document length are taken over all of them,
+                so scores from each index are directly comparable.
+
+        Returns:
+            Up to ``limit`` (doc_id, score) pairs, best first
+        """
+        corpus = corpus or [self]
+        n_docs = sum(len(index.documents) for index in corpus)
+        if not self.documents or n_docs == 0:
+            return []
+
+        avgdl = sum(index._total_length for index in corpus) / n_docs
+        scores: Dict[str, float] = defaultdict(float)
+        for term in set(_tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            df = sum(len(index.postings.get(term, ())) for index in corpus)
+            idf = math.log((n_docs - df + 0.5) / (df + 0.5) + 1)
+            for doc_id, tf in postings.items():
+                dl = self._doc_lengths[doc_id]
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * dl / avgdl))
+
+        if where:
+            scores = {d: sc for d, sc in scores.items() if _matches_where(self.documents[d][1], where)}
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
 
 
 class VectorStore:
@@ -62,6 +206,10 @@ class VectorStore:
         self.collection_name = collection_name
         self.embedding_model = embedding_model or EmbeddingModel()
 
+        # Per-location BM25 indexes, built lazily from the collection on first keyword/hybrid search
+        self._keyword_indexes: Optional[Dict[str, KeywordIndex]] = None
+        self.rrf_k = 60
+
         if CHROMA_AVAILABLE:
             # Initialize Client
             try:
@@ -114,6 +262,7 @@ class VectorStore:
 
             # Add to Chroma
             self._collection.add(documents=texts, embeddings=embeddings, metadatas=metadatas, ids=ids)
+            self._index_keywords(ids, texts, metadatas)
             logger.info(f"Added {len(texts)} documents to vector store (location: {location_id or 'global'})")
             return ids
         except Exception as e:
@@ -130,6 +279,59 @@ class VectorStore:
         """Alias for add_texts."""
         return self.add_texts(documents, metadatas, ids, location_id=location_id)
 
+    def _index_keywords(self, ids: List[str], texts: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """Keep the keyword indexes in step with the Chroma collection."""
+        if self._keyword_indexes is None:
+            # Not built yet; the lazy build will read these documents from the collection
+            return
+        self._add_keywords(self._keyword_indexes, ids, texts, metadatas)
+
+    @staticmethod
+    def _add_keywords(
+        indexes: Dict[str, KeywordIndex], ids: List[str], texts: List[str], metadatas: List[Dict[str, Any]]
+    ) -> None:
+        for doc_id, text, meta in zip(ids, texts, metadatas):
+            loc = meta.get("location_id", "global")
+            if loc not in indexes:
+                indexes[loc] = KeywordIndex()
+            indexes[loc].add(doc_id, text, meta)
+
+    def _get_keyword_indexes(self) -> Dict[str, KeywordIndex]:
+        """Build the per-location keyword indexes from the collection once."""
+        if self._keyword_indexes is None:
+            # Built aside and assigned only on success, so a failed read is retried next time
+            indexes: Dict[str, KeywordIndex] = {}
+            if self._collection is not None:
+                stored = self._collection.get(include=["documents", "metadatas"])
+                metadatas = stored.get("metadatas") or [{} for _ in stored["ids"]]
+                self._add_keywords(indexes, stored["ids"], stored["documents"], [m or {} for m in metadatas])
+                logger.info(f"Built keyword index for {len(stored['ids'])} documents")
+            self._keyword_indexes = indexes
+        return self._keyword_indexes
+
+    def _keyword_search(
+        self, query: str, limit: int, location_id: Optional[str], where: Optional[Dict[str, Any]]
+    ) -> List[Tuple[str, float]]:
+        """BM25 search over the caller's location and global documents.
+
+        Both indexes are scored against their combined corpus statistics, so
+        their scores can be merged into one ranking.
+        """
+        indexes = self._get_keyword_indexes()
+        corpus = [indexes[loc] for loc in {location_id or "global", "global"} if loc in indexes]
+        hits: List[Tuple[str, float]] = []
+        for index in corpus:
+            hits.extend(index.search(query, limit, where, corpus=corpus))
+        hits.sort(key=lambda item: item[1], reverse=True)
+        return hits[:limit]
+
+    def _keyword_document(self, doc_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        for index in self._get_keyword_indexes().values():
+            doc = index.documents.get(doc_id)
+            if doc is not None:
+                return doc
+        return None
+
     def search(
         self,
         query: str,
@@ -141,7 +343,8 @@ class VectorStore:
     ) -> List[SearchResult]:
         """
         Search for relevant documents.
-        Supports 'semantic' (default), 'keyword' (exact match boost), or 'hybrid'.
+        Supports 'semantic' (default), 'keyword' (BM25 over the per-location inverted index),
+        or 'hybrid' (reciprocal rank fusion of the dense and BM25 rankings).
 
         Args:
             query: The search query
@@ -155,42 +358,101 @@ class VectorStore:
             return []
 
         try:
-            # Build filter metadata
-            where_filter = {}
-
-            # If location_id is provided, we want documents for this location OR global documents
-            loc_filter = {"location_id": {"$in": [location_id or "global", "global"]}}
-
-            filters = [loc_filter]
-
-            if neighborhood:
-                # If neighborhood is provided, we can either filter strictly or bias
-                # For "Neighborhood Persona", we'll try to find neighborhood-specific docs
-                neighborhood_filter = {"neighborhood": {"$in": [neighborhood, "all"]}}
-                filters.append(neighborhood_filter)
+            where_filter = self._build_where_filter(location_id, neighborhood, filter_metadata)
+            query_embedding = None
+            if mode != "keyword":
+                query_embedding = self.embedding_model.embed_query(self._biased_query(query, neighborhood))
+            return self._rank_results(query, n_results, location_id, where_filter, mode, query_embedding)
+        except Exception as e:
+            logger.error(f"Error searching vector store: {e}")
+            return []
 
-            if filter_metadata:
-                filters.append(filter_metadata)
+    async def asearch(
+        self,
+        query: str,
+        n_results: int = 4,
+        location_id: Optional[str] = None,
+        neighborhood: Optional[str] = None,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        mode: str = "semantic",
+    ) -> List[SearchResult]:
+        """
+        Async variant of :meth:`search` that embeds the query off the event loop.
 
-            if len(filters) > 1:
-                where_filter = {"$and": filters}
-            else:
-                where_filter = filters[0]
+        Uses ``embedding_model.aembed_query`` when available, otherwise runs
+        ``embed_query`` in a worker thread. Arguments match :meth:`search`.
+        """
+        if not self._collection:
+            return []
 
-            # 1. Semantic Search (Base)
-            query_embedding = self.embedding_model.embed_query(query)
+        try:
+            where_filter = self._build_where_filter(location_id, neighborhood, filter_metadata)
+            query_embedding = None
+            if mode != "keyword":
+                biased_query = self._biased_query(query, neighborhood)
+                aembed_query = getattr(self.embedding_model, "aembed_query", None)
+                if aembed_query is not None:
+                    query_embedding = await aembed_query(biased_query)
+                else:
+                    query_embedding = await asyncio.to_thread(self.embedding_model.embed_query, biased_query)
+            return self._rank_results(query, n_results, location_id, where_filter, mode, query_embedding)
+        except Exception as e:
+            logger.error(f"Error searching vector store: {e}")
+            return []
 
-            # Biasing: If neighborhood is specified, boost the query with neighborhood name
-            biased_query = f"{neighborhood} {query}" if neighborhood else query
-            biased_embedding = self.embedding_model.embed_query(biased_query) if neighborhood else query_embedding
+    @staticmethod
+    def _biased_query(query: str, neighborhood: Optional[str]) -> str:
+        # Biasing: If neighborhood is specified, boost the query with neighborhood name.
+        # Only the biased vector is queried, so embed exactly one text.
+        return f"{neighborhood} {query}" if neighborhood else query
+
+    @staticmethod
+    def _build_where_filter(
+        location_id: Optional[str],
+        neighborhood: Optional[str],
+        filter_metadata: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Build the Chroma ``where`` filter for a search."""
+        # If location_id is provided, we want documents for this location OR global documents
+        loc_filter = {"location_id": {"$in": [location_id or "global", "global"]}}
+
+        filters = [loc_filter]
+
+        if neighborhood:
+            # If neighborhood is provided, we can either filter strictly or bias
+            # For "Neighborhood Persona", we'll try to find neighborhood-specific docs
+            neighborhood_filter = {"neighborhood": {"$in": [neighborhood, "all"]}}
+            filters.append(neighborhood_filter)
+
+        if filter_metadata:
+            filters.append(filter_metadata)
+
+        if len(filters) > 1:
+            return {"$and": filters}
+        return filters[0]
+
+    def _rank_results(
+        self,
+        query: str,
+        n_results: int,
+        location_id: Optional[str],
+        where_filter: Dict[str, Any],
+        mode: str,
+        query_embedding: Optional[List[float]],
+    ) -> List[SearchResult]:
+        """Run the dense and/or keyword passes and fuse them according to ``mode``."""
+        candidates = {}
+        candidate_pool = n_results * 2 if mode == "hybrid" else n_results
 
+        # 1. Semantic Search (Base); keyword mode skips the embedding entirely
+        dense_ranking: List[str] = []
+        if query_embedding is not None:
             results = self._collection.query(
-                query_embeddings=[biased_embedding],
-                n_results=n_results * 2 if mode == "hybrid" else n_results,
+                query_embeddings=[query_embedding],
+                n_results=candidate_pool,
                 where=where_filter if where_filter else None,
             )
 
-            candidates = {}
             if results["ids"] and results["ids"][0]:
                 for i in range(len(results["ids"][0])):
                     doc_id = results["ids"][0][i]
@@ -203,32 +465,42 @@ class VectorStore:
                         else "unknown",
                         distance=results["distances"][0][i] if results["distances"] else 0.0,
                     )
+                    dense_ranking.append(doc_id)
 
-            if mode in ["keyword", "hybrid"]:
-                # 2. Simple Keyword Scoring (Reranking)
-                # In a real system, we'd query an Inverted Index. here we scan candidates.
-                # Just rerank the semantic candidates based on keyword overlap
-                query_terms = set(query.lower().split())
-
-                for doc_id, res in candidates.items():
-                    doc_lower = res.text.lower()
-                    score = sum(1 for term in query_terms if term in doc_lower)
-                    # Normalize simple score
-                    keyword_boost = score * 0.1
-                    # Reduce distance (which is bad in cosine distance, usually smaller is better?
-                    # Chroma returns distance. If cosine DISTANCE, 0 is identical.
-                    # We want to reduce distance if keywords match.
-                    res.distance = max(0.0, res.distance - keyword_boost)
-
-            # Sort and Slice
+        if mode == "semantic":
             final_results = list(candidates.values())
             final_results.sort(key=lambda x: x.distance)
+            return final_results[:n_results]
 
+        # 2. BM25 over the inverted index; finds documents the dense pass never saw
+        keyword_hits = self._keyword_search(query, candidate_pool, location_id, where_filter)
+        for doc_id, _ in keyword_hits:
+            if doc_id not in candidates:
+                text, meta = self._keyword_document(doc_id)
+                # Distance is unknown for keyword-only hits; rank by score instead
+                candidates[doc_id] = SearchResult(
+                    id=doc_id, text=text, metadata=meta, source=meta.get("source", "unknown"), distance=1.0
+                )
+
+        if mode == "keyword":
+            for doc_id, bm25_score in keyword_hits:
+                candidates[doc_id].score = bm25_score
+            final_results = [candidates[doc_id] for doc_id, _ in keyword_hits]
             return final_results[:n_results]
 
-        except Exception as e:
-            logger.error(f"Error searching vector store: {e}")
-            return []
+        # 3. Reciprocal rank fusion of dense and keyword rankings
+        fused: Dict[str, float] = defaultdict(float)
+        for rank, doc_id in enumerate(dense_ranking):
+            fused[doc_id] += 1.0 / (self.rrf_k + rank + 1)
+        for rank, (doc_id, _) in enumerate(keyword_hits):
+            fused[doc_id] += 1.0 / (self.rrf_k + rank + 1)
+
+        for doc_id, fused_score in fused.items():
+            candidates[doc_id].score = fused_score
+
+        # Sort and Slice
+        final_results = sorted(fused, key=lambda doc_id: fused[doc_id], reverse=True)
+        return [candidates[doc_id] for doc_id in final_results[:n_results]]
 
     async def search_corrective(
         self,
@@ -244,7 +516,9 @@ class VectorStore:
         Evaluates retrieval quality and triggers web search fallback if relevance is low.
         """
         # 1. Standard semantic search
-        results = self.search(query=query, n_results=n_results, location_id=location_id, neighborhood=neighborhood)
+        results = await self.asearch(
+            query=query, n_results=n_results, location_id=location_id, neighborhood=neighborhood
+        )
 
         # 2. Evaluate relevance
         # Chroma cosine distance: 0 is identical, > 0.6 is generally low relevance
@@ -315,6 +589,7 @@ class VectorStore:
             self._collection = self._client.get_or_create_collection(
                 name=self.collection_name, metadata={"hnsw:space": "cosine"}
             )
+            self._keyword_indexes = {}
             logger.info("Vector store cleared")
         except Exception as e:
             logger.error(f"Error clearing vector store: {e}")
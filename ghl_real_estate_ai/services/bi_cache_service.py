@@ -109,6 +109,9 @@ class BICacheService:
         self.prediction_enabled = True
         self.prediction_threshold = 0.7  # Probability threshold for prefetching
 
+        # Stale-while-revalidate window as a fraction of each query's TTL
+        self.stale_ttl_ratio = 0.5
+
         logger.info("BI Cache Service initialized")
 
     async def start_warming_scheduler(self):
@@ -152,31 +155,35 @@ class BICacheService:
         # Track query access
         self._track_query_access(query_hash, query_type)
 
-        # Check cache first (unless force refresh)
-        if not force_refresh:
-            cached_result = await self.cache_service.get(cache_key)
-            if cached_result is not None:
-                self.metrics.cache_hits += 1
-                self._record_query_time(query_hash, (time.time() - start_time) * 1000)
-                logger.debug(f"Cache hit for analytics query: {query_type}")
-                return cached_result
+        # Determine TTL based on data volatility
+        ttl = ttl_override or self._calculate_intelligent_ttl(query_type, query_params)
+        computed = False
 
-        # Cache miss - compute result
-        self.metrics.cache_misses += 1
-        logger.debug(f"Cache miss for analytics query: {query_type}, computing...")
+        async def compute() -> Any:
+            nonlocal computed
+            computed = True
+            if asyncio.iscoroutinefunction(computation_func):
+                return await computation_func(**query_params)
+            return computation_func(**query_params)
 
         try:
-            # Compute result
-            if asyncio.iscoroutinefunction(computation_func):
-                result = await computation_func(**query_params)
+            if force_refresh:
+                result = await compute()
+                await self.cache_service.set(cache_key, result, ttl)
             else:
-                result = computation_func(**query_params)
+                # Concurrent misses share one computation; expired KPIs are
+                # served stale while a single refresh runs in the background
+                result = await self.cache_service.get_or_compute(
+                    cache_key, compute, ttl, stale_ttl=int(ttl * self.stale_ttl_ratio)
+                )
 
-            # Determine TTL based on data volatility
-            ttl = ttl_override or self._calculate_intelligent_ttl(query_type, query_params)
+            if not computed:
+                self.metrics.cache_hits += 1
+                self._record_query_time(query_hash, (time.time() - start_time) * 1000)
+                logger.debug(f"Cache hit for analytics query: {query_type}")
+                return result
 
-            # Cache the result
-            await self.cache_service.set(cache_key, result, ttl)
+            self.metrics.cache_misses += 1
 
             # Record metrics
             processing_time = (time.time() - start_time) * 1000
@@ -417,24 +424,20 @@ class BICacheService:
     async def _background_prefetch(self, query_type: str, query_params: Dict[str, Any]):
         """Execute background prefetch of a query."""
         try:
-            # Check if already cached
-            cache_key = self._generate_cache_key(query_type, query_params)
-            if await self.cache_service.get(cache_key) is not None:
-                return  # Already cached
-
             # Get appropriate computation function
             computation_func = getattr(self, f"_compute_{query_type}", None)
             if not computation_func:
                 return
 
-            # Compute and cache
-            if asyncio.iscoroutinefunction(computation_func):
-                result = await computation_func(**query_params)
-            else:
-                result = computation_func(**query_params)
-
+            # Compute and cache unless cached or already being computed
+            cache_key = self._generate_cache_key(query_type, query_params)
             ttl = self._calculate_intelligent_ttl(query_type, query_params)
-            await self.cache_service.set(cache_key, result, ttl)
+            await self.cache_service.get_or_compute(
+                cache_key,
+                lambda: computation_func(**query_params),
+                ttl,
+                stale_ttl=int(ttl * self.stale_ttl_ratio),
+            )
 
             logger.debug(f"Background prefetch completed: {query_type}")
 
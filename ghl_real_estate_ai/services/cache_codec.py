@@ -0,0 +1,343 @@
+"""
+Cache Codec - Shared serialization for Redis-backed caches.
+
+Every payload starts with a 3-byte header:
+
+    MAGIC (0xC1) | VERSION | FLAGS (format in the low nibble, compression in the high nibble)
+
+Formats:
+- msgpack (default): compact binary with typed extensions for datetime/date,
+  Decimal, UUID, set/frozenset, tuple and numpy arrays/scalars
+- json: orjson (stdlib json fallback), for payloads other languages must read
+- pickle: used only for values msgpack cannot represent (arbitrary objects),
+  and only when ``allow_pickle`` is enabled
+
+Payloads larger than ``compress_threshold`` bytes are compressed with zstd,
+lz4 or zlib, depending on what is installed. Data without the header is
+treated as a legacy raw-pickle payload so existing keys keep working until
+they expire.
+
+Tuples round-trip as tuples in msgpack (including as dict keys) and as lists
+in json. Tuple subclasses such as namedtuples cannot be represented either way,
+so they are pickled, or rejected at encode time when pickle is disabled.
+"""
+
+import datetime as dt
+import json
+import pickle
+import uuid
+import zlib
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from ghl_real_estate_ai.ghl_utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import lz4.frame
+
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+
+MAGIC = 0xC1  # Never used by msgpack and never the first byte of a pickle
+CODEC_VERSION = 1
+
+FORMAT_MSGPACK = 1
+FORMAT_JSON = 2
+FORMAT_PICKLE = 3
+_FORMAT_IDS = {"msgpack": FORMAT_MSGPACK, "json": FORMAT_JSON, "pickle": FORMAT_PICKLE}
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+COMPRESSION_LZ4 = 3
+_COMPRESSION_IDS = {
+    "none": COMPRESSION_NONE,
+    "zlib": COMPRESSION_ZLIB,
+    "zstd": COMPRESSION_ZSTD,
+    "lz4": COMPRESSION_LZ4,
+}
+
+# msgpack extension type codes
+_EXT_DATETIME = 1
+_EXT_DATE = 2
+_EXT_DECIMAL = 3
+_EXT_UUID = 4
+_EXT_SET = 5
+_EXT_NDARRAY = 6
+_EXT_TUPLE = 7
+
+
+class CacheCodecError(ValueError):
+    """Raised when a value cannot be encoded or a payload cannot be decoded."""
+
+
+# ============================================================================
+# msgpack typed extensions
+# ============================================================================
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, dt.datetime):
+        return msgpack.ExtType(_EXT_DATETIME, obj.isoformat().encode())
+    if isinstance(obj, dt.date):
+        return msgpack.ExtType(_EXT_DATE, obj.isoformat().encode())
+    if isinstance(obj, Decimal):
+        return msgpack.ExtType(_EXT_DECIMAL, str(obj).encode())
+    if isinstance(obj, uuid.UUID):
+        return msgpack.ExtType(_EXT_UUID, obj.bytes)
+    if isinstance(obj, (set, frozenset)):
+        return msgpack.ExtType(_EXT_SET, _pack(list(obj)))
+    if isinstance(obj, np.ndarray) and obj.dtype != object:
+        array = np.ascontiguousarray(obj)
+        return msgpack.ExtType(_EXT_NDARRAY, _pack([array.dtype.str, list(array.shape), array.tobytes()]))
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if type(obj) is tuple:
+        return msgpack.ExtType(_EXT_TUPLE, _pack(list(obj)))
+    # strict_types routes subclasses of builtins here; keep the plain value for
+    # those that lose nothing readable (enums, OrderedDict, ...), but never
+    # flatten a namedtuple into a list
+    if isinstance(obj, tuple):
+        raise TypeError(f"Cannot msgpack-encode tuple subclass {type(obj).__name__}")
+    if isinstance(obj, str):
+        # str() of a str-mixin enum is its name, not its value
+        return str.__str__(obj)
+    for base in (bool, int, float, bytes, dict, list):
+        if isinstance(obj, base):
+            return base(obj)
+    raise TypeError(f"Cannot msgpack-encode {type(obj).__name__}")
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == _EXT_DATETIME:
+        return dt.datetime.fromisoformat(data.decode())
+    if code == _EXT_DATE:
+        return dt.date.fromisoformat(data.decode())
+    if code == _EXT_DECIMAL:
+        return Decimal(data.decode())
+    if code == _EXT_UUID:
+        return uuid.UUID(bytes=data)
+    if code == _EXT_SET:
+        return set(_unpack(data))
+    if code == _EXT_NDARRAY:
+        dtype, shape, raw = _unpack(data)
+        return np.frombuffer(raw, dtype=np.dtype(dtype)).reshape(shape).copy()
+    if code == _EXT_TUPLE:
+        return tuple(_unpack(data))
+    return msgpack.ExtType(code, data)
+
+
+def _pack(value: Any) -> bytes:
+    return msgpack.packb(value, default=_msgpack_default, use_bin_type=True, strict_types=True)
+
+
+def _unpack(data: bytes) -> Any:
+    return msgpack.unpackb(data, ext_hook=_msgpack_ext_hook, raw=False, strict_map_key=False)
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, (dt.datetime, dt.date)):
+        return obj.isoformat()
+    if isinstance(obj, (Decimal, uuid.UUID)):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Cannot json-encode {type(obj).__name__}")
+
+
+# ============================================================================
+# Compression
+# ============================================================================
+
+
+def _resolve_compression(name: str) -> int:
+    if name not in _COMPRESSION_IDS:
+        raise ValueError(f"Unknown cache compression: {name}")
+    if name == "zstd" and not ZSTD_AVAILABLE:
+        logger.warning("zstandard not installed, cache codec falling back to zlib compression")
+        return COMPRESSION_ZLIB
+    if name == "lz4" and not LZ4_AVAILABLE:
+        logger.warning("lz4 not installed, cache codec falling back to zlib compression")
+        return COMPRESSION_ZLIB
+    return _COMPRESSION_IDS[name]
+
+
+def _compress(method: int, data: bytes) -> bytes:
+    if method == COMPRESSION_ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    if method == COMPRESSION_LZ4:
+        return lz4.frame.compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(method: int, data: bytes) -> bytes:
+    if method == COMPRESSION_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise CacheCodecError("zstd-compressed cache payload but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if method == COMPRESSION_LZ4:
+        if not LZ4_AVAILABLE:
+            raise CacheCodecError("lz4-compressed cache payload but lz4 is not installed")
+        return lz4.frame.decompress(data)
+    if method == COMPRESSION_ZLIB:
+        return zlib.decompress(data)
+    raise CacheCodecError(f"Unknown cache compression id: {method}")
+
+
+# ============================================================================
+# Codec
+# ============================================================================
+
+
+class CacheCodec:
+    """
+    Versioned, optionally compressed serializer for cache values.
+
+    Args:
+        format: "msgpack" (default), "json" or "pickle"
+        compression: "zstd" (default), "lz4", "zlib" or "none"
+        compress_threshold: Only payloads at least this large are compressed
+        allow_pickle: Allow pickle for unsupported types and legacy payloads
+    """
+
+    def __init__(
+        self,
+        format: str = "msgpack",
+        compression: str = "zstd",
+        compress_threshold: int = 1024,
+        allow_pickle: bool = True,
+    ):
+        if format not in _FORMAT_IDS:
+            raise ValueError(f"Unknown cache format: {format}")
+        if format == "msgpack" and not MSGPACK_AVAILABLE:
+            logger.warning("msgpack not installed, cache codec falling back to pickle")
+            format = "pickle"
+        if format == "pickle" and not allow_pickle:
+            raise ValueError("Pickle cache format requires allow_pickle=True")
+
+        self.format = format
+        self.compression = _resolve_compression(compression)
+        self.compress_threshold = compress_threshold
+        self.allow_pickle = allow_pickle
+
+        self._encoders: Dict[int, Callable[[Any], bytes]] = {
+            FORMAT_MSGPACK: _pack,
+            FORMAT_JSON: self._encode_json,
+            FORMAT_PICKLE: lambda value: pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+        }
+
+    @staticmethod
+    def _encode_json(value: Any) -> bytes:
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(value, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(value, default=_json_default, separators=(",", ":")).encode()
+
+    def _serialize(self, value: Any) -> Tuple[int, bytes]:
+        fmt = _FORMAT_IDS[self.format]
+        try:
+            return fmt, self._encoders[fmt](value)
+        except (TypeError, ValueError, OverflowError) as e:
+            if fmt == FORMAT_PICKLE or not self.allow_pickle:
+                raise CacheCodecError(f"Cannot encode {type(value).__name__}: {e}") from e
+        try:
+            return FORMAT_PICKLE, self._encoders[FORMAT_PICKLE](value)
+        except Exception as e:
+            raise CacheCodecError(f"Cannot encode {type(value).__name__}: {e}") from e
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize ``value`` into a self-describing payload."""
+        fmt, body = self._serialize(value)
+
+        compression = COMPRESSION_NONE
+        if self.compression != COMPRESSION_NONE and len(body) >= self.compress_threshold:
+            compressed = _compress(self.compression, body)
+            if len(compressed) < len(body):
+                compression, body = self.compression, compressed
+
+        return bytes((MAGIC, CODEC_VERSION, (compression << 4) | fmt)) + body
+
+    def decode(self, data: bytes) -> Any:
+        """Deserialize a payload produced by ``encode`` (or a legacy raw pickle)."""
+        if not data:
+            raise CacheCodecError("Empty cache payload")
+
+        if data[0] != MAGIC:
+            return self._decode_legacy(data)
+        if len(data) < 3:
+            raise CacheCodecError("Truncated cache payload header")
+
+        version, flags = data[1], data[2]
+        if version > CODEC_VERSION:
+            raise CacheCodecError(f"Cache payload version {version} is newer than supported {CODEC_VERSION}")
+
+        fmt, compression = flags & 0x0F, flags >> 4
+        body = memoryview(data)[3:]
+        try:
+            if compression != COMPRESSION_NONE:
+                body = _decompress(compression, bytes(body))
+            if fmt == FORMAT_MSGPACK:
+                return _unpack(body)
+            if fmt == FORMAT_JSON:
+                return orjson.loads(body) if ORJSON_AVAILABLE else json.loads(bytes(body))
+            if fmt == FORMAT_PICKLE:
+                if not self.allow_pickle:
+                    raise CacheCodecError("Pickle cache payloads are disabled")
+                return pickle.loads(body)
+        except CacheCodecError:
+            raise
+        except Exception as e:
+            raise CacheCodecError(f"Corrupt cache payload: {e}") from e
+        raise CacheCodecError(f"Unknown cache format id: {fmt}")
+
+    def _decode_legacy(self, data: bytes) -> Any:
+        if not self.allow_pickle:
+            raise CacheCodecError("Legacy pickle cache payloads are disabled")
+        try:
+            return pickle.loads(data)
+        except Exception as e:
+            raise CacheCodecError(f"Corrupt legacy cache payload: {e}") from e
+
+
+_default_codec: Optional[CacheCodec] = None
+
+
+def get_default_codec() -> CacheCodec:
+    """Get the shared codec used by the Redis-backed caches."""
+    global _default_codec
+    if _default_codec is None:
+        _default_codec = CacheCodec()
+    return _default_codec
+
+
+__all__ = ["CacheCodec", "CacheCodecError", "get_default_codec"]
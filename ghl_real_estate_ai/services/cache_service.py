@@ -18,6 +18,9 @@ from typing import Any, Dict, List, Optional
 
 from ghl_real_estate_ai.ghl_utils.config import settings
 from ghl_real_estate_ai.ghl_utils.logger import get_logger
+from ghl_real_estate_ai.services.cache_codec import CacheCodec, CacheCodecError, get_default_codec
+from ghl_real_estate_ai.services.cache_single_flight import RedisLease, StampedeGuard, unwrap_entry
+from ghl_real_estate_ai.services.cache_tags import LocalTagIndex, RedisTagIndex
 from ghl_real_estate_ai.utils.async_utils import safe_create_task
 
 logger = get_logger(__name__)
@@ -32,8 +35,8 @@ class AbstractCache(ABC):
         pass
 
     @abstractmethod
-    async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
-        """Set value in cache with TTL in seconds."""
+    async def set(self, key: str, value: Any, ttl: int = 300, tags: Optional[List[str]] = None) -> bool:
+        """Set value in cache with TTL in seconds, optionally tagged for invalidate_tags."""
         pass
 
     @abstractmethod
@@ -58,6 +61,7 @@ class MemoryCache(AbstractCache):
         self._max_memory_bytes = max_memory_mb * 1024 * 1024
         self._current_memory = 0
         self._memory_lock: Optional[asyncio.Lock] = None
+        self._tag_index = LocalTagIndex()
         logger.info(f"Initialized MemoryCache (max_size={max_size}, max_memory={max_memory_mb}MB)")
 
     def _get_lock(self) -> asyncio.Lock:
@@ -82,7 +86,7 @@ class MemoryCache(AbstractCache):
 
             return self._cache[key]
 
-    async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
+    async def set(self, key: str, value: Any, ttl: int = 300, tags: Optional[List[str]] = None) -> bool:
         async with self._get_lock():
             try:
                 # Estimate memory usage
@@ -110,6 +114,8 @@ class MemoryCache(AbstractCache):
                 self._expiry[key] = time.time() + ttl
                 self._access_order.append(key)
                 self._current_memory += value_size
+                if tags:
+                    self._tag_index.add([key], tags)
 
                 return True
             except (TypeError, ValueError) as e:
@@ -126,8 +132,18 @@ class MemoryCache(AbstractCache):
             self._expiry.clear()
             self._access_order.clear()
             self._current_memory = 0
+            self._tag_index.clear()
             return True
 
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """Delete every key tagged with any of the given tags."""
+        async with self._get_lock():
+            deleted = 0
+            for key in self._tag_index.pop(tags):
+                if await self._remove_item_internal(key):
+                    deleted += 1
+            return deleted
+
     async def _remove_item_internal(self, key: str) -> bool:
         """Internal method to remove item (assumes lock is held)"""
         if key in self._cache:
@@ -141,6 +157,7 @@ class MemoryCache(AbstractCache):
             del self._expiry[key]
             if key in self._access_order:
                 self._access_order.remove(key)
+            self._tag_index.discard(key)
             return True
         return False
 
@@ -171,6 +188,7 @@ class FileCache(AbstractCache):
         self.cache_dir = cache_dir
         os.makedirs(cache_dir, exist_ok=True)
         self._file_lock: Optional[asyncio.Lock] = None
+        self._tag_index = LocalTagIndex()
         logger.info(f"Initialized FileCache at {cache_dir}")
 
     def _get_lock(self) -> asyncio.Lock:
@@ -198,6 +216,7 @@ class FileCache(AbstractCache):
 
             if time.time() > data["expiry"]:
                 os.remove(path)
+                self._tag_index.discard(key)
                 return None
 
             return data["value"]
@@ -205,13 +224,16 @@ class FileCache(AbstractCache):
             logger.warning(f"FileCache read error for {key}: {str(e)}")
             return None
 
-    async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
+    async def set(self, key: str, value: Any, ttl: int = 300, tags: Optional[List[str]] = None) -> bool:
         path = self._get_path(key)
         data = {"value": value, "expiry": time.time() + ttl}
         try:
             async with self._get_lock():
                 with open(path, "wb") as f:
                     pickle.dump(data, f)
+            self._tag_index.discard(key)
+            if tags:
+                self._tag_index.add([key], tags)
             return True
         except (IOError, pickle.PickleError, TypeError) as e:
             logger.error(f"FileCache write error for {key}: {str(e)}")
@@ -219,6 +241,7 @@ class FileCache(AbstractCache):
 
     async def delete(self, key: str) -> bool:
         path = self._get_path(key)
+        self._tag_index.discard(key)
         if os.path.exists(path):
             try:
                 os.remove(path)
@@ -232,16 +255,32 @@ class FileCache(AbstractCache):
             for f in os.listdir(self.cache_dir):
                 if f.endswith(".pickle"):
                     os.remove(os.path.join(self.cache_dir, f))
+            self._tag_index.clear()
             return True
         except OSError as e:
             logger.error(f"FileCache clear error: {str(e)}")
             return False
 
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """Delete every key tagged with any of the given tags (tags are tracked in-process)."""
+        deleted = 0
+        for key in self._tag_index.pop(tags):
+            if await self.delete(key):
+                deleted += 1
+        return deleted
+
 
 class RedisCache(AbstractCache):
     """Redis-based cache for production with advanced optimization."""
 
-    def __init__(self, redis_url: str, max_connections: int = 50, min_connections: int = 10):
+    def __init__(
+        self,
+        redis_url: str,
+        max_connections: int = 50,
+        min_connections: int = 10,
+        codec: Optional[CacheCodec] = None,
+    ):
+        self.codec = codec or get_default_codec()
         try:
             import redis.asyncio as redis
             from redis.asyncio.connection import ConnectionPool
@@ -255,10 +294,11 @@ class RedisCache(AbstractCache):
                 socket_keepalive=True,  # Keep connections alive
                 health_check_interval=30,  # More frequent health checks
                 retry_on_timeout=True,  # Retry on timeout
-                decode_responses=False,  # We handle encoding with pickle
+                decode_responses=False,  # Payloads are encoded by the cache codec
             )
 
             self.redis = redis.Redis(connection_pool=self.connection_pool)
+            self.tag_index = RedisTagIndex(self.redis)
             self.enabled = True
 
             # Performance metrics tracking
@@ -286,13 +326,13 @@ class RedisCache(AbstractCache):
         try:
             data = await self.redis.get(key)
             if data:
-                result = pickle.loads(data)
+                result = self.codec.decode(data)
                 self.metrics["hits"] += 1
                 return result
             else:
                 self.metrics["misses"] += 1
                 return None
-        except (pickle.PickleError, AttributeError, EOFError, ImportError) as e:
+        except CacheCodecError as e:
             logger.error(f"Redis get deserialization error for key {key}: {str(e)}")
             self.metrics["misses"] += 1
             return None
@@ -304,7 +344,7 @@ class RedisCache(AbstractCache):
             self.metrics["total_time_ms"] += (time.time() - start_time) * 1000
             self.metrics["operation_count"] += 1
 
-    async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
+    async def set(self, key: str, value: Any, ttl: int = 300, tags: Optional[List[str]] = None) -> bool:
         if not self.enabled:
             return False
 
@@ -313,11 +353,18 @@ class RedisCache(AbstractCache):
         start_time = time.time()
 
         try:
-            data = pickle.dumps(value)
-            await self.redis.set(key, data, ex=int(ttl))
+            data = self.codec.encode(value)
+            if tags:
+                # Value and tag membership go out in one round trip
+                pipeline = self.redis.pipeline(transaction=False)
+                pipeline.set(key, data, ex=int(ttl))
+                self.tag_index.add_to_pipeline(pipeline, [key], tags, ttl)
+                await pipeline.execute()
+            else:
+                await self.redis.set(key, data, ex=int(ttl))
             self.metrics["sets"] += 1
             return True
-        except (pickle.PickleError, TypeError) as e:
+        except CacheCodecError as e:
             logger.error(f"Redis set serialization error for key {key}: {str(e)}")
             return False
         except Exception as e:
@@ -388,7 +435,7 @@ class RedisCache(AbstractCache):
             for key, data in zip(keys, results):
                 if data:
                     try:
-                        output[key] = pickle.loads(data)
+                        output[key] = self.codec.decode(data)
                         hits += 1
                     except Exception as e:
                         logger.warning(f"Failed to deserialize cached data for key {key}: {e}")
@@ -404,7 +451,7 @@ class RedisCache(AbstractCache):
             self.metrics["total_time_ms"] += (time.time() - start_time) * 1000
             self.metrics["operation_count"] += len(keys)
 
-    async def set_many(self, items: dict[str, Any], ttl: int = 300) -> bool:
+    async def set_many(self, items: dict[str, Any], ttl: int = 300, tags: Optional[List[str]] = None) -> bool:
         """Batch set multiple items using pipeline for maximum performance."""
         if not self.enabled or not items:
             return False
@@ -418,14 +465,19 @@ class RedisCache(AbstractCache):
             pipeline = self.redis.pipeline()
             successful_items = 0
 
+            tagged_keys = []
             for key, value in items.items():
                 try:
-                    data = pickle.dumps(value)
+                    data = self.codec.encode(value)
                     pipeline.set(key, data, ex=int(ttl))
+                    tagged_keys.append(key)
                     successful_items += 1
                 except Exception as e:
                     logger.warning(f"Failed to serialize value for key {key}: {e}")
 
+            if tags:
+                self.tag_index.add_to_pipeline(pipeline, tagged_keys, tags, ttl)
+
             if successful_items > 0:
                 await pipeline.execute()
                 self.metrics["sets"] += successful_items
@@ -547,19 +599,68 @@ class RedisCache(AbstractCache):
         """Reset performance metrics."""
         self.metrics = {"hits": 0, "misses": 0, "sets": 0, "deletes": 0, "total_time_ms": 0.0, "operation_count": 0}
 
+    # TAG-BASED INVALIDATION
+
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """Delete exactly the keys tagged with any of the given tags, in one pipeline."""
+        if not self.enabled or not tags:
+            return 0
+        try:
+            deleted = await self.tag_index.invalidate(tags)
+            self.metrics["deletes"] += deleted
+            return deleted
+        except Exception as e:
+            logger.error(f"Redis tag invalidation error for tags {tags}: {e}", exc_info=True)
+            return 0
+
     # CACHE WARMING AND PRELOADING FEATURES
 
-    async def warm_cache_from_pattern(self, pattern: str, computation_func, ttl: int = 300):
-        """Warm cache for keys matching pattern."""
+    async def warm_cache_for_tag(self, tag: str, computation_func, ttl: int = 300) -> int:
+        """Recompute the expired keys that carry a tag; returns the number of keys warmed."""
         if not self.enabled:
-            return
+            return 0
 
         try:
-            # Get all keys matching pattern
-            keys = await self.redis.keys(pattern)
+            keys = sorted(await self.tag_index.members(tag))
+            if not keys:
+                return 0
 
-            # Warm cache for missing keys
+            pipeline = self.redis.pipeline(transaction=False)
             for key in keys:
+                pipeline.exists(key)
+            missing = [key for key, found in zip(keys, await pipeline.execute()) if not found]
+
+            warmed = {}
+            for key in missing:
+                try:
+                    if asyncio.iscoroutinefunction(computation_func):
+                        warmed[key] = await computation_func(key)
+                    else:
+                        warmed[key] = computation_func(key)
+                except Exception as e:
+                    logger.warning(f"Failed to warm cache for key {key}: {e}")
+
+            if warmed:
+                await self.set_many(warmed, ttl, tags=[tag])
+
+            logger.info(f"Cache warming completed for tag {tag}, warmed {len(warmed)}/{len(keys)} keys")
+            return len(warmed)
+        except Exception as e:
+            logger.error(f"Cache warming error for tag {tag}: {e}", exc_info=True)
+            return 0
+
+    async def warm_cache_from_pattern(self, pattern: str, computation_func, ttl: int = 300):
+        """Warm cache for keys matching pattern.
+
+        Walks the keyspace with SCAN; prefer tagging keys and warm_cache_for_tag.
+        """
+        if not self.enabled:
+            return
+
+        try:
+            processed = 0
+            async for key in self.redis.scan_iter(match=pattern, count=500):
+                processed += 1
                 if not await self.exists(key):
                     try:
                         if asyncio.iscoroutinefunction(computation_func):
@@ -570,7 +671,7 @@ class RedisCache(AbstractCache):
                     except Exception as e:
                         logger.warning(f"Failed to warm cache for key {key}: {e}")
 
-            logger.info(f"Cache warming completed for pattern {pattern}, processed {len(keys)} keys")
+            logger.info(f"Cache warming completed for pattern {pattern}, processed {processed} keys")
         except Exception as e:
             logger.error(f"Cache warming error for pattern {pattern}: {e}", exc_info=True)
 
@@ -645,6 +746,8 @@ class CacheService:
         self.backend: AbstractCache = None
         self.fallback_backend: AbstractCache = None
         self.circuit_breaker = {"failures": 0, "last_failure": 0, "open": False}
+        self._lease: Optional[RedisLease] = None
+        self._stampede_guard = StampedeGuard(read=self._get_raw, write=self.set, lease_provider=self._stampede_lease)
 
         # Try Redis first if configured
         if settings.redis_url:
@@ -710,18 +813,27 @@ class CacheService:
 
             return None
 
+    async def _get_raw(self, key: str) -> Optional[Any]:
+        return await self._execute_with_fallback(self.backend.get, key)
+
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache with automatic fallback."""
-        return await self._execute_with_fallback(self.backend.get, key)
+        value, fresh = unwrap_entry(await self._get_raw(key))
+        return value if fresh else None
+
+    async def set(self, key: str, value: Any, ttl: int = 300, tags: Optional[List[str]] = None) -> bool:
+        """Set value in cache with automatic fallback.
 
-    async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
-        """Set value in cache with automatic fallback."""
-        result = await self._execute_with_fallback(self.backend.set, key, value, ttl)
+        Tags (e.g. ``lead:{id}``) record the key as a dependent so that
+        invalidate_tags can delete it without scanning the keyspace.
+        """
+        tag_kwargs = {"tags": tags} if tags else {}
+        result = await self._execute_with_fallback(self.backend.set, key, value, ttl, **tag_kwargs)
 
         # Also set in fallback if primary succeeded and fallback exists
         if result and self.fallback_backend and not self.circuit_breaker["open"]:
             try:
-                await self.fallback_backend.set(key, value, ttl)
+                await self.fallback_backend.set(key, value, ttl, **tag_kwargs)
             except Exception as e:
                 logger.debug(f"Secondary failure in fallback cache set for {key}: {str(e)}")
 
@@ -740,6 +852,24 @@ class CacheService:
 
         return bool(result)
 
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """Delete every key tagged with any of the given tags; returns the primary backend's count."""
+        if not tags:
+            return 0
+
+        result = 0
+        if hasattr(self.backend, "invalidate_tags"):
+            result = await self._execute_with_fallback(self.backend.invalidate_tags, tags)
+
+        # Also invalidate fallback so it cannot serve the dependents
+        if self.fallback_backend and hasattr(self.fallback_backend, "invalidate_tags"):
+            try:
+                await self.fallback_backend.invalidate_tags(tags)
+            except Exception as e:
+                logger.debug(f"Secondary failure in fallback cache invalidate_tags for {tags}: {str(e)}")
+
+        return int(result or 0)
+
     async def clear(self) -> bool:
         """Clear all cache with automatic fallback."""
         result = await self._execute_with_fallback(self.backend.clear)
@@ -777,7 +907,12 @@ class CacheService:
     async def get_many(self, keys: list[str]) -> dict[str, Any]:
         """Batch get multiple keys for improved performance."""
         if hasattr(self.backend, "get_many"):
-            return await self._execute_with_fallback(self.backend.get_many, keys) or {}
+            results = {}
+            for key, raw in (await self._execute_with_fallback(self.backend.get_many, keys) or {}).items():
+                value, fresh = unwrap_entry(raw)
+                if fresh:
+                    results[key] = value
+            return results
 
         # Fallback: sequential gets for backends without batch support
         results = {}
@@ -787,52 +922,48 @@ class CacheService:
                 results[key] = value
         return results
 
-    async def set_many(self, items: dict[str, Any], ttl: int = 300) -> bool:
+    async def set_many(self, items: dict[str, Any], ttl: int = 300, tags: Optional[List[str]] = None) -> bool:
         """Batch set multiple items for improved performance."""
         if hasattr(self.backend, "set_many"):
-            result = await self._execute_with_fallback(self.backend.set_many, items, ttl)
+            tag_kwargs = {"tags": tags} if tags else {}
+            result = await self._execute_with_fallback(self.backend.set_many, items, ttl, **tag_kwargs)
             return bool(result)
 
         # Fallback: sequential sets for backends without batch support
         success_count = 0
         for key, value in items.items():
-            if await self.set(key, value, ttl):
+            if await self.set(key, value, ttl, tags):
                 success_count += 1
 
         return success_count == len(items)
 
-    async def cached_computation(self, key: str, computation_func, ttl: int = 300, *args, **kwargs) -> Any:
-        """Cache the result of a computation with automatic key management and performance tracking."""
-        import time
+    def _stampede_lease(self) -> Optional[RedisLease]:
+        """Lease for cross-pod single flight; only available on a healthy Redis backend."""
+        redis = getattr(self.backend, "redis", None)
+        if redis is None or not getattr(self.backend, "enabled", False) or self.circuit_breaker["open"]:
+            return None
+        if self._lease is None or self._lease.redis is not redis:
+            self._lease = RedisLease(redis)
+        return self._lease
 
-        start_time = time.time()
+    async def get_or_compute(self, key: str, compute_func, ttl: int = 300, stale_ttl: int = 0) -> Any:
+        """
+        Get a cached value, computing it on a miss with stampede protection.
 
-        # Check cache first
-        cached_result = await self.get(key)
-        if cached_result is not None:
-            logger.debug(f"Cache hit for computation key: {key} ({(time.time() - start_time) * 1000:.2f}ms)")
-            return cached_result
+        Concurrent misses for the same key share one computation in this
+        process and, on Redis, one computation across pods. With stale_ttl > 0
+        an expired value is served for that many extra seconds while a single
+        background task refreshes it.
+        """
+        return await self._stampede_guard.get_or_compute(key, compute_func, ttl, stale_ttl)
 
-        # Compute and cache result
-        logger.debug(f"Cache miss for computation key: {key}, computing...")
-        compute_start = time.time()
+    async def cached_computation(self, key: str, computation_func, ttl: int = 300, *args, **kwargs) -> Any:
+        """Cache the result of a computation with automatic key management and performance tracking."""
+        start_time = time.time()
 
         try:
-            if asyncio.iscoroutinefunction(computation_func):
-                result = await computation_func(*args, **kwargs)
-            else:
-                result = computation_func(*args, **kwargs)
-
-            compute_time = (time.time() - compute_start) * 1000
-
-            # Cache the result
-            await self.set(key, result, ttl)
-
-            total_time = (time.time() - start_time) * 1000
-            logger.debug(
-                f"Computation cached for key: {key} (compute: {compute_time:.2f}ms, total: {total_time:.2f}ms)"
-            )
-
+            result = await self.get_or_compute(key, functools.partial(computation_func, *args, **kwargs), ttl)
+            logger.debug(f"Cached computation for key: {key} ({(time.time() - start_time) * 1000:.2f}ms)")
             return result
         except Exception as e:
             logger.error(f"Computation failed for key {key}: {e}", exc_info=True)
@@ -901,6 +1032,7 @@ class CacheService:
             "backend_type": type(self.backend).__name__,
             "fallback_available": self.fallback_backend is not None,
             "circuit_breaker": self.circuit_breaker.copy(),
+            "single_flight": self._stampede_guard.get_stats(),
             "performance_metrics": {},
         }
 
@@ -1053,8 +1185,14 @@ class TenantScopedCache:
     async def get(self, key: str) -> Optional[Any]:
         return await self.cache.get(self._scope_key(key))
 
-    async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
-        return await self.cache.set(self._scope_key(key), value, ttl)
+    async def set(self, key: str, value: Any, ttl: int = 300, tags: Optional[List[str]] = None) -> bool:
+        return await self.cache.set(self._scope_key(key), value, ttl, self._scope_tags(tags))
+
+    def _scope_tags(self, tags: Optional[List[str]]) -> Optional[List[str]]:
+        return [self._scope_key(tag) for tag in tags] if tags else None
+
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        return await self.cache.invalidate_tags(self._scope_tags(tags) or [])
 
     async def delete(self, key: str) -> bool:
         return await self.cache.delete(self._scope_key(key))
@@ -1068,9 +1206,9 @@ class TenantScopedCache:
         # Unscope keys for the caller
         return {k.split(":", 2)[-1]: v for k, v in results.items()}
 
-    async def set_many(self, items: dict[str, Any], ttl: int = 300) -> bool:
+    async def set_many(self, items: dict[str, Any], ttl: int = 300, tags: Optional[List[str]] = None) -> bool:
         scoped_items = {self._scope_key(k): v for k, v in items.items()}
-        return await self.cache.set_many(scoped_items, ttl)
+        return await self.cache.set_many(scoped_items, ttl, self._scope_tags(tags))
 
     async def exists(self, key: str) -> bool:
         return await self.cache.exists(self._scope_key(key))
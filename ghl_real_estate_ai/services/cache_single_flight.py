@@ -0,0 +1,278 @@
+"""
+Cache Single-Flight - Stampede protection for cache-miss recomputation.
+
+Three layers, each optional on top of the previous one:
+
+- SingleFlight: concurrent misses for the same key in one process share a
+  single in-flight computation
+- RedisLease: a short Redis lock (SET NX PX) so only one pod recomputes a
+  key; other pods poll the cache until the holder writes the value
+- Stale-while-revalidate: values are written with a freshness deadline and
+  kept for an extra ``stale_ttl``; an expired-but-stale value is served
+  immediately while one background task recomputes it
+
+StampedeGuard ties these together for a cache exposed as read/write
+coroutines, which lets each cache service keep its own layering.
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from ghl_real_estate_ai.ghl_utils.logger import get_logger
+from ghl_real_estate_ai.utils.async_utils import safe_create_task
+
+logger = get_logger(__name__)
+
+ENTRY_MARKER = "__cache_entry__"
+
+# Deletes the lease only if it is still held by the caller's token
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+async def _call(func: Callable[[], Any]) -> Any:
+    """Call a sync or async zero-argument function."""
+    result = func()
+    if asyncio.iscoroutine(result):
+        result = await result
+    return result
+
+
+# ============================================================================
+# Cache entries with a freshness deadline
+# ============================================================================
+
+
+def make_entry(value: Any, ttl: int) -> Dict[str, Any]:
+    """Wrap a value with the time until which it counts as fresh."""
+    return {ENTRY_MARKER: 1, "value": value, "fresh_until": time.time() + ttl}
+
+
+def unwrap_entry(raw: Any) -> Tuple[Any, bool]:
+    """
+    Split a cached value into (value, is_fresh).
+
+    Values that were not written through make_entry are returned as fresh;
+    their expiry is left to the backend TTL.
+    """
+    if isinstance(raw, dict) and ENTRY_MARKER in raw:
+        return raw.get("value"), time.time() < raw.get("fresh_until", 0)
+    return raw, True
+
+
+# ============================================================================
+# In-process single flight
+# ============================================================================
+
+
+class SingleFlight:
+    """Runs at most one computation per key at a time within this process."""
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.computations = 0
+        self.coalesced = 0
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._inflight
+
+    async def run(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await ``func()`` for ``key``, or join the computation already running.
+
+        The computation runs in a task owned by the SingleFlight, so every
+        caller, including the one that started it, only waits on it. Every
+        caller gets the same result or exception, and cancelling any caller
+        leaves the shared computation running for the others.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            self.computations += 1
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved so a failure nobody awaited is not logged
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._inflight),
+            "computations": self.computations,
+            "coalesced": self.coalesced,
+        }
+
+
+# ============================================================================
+# Cross-pod lease
+# ============================================================================
+
+
+class RedisLease:
+    """
+    Short-lived Redis lock that elects one pod to recompute a key.
+
+    The lease expires on its own after ``lease_ttl`` seconds, so a pod that
+    dies mid-computation only delays the others, it never blocks them.
+    """
+
+    def __init__(
+        self,
+        redis,
+        lease_ttl: float = 30.0,
+        wait_timeout: float = 10.0,
+        poll_interval: float = 0.05,
+        prefix: str = "lease:",
+    ):
+        self.redis = redis
+        self.lease_ttl = lease_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.prefix = prefix
+
+    async def acquire(self, key: str) -> Optional[str]:
+        """Try to take the lease; returns the owner token, or None if held elsewhere."""
+        token = uuid.uuid4().hex
+        acquired = await self.redis.set(self.prefix + key, token, nx=True, px=int(self.lease_ttl * 1000))
+        return token if acquired else None
+
+    async def release(self, key: str, token: str) -> None:
+        try:
+            await self.redis.eval(_RELEASE_SCRIPT, 1, self.prefix + key, token)
+        except Exception as e:
+            logger.warning(f"Failed to release cache lease for {key}: {e}")
+
+    async def is_held(self, key: str) -> bool:
+        return bool(await self.redis.exists(self.prefix + key))
+
+
+# ============================================================================
+# Guard
+# ============================================================================
+
+
+class StampedeGuard:
+    """
+    get_or_compute on top of a cache's read/write coroutines.
+
+    Args:
+        read: ``async (key) -> raw cached value or None``
+        write: ``async (key, value, ttl) -> bool``
+        lease_provider: Returns the RedisLease to use, or None for in-process only
+    """
+
+    def __init__(
+        self,
+        read: Callable[[str], Awaitable[Any]],
+        write: Callable[[str, Any, int], Awaitable[Any]],
+        lease_provider: Optional[Callable[[], Optional[RedisLease]]] = None,
+    ):
+        self._read = read
+        self._write = write
+        self._lease_provider = lease_provider
+        self.single_flight = SingleFlight()
+        self.stale_served = 0
+        self.lease_waits = 0
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Any], ttl: int = 300, stale_ttl: int = 0) -> Any:
+        """
+        Return the cached value for ``key``, computing it at most once on a miss.
+
+        With ``stale_ttl`` > 0 an expired value is kept that many extra seconds;
+        during that window it is returned immediately and refreshed in the
+        background. ``compute`` may be sync or async. None results are not cached.
+        """
+        raw = await self._read(key)
+        if raw is not None:
+            value, fresh = unwrap_entry(raw)
+            if fresh:
+                return value
+            if stale_ttl > 0:
+                self.stale_served += 1
+                if not self.single_flight.in_flight(key):
+                    safe_create_task(self._background_refresh(key, compute, ttl, stale_ttl))
+                return value
+
+        return await self.single_flight.run(key, lambda: self._refresh(key, compute, ttl, stale_ttl))
+
+    async def _refresh(self, key: str, compute: Callable[[], Any], ttl: int, stale_ttl: int) -> Any:
+        lease = self._lease_provider() if self._lease_provider else None
+        if lease is None:
+            return await self._compute_and_store(key, compute, ttl, stale_ttl)
+
+        try:
+            token = await lease.acquire(key)
+        except Exception as e:
+            logger.warning(f"Cache lease unavailable for {key}, computing locally: {e}")
+            return await self._compute_and_store(key, compute, ttl, stale_ttl)
+
+        if token is None:
+            found, value = await self._wait_for_holder(key, lease)
+            if found:
+                return value
+            return await self._compute_and_store(key, compute, ttl, stale_ttl)
+
+        try:
+            # Another pod may have finished between our read and the lease
+            raw = await self._read(key)
+            if raw is not None:
+                value, fresh = unwrap_entry(raw)
+                if fresh:
+                    return value
+            return await self._compute_and_store(key, compute, ttl, stale_ttl)
+        finally:
+            await lease.release(key, token)
+
+    async def _wait_for_holder(self, key: str, lease: RedisLease) -> Tuple[bool, Any]:
+        """Poll until the lease holder writes a fresh value, gives up, or we time out."""
+        self.lease_waits += 1
+        deadline = time.monotonic() + lease.wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(lease.poll_interval)
+            raw = await self._read(key)
+            if raw is not None:
+                value, fresh = unwrap_entry(raw)
+                if fresh:
+                    return True, value
+            try:
+                if not await lease.is_held(key):
+                    return False, None
+            except Exception:
+                return False, None
+        logger.warning(f"Timed out waiting for cache lease holder of {key}")
+        return False, None
+
+    async def _compute_and_store(self, key: str, compute: Callable[[], Any], ttl: int, stale_ttl: int) -> Any:
+        value = await _call(compute)
+        if value is not None:
+            await self._write(key, make_entry(value, ttl), ttl + max(0, stale_ttl))
+        return value
+
+    async def _background_refresh(self, key: str, compute: Callable[[], Any], ttl: int, stale_ttl: int):
+        try:
+            await self.single_flight.run(key, lambda: self._refresh(key, compute, ttl, stale_ttl))
+            logger.debug(f"Stale cache value refreshed for key: {key}")
+        except Exception as e:
+            logger.error(f"Background cache refresh failed for key {key}: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            **self.single_flight.get_stats(),
+            "stale_served": self.stale_served,
+            "lease_waits": self.lease_waits,
+        }
+
+
+__all__ = ["RedisLease", "SingleFlight", "StampedeGuard", "make_entry", "unwrap_entry"]
@@ -0,0 +1,142 @@
+"""
+Cache Tags - Dependency tracking for targeted cache invalidation.
+
+Each tag (e.g. ``lead:{id}``, ``location:{id}``) is a Redis set holding the
+keys that depend on it. Tagging rides along in the pipeline that writes the
+value, and ``invalidate`` deletes exactly the member keys, so invalidating a
+lead costs O(dependents) instead of a SCAN/KEYS pass over the keyspace.
+Invalidation runs as one Lua script, so a key tagged while it runs is either
+deleted with the rest or stays in its tag set for the next invalidation.
+
+A tag set expires with its longest-lived member (EXPIRE NX + GT, Redis 7+).
+Members whose keys expired on their own stay in the set until then; deleting
+them during invalidation is a harmless no-op.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set
+
+from ghl_real_estate_ai.ghl_utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TAG_PREFIX = "tag:"
+DELETE_CHUNK_SIZE = 500
+
+# KEYS: tag sets; ARGV[1]: delete chunk size (keeps unpack() under Lua's stack limit)
+_INVALIDATE_SCRIPT = """
+local chunk = tonumber(ARGV[1])
+local deleted = 0
+for _, tag_key in ipairs(KEYS) do
+    local members = redis.call('SMEMBERS', tag_key)
+    for i = 1, #members, chunk do
+        deleted = deleted + redis.call('DEL', unpack(members, i, math.min(i + chunk - 1, #members)))
+    end
+    redis.call('DEL', tag_key)
+end
+return deleted
+"""
+
+
+class RedisTagIndex:
+    """Tag -> keys index stored as Redis sets."""
+
+    def __init__(self, redis, prefix: str = TAG_PREFIX):
+        self.redis = redis
+        self.prefix = prefix
+        self._invalidate_script = None
+
+    def tag_key(self, tag: str) -> str:
+        return f"{self.prefix}{tag}"
+
+    def add_to_pipeline(self, pipeline, keys: Iterable[str], tags: Iterable[str], ttl: int) -> None:
+        """Queue the SADD/EXPIRE commands tagging ``keys`` on an existing pipeline."""
+        keys = list(keys)
+        if not keys:
+            return
+        for tag in tags:
+            tag_key = self.tag_key(tag)
+            pipeline.sadd(tag_key, *keys)
+            pipeline.expire(tag_key, int(ttl), nx=True)  # First member sets the lifetime
+            pipeline.expire(tag_key, int(ttl), gt=True)  # Longer-lived members extend it
+
+    async def add(self, keys: Iterable[str], tags: Iterable[str], ttl: int) -> None:
+        pipeline = self.redis.pipeline(transaction=False)
+        self.add_to_pipeline(pipeline, keys, tags, ttl)
+        await pipeline.execute()
+
+    async def members(self, tag: str) -> Set[str]:
+        members = await self.redis.smembers(self.tag_key(tag))
+        return {m.decode() if isinstance(m, bytes) else m for m in members}
+
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        """Delete every key carrying any of ``tags`` along with the tag sets; returns keys deleted."""
+        tags = list(dict.fromkeys(tags))
+        tag_keys = [self.tag_key(tag) for tag in tags]
+        if not tag_keys:
+            return 0
+
+        if self._invalidate_script is None:
+            self._invalidate_script = self.redis.register_script(_INVALIDATE_SCRIPT)
+        # Read and delete atomically; members a key shares across tags are deleted (and counted) once
+        deleted = int(await self._invalidate_script(keys=tag_keys, args=[DELETE_CHUNK_SIZE]))
+
+        logger.debug(f"Invalidated {deleted} cache keys for tags {tags}")
+        return deleted
+
+
+class LocalTagIndex:
+    """
+    In-process tag -> keys index for memory, file and L1 caches.
+
+    A reverse key -> tags map lets caches ``discard`` a key on eviction,
+    expiry or delete, so the index never outgrows the cache it tracks.
+    """
+
+    def __init__(self):
+        self._tags: Dict[str, Set[str]] = defaultdict(set)
+        self._keys: Dict[str, Set[str]] = defaultdict(set)
+
+    def add(self, keys: Iterable[str], tags: Iterable[str]) -> None:
+        keys = list(keys)
+        tags = list(tags)
+        for tag in tags:
+            self._tags[tag].update(keys)
+        for key in keys:
+            self._keys[key].update(tags)
+
+    def members(self, tag: str) -> Set[str]:
+        return set(self._tags.get(tag, ()))
+
+    def discard(self, key: str) -> None:
+        """Forget ``key`` under every tag; tags left without members are dropped."""
+        for tag in self._keys.pop(key, ()):
+            members = self._tags.get(tag)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self._tags[tag]
+
+    def pop(self, tags: Iterable[str]) -> List[str]:
+        """Remove ``tags`` and return the keys that carried any of them."""
+        keys: Set[str] = set()
+        for tag in tags:
+            members = self._tags.pop(tag, ())
+            keys.update(members)
+            for key in members:
+                key_tags = self._keys.get(key)
+                if key_tags is not None:
+                    key_tags.discard(tag)
+                    if not key_tags:
+                        del self._keys[key]
+        return list(keys)
+
+    def clear(self) -> None:
+        self._tags.clear()
+        self._keys.clear()
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+
+__all__ = ["LocalTagIndex", "RedisTagIndex"]
@@ -0,0 +1,284 @@
+"""
+Event Fan-out - Bounded priority lanes and streaming latency statistics.
+
+Building blocks for EventPublisher:
+
+- EventLane: bounded FIFO for one priority with an overflow policy
+  ("block", "drop_oldest" or "drop_newest"). Above a high watermark,
+  events that share a coalesce key replace the pending one instead of
+  queuing behind it, so slow WebSocket consumers see the latest state
+  rather than a growing backlog.
+- LatencyHistogram: log-bucketed histogram over a rolling two-window span.
+  Recording is O(1); mean, max and percentiles cost O(buckets).
+
+Lanes are meant for a single event loop and are not thread-safe.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Generic, Hashable, List, Optional, TypeVar
+
+from ghl_real_estate_ai.ghl_utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+QUEUED = "queued"
+COALESCED = "coalesced"
+DROPPED = "dropped"
+
+
+# ============================================================================
+# Streaming latency histogram
+# ============================================================================
+
+
+class LatencyHistogram:
+    """
+    Rolling latency histogram with log-spaced buckets.
+
+    Observations land in the current window; when it is older than
+    ``window_seconds`` it becomes the previous window and a fresh one starts.
+    Statistics cover both windows, i.e. the last one to two windows of data.
+
+    Args:
+        window_seconds: Length of each window
+        min_ms: Upper bound of the first bucket
+        growth: Ratio between consecutive bucket bounds (1.25 keeps <=12.5% error)
+        max_ms: Values above this share the last bucket
+    """
+
+    def __init__(
+        self, window_seconds: float = 60.0, min_ms: float = 0.01, growth: float = 1.25, max_ms: float = 60000.0
+    ):
+        self.window_seconds = window_seconds
+        self.min_ms = min_ms
+        self._log_growth = math.log(growth)
+        self.bucket_count = int(math.ceil(math.log(max_ms / min_ms) / self._log_growth)) + 2
+        self._bounds = [0.0] + [min_ms * growth**i for i in range(self.bucket_count - 1)]
+
+        self._current = self._empty_window()
+        self._previous = self._empty_window()
+        self._window_start = time.monotonic()
+        self.total_count = 0
+
+    def _empty_window(self) -> Dict[str, Any]:
+        return {"buckets": [0] * self.bucket_count, "count": 0, "sum": 0.0, "max": 0.0}
+
+    def _rotate(self, now: float) -> None:
+        elapsed = now - self._window_start
+        if elapsed < self.window_seconds:
+            return
+        # A gap longer than two windows leaves nothing recent to keep
+        self._previous = self._current if elapsed < 2 * self.window_seconds else self._empty_window()
+        self._current = self._empty_window()
+        self._window_start = now
+
+    def _bucket(self, value_ms: float) -> int:
+        if value_ms <= self.min_ms:
+            return 0
+        index = int(math.log(value_ms / self.min_ms) / self._log_growth) + 1
+        return min(index, self.bucket_count - 1)
+
+    def record(self, value_ms: float) -> None:
+        self._rotate(time.monotonic())
+        window = self._current
+        window["buckets"][self._bucket(value_ms)] += 1
+        window["count"] += 1
+        window["sum"] += value_ms
+        if value_ms > window["max"]:
+            window["max"] = value_ms
+        self.total_count += 1
+
+    @property
+    def count(self) -> int:
+        self._rotate(time.monotonic())
+        return self._current["count"] + self._previous["count"]
+
+    def mean(self) -> float:
+        count = self.count
+        return (self._current["sum"] + self._previous["sum"]) / count if count else 0.0
+
+    def max(self) -> float:
+        self._rotate(time.monotonic())
+        return max(self._current["max"], self._previous["max"])
+
+    def percentile(self, pct: float) -> float:
+        """Approximate percentile (0-100), reported as the bucket's upper bound."""
+        count = self.count
+        if not count:
+            return 0.0
+        rank = max(1, math.ceil(count * pct / 100.0))
+        seen = 0
+        for i in range(self.bucket_count):
+            seen += self._current["buckets"][i] + self._previous["buckets"][i]
+            if seen >= rank:
+                upper = self._bounds[i + 1] if i + 1 < self.bucket_count else self.max()
+                return min(upper, self.max())
+        return self.max()
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.mean(), 3),
+            "max_ms": round(self.max(), 3),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+        }
+
+
+# ============================================================================
+# Bounded priority lane
+# ============================================================================
+
+
+class EventLane(Generic[T]):
+    """
+    Bounded FIFO for one priority lane.
+
+    Args:
+        name: Lane name used in metrics
+        maxsize: Maximum pending items
+        overflow: What to do when full - "block" waits up to ``put_timeout``
+            then drops the new item, "drop_oldest" evicts the head,
+            "drop_newest" rejects the new item
+        coalesce_watermark: Depth (fraction of maxsize) from which items with a
+            coalesce key replace a pending item with the same key
+        merge: ``(pending, incoming)`` hook applied when coalescing; defaults to
+            keeping the incoming item in the pending item's position
+        put_timeout: Seconds a "block" producer waits for space
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 1000,
+        overflow: str = "drop_oldest",
+        coalesce_watermark: float = 0.5,
+        merge: Optional[Callable[[T, T], T]] = None,
+        put_timeout: float = 0.5,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+
+        self.name = name
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.coalesce_depth = max(1, int(maxsize * coalesce_watermark))
+        self.put_timeout = put_timeout
+        self._merge = merge
+
+        # Each slot is [item, coalesce_key] so coalescing can swap the item in place
+        self._slots: Deque[List[Any]] = deque()
+        self._pending_by_key: Dict[Hashable, List[Any]] = {}
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+
+        self.enqueued = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.high_watermark = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def full(self) -> bool:
+        return len(self._slots) >= self.maxsize
+
+    async def put(self, item: T, coalesce_key: Optional[Hashable] = None) -> str:
+        """Enqueue ``item``; returns "queued", "coalesced" or "dropped"."""
+        if coalesce_key is not None and len(self._slots) >= self.coalesce_depth:
+            slot = self._pending_by_key.get(coalesce_key)
+            if slot is not None:
+                slot[0] = self._merge(slot[0], item) if self._merge else item
+                self.coalesced += 1
+                return COALESCED
+
+        if self.full():
+            if self.overflow == "drop_newest":
+                self.dropped += 1
+                return DROPPED
+            if self.overflow == "drop_oldest":
+                self._forget(self._slots.popleft())
+                self.dropped += 1
+            else:
+                if not await self._wait_for_space():
+                    self.dropped += 1
+                    return DROPPED
+
+        slot = [item, coalesce_key]
+        self._slots.append(slot)
+        if coalesce_key is not None:
+            self._pending_by_key[coalesce_key] = slot
+
+        self.enqueued += 1
+        self.high_watermark = max(self.high_watermark, len(self._slots))
+        self._not_empty.set()
+        if self.full():
+            self._not_full.clear()
+        return QUEUED
+
+    async def _wait_for_space(self) -> bool:
+        deadline = time.monotonic() + self.put_timeout
+        while self.full():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._not_full.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def _forget(self, slot: List[Any]) -> None:
+        key = slot[1]
+        if key is not None and self._pending_by_key.get(key) is slot:
+            del self._pending_by_key[key]
+
+    def get_nowait_batch(self, max_items: int) -> List[T]:
+        """Pop up to ``max_items`` pending items without waiting."""
+        batch = []
+        while self._slots and len(batch) < max_items:
+            slot = self._slots.popleft()
+            self._forget(slot)
+            batch.append(slot[0])
+
+        if not self._slots:
+            self._not_empty.clear()
+        if not self.full():
+            self._not_full.set()
+        return batch
+
+    async def get_batch(self, max_items: int, linger: float = 0.0) -> List[T]:
+        """
+        Wait for at least one item, then pop up to ``max_items``.
+
+        With ``linger`` > 0 a partial batch waits that long for more items
+        (and more coalescing) before it is returned.
+        """
+        while not self._slots:
+            await self._not_empty.wait()
+        if linger > 0 and len(self._slots) < max_items:
+            await asyncio.sleep(linger)
+        return self.get_nowait_batch(max_items)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "depth": len(self._slots),
+            "maxsize": self.maxsize,
+            "overflow": self.overflow,
+            "enqueued": self.enqueued,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "high_watermark": self.high_watermark,
+        }
+
+
+__all__ = ["EventLane", "LatencyHistogram", "COALESCED", "DROPPED", "QUEUED"]
@@ -23,6 +23,7 @@ from typing import Any, Callable, Dict, List, Optional
 from ghl_real_estate_ai.ghl_utils.logger import get_logger
 from ghl_real_estate_ai.services.auth_service import UserRole
 from ghl_real_estate_ai.services.cache_service import get_cache_service
+from ghl_real_estate_ai.services.event_fanout import DROPPED, EventLane, LatencyHistogram
 from ghl_real_estate_ai.services.websocket_server import EventType, RealTimeEvent, get_websocket_manager
 
 logger = get_logger(__name__)
@@ -52,6 +53,11 @@ class EventPublisher:
     performance optimization.
     """
 
+    # State-style events where only the latest update per user/location matters
+    COALESCIBLE_EVENT_TYPES = frozenset(
+        {EventType.DASHBOARD_REFRESH, EventType.PERFORMANCE_UPDATE, EventType.AI_CONCIERGE_STATUS}
+    )
+
     def __init__(self):
         self.websocket_manager = get_websocket_manager()
         self.cache_service = get_cache_service()
@@ -60,15 +66,27 @@ class EventPublisher:
         # 🚀 ENHANCED EVENT BATCHING CONFIGURATION (Phase 8+ Optimization)
         self.batch_interval = 0.01  # 10ms micro-batching (vs 500ms previous)
         self.max_batch_size = 50  # Increased capacity for enterprise throughput
-        self._event_batch = []
-        self._batch_timer = None
 
         # 🎯 PRIORITY LANES FOR <10MS LATENCY TARGET
         self.critical_bypass = True  # Critical events skip batching entirely
 
-        # 📊 ENHANCED PERFORMANCE TRACKING
-        self._processing_times = []
-        self._latency_measurements = []
+        # Bounded lanes, each drained by its own consumer task. High-priority
+        # producers wait briefly for space; normal/low shed load and coalesce
+        # repeated state updates when WebSocket delivery falls behind.
+        self._lanes: Dict[str, EventLane] = {
+            "critical": EventLane("critical", maxsize=1000, overflow="block", merge=self._merge_pending),
+            "high": EventLane("high", maxsize=2000, overflow="block", merge=self._merge_pending),
+            "normal": EventLane("normal", maxsize=5000, overflow="drop_oldest", merge=self._merge_pending),
+            "low": EventLane("low", maxsize=2000, overflow="drop_newest", merge=self._merge_pending),
+        }
+        self._lane_targets_ms = {"critical": 1.0, "high": 5.0, "normal": 10.0, "low": 50.0}
+        self._lane_linger = {"critical": 0.0, "high": 0.0, "normal": self.batch_interval, "low": self.batch_interval}
+        self._consumer_tasks: Dict[str, asyncio.Task] = {}
+
+        # 📊 ENHANCED PERFORMANCE TRACKING (O(1) per event)
+        self._enqueue_latency = LatencyHistogram()
+        self._delivery_latency = {name: LatencyHistogram() for name in self._lanes}
+        self._latency_target_misses = 0
         self._events_under_10ms = 0
         self._total_events_processed = 0
 
@@ -77,12 +95,21 @@ class EventPublisher:
     async def start(self):
         """Start the event publisher service."""
         await self.websocket_manager.start_services()
+        self._ensure_consumers()
         logger.info("Event Publisher started")
 
-    async def stop(self):
-        """Stop the event publisher service."""
-        if self._batch_timer:
-            self._batch_timer.cancel()
+    async def stop(self, drain_timeout: float = 1.0):
+        """Stop the event publisher service, delivering queued events for up to drain_timeout seconds."""
+        try:
+            await asyncio.wait_for(self.flush(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Event Publisher stopped with {self._queue_depth()} undelivered events")
+
+        for task in self._consumer_tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._consumer_tasks.values(), return_exceptions=True)
+        self._consumer_tasks.clear()
+
         await self.websocket_manager.stop_services()
         logger.info("Event Publisher stopped")
 
@@ -1309,11 +1336,14 @@ class EventPublisher:
         """
         OPTIMIZED event publishing with <10ms latency target.
 
-        Phase 8+ Enhancement:
-        - Micro-batching (10ms max vs 500ms previous)
-        - Priority bypass for critical events (<1ms)
-        - Real-time latency tracking and alerting
-        - Performance compliance monitoring
+        Critical events are delivered inline. Everything else goes into a
+        bounded priority lane drained by a dedicated consumer task, so a slow
+        WebSocket layer applies backpressure instead of growing memory:
+        - high: producer waits briefly for space, then the event is dropped
+        - normal: oldest pending event is dropped when full
+        - low: new event is dropped when full
+        Above half capacity, dashboard/performance/concierge status events for
+        the same user and location replace the pending one (latest state wins).
 
         Args:
             event: Event to publish
@@ -1330,36 +1360,22 @@ class EventPublisher:
             ):
                 # Immediate processing - no batching
                 await self.websocket_manager.publish_event(event)
-                await self._track_event_latency(event, start_time, 1, target_ms=1.0)
-                return
-
-            # 🎯 MICRO-BATCHING WITH PRIORITY ROUTING
-            self._event_batch.append(event)
-
-            # Enhanced batch processing criteria
-            should_process_immediately = (
-                len(self._event_batch) >= self.max_batch_size
-                or event.priority == "high"
-                or (time.perf_counter() - start_time) > self.batch_interval
-            )
-
-            if should_process_immediately:
-                await self._process_event_batch_optimized()
+                self._record_delivery("critical", [event.data.pop("_processing_start")], time.perf_counter())
             else:
-                # Schedule micro-batch processing if not already scheduled
-                if self._batch_timer is None:
-                    self._batch_timer = asyncio.create_task(self._schedule_micro_batch_processing())
+                lane = self._lanes[self._lane_for(event)]
+                outcome = await lane.put(event, self._coalesce_key(event))
+                self._ensure_consumers()
+                if outcome == DROPPED:
+                    self.metrics.failed_publishes += 1
+                    logger.debug(f"Event lane '{lane.name}' full, dropped {event.event_type.value}")
+                    return
 
             # 📊 ENHANCED PERFORMANCE TRACKING
             processing_time_ms = (time.perf_counter() - start_time) * 1000
-            self._processing_times.append(processing_time_ms)
-
-            # Keep only recent processing times (last 1000 for better statistics)
-            if len(self._processing_times) > 1000:
-                self._processing_times = self._processing_times[-1000:]
+            self._enqueue_latency.record(processing_time_ms)
 
             # Update enhanced metrics
-            self.metrics.average_processing_time_ms = sum(self._processing_times) / len(self._processing_times)
+            self.metrics.average_processing_time_ms = self._enqueue_latency.mean()
             self.metrics.total_events_published += 1
             self.metrics.last_event_time = datetime.now(timezone.utc)
             self._total_events_processed += 1
@@ -1382,106 +1398,88 @@ class EventPublisher:
             logger.error(f"Error publishing event {event.event_type.value}: {e}")
             self.metrics.failed_publishes += 1
 
-    async def _schedule_batch_processing(self):
-        """Schedule batch processing after interval."""
-        try:
-            await asyncio.sleep(self.batch_interval)
-            await self._process_event_batch()
-        except asyncio.CancelledError:
-            pass
-        finally:
-            self._batch_timer = None
-
-    async def _schedule_micro_batch_processing(self):
-        """OPTIMIZED: Schedule micro-batch processing with 10ms maximum delay."""
-        try:
-            await asyncio.sleep(self.batch_interval)  # 10ms micro-batch interval
-            await self._process_event_batch_optimized()
-        except asyncio.CancelledError:
-            pass
-        finally:
-            self._batch_timer = None
-
-    async def _process_event_batch(self):
-        """Process the current batch of events."""
-        if not self._event_batch:
-            return
-
-        # Cancel existing timer
-        if self._batch_timer:
-            self._batch_timer.cancel()
-            self._batch_timer = None
-
-        # Process events
-        batch = self._event_batch.copy()
-        self._event_batch.clear()
-
-        # Group events by priority for processing order
-        critical_events = [e for e in batch if e.priority == "critical"]
-        high_events = [e for e in batch if e.priority == "high"]
-        normal_events = [e for e in batch if e.priority in ["normal", "low"]]
-
-        # Process critical events first
-        for event in critical_events:
-            await self.websocket_manager.publish_event(event)
-
-        # Process high priority events
-        for event in high_events:
-            await self.websocket_manager.publish_event(event)
-
-        # Batch process normal priority events
-        if normal_events:
-            # For normal events, we can potentially aggregate similar events
-            aggregated_events = self._aggregate_similar_events(normal_events)
-            for event in aggregated_events:
-                await self.websocket_manager.publish_event(event)
-
-        logger.debug(
-            f"Processed event batch: {len(batch)} events ({len(critical_events)} critical, {len(high_events)} high, {len(normal_events)} normal)"
+    def _lane_for(self, event: RealTimeEvent) -> str:
+        """Map an event to its priority lane."""
+        return event.priority if event.priority in self._lanes else "normal"
+
+    def _coalesce_key(self, event: RealTimeEvent) -> Optional[str]:
+        """Key under which pending events may be replaced by newer ones, or None."""
+        if event.event_type in self.COALESCIBLE_EVENT_TYPES:
+            return f"{event.event_type.value}_{event.user_id}_{event.location_id}"
+        return None
+
+    @staticmethod
+    def _merge_pending(pending: RealTimeEvent, incoming: RealTimeEvent) -> RealTimeEvent:
+        """Coalesce into the newer event, keeping the pending event's enqueue time for delivery latency."""
+        if "_processing_start" in pending.data:
+            incoming.data["_processing_start"] = pending.data["_processing_start"]
+        return incoming
+
+    def _queue_depth(self) -> int:
+        return sum(len(lane) for lane in self._lanes.values())
+
+    def _ensure_consumers(self):
+        """Start one consumer task per lane if not already running."""
+        for name, lane in self._lanes.items():
+            task = self._consumer_tasks.get(name)
+            if task is None or task.done():
+                self._consumer_tasks[name] = asyncio.create_task(self._consume_lane(lane))
+
+    async def _consume_lane(self, lane: EventLane):
+        """Deliver events from one lane until cancelled."""
+        linger = self._lane_linger.get(lane.name, 0.0)
+        while True:
+            batch = await lane.get_batch(self.max_batch_size, linger=linger)
+            try:
+                await self._deliver_batch(lane.name, batch)
+            except Exception as e:
+                logger.error(f"Error delivering {len(batch)} events from lane '{lane.name}': {e}")
+                self.metrics.failed_publishes += len(batch)
+
+    async def _deliver_batch(self, lane_name: str, batch: List[RealTimeEvent]):
+        """Publish one batch concurrently, aggregating similar normal/low priority events."""
+        start_times = [event.data.pop("_processing_start", None) for event in batch]
+        events = batch if lane_name in ("critical", "high") else self._aggregate_similar_events_optimized(batch)
+        results = await asyncio.gather(
+            *[self.websocket_manager.publish_event(event) for event in events], return_exceptions=True
         )
+        for result in results:
+            if isinstance(result, Exception):
+                self.metrics.failed_publishes += 1
+                logger.error(f"Error delivering event from lane '{lane_name}': {result}")
+
+        self._record_delivery(lane_name, start_times, time.perf_counter())
+
+        logger.debug(f"📊 Lane '{lane_name}' delivered {len(batch)} events as {len(events)} messages")
+
+    def _record_delivery(self, lane_name: str, start_times: List[Optional[float]], delivered_at: float):
+        """Record end-to-end latency for a delivered batch; one warning per batch on target misses."""
+        histogram = self._delivery_latency[lane_name]
+        target_ms = self._lane_targets_ms[lane_name]
+        misses = 0
+        worst_ms = 0.0
+
+        for start_time in start_times:
+            if start_time is None:
+                continue
+            latency_ms = (delivered_at - start_time) * 1000
+            histogram.record(latency_ms)
+            if latency_ms > target_ms:
+                misses += 1
+                worst_ms = max(worst_ms, latency_ms)
+
+        if misses:
+            self._latency_target_misses += misses
+            logger.warning(
+                f"⚠️ Latency target missed for {misses}/{len(start_times)} events in lane '{lane_name}' "
+                f"(worst: {worst_ms:.2f}ms, target: {target_ms}ms)"
+            )
 
-    async def _process_event_batch_optimized(self):
-        """OPTIMIZED: Process event batch with priority lanes and concurrent publishing."""
-        if not self._event_batch:
-            return
-
-        # Cancel existing timer
-        if self._batch_timer:
-            self._batch_timer.cancel()
-            self._batch_timer = None
-
-        # Process events
-        batch = self._event_batch.copy()
-        self._event_batch.clear()
-
-        processing_start = time.perf_counter()
-
-        # 🎯 PRIORITY LANE PROCESSING
-        critical_events = [e for e in batch if e.priority == "critical"]
-        high_events = [e for e in batch if e.priority == "high"]
-        normal_events = [e for e in batch if e.priority in ["normal", "low"]]
-
-        # Process critical events first (should be rare due to bypass)
-        for event in critical_events:
-            await self.websocket_manager.publish_event(event)
-
-        # Concurrent processing for high and normal priority events
-        if high_events:
-            await asyncio.gather(*[self.websocket_manager.publish_event(event) for event in high_events])
-
-        # Apply intelligent aggregation for normal events to reduce volume
-        if normal_events:
-            aggregated_events = self._aggregate_similar_events_optimized(normal_events)
-            await asyncio.gather(*[self.websocket_manager.publish_event(event) for event in aggregated_events])
-
-        # Track latency for all events in batch
-        for event in batch:
-            await self._track_event_latency(event, processing_start, len(batch), target_ms=10.0)
-
-        logger.debug(
-            f"📊 Optimized batch processed: {len(batch)} events "
-            f"({len(critical_events)} critical, {len(high_events)} high, {len(normal_events)} normal)"
-        )
+    async def flush(self):
+        """Deliver every queued event now (used on shutdown and in tests)."""
+        for name, lane in self._lanes.items():
+            while len(lane):
+                await self._deliver_batch(name, lane.get_nowait_batch(self.max_batch_size))
 
     def _aggregate_similar_events_optimized(self, events: List[RealTimeEvent]) -> List[RealTimeEvent]:
         """
@@ -1502,13 +1500,8 @@ class EventPublisher:
 
         for event in events:
             # Events that can be aggregated to reduce volume
-            if event.event_type in {
-                EventType.DASHBOARD_REFRESH,
-                EventType.PERFORMANCE_UPDATE,
-                EventType.AI_CONCIERGE_STATUS,
-            }:
-                key = f"{event.event_type.value}_{event.user_id}_{event.location_id}"
-
+            key = self._coalesce_key(event)
+            if key is not None:
                 if key not in aggregable_groups:
                     aggregable_groups[key] = []
                 aggregable_groups[key].append(event)
@@ -1543,44 +1536,6 @@ class EventPublisher:
 
         return result_events
 
-    async def _track_event_latency(
-        self, event: RealTimeEvent, processing_start: float, batch_size: int, target_ms: float
-    ):
-        """Track individual event latency for performance optimization."""
-        processing_end = time.perf_counter()
-        event_start = event.data.get("_processing_start", processing_start)
-
-        # Calculate end-to-end latency
-        latency_ms = (processing_end - event_start) * 1000
-        target_met = latency_ms <= target_ms
-
-        # Store measurement
-        measurement = {
-            "event_type": event.event_type.value,
-            "priority": event.priority,
-            "latency_ms": latency_ms,
-            "target_met": target_met,
-            "batch_size": batch_size,
-            "timestamp": datetime.now(timezone.utc),
-        }
-
-        self._latency_measurements.append(measurement)
-
-        # Keep only recent measurements (last 1000)
-        if len(self._latency_measurements) > 1000:
-            self._latency_measurements = self._latency_measurements[-1000:]
-
-        # Alert on target miss
-        if not target_met:
-            logger.warning(
-                f"⚠️ Latency target missed: {latency_ms:.2f}ms (target: {target_ms}ms) "
-                f"for {event.event_type.value} [batch_size: {batch_size}]"
-            )
-
-        # Clean up processing timestamp
-        if "_processing_start" in event.data:
-            del event.data["_processing_start"]
-
     def _aggregate_similar_events(self, events: List[RealTimeEvent]) -> List[RealTimeEvent]:
         """
         Legacy method - maintained for backward compatibility.
@@ -1632,7 +1587,9 @@ class EventPublisher:
             "last_event_time": self.metrics.last_event_time.isoformat() if self.metrics.last_event_time else None,
             "average_processing_time_ms": round(self.metrics.average_processing_time_ms, 3),
             "failed_publishes": self.metrics.failed_publishes,
-            "batch_queue_size": len(self._event_batch),
+            "batch_queue_size": self._queue_depth(),
+            "queue_depth": {name: len(lane) for name, lane in self._lanes.items()},
+            "lanes": {name: lane.get_stats() for name, lane in self._lanes.items()},
             "websocket_metrics": self.websocket_manager.get_metrics(),
         }
 
@@ -1649,25 +1606,21 @@ class EventPublisher:
                 "target_achievement": "✅ ACHIEVED" if compliance_10ms >= 95 else "🎯 IN PROGRESS",
             }
 
-            # Recent latency statistics
-            if self._latency_measurements:
-                recent_latencies = [m["latency_ms"] for m in self._latency_measurements[-100:]]
-                optimization_metrics.update(
-                    {
-                        "recent_avg_latency_ms": round(sum(recent_latencies) / len(recent_latencies), 3),
-                        "recent_max_latency_ms": round(max(recent_latencies), 3),
-                        "recent_min_latency_ms": round(min(recent_latencies), 3),
-                    }
-                )
-
-                # Calculate percentiles
-                sorted_latencies = sorted(recent_latencies)
+            # Rolling latency statistics from the streaming histograms
+            if self._enqueue_latency.count:
+                enqueue = self._enqueue_latency.summary()
                 optimization_metrics.update(
                     {
-                        "p95_latency_ms": round(sorted_latencies[int(len(sorted_latencies) * 0.95)], 3),
-                        "p99_latency_ms": round(sorted_latencies[int(len(sorted_latencies) * 0.99)], 3),
+                        "recent_avg_latency_ms": enqueue["avg_ms"],
+                        "recent_max_latency_ms": enqueue["max_ms"],
+                        "p95_latency_ms": enqueue["p95_ms"],
+                        "p99_latency_ms": enqueue["p99_ms"],
                     }
                 )
+            optimization_metrics["delivery_latency_by_lane"] = {
+                name: histogram.summary() for name, histogram in self._delivery_latency.items()
+            }
+            optimization_metrics["latency_target_misses"] = self._latency_target_misses
 
             base_metrics["optimization_metrics"] = optimization_metrics
 
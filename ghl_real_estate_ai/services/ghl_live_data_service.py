@@ -212,6 +212,11 @@ class GHLLiveDataService:
         self.bot_metrics_cache_ttl = 60  # 1 minute
         self.business_metrics_cache_ttl = 900  # 15 minutes
 
+        # Cache tags: per-lead entries and lead lists carry "lead:{id}", so a
+        # webhook only drops what depends on that lead plus the aggregates
+        self.lead_lists_tag = "live_lead_lists"
+        self.lead_aggregates_tag = "live_lead_aggregates"
+
         # Data Refresh Intervals
         self.lead_refresh_interval = 180  # 3 minutes
         self.bot_metrics_refresh_interval = 60  # 1 minute
@@ -237,20 +242,23 @@ class GHLLiveDataService:
             cached_leads = await self.cache.get(cache_key)
 
             if cached_leads:
-                return [LiveLeadData(**lead) for lead in json.loads(cached_leads)]
+                return [self._lead_from_cache(lead) for lead in json.loads(cached_leads)]
 
             # Fetch raw leads from GHL
             raw_leads = await self.ghl_service.get_contacts(limit=limit, sort_by="dateAdded", sort_direction="desc")
 
-            # Enhance with Jorge-specific intelligence
+            # Enhance with Jorge-specific intelligence (reusing per-lead cache entries)
             enhanced_leads = []
             for raw_lead in raw_leads.get("contacts", []):
-                enhanced_lead = await self._enhance_lead_with_jorge_context(raw_lead)
+                enhanced_lead = await self._get_enhanced_lead(raw_lead)
                 enhanced_leads.append(enhanced_lead)
 
-            # Cache enhanced lead data
+            # Cache enhanced lead data, tagged with every lead it contains
             cached_data = [asdict(lead) for lead in enhanced_leads]
-            await self.cache.set(cache_key, json.dumps(cached_data, default=str), ttl=self.lead_data_cache_ttl)
+            tags = [self.lead_lists_tag] + [self._lead_tag(lead.lead_id) for lead in enhanced_leads]
+            await self.cache.set(
+                cache_key, json.dumps(cached_data, default=str), ttl=self.lead_data_cache_ttl, tags=tags
+            )
 
             self.last_sync_times["leads"] = datetime.now()
 
@@ -261,6 +269,38 @@ class GHLLiveDataService:
             logger.error(f"Error getting live leads context: {e}")
             return []
 
+    @staticmethod
+    def _lead_tag(lead_id: str) -> str:
+        return f"lead:{lead_id}"
+
+    @staticmethod
+    def _lead_from_cache(data: Dict[str, Any]) -> LiveLeadData:
+        """Rebuild a lead cached as JSON, restoring the datetimes ``default=str`` flattened."""
+        for field in ("created_at", "last_activity"):
+            if isinstance(data.get(field), str):
+                data[field] = datetime.fromisoformat(data[field])
+        return LiveLeadData(**data)
+
+    async def _get_enhanced_lead(self, raw_lead: Dict[str, Any]) -> LiveLeadData:
+        """Get an enhanced lead from its per-lead cache entry, enhancing and caching it on a miss."""
+        lead_id = raw_lead.get("id")
+        if not lead_id:
+            return await self._enhance_lead_with_jorge_context(raw_lead)
+
+        cache_key = f"live_lead_{lead_id}"
+        cached_lead = await self.cache.get(cache_key)
+        if cached_lead:
+            return self._lead_from_cache(json.loads(cached_lead))
+
+        enhanced_lead = await self._enhance_lead_with_jorge_context(raw_lead)
+        await self.cache.set(
+            cache_key,
+            json.dumps(asdict(enhanced_lead), default=str),
+            ttl=self.lead_data_cache_ttl,
+            tags=[self._lead_tag(lead_id)],
+        )
+        return enhanced_lead
+
     async def _enhance_lead_with_jorge_context(self, raw_lead: Dict[str, Any]) -> LiveLeadData:
         """Enhance raw GHL lead with Jorge-specific intelligence."""
 
@@ -597,7 +637,10 @@ class GHLLiveDataService:
 
             # Cache business metrics
             await self.cache.set(
-                cache_key, json.dumps(asdict(metrics), default=str), ttl=self.business_metrics_cache_ttl
+                cache_key,
+                json.dumps(asdict(metrics), default=str),
+                ttl=self.business_metrics_cache_ttl,
+                tags=[self.lead_aggregates_tag],
             )
 
             self.last_sync_times["business"] = datetime.now()
@@ -1002,7 +1045,7 @@ class GHLLiveDataService:
 
             # Invalidate relevant caches for real-time updates
             if contact_id:
-                await self._invalidate_lead_cache(contact_id)
+                await self._invalidate_lead_cache(contact_id, new_lead=webhook_type == "ContactCreated")
 
             logger.info(f"Processed webhook: {webhook_type} for contact {contact_id}")
 
@@ -1058,12 +1101,19 @@ class GHLLiveDataService:
         except Exception as e:
             logger.error(f"Error in real-time conversation analysis: {e}")
 
-    async def _invalidate_lead_cache(self, contact_id: str) -> None:
-        """Invalidate caches for updated lead data."""
+    async def _invalidate_lead_cache(self, contact_id: str, new_lead: bool = False) -> None:
+        """
+        Invalidate caches that depend on one lead.
+
+        Drops the lead's own entry, every lead list containing it and the
+        business-metric aggregates. A new lead is in no cached list yet, so
+        it invalidates all lead lists instead.
+        """
         try:
-            # Clear lead-specific caches
-            await self.cache.delete(f"live_leads_context_*")
-            await self.cache.delete("live_business_metrics")
+            tags = [self._lead_tag(contact_id), self.lead_aggregates_tag]
+            if new_lead:
+                tags.append(self.lead_lists_tag)
+            await self.cache.invalidate_tags(tags)
 
         except Exception as e:
             logger.warning(f"Error invalidating lead cache: {e}")
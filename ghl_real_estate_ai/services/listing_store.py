@@ -0,0 +1,186 @@
+"""
+Columnar Listing Store for property matching.
+
+Loads listing dicts once into numpy columns (price, beds, baths, sqft,
+lat/lon, neighborhood codes) with a price-sorted index, so budget / bedroom /
+neighborhood queries are answered with vectorized masks and ``argpartition``
+top-k instead of per-listing dict lookups and full sorts.
+
+Scoring mirrors ``PropertyMatcher.find_buyer_matches`` and
+``BasicFilteringStrategy`` exactly; only the evaluation strategy changes.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+EARTH_RADIUS_MILES = 3958.8
+
+
+def _number(value: Any) -> float:
+    """Coerce a listing field to float; missing or malformed values become NaN."""
+    if value is None or isinstance(value, bool):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def top_k_indices(candidates: np.ndarray, scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Return the ``k`` best candidates by score, ties broken by listing order.
+
+    Uses ``argpartition`` to find the k-th best score, then sorts only the
+    survivors, which matches a stable descending sort of the full list.
+    """
+    if k <= 0 or candidates.size == 0:
+        return candidates[:0]
+    if candidates.size > k:
+        kth_score = scores[np.argpartition(-scores, k - 1)[:k]].min()
+        keep = scores >= kth_score
+        candidates, scores = candidates[keep], scores[keep]
+    order = np.lexsort((candidates, -scores))
+    return candidates[order[:k]]
+
+
+class ListingStore:
+    """
+    Immutable columnar view over a list of listing dicts.
+
+    The original dicts are kept (``listings``) so results can be returned in
+    the same shape callers already consume.
+    """
+
+    def __init__(self, listings: Sequence[Dict[str, Any]]):
+        self.listings = listings
+        n = len(listings)
+
+        self.price = np.fromiter((_number(p.get("price", 0)) for p in listings), dtype=np.float64, count=n)
+        # find_buyer_matches reads "beds" then "bedrooms"; the basic strategy reads "bedrooms" only
+        self.beds = np.fromiter(
+            (_number(p.get("beds", p.get("bedrooms", 0))) for p in listings), dtype=np.float64, count=n
+        )
+        self.bedrooms = np.fromiter((_number(p.get("bedrooms", 0)) for p in listings), dtype=np.float64, count=n)
+        self.baths = np.fromiter(
+            (_number(p.get("baths", p.get("bathrooms", 0))) for p in listings), dtype=np.float64, count=n
+        )
+        self.sqft = np.fromiter((_number(p.get("sqft")) for p in listings), dtype=np.float64, count=n)
+        self.lat = np.fromiter((_number(p.get("lat", p.get("latitude"))) for p in listings), dtype=np.float64, count=n)
+        self.lon = np.fromiter((_number(p.get("lon", p.get("longitude"))) for p in listings), dtype=np.float64, count=n)
+
+        # Neighborhood codes into a small vocabulary of lowercased names
+        vocabulary: Dict[str, int] = {}
+        codes = np.empty(n, dtype=np.int32)
+        for i, prop in enumerate(listings):
+            name = str(prop.get("neighborhood", "") or "").lower()
+            codes[i] = vocabulary.setdefault(name, len(vocabulary))
+        self.neighborhood_codes = codes
+        self.neighborhood_vocabulary: List[str] = list(vocabulary)
+
+        # Lowercased address text for the basic strategy's substring location match
+        self.address_text = np.array([str(p.get("address", {})).lower() for p in listings], dtype=np.str_)
+
+        # Price-sorted index: budget windows become two binary searches
+        self._price_order = np.argsort(self.price, kind="stable")
+        self._sorted_prices = self.price[self._price_order]
+
+    def __len__(self) -> int:
+        return len(self.listings)
+
+    # ------------------------------------------------------------------
+    # Indexes and masks
+    # ------------------------------------------------------------------
+
+    def price_range(self, low: float, high: float) -> np.ndarray:
+        """Indices of listings priced within [low, high], in listing order."""
+        start = np.searchsorted(self._sorted_prices, low, side="left")
+        stop = np.searchsorted(self._sorted_prices, high, side="right")
+        return np.sort(self._price_order[start:stop])
+
+    def neighborhood_mask(self, neighborhood: str, indices: Optional[np.ndarray] = None) -> np.ndarray:
+        """Case-insensitive substring match against each listing's neighborhood."""
+        needle = neighborhood.lower()
+        matching_codes = np.array([needle in name for name in self.neighborhood_vocabulary], dtype=bool)
+        codes = self.neighborhood_codes if indices is None else self.neighborhood_codes[indices]
+        return matching_codes[codes] if matching_codes.size else np.zeros(codes.shape, dtype=bool)
+
+    def distance_miles(self, lat: float, lon: float) -> np.ndarray:
+        """Great-circle distance from a point to every listing (NaN where unknown)."""
+        lat1, lon1 = np.radians(lat), np.radians(lon)
+        lat2, lon2 = np.radians(self.lat), np.radians(self.lon)
+        a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def buyer_matches(
+        self, budget: int, beds: Optional[int] = None, neighborhood: Optional[str] = None, limit: int = 3
+    ) -> List[Dict[str, Any]]:
+        """
+        Vectorized ``PropertyMatcher.find_buyer_matches``.
+
+        Filters by price (budget ± 20%) and minimum beds, scores neighborhood
+        preference and closeness to budget, and returns the top ``limit``.
+        """
+        if not budget or budget <= 0:
+            return []
+
+        candidates = self.price_range(int(budget * 0.8), int(budget * 1.2))
+        if beds:
+            candidates = candidates[self.beds[candidates] >= beds]  # Hard filter: must meet minimum beds
+        if candidates.size == 0:
+            return []
+
+        price = self.price[candidates]
+        scores = np.full(candidates.size, 1.0)
+        if beds:
+            scores += 0.3
+        if neighborhood:
+            scores += np.where(self.neighborhood_mask(neighborhood, candidates), 0.5, 0.0)
+        scores += (1.0 - np.abs(price - budget) / budget) * 0.2
+        scores = np.round(scores, 2)
+
+        top = top_k_indices(candidates, scores, limit)
+        score_by_index = dict(zip(candidates.tolist(), scores.tolist()))
+        return [{**self.listings[i], "match_score": round(score_by_index[i], 2)} for i in top.tolist()]
+
+    def basic_scores(self, preferences: Dict[str, Any]) -> np.ndarray:
+        """Vectorized ``BasicFilteringStrategy._calculate_basic_score`` for every listing."""
+        n = len(self.listings)
+        score = np.zeros(n)
+
+        # 1. Budget (Critical)
+        budget = preferences.get("budget", 0)
+        price = self.price
+        has_price = np.nan_to_num(price) != 0
+        if budget:
+            score += np.where(
+                has_price,
+                np.where(price <= budget, 0.4, np.where(price <= budget * 1.1, 0.2, 0.0)),
+                0.2,  # Neutral
+            )
+        else:
+            score += 0.2
+
+        # 2. Bedrooms
+        req_beds = preferences.get("bedrooms", 0)
+        prop_beds = self.bedrooms
+        has_beds = np.nan_to_num(prop_beds) != 0
+        if req_beds:
+            score += np.where(
+                has_beds,
+                np.where(prop_beds >= req_beds, 0.3, np.where(prop_beds == req_beds - 1, 0.1, 0.0)),
+                0.15,
+            )
+        else:
+            score += 0.15
+
+        # 3. Location (Simple substring match)
+        req_loc = preferences.get("location", "").lower()
+        if req_loc and n:
+            score += np.where(np.char.find(self.address_text, req_loc) >= 0, 0.3, 0.0)
+
+        return np.minimum(1.0, score)
@@ -28,6 +28,10 @@ from enum import Enum
 from functools import wraps
 from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
+from ghl_real_estate_ai.services.cache_codec import CacheCodec, get_default_codec
+from ghl_real_estate_ai.services.cache_single_flight import RedisLease, StampedeGuard, unwrap_entry
+from ghl_real_estate_ai.services.cache_tags import LocalTagIndex, RedisTagIndex
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
@@ -111,6 +115,8 @@ class L1MemoryCache:
         self.cache: Dict[str, CacheItem] = {}
         self.access_order: collections.OrderedDict = collections.OrderedDict()  # O(1) LRU tracking
         self.current_memory = 0
+        # Tag -> keys, pruned whenever an item is removed, evicted or expires
+        self.tag_index = LocalTagIndex()
         # Fix race condition: Initialize lock in constructor
         self._lock = asyncio.Lock()
 
@@ -135,7 +141,7 @@ class L1MemoryCache:
 
             return item.value
 
-    async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
+    async def set(self, key: str, value: Any, ttl: int = 300, tags: Optional[List[str]] = None) -> bool:
         # Serialize outside the lock to avoid blocking other coroutines
         try:
             size_bytes = len(pickle.dumps(value))
@@ -163,6 +169,8 @@ class L1MemoryCache:
             self.cache[key] = item
             self.access_order[key] = True
             self.current_memory += size_bytes
+            if tags:
+                self.tag_index.add([key], tags)
 
             return True
 
@@ -180,8 +188,18 @@ class L1MemoryCache:
             self.cache.clear()
             self.access_order.clear()
             self.current_memory = 0
+            self.tag_index.clear()
             return True
 
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """Delete every key tagged with any of the given tags"""
+        lock = await self._get_lock()
+        async with lock:
+            keys = [key for key in self.tag_index.pop(tags) if key in self.cache]
+            for key in keys:
+                await self._remove_item(key)
+            return len(keys)
+
     async def _remove_item(self, key: str):
         """Remove item and update memory tracking"""
         if key in self.cache:
@@ -189,6 +207,7 @@ class L1MemoryCache:
             self.current_memory -= item.size_bytes
             del self.cache[key]
             self.access_order.pop(key, None)
+        self.tag_index.discard(key)
 
     async def _evict_lru(self):
         """Evict least recently used item"""
@@ -209,8 +228,9 @@ class L1MemoryCache:
 class L2RedisCache:
     """Level 2: Redis cache with connection pooling"""
 
-    def __init__(self, redis_url: str, max_connections: int = 50):
+    def __init__(self, redis_url: str, max_connections: int = 50, codec: Optional[CacheCodec] = None):
         self.redis_url = redis_url
+        self.codec = codec or get_default_codec()
         self.redis = None
         self.enabled = False
         self.max_connections = max_connections
@@ -230,6 +250,7 @@ class L2RedisCache:
             )
 
             self.redis = redis.Redis(connection_pool=self.connection_pool)
+            self.tag_index = RedisTagIndex(self.redis, prefix="l2:tag:")
             self.enabled = True
             logger.info("L2 Redis cache initialized")
         except Exception as e:
@@ -245,20 +266,26 @@ class L2RedisCache:
             cache_key = f"l2:{key}"
             data = await self.redis.get(cache_key)
             if data:
-                return pickle.loads(data)
+                return self.codec.decode(data)
             return None
         except Exception as e:
             logger.error(f"L2 cache get error: {e}")
             return None
 
-    async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
+    async def set(self, key: str, value: Any, ttl: int = 300, tags: Optional[List[str]] = None) -> bool:
         if not self.enabled:
             return False
 
         try:
             cache_key = f"l2:{key}"
-            data = pickle.dumps(value)
-            await self.redis.set(cache_key, data, ex=ttl)
+            data = self.codec.encode(value)
+            if tags:
+                pipeline = self.redis.pipeline(transaction=False)
+                pipeline.set(cache_key, data, ex=ttl)
+                self.tag_index.add_to_pipeline(pipeline, [cache_key], tags, ttl)
+                await pipeline.execute()
+            else:
+                await self.redis.set(cache_key, data, ex=ttl)
             return True
         except Exception as e:
             logger.error(f"L2 cache set error: {e}")
@@ -276,6 +303,17 @@ class L2RedisCache:
             logger.error(f"L2 cache delete error: {e}")
             return False
 
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """Delete the L2 keys tagged with any of the given tags"""
+        if not self.enabled or not tags:
+            return 0
+
+        try:
+            return await self.tag_index.invalidate(tags)
+        except Exception as e:
+            logger.error(f"L2 cache invalidate_tags error: {e}")
+            return 0
+
     async def get_many(self, keys: List[str]) -> Dict[str, Any]:
         """Batch get operation for efficiency"""
         if not self.enabled:
@@ -293,7 +331,7 @@ class L2RedisCache:
             for key, data in zip(keys, results):
                 if data:
                     try:
-                        output[key] = pickle.loads(data)
+                        output[key] = self.codec.decode(data)
                     except Exception:
                         pass  # Skip corrupted entries
 
@@ -302,7 +340,7 @@ class L2RedisCache:
             logger.error(f"L2 cache get_many error: {e}")
             return {}
 
-    async def set_many(self, items: Dict[str, Tuple[Any, int]]) -> bool:
+    async def set_many(self, items: Dict[str, Tuple[Any, int]], tags: Optional[List[str]] = None) -> bool:
         """Batch set operation for efficiency"""
         if not self.enabled:
             return False
@@ -311,9 +349,13 @@ class L2RedisCache:
             pipeline = self.redis.pipeline()
             for key, (value, ttl) in items.items():
                 cache_key = f"l2:{key}"
-                data = pickle.dumps(value)
+                data = self.codec.encode(value)
                 pipeline.set(cache_key, data, ex=ttl)
 
+            if tags and items:
+                max_ttl = max(ttl for _, ttl in items.values())
+                self.tag_index.add_to_pipeline(pipeline, [f"l2:{key}" for key in items], tags, max_ttl)
+
             await pipeline.execute()
             return True
         except Exception as e:
@@ -358,6 +400,10 @@ class OptimizedCacheService:
         # Fix race condition: Initialize lock in constructor
         self._lock = asyncio.Lock()
 
+        # Stampede protection for L3 computes and get_or_compute
+        self._lease = RedisLease(self.l2_cache.redis) if self.l2_cache and self.l2_cache.enabled else None
+        self._stampede_guard = StampedeGuard(read=self._get_cached, write=self.set, lease_provider=lambda: self._lease)
+
     async def _get_lock(self) -> asyncio.Lock:
         # Lock is now always initialized in __init__
         return self._lock
@@ -367,30 +413,13 @@ class OptimizedCacheService:
         start_time = time.time()
 
         try:
-            # Try L1 (Memory) first
-            value = await self.l1_cache.get(key)
-            if value is not None:
-                await self._update_stats("l1_hit", start_time)
+            value, fresh = unwrap_entry(await self._get_cached(key, start_time))
+            if value is not None and fresh:
                 return value
 
-            await self._update_stats("l1_miss")
-
-            # Try L2 (Redis) second
-            if self.l2_cache:
-                value = await self.l2_cache.get(key)
-                if value is not None:
-                    # Backfill L1 with shorter TTL
-                    await self.l1_cache.set(key, value, ttl=min(300, 60))
-                    await self._update_stats("l2_hit", start_time)
-                    return value
-
-                await self._update_stats("l2_miss")
-
-            # Try L3 (Compute) last
-            value = await self.l3_cache.get(key)
+            # Try L3 (Compute) last; concurrent misses share one computation
+            value = await self._stampede_guard.single_flight.run(key, lambda: self._compute_l3(key))
             if value is not None:
-                # Backfill L2 and L1
-                await self.set(key, value, ttl=300)
                 await self._update_stats("l3_hit", start_time)
                 return value
 
@@ -401,18 +430,60 @@ class OptimizedCacheService:
             logger.error(f"Cache get error: {e}")
             return None
 
-    async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
-        """Set value in all appropriate cache layers"""
+    async def _get_cached(self, key: str, start_time: Optional[float] = None) -> Optional[Any]:
+        """Look up L1 then L2, backfilling L1 on an L2 hit"""
+        start_time = start_time or time.time()
+
+        # Try L1 (Memory) first
+        value = await self.l1_cache.get(key)
+        if value is not None:
+            await self._update_stats("l1_hit", start_time)
+            return value
+
+        await self._update_stats("l1_miss")
+
+        # Try L2 (Redis) second
+        if self.l2_cache:
+            value = await self.l2_cache.get(key)
+            if value is not None:
+                # Backfill L1 with shorter TTL
+                await self.l1_cache.set(key, value, ttl=min(300, 60))
+                await self._update_stats("l2_hit", start_time)
+                return value
+
+            await self._update_stats("l2_miss")
+
+        return None
+
+    async def _compute_l3(self, key: str) -> Optional[Any]:
+        """Compute a miss with the registered L3 function and backfill L2 and L1"""
+        value = await self.l3_cache.get(key)
+        if value is not None:
+            await self.set(key, value, ttl=300)
+        return value
+
+    async def get_or_compute(self, key: str, compute_func: Callable, ttl: int = 300, stale_ttl: int = 0) -> Any:
+        """
+        Get from cache or compute and cache the result
+
+        Concurrent misses for the same key share one computation (across pods
+        when Redis is available). With stale_ttl > 0 an expired value is served
+        for that many extra seconds while it is refreshed in the background.
+        """
+        return await self._stampede_guard.get_or_compute(key, compute_func, ttl, stale_ttl)
+
+    async def set(self, key: str, value: Any, ttl: int = 300, tags: Optional[List[str]] = None) -> bool:
+        """Set value in all appropriate cache layers, optionally tagged for invalidate_tags"""
         try:
             success = True
 
             # Set in L1 (Memory) with shorter TTL
             l1_ttl = min(ttl, 300)  # Max 5 minutes in memory
-            await self.l1_cache.set(key, value, ttl=l1_ttl)
+            await self.l1_cache.set(key, value, ttl=l1_ttl, tags=tags)
 
             # Set in L2 (Redis) if available
             if self.l2_cache:
-                redis_success = await self.l2_cache.set(key, value, ttl=ttl)
+                redis_success = await self.l2_cache.set(key, value, ttl=ttl, tags=tags)
                 success = success and redis_success
 
             return success
@@ -462,19 +533,25 @@ class OptimizedCacheService:
             for _ in missing_keys:
                 await self._update_stats("l2_miss")
 
-        return results
+        # Drop get_or_compute entries that are past their fresh deadline
+        unwrapped = {}
+        for key, raw in results.items():
+            value, fresh = unwrap_entry(raw)
+            if fresh:
+                unwrapped[key] = value
+        return unwrapped
 
-    async def set_many(self, items: Dict[str, Tuple[Any, int]]) -> bool:
+    async def set_many(self, items: Dict[str, Tuple[Any, int]], tags: Optional[List[str]] = None) -> bool:
         """Efficient batch set operation"""
         try:
             # Set in L1
             for key, (value, ttl) in items.items():
                 l1_ttl = min(ttl, 300)
-                await self.l1_cache.set(key, value, ttl=l1_ttl)
+                await self.l1_cache.set(key, value, ttl=l1_ttl, tags=tags)
 
             # Set in L2 if available
             if self.l2_cache:
-                await self.l2_cache.set_many(items)
+                await self.l2_cache.set_many(items, tags=tags)
 
             return True
 
@@ -497,14 +574,26 @@ class OptimizedCacheService:
         for key in keys_to_remove:
             await self.l1_cache.delete(key)
 
-        # For L2 (Redis), we'd need a more sophisticated approach
-        # This is a simplified version
+        # L2 (Redis) is not scanned; tag keys on write and use invalidate_tags
         if self.l2_cache and self.l2_cache.enabled:
-            try:
-                # In production, you'd use Redis SCAN with pattern matching
-                logger.info(f"Pattern invalidation requested: {pattern}")
-            except Exception as e:
-                logger.error(f"Pattern invalidation failed: {e}")
+            logger.info(f"Pattern invalidation requested: {pattern} (L1 only, use invalidate_tags for L2)")
+
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """
+        Invalidate exactly the keys tagged with any of the given tags
+
+        Cost is proportional to the number of dependent keys, not the keyspace.
+        Returns the number of keys removed from L1 and L2 combined.
+        """
+        if not tags:
+            return 0
+
+        removed = await self.l1_cache.invalidate_tags(tags)
+
+        if self.l2_cache:
+            removed += await self.l2_cache.invalidate_tags(tags)
+
+        return removed
 
     async def warm_cache(self, items: Dict[str, Tuple[Any, int]]):
         """Warm cache with frequently accessed items"""
@@ -599,7 +688,9 @@ class EnhancedCacheService(OptimizedCacheService):
         }
         logger.info("EnhancedCacheService initialized with performance optimizations")
 
-    async def set_with_priority(self, key: str, value: Any, ttl: int = 300, priority: str = "normal") -> bool:
+    async def set_with_priority(
+        self, key: str, value: Any, ttl: int = 300, priority: str = "normal", tags: Optional[List[str]] = None
+    ) -> bool:
         """
         Set cache value with priority-based TTL adjustment
 
@@ -608,36 +699,25 @@ class EnhancedCacheService(OptimizedCacheService):
             value: Value to cache
             ttl: Base TTL in seconds
             priority: 'critical', 'high', 'normal', or 'low'
+            tags: Optional dependency tags for invalidate_tags
 
         Returns:
             bool: Success status
         """
         multiplier = CachePriority.get_multiplier(priority)
         adjusted_ttl = int(ttl * multiplier)
-        return await self.set(key, value, adjusted_ttl)
+        return await self.set(key, value, adjusted_ttl, tags=tags)
 
-    async def get_or_compute(self, key: str, compute_func: Callable, ttl: int = 300, priority: str = "normal") -> Any:
+    async def get_or_compute(
+        self, key: str, compute_func: Callable, ttl: int = 300, priority: str = "normal", stale_ttl: int = 0
+    ) -> Any:
         """
         Get from cache or compute and cache the result
 
         This is the preferred method for caching expensive computations.
         """
-        # Try cache first
-        value = await self.get(key)
-        if value is not None:
-            return value
-
-        # Compute value
-        if asyncio.iscoroutinefunction(compute_func):
-            value = await compute_func()
-        else:
-            value = compute_func()
-
-        # Cache it
-        if value is not None:
-            await self.set_with_priority(key, value, ttl, priority)
-
-        return value
+        adjusted_ttl = int(ttl * CachePriority.get_multiplier(priority))
+        return await super().get_or_compute(key, compute_func, adjusted_ttl, stale_ttl)
 
     def register_warm_config(self, key_pattern: str, data_loader: Callable, ttl: int = 3600, priority: str = "high"):
         """Register a cache warming configuration"""
@@ -828,19 +908,7 @@ def cached(ttl: int = 300, priority: str = "normal", key_prefix: str = ""):
                 cache_key += f":{hashlib.md5(sorted_kwargs.encode(), usedforsecurity=False).hexdigest()[:8]}"
 
             cache = get_enhanced_cache_service()
-
-            # Try cache first
-            cached_value = await cache.get(cache_key)
-            if cached_value is not None:
-                return cached_value
-
-            # Execute function
-            result = await func(*args, **kwargs)
-
-            # Cache result
-            await cache.set_with_priority(cache_key, result, ttl, priority)
-
-            return result
+            return await cache.get_or_compute(cache_key, lambda: func(*args, **kwargs), ttl, priority)
 
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
@@ -18,6 +18,7 @@ from ghl_real_estate_ai.ghl_utils.config import settings
 from ghl_real_estate_ai.ghl_utils.jorge_config import CURRENT_MARKET
 from ghl_real_estate_ai.ghl_utils.logger import get_logger
 from ghl_real_estate_ai.services.analytics_service import AnalyticsService
+from ghl_real_estate_ai.services.listing_store import ListingStore
 from ghl_real_estate_ai.services.property_matching_strategy import (
     AISemanticSearchStrategy,
     BasicFilteringStrategy,
@@ -55,6 +56,7 @@ class PropertyMatcher:
         self.llm_client = LLMClient(provider="claude", model=settings.claude_model)
         self.analytics = AnalyticsService()
         self.strategy: PropertyMatchingStrategy = BasicFilteringStrategy()
+        self._listing_store: Optional[ListingStore] = None
 
         # Initialize Shared Resource Pool
         self._init_shared_resources()
@@ -219,12 +221,18 @@ class PropertyMatcher:
             logger.error(f"Failed to load sample properties: {e}")
         return []
 
+    def _get_listing_store(self, listings: List[Dict[str, Any]]) -> ListingStore:
+        """Columnar store for the current listings, rebuilt only when the listings are reloaded."""
+        if self._listing_store is None or self._listing_store.listings is not listings:
+            self._listing_store = ListingStore(listings)
+        return self._listing_store
+
     def find_matches(self, preferences: Dict[str, Any], limit: int = 3, min_score: float = 0.5) -> List[Dict[str, Any]]:
         """
         Find property listings that match lead preferences using the active strategy.
         """
         # Delegate to the strategy
-        matches = self.strategy.find_matches(self.listings, preferences, limit)
+        matches = self.strategy.find_matches_in_store(self._get_listing_store(self.listings), preferences, limit)
 
         # Filter by min_score if the strategy didn't (strategies return sorted list)
         return [m for m in matches if m.get("match_score", 0) >= min_score]
@@ -321,37 +329,7 @@ Example: "This South Lamar home is a strategic capture; it sits 5% below your bu
         if not listings:
             listings = self._load_sample_data()
 
-        scored = []
-        budget_min = int(budget * 0.8)
-        budget_max = int(budget * 1.2)
-
-        for prop in listings:
-            price = prop.get("price", 0)
-            if not (budget_min <= price <= budget_max):
-                continue
-
-            score = 1.0
-
-            # Bedroom match
-            prop_beds = prop.get("beds", prop.get("bedrooms", 0))
-            if beds and prop_beds >= beds:
-                score += 0.3
-            elif beds and prop_beds < beds:
-                continue  # Hard filter: must meet minimum beds
-
-            # Neighborhood preference
-            prop_neighborhood = prop.get("neighborhood", "")
-            if neighborhood and neighborhood.lower() in prop_neighborhood.lower():
-                score += 0.5
-
-            # Closer to budget center scores higher
-            budget_distance = abs(price - budget) / budget
-            score += (1.0 - budget_distance) * 0.2
-
-            scored.append({**prop, "match_score": round(score, 2)})
-
-        scored.sort(key=lambda x: x["match_score"], reverse=True)
-        return scored[:limit]
+        return self._get_listing_store(listings).buyer_matches(budget, beds, neighborhood, limit)
 
     def format_match_for_sms(self, property: Dict[str, Any]) -> str:
         """Format a property match for an SMS message."""
@@ -9,6 +9,10 @@ and advanced AI semantic search.
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List
 
+import numpy as np
+
+from ghl_real_estate_ai.services.listing_store import ListingStore, top_k_indices
+
 
 class PropertyMatchingStrategy(ABC):
     """
@@ -32,6 +36,17 @@ class PropertyMatchingStrategy(ABC):
         """
         pass
 
+    def find_matches_in_store(
+        self, store: ListingStore, preferences: Dict[str, Any], limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Find property matches against a columnar ListingStore.
+
+        Strategies that can vectorize their scoring override this; the default
+        falls back to ``find_matches`` over the store's original listings.
+        """
+        return self.find_matches(list(store.listings), preferences, limit)
+
 
 class BasicFilteringStrategy(PropertyMatchingStrategy):
     """
@@ -56,6 +71,21 @@ class BasicFilteringStrategy(PropertyMatchingStrategy):
         scored_listings.sort(key=lambda x: x["match_score"], reverse=True)
         return scored_listings[:limit]
 
+    def find_matches_in_store(
+        self, store: ListingStore, preferences: Dict[str, Any], limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        scores = store.basic_scores(preferences)
+        candidates = np.flatnonzero(scores > 0.4)  # Minimum threshold
+        rounded = np.round(scores[candidates], 2)
+
+        matches = []
+        for i in top_k_indices(candidates, rounded, limit).tolist():
+            prop_copy = store.listings[i].copy()
+            prop_copy["match_score"] = round(float(scores[i]), 2)
+            prop_copy["match_type"] = "Basic Filter"
+            matches.append(prop_copy)
+        return matches
+
     def _calculate_basic_score(self, prop: Dict[str, Any], pref: Dict[str, Any]) -> float:
         score = 0.0
 
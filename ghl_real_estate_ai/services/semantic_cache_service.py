@@ -2,79 +2,167 @@
 Semantic Cache Service
 Implements similarity-based caching for agentic reasoning results.
 Reduces token usage and improves response time for repetitive or similar queries.
+
+Each tenant keeps an in-process index: a contiguous matrix of L2-normalised
+float32 query embeddings, so a lookup is a single matrix-vector product.
+Entries are evicted by TTL first and then least-recently-used. Each entry is
+persisted as its own packed record (see ``SemanticIndexStore``): at most once
+per ``persist_interval`` seconds a tenant writes the entries it changed and
+merges the ones other processes wrote, so pods sharing Redis see each other's
+entries without overwriting them. Unsaved entries are written by ``flush()``,
+which runs on application shutdown.
 """
 
+import asyncio
+import hashlib
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 import numpy as np
 
 from ghl_real_estate_ai.core.embeddings import EmbeddingModel
 from ghl_real_estate_ai.ghl_utils.logger import get_logger
 from ghl_real_estate_ai.services.cache_service import get_cache_service
+from ghl_real_estate_ai.services.semantic_vector_index import (
+    SemanticIndexStore,
+    SemanticVectorIndex,
+    normalize_embedding,
+    register_for_flush,
+)
 
 logger = get_logger(__name__)
 
 
 class SemanticCache:
-    def __init__(self, threshold: float = 0.92, ttl: int = 3600 * 24):
-        self.embedding_model = EmbeddingModel()
-        self.cache_service = get_cache_service()
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        ttl: int = 3600 * 24,
+        max_entries: int = 5000,
+        persist_interval: float = 5.0,
+        embedding_model: Optional[EmbeddingModel] = None,
+        cache_service=None,
+    ):
+        self.embedding_model = embedding_model or EmbeddingModel()
+        self.cache_service = cache_service or get_cache_service()
         self.threshold = threshold
         self.ttl = ttl
+        self.max_entries = max_entries
+        self.persist_interval = persist_interval
         self.index_key = "semantic_cache:index"
-
-    async def _get_index(self) -> List[Dict[str, Any]]:
-        index = await self.cache_service.get(self.index_key)
-        return index if index else []
-
-    async def _save_index(self, index: List[Dict[str, Any]]):
-        await self.cache_service.set(self.index_key, index, ttl=self.ttl)
-
-    def _cosine_similarity(self, v1: List[float], v2: List[float]) -> float:
-        a = np.array(v1)
-        b = np.array(v2)
-        return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
-
-    async def get(self, query: str) -> Optional[Any]:
+        self._indexes: Dict[str, SemanticVectorIndex] = {}
+        self._load_locks: Dict[str, asyncio.Lock] = {}
+        self._store = SemanticIndexStore(self.cache_service)
+        register_for_flush(self)
+
+    def _store_key(self, tenant_id: str) -> str:
+        return f"{self.index_key}:{tenant_id}"
+
+    def _data_key(self, tenant_id: str, query: str) -> str:
+        # Stable across processes, unlike hash()
+        digest = hashlib.blake2b(query.encode("utf-8"), digest_size=16).hexdigest()
+        return f"semantic_cache:data:{tenant_id}:{digest}"
+
+    async def _embed(self, query: str) -> Optional[np.ndarray]:
+        # Prefer the coalescing async path so lookups never block the event loop
+        aembed_query = getattr(self.embedding_model, "aembed_query", None)
+        if aembed_query is not None:
+            return normalize_embedding(await aembed_query(query))
+        return normalize_embedding(self.embedding_model.embed_query(query))
+
+    async def _get_index(self, tenant_id: str, dim: int) -> SemanticVectorIndex:
+        index = self._indexes.get(tenant_id)
+        if index is None:
+            lock = self._load_locks.setdefault(tenant_id, asyncio.Lock())
+            async with lock:
+                index = self._indexes.get(tenant_id)
+                if index is None:
+                    index = await self._load_index(tenant_id, dim)
+                    self._indexes[tenant_id] = index
+
+        if index.dim != dim:
+            logger.warning(f"Semantic cache embedding dimension changed ({index.dim} -> {dim}); resetting index")
+            index = SemanticVectorIndex(dim, self.max_entries)
+            self._indexes[tenant_id] = index
+        return index
+
+    async def _load_index(self, tenant_id: str, dim: int) -> SemanticVectorIndex:
+        index = SemanticVectorIndex(dim, self.max_entries)
+        try:
+            loaded = await self._store.load(self._store_key(tenant_id), index, time.time())
+            if loaded:
+                logger.info(f"Loaded semantic cache index for {tenant_id} ({loaded} entries)")
+        except Exception as e:
+            logger.warning(f"Failed to load semantic cache index for {tenant_id}: {e}")
+        return index
+
+    async def _sync(self, tenant_id: str, index: SemanticVectorIndex, force: bool = False) -> None:
+        """Write this process's changes and merge other processes' entries, debounced."""
+        now = time.time()
+        key = self._store_key(tenant_id)
+        try:
+            if index.dirty and (force or now - index.last_persist >= self.persist_interval):
+                await self._store.persist(key, index, self.ttl, now)
+            if not force and now - index.last_refresh >= self.persist_interval:
+                await self._store.refresh(key, index, now)
+        except Exception as e:
+            logger.warning(f"Failed to sync semantic cache index for {tenant_id}: {e}")
+
+    async def flush(self) -> None:
+        """Persist every tenant's unsaved entries immediately."""
+        for tenant_id, index in list(self._indexes.items()):
+            await self._sync(tenant_id, index, force=True)
+
+    async def get(self, query: str, tenant_id: str = "default") -> Optional[Any]:
         """Find a semantically similar query in the cache."""
-        query_embedding = self.embedding_model.embed_query(query)
-        index = await self._get_index()
-
-        best_match = None
-        highest_score = 0.0
-
-        for entry in index:
-            score = self._cosine_similarity(query_embedding, entry["embedding"])
-            if score > highest_score:
-                highest_score = score
-                best_match = entry
-
-        if highest_score >= self.threshold:
+        query_embedding = await self._embed(query)
+        if query_embedding is None:
+            return None
+
+        index = await self._get_index(tenant_id, query_embedding.shape[0])
+        await self._sync(tenant_id, index)
+        now = time.time()
+        slot, highest_score = index.search(query_embedding, now)
+
+        if slot >= 0 and highest_score >= self.threshold:
+            value = await self.cache_service.get(index.cache_keys[slot])
+            if value is None:
+                # Data expired or was evicted from the backend
+                index.remove(slot)
+                logger.info(f"🧊 Semantic cache STALE (score: {highest_score:.4f}) for: {query[:50]}...")
+                return None
+            index.last_used[slot] = now
             logger.info(f"🎯 Semantic cache HIT (score: {highest_score:.4f}) for: {query[:50]}...")
-            return await self.cache_service.get(best_match["cache_key"])
+            return value
 
         logger.info(f"🧊 Semantic cache MISS (best score: {highest_score:.4f}) for: {query[:50]}...")
         return None
 
-    async def set(self, query: str, value: Any):
+    async def set(self, query: str, value: Any, tenant_id: str = "default"):
         """Store a value in the semantic cache with its embedding."""
-        query_embedding = self.embedding_model.embed_query(query)
-        cache_key = f"semantic_cache:data:{hash(query)}"
+        query_embedding = await self._embed(query)
+        cache_key = self._data_key(tenant_id, query)
 
         # Save actual data
         await self.cache_service.set(cache_key, value, ttl=self.ttl)
+        if query_embedding is None:
+            return
 
-        # Update index
-        index = await self._get_index()
-        index.append({"query": query, "embedding": query_embedding, "cache_key": cache_key, "timestamp": time.time()})
+        # Update index incrementally
+        index = await self._get_index(tenant_id, query_embedding.shape[0])
+        now = time.time()
+        index.add(cache_key, query_embedding, now + self.ttl, now)
 
-        # Limit index size (simple eviction)
-        if len(index) > 500:
-            index = index[-500:]
-
-        await self._save_index(index)
+        await self._sync(tenant_id, index)
         logger.info(f"📥 Cached new entry semantically: {query[:50]}...")
 
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "tenants": len(self._indexes),
+            "entries": {tenant_id: len(index) for tenant_id, index in self._indexes.items()},
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+        }
+
 
 semantic_cache = SemanticCache()
@@ -0,0 +1,302 @@
+"""
+Semantic Vector Index
+In-process top-1 similarity index shared by the semantic caches.
+
+Embeddings are stored L2-normalised in one contiguous float32 matrix, so a
+lookup is a single matrix-vector product instead of a per-entry cosine loop.
+Each entry persists as its own packed record (expiry plus raw little-endian
+float32 vector), so processes sharing a backend only ever write the entries
+they changed and merge what the others wrote.
+"""
+
+import struct
+import weakref
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from ghl_real_estate_ai.ghl_utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_EXPIRY = struct.Struct("<d")
+
+# Slack for clock differences between the processes appending to a change log
+_LOG_SLACK_SECONDS = 5.0
+
+# Caches whose indexes are flushed on shutdown
+_flush_registry: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+def normalize_embedding(embedding: Sequence[float]) -> Optional[np.ndarray]:
+    """Return a unit-length float32 copy, or None for zero/invalid vectors."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    if norm == 0.0 or not np.isfinite(norm):
+        # Dummy/zero embeddings can never match anything
+        return None
+    return vector / norm
+
+
+def pack_entry(vector: np.ndarray, expires_at: float) -> bytes:
+    """Pack one index entry as ``<expiry f8><vector f4...>``."""
+    return _EXPIRY.pack(expires_at) + np.asarray(vector, dtype="<f4").tobytes()
+
+
+def unpack_entry(record: bytes) -> Tuple[np.ndarray, float]:
+    (expires_at,) = _EXPIRY.unpack_from(record)
+    return np.frombuffer(record, dtype="<f4", offset=_EXPIRY.size), expires_at
+
+
+def register_for_flush(cache: Any) -> None:
+    """Flush ``cache`` (anything with an async ``flush()``) on shutdown."""
+    _flush_registry.add(cache)
+
+
+async def flush_semantic_indexes() -> None:
+    """Persist unsaved index entries of every live semantic cache."""
+    for cache in list(_flush_registry):
+        try:
+            await cache.flush()
+        except Exception as e:
+            logger.warning(f"Failed to flush semantic cache index: {e}")
+
+
+class SemanticVectorIndex:
+    """Fixed-capacity matrix of L2-normalised float32 embeddings.
+
+    Slots are keyed by the cache key of the stored value. Lookups mask out
+    expired and free slots; when full, an expired slot is reused first,
+    otherwise the least recently used entry is evicted. Keys added or removed
+    since the last persist are tracked in ``pending`` and ``removed``.
+    """
+
+    def __init__(self, dim: int, capacity: int):
+        self.dim = dim
+        self.capacity = capacity
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.cache_keys: List[Optional[str]] = []
+        self.expires_at = np.zeros(0, dtype=np.float64)
+        self.last_used = np.zeros(0, dtype=np.float64)
+        self.slots: Dict[str, int] = {}
+        self.free: List[int] = []
+        self.pending: Set[str] = set()
+        self.removed: Set[str] = set()
+        self.last_persist = 0.0
+        self.last_refresh = 0.0
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self.pending or self.removed)
+
+    def search(self, query: np.ndarray, now: float) -> Tuple[int, float]:
+        """Return (slot, score) of the best live entry, or (-1, 0.0)."""
+        if not self.slots:
+            return -1, 0.0
+        scores = self.vectors @ query
+        scores[self.expires_at <= now] = -np.inf
+        slot = int(np.argmax(scores))
+        score = float(scores[slot])
+        if not np.isfinite(score):
+            return -1, 0.0
+        return slot, score
+
+    def add(self, cache_key: str, vector: np.ndarray, expires_at: float, now: float) -> None:
+        self._put(cache_key, vector, expires_at, now, last_used=now)
+        self.pending.add(cache_key)
+        self.removed.discard(cache_key)
+
+    def remove(self, slot: int) -> None:
+        """Drop a slot here and from the shared store on the next persist."""
+        cache_key = self._drop(slot)
+        if cache_key is not None:
+            self.removed.add(cache_key)
+            self.pending.discard(cache_key)
+
+    def entry(self, cache_key: str) -> Optional[bytes]:
+        """Packed record for ``cache_key``, or None if it is no longer indexed."""
+        slot = self.slots.get(cache_key)
+        if slot is None:
+            return None
+        return pack_entry(self.vectors[slot], float(self.expires_at[slot]))
+
+    def merge(self, records: Dict[str, bytes], now: float) -> int:
+        """Add entries persisted by other processes; returns how many were added.
+
+        Keys already indexed or removed locally are skipped, and merged entries
+        start as least recently used so they never push out the local working set.
+        """
+        added = 0
+        for cache_key, record in records.items():
+            if cache_key in self.slots or cache_key in self.removed:
+                continue
+            vector, expires_at = unpack_entry(record)
+            if vector.shape[0] != self.dim or expires_at <= now:
+                continue
+            self._put(cache_key, vector, expires_at, now, last_used=0.0)
+            added += 1
+        return added
+
+    def _put(self, cache_key: str, vector: np.ndarray, expires_at: float, now: float, last_used: float) -> None:
+        slot = self.slots.get(cache_key)
+        if slot is None:
+            slot = self._allocate(now)
+            self.slots[cache_key] = slot
+            self.cache_keys[slot] = cache_key
+        self.vectors[slot] = vector
+        self.expires_at[slot] = expires_at
+        self.last_used[slot] = last_used
+
+    def _drop(self, slot: int) -> Optional[str]:
+        cache_key = self.cache_keys[slot]
+        if cache_key is None:
+            return None
+        del self.slots[cache_key]
+        self.cache_keys[slot] = None
+        self.vectors[slot] = 0.0
+        self.expires_at[slot] = 0.0
+        self.free.append(slot)
+        return cache_key
+
+    def _allocate(self, now: float) -> int:
+        if self.free:
+            return self.free.pop()
+
+        size = len(self.cache_keys)
+        if size < self.capacity:
+            # Grow geometrically up to capacity
+            new_size = min(self.capacity, max(16, size * 2))
+            if new_size > self.vectors.shape[0]:
+                self._resize(new_size)
+            self.free.extend(range(new_size - 1, size, -1))
+            self.cache_keys.extend([None] * (new_size - size))
+            return size
+
+        # Full: evict expired entries first, then the least recently used. Local
+        # evictions stay local; other processes may still be using the entry.
+        expired = np.flatnonzero(self.expires_at <= now)
+        slot = int(expired[0]) if expired.size else int(np.argmin(self.last_used))
+        self._drop(slot)
+        return self.free.pop()
+
+    def _resize(self, size: int) -> None:
+        old = self.vectors.shape[0]
+        vectors = np.zeros((size, self.dim), dtype=np.float32)
+        vectors[:old] = self.vectors
+        expires_at = np.zeros(size, dtype=np.float64)
+        expires_at[:old] = self.expires_at
+        last_used = np.zeros(size, dtype=np.float64)
+        last_used[:old] = self.last_used
+        self.vectors, self.expires_at, self.last_used = vectors, expires_at, last_used
+
+
+class SemanticIndexStore:
+    """Per-entry persistence for :class:`SemanticVectorIndex` in a cache backend.
+
+    On Redis, each index is a hash of packed records keyed by cache key plus a
+    sorted-set change log scored by write time: a persist writes only the
+    entries that changed (HSET/HDEL), and a refresh fetches only the entries
+    written since the previous one, so processes never overwrite each other.
+    Other backends are process-local, so they hold the records as one mapping
+    that is read, merged and written back.
+    """
+
+    def __init__(self, cache_service: Any):
+        self.cache_service = cache_service
+
+    def _redis(self) -> Optional[Any]:
+        backend = getattr(self.cache_service, "backend", None)
+        redis = getattr(backend, "redis", None)
+        breaker = getattr(self.cache_service, "circuit_breaker", None) or {}
+        if redis is None or not getattr(backend, "enabled", False) or breaker.get("open"):
+            return None
+        return redis
+
+    @staticmethod
+    def _entries_key(key: str) -> str:
+        return f"{key}:entries"
+
+    @staticmethod
+    def _log_key(key: str) -> str:
+        return f"{key}:log"
+
+    @staticmethod
+    def _decode(records: Dict[Any, Any]) -> Dict[str, bytes]:
+        return {
+            (field.decode("utf-8") if isinstance(field, bytes) else field): record
+            for field, record in records.items()
+            if record is not None
+        }
+
+    async def load(self, key: str, index: SemanticVectorIndex, now: float) -> int:
+        """Merge every stored entry into ``index``; returns how many were added."""
+        redis = self._redis()
+        if redis is not None:
+            records = self._decode(await redis.hgetall(self._entries_key(key)))
+            expired = [field for field, record in records.items() if unpack_entry(record)[1] <= now]
+            if expired:
+                pipeline = redis.pipeline(transaction=False)
+                pipeline.hdel(self._entries_key(key), *expired)
+                pipeline.zrem(self._log_key(key), *expired)
+                await pipeline.execute()
+        else:
+            records = await self.cache_service.get(key) or {}
+        index.last_refresh = now
+        return index.merge(records, now)
+
+    async def refresh(self, key: str, index: SemanticVectorIndex, now: float) -> int:
+        """Merge entries written since the last refresh; returns how many were added."""
+        redis = self._redis()
+        if redis is None:
+            return await self.load(key, index, now)
+
+        since = index.last_refresh - _LOG_SLACK_SECONDS
+        logged = await redis.zrangebyscore(self._log_key(key), since, "+inf")
+        index.last_refresh = now
+        fields = [field for field in self._decode(dict.fromkeys(logged, b"")) if field not in index.slots]
+        if not fields:
+            return 0
+        values = await redis.hmget(self._entries_key(key), fields)
+        return index.merge(self._decode(dict(zip(fields, values))), now)
+
+    async def persist(self, key: str, index: SemanticVectorIndex, ttl: int, now: float) -> None:
+        """Write the entries added or removed since the last persist."""
+        # Swap the change sets out first so keys touched during the write are kept for the next one
+        pending, index.pending = index.pending, set()
+        removed, index.removed = index.removed, set()
+        records = {cache_key: record for cache_key in pending if (record := index.entry(cache_key)) is not None}
+        index.last_persist = now
+
+        try:
+            redis = self._redis()
+            if redis is not None:
+                entries_key, log_key = self._entries_key(key), self._log_key(key)
+                pipeline = redis.pipeline(transaction=False)
+                if records:
+                    pipeline.hset(entries_key, mapping=records)
+                    pipeline.zadd(log_key, {cache_key: now for cache_key in records})
+                if removed:
+                    pipeline.hdel(entries_key, *removed)
+                    pipeline.zrem(log_key, *removed)
+                pipeline.zremrangebyscore(log_key, "-inf", now - ttl)
+                pipeline.expire(entries_key, int(ttl))
+                pipeline.expire(log_key, int(ttl))
+                await pipeline.execute()
+            else:
+                stored = await self.cache_service.get(key) or {}
+                stored = {k: v for k, v in stored.items() if k not in removed and unpack_entry(v)[1] > now}
+                stored.update(records)
+                await self.cache_service.set(key, stored, ttl=int(ttl))
+        except Exception:
+            index.pending |= pending - index.removed
+            index.removed |= removed - index.pending
+            raise
+
+    async def delete(self, key: str) -> None:
+        redis = self._redis()
+        if redis is not None:
+            await redis.delete(self._entries_key(key), self._log_key(key))
+        await self.cache_service.delete(key)
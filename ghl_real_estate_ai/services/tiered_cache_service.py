@@ -2,9 +2,10 @@
 Tiered Cache Service - High-Performance Multi-Layer Caching
 
 Provides a zero-configuration tiered caching system with:
-- L1 Memory Cache: Thread-safe LRU with <1ms latency (10,000 items max)
+- L1 Memory Cache: Sharded thread-safe LRU with <1ms latency (10,000 items max)
 - L2 Redis Cache: Distributed cache with <5ms latency (persistent)
-- Automatic L2 → L1 promotion after 2 accesses
+- Automatic L2 → L1 promotion after 2 accesses (tracked in L1, no L2 write-back)
+- Batch get_many/set_many with one Redis round trip per call
 - Comprehensive metrics tracking
 - Background cleanup tasks
 
@@ -27,10 +28,11 @@ from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 from functools import wraps
-from typing import Any, Callable, Dict, Generic, Optional, TypeVar
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
 
 from ghl_real_estate_ai.ghl_utils.config import settings
 from ghl_real_estate_ai.ghl_utils.logger import get_logger
+from ghl_real_estate_ai.services.cache_codec import CacheCodecError, get_default_codec
 
 logger = get_logger(__name__)
 
@@ -198,9 +200,14 @@ class LRUCache(Generic[T]):
         self.max_size = max_size
         self.default_ttl = default_ttl
         self._cache: OrderedDict[str, CacheItem[T]] = OrderedDict()
+        # L2 read counts for keys not (yet) in this cache, used for promotion
+        self._l2_access_counts: OrderedDict[str, int] = OrderedDict()
         self._lock = threading.RLock()
         self._metrics_ref: Optional[weakref.ref] = None
 
+    def __len__(self) -> int:
+        return len(self._cache)
+
     def set_metrics_ref(self, metrics: CacheMetrics):
         """Set weak reference to metrics for tracking."""
         self._metrics_ref = weakref.ref(metrics)
@@ -249,9 +256,19 @@ class LRUCache(Generic[T]):
 
             return True
 
+    def record_l2_access(self, key: str) -> int:
+        """Count an L2 read of ``key`` and return the total reads seen so far."""
+        with self._lock:
+            count = self._l2_access_counts.pop(key, 0) + 1
+            self._l2_access_counts[key] = count
+            while len(self._l2_access_counts) > self.max_size:
+                self._l2_access_counts.popitem(last=False)
+            return count
+
     def delete(self, key: str) -> bool:
         """Delete item from cache."""
         with self._lock:
+            self._l2_access_counts.pop(key, None)
             if key in self._cache:
                 del self._cache[key]
                 return True
@@ -261,6 +278,7 @@ class LRUCache(Generic[T]):
         """Clear all items from cache."""
         with self._lock:
             self._cache.clear()
+            self._l2_access_counts.clear()
 
     def cleanup_expired(self) -> int:
         """Remove expired items and return count."""
@@ -308,6 +326,65 @@ class LRUCache(Generic[T]):
             self._metrics_ref().update_l1_miss(latency_ms)
 
 
+class ShardedLRUCache(Generic[T]):
+    """
+    LRU cache split into independently locked shards by key hash.
+
+    Concurrent readers and writers only contend when their keys land on the
+    same shard. Eviction is LRU within each shard.
+    """
+
+    def __init__(self, max_size: int = 10000, default_ttl: int = 300, shards: int = 16):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        shard_size = max(1, -(-max_size // shards))
+        self._shards: List[LRUCache[T]] = [
+            LRUCache(max_size=shard_size, default_ttl=default_ttl) for _ in range(shards)
+        ]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def _shard(self, key: str) -> LRUCache[T]:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def set_metrics_ref(self, metrics: CacheMetrics):
+        """Set weak reference to metrics on every shard."""
+        for shard in self._shards:
+            shard.set_metrics_ref(metrics)
+
+    def get(self, key: str) -> Optional[T]:
+        return self._shard(key).get(key)
+
+    def set(self, key: str, value: T, ttl: Optional[int] = None) -> bool:
+        return self._shard(key).set(key, value, ttl)
+
+    def record_l2_access(self, key: str) -> int:
+        return self._shard(key).record_l2_access(key)
+
+    def delete(self, key: str) -> bool:
+        return self._shard(key).delete(key)
+
+    def clear(self):
+        for shard in self._shards:
+            shard.clear()
+
+    def cleanup_expired(self) -> int:
+        return sum(shard.cleanup_expired() for shard in self._shards)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get aggregate statistics across shards."""
+        shard_stats = [shard.get_stats() for shard in self._shards]
+        size = sum(stats["size"] for stats in shard_stats)
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "total_size_bytes": sum(stats["total_size_bytes"] for stats in shard_stats),
+            "utilization_percent": size / self.max_size * 100,
+            "shards": len(self._shards),
+        }
+
+
 class RedisBackend:
     """Async Redis backend for L2 cache."""
 
@@ -371,6 +448,43 @@ class RedisBackend:
             logger.error(f"Redis set error for key {key}: {e}")
             return False
 
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Get raw bytes for several keys in one round trip (MGET)."""
+        if not self.enabled or not keys:
+            return [None] * len(keys)
+
+        try:
+            return await self.redis.mget(keys)
+        except Exception as e:
+            logger.error(f"Redis mget error for {len(keys)} keys: {e}")
+            return [None] * len(keys)
+
+    async def set_many(self, items: Iterable[Tuple[str, bytes, int]]) -> bool:
+        """Set several (key, data, ttl) entries in one pipelined round trip."""
+        if not self.enabled:
+            return False
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, data, ttl in items:
+                pipe.set(key, data, ex=ttl)
+            results = await pipe.execute()
+            return all(results)
+        except Exception as e:
+            logger.error(f"Redis pipelined set error: {e}")
+            return False
+
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys in one round trip."""
+        if not self.enabled or not keys:
+            return 0
+
+        try:
+            return await self.redis.delete(*keys)
+        except Exception as e:
+            logger.error(f"Redis delete error for {len(keys)} keys: {e}")
+            return 0
+
     async def delete(self, key: str) -> bool:
         """Delete key from Redis."""
         if not self.enabled:
@@ -397,6 +511,7 @@ class TieredCacheService:
     Provides automatic L1 (memory) + L2 (Redis) caching with:
     - Zero-configuration setup
     - Automatic promotion based on access patterns
+    - Batch get_many/set_many for multi-key requests
     - Comprehensive performance metrics
     - Background maintenance tasks
     """
@@ -404,6 +519,9 @@ class TieredCacheService:
     _instance: Optional["TieredCacheService"] = None
     _lock = threading.Lock()
 
+    L1_SHARDS = 16
+    PROMOTION_THRESHOLD = 2  # Promote to L1 after this many L2 reads
+
     def __new__(cls) -> "TieredCacheService":
         """Singleton pattern for global cache instance."""
         if cls._instance is None:
@@ -421,8 +539,11 @@ class TieredCacheService:
         self._initialized = True
 
         # Cache layers
-        self.l1_cache: LRUCache = LRUCache(max_size=10000, default_ttl=1800)  # 30min for better hit rates
+        self.l1_cache = ShardedLRUCache(
+            max_size=10000, default_ttl=1800, shards=self.L1_SHARDS
+        )  # 30min for better hit rates
         self.l2_backend = RedisBackend()
+        self.codec = get_default_codec()
 
         # Metrics and monitoring
         self.metrics = CacheMetrics()
@@ -479,41 +600,95 @@ class TieredCacheService:
         start_time = time.perf_counter()
         data = await self.l2_backend.get(key)
 
-        if data is None:
+        cache_item = self._decode_l2(key, data)
+        if cache_item is None:
+            if data is not None:
+                await self.l2_backend.delete(key)  # Expired or undecodable
             self.metrics.update_l2_miss((time.perf_counter() - start_time) * 1000)
             return None
 
-        try:
-            # Deserialize from L2
-            cache_item: CacheItem = pickle.loads(data)
+        return self._accept_l2_hit(key, cache_item, start_time)
 
-            if cache_item.is_expired:
-                await self.l2_backend.delete(key)
-                self.metrics.update_l2_miss((time.perf_counter() - start_time) * 1000)
-                return None
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get several values at once.
 
-            # Record access
-            cache_item.access()
+        L1 is checked per key; all L1 misses are fetched from L2 in a single
+        round trip. Returns a dict containing only the keys that were found.
+        """
+        results: Dict[str, Any] = {}
+        l2_keys: List[str] = []
 
-            # Promote to L1 if accessed enough
-            promoted = False
-            if cache_item.should_promote:
-                self.l1_cache.set(key, cache_item.value, int(cache_item.expires_at - time.time()))
-                promoted = True
+        for key in dict.fromkeys(keys):
+            value = self.l1_cache.get(key)
+            if value is not None:
+                results[key] = value
+            else:
+                l2_keys.append(key)
 
-            self.metrics.update_l2_hit((time.perf_counter() - start_time) * 1000, promoted)
+        if not l2_keys:
+            return results
 
-            # Update L2 with new access count
-            await self._set_l2(key, cache_item, int(cache_item.expires_at - time.time()))
+        start_time = time.perf_counter()
+        payloads = await self.l2_backend.get_many(l2_keys)
+
+        stale_keys = []
+        for key, data in zip(l2_keys, payloads):
+            cache_item = self._decode_l2(key, data)
+            if cache_item is None:
+                if data is not None:
+                    stale_keys.append(key)
+                self.metrics.update_l2_miss((time.perf_counter() - start_time) * 1000)
+                continue
+            results[key] = self._accept_l2_hit(key, cache_item, start_time)
+
+        if stale_keys:
+            await self.l2_backend.delete_many(stale_keys)
 
-            return cache_item.value
+        return results
+
+    def _decode_l2(self, key: str, data: Optional[bytes]) -> Optional[CacheItem]:
+        """Deserialize an L2 payload; returns None if missing, expired or corrupt."""
+        if data is None:
+            return None
 
-        except (pickle.PickleError, AttributeError, EOFError, ImportError) as e:
+        try:
+            payload = self.codec.decode(data)
+        except CacheCodecError as e:
             logger.error(f"Cache deserialization error for key {key}: {str(e)}")
-            await self.l2_backend.delete(key)
-            self.metrics.update_l2_miss((time.perf_counter() - start_time) * 1000)
             return None
 
+        if isinstance(payload, CacheItem):
+            cache_item = payload  # Legacy pickled wrapper
+        elif isinstance(payload, dict) and "v" in payload and "e" in payload:
+            cache_item = CacheItem(
+                value=payload["v"],
+                created_at=payload.get("c", 0.0),
+                expires_at=payload["e"],
+                size_bytes=len(data),
+                source=payload.get("s", "l2"),
+            )
+        else:
+            logger.error(f"Unexpected L2 payload for key {key}: {type(payload).__name__}")
+            return None
+
+        if cache_item.is_expired:
+            return None
+        return cache_item
+
+    def _accept_l2_hit(self, key: str, cache_item: CacheItem, start_time: float) -> Any:
+        """Record an L2 hit and promote to L1 once the key has been read often enough.
+
+        Access counts live in L1-side metadata, so a read never writes back to L2.
+        """
+        promoted = False
+        if self.l1_cache.record_l2_access(key) >= self.PROMOTION_THRESHOLD:
+            self.l1_cache.set(key, cache_item.value, max(1, int(cache_item.expires_at - time.time())))
+            promoted = True
+
+        self.metrics.update_l2_hit((time.perf_counter() - start_time) * 1000, promoted)
+        return cache_item.value
+
     async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
         """
         Set value in tiered cache.
@@ -524,12 +699,34 @@ class TieredCacheService:
         - L2 provides persistence across restarts
         """
         success_l1 = self.l1_cache.set(key, value, ttl)
-        success_l2 = await self._set_l2(
-            key, CacheItem(value=value, created_at=time.time(), expires_at=time.time() + ttl, source="direct"), ttl
-        )
+        success_l2 = await self._set_l2(key, value, ttl)
 
         return success_l1 and success_l2
 
+    async def set_many(self, items: Dict[str, Any], ttl: int = 300) -> bool:
+        """
+        Set several values at once.
+
+        Every value is stored in L1, and all L2 writes go out in one pipeline.
+        """
+        now = time.time()
+        success_l1 = all([self.l1_cache.set(key, value, ttl) for key, value in items.items()])
+
+        if not self.l2_backend.enabled or not items:
+            return success_l1
+
+        payloads = []
+        serialized_all = True
+        for key, value in items.items():
+            try:
+                payloads.append((key, self._encode_l2(value, now, now + ttl, "direct"), ttl))
+            except Exception as e:
+                logger.error(f"L2 cache serialization error for key {key}: {e}")
+                serialized_all = False
+
+        success_l2 = await self.l2_backend.set_many(payloads) if payloads else True
+        return success_l1 and serialized_all and success_l2
+
     async def delete(self, key: str) -> bool:
         """Delete key from both cache layers."""
         success_l1 = self.l1_cache.delete(key)
@@ -564,13 +761,22 @@ class TieredCacheService:
 
         return metrics_data
 
-    async def _set_l2(self, key: str, item: CacheItem, ttl: int) -> bool:
-        """Set item in L2 cache with serialization."""
+    def _encode_l2(self, value: Any, created_at: float, expires_at: float, source: str) -> bytes:
+        """Encode a value with its expiry metadata for L2.
+
+        Only the fields needed to rebuild a CacheItem are stored, so the payload
+        does not depend on the CacheItem class layout of the writing process.
+        """
+        return self.codec.encode({"v": value, "c": created_at, "e": expires_at, "s": source})
+
+    async def _set_l2(self, key: str, value: Any, ttl: int) -> bool:
+        """Set value in L2 cache with serialization."""
         if not self.l2_backend.enabled:
             return True  # Consider success if L2 not available
 
         try:
-            data = pickle.dumps(item)
+            now = time.time()
+            data = self._encode_l2(value, now, now + ttl, "direct")
             return await self.l2_backend.set(key, data, ttl)
         except Exception as e:
             logger.error(f"L2 cache serialization error for key {key}: {e}")
@@ -590,7 +796,7 @@ class TieredCacheService:
                     logger.debug(f"Cleaned {expired_count} expired items from L1 cache")
 
                 # Update metrics
-                self.metrics.l1_size_current = len(self.l1_cache._cache)
+                self.metrics.l1_size_current = len(self.l1_cache)
 
                 # Wait for next cleanup cycle
                 await asyncio.wait_for(self._shutdown_event.wait(), timeout=self._maintenance_interval)
@@ -751,6 +957,8 @@ __all__ = [
     "TieredCacheService",
     "CacheMetrics",
     "CacheItem",
+    "LRUCache",
+    "ShardedLRUCache",
     "tiered_cache",
     "get_tiered_cache",
     "cache_get",
@@ -0,0 +1,223 @@
+"""
+Tests for the BM25 inverted index and hybrid rank fusion in RAGEngine.search.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from ghl_real_estate_ai.core.rag_engine import KeywordIndex, RAGEngine, _matches_where
+
+
+class FakeEmbeddingModel:
+    """Maps text to a bag-of-topics vector so dense search ignores exact identifiers."""
+
+    TOPICS = ["pool", "school", "hoa", "price", "kitchen"]
+
+    def _vector(self, text):
+        lower = text.lower()
+        return [float(t in lower) for t in self.TOPICS] + [0.1]
+
+    def embed_documents(self, texts):
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, query):
+        return self._vector(query)
+
+
+class FakeCollection:
+    """Minimal in-memory stand-in for a Chroma collection."""
+
+    def __init__(self):
+        self.docs = {}
+
+    def add(self, documents, embeddings, metadatas, ids):
+        for doc_id, text, emb, meta in zip(ids, documents, embeddings, metadatas):
+            self.docs[doc_id] = (text, np.asarray(emb, dtype=float), dict(meta))
+
+    def get(self, include=None):
+        ids = list(self.docs)
+        return {
+            "ids": ids,
+            "documents": [self.docs[i][0] for i in ids],
+            "metadatas": [self.docs[i][2] for i in ids],
+        }
+
+    def query(self, query_embeddings, n_results, where=None):
+        q = np.asarray(query_embeddings[0], dtype=float)
+        scored = []
+        for doc_id, (text, emb, meta) in self.docs.items():
+            if _matches_where(meta, where):
+                distance = 1 - float(q @ emb / (np.linalg.norm(q) * np.linalg.norm(emb)))
+                scored.append((distance, doc_id))
+        scored.sort()
+        top = scored[:n_results]
+        return {
+            "ids": [[d for _, d in top]],
+            "documents": [[self.docs[d][0] for _, d in top]],
+            "metadatas": [[self.docs[d][2] for _, d in top]],
+            "distances": [[dist for dist, _ in top]],
+        }
+
+
+@pytest.fixture
+def rag():
+    engine = RAGEngine(embedding_model=FakeEmbeddingModel())
+    engine._collection = FakeCollection()
+    # Semantically similar filler documents crowd out the identifier match
+    for i in range(6):
+        engine.add_texts([f"Lovely pool home with great school access #{i}"], ids=[f"filler_{i}"], location_id="LOC_A")
+    engine.add_texts(["Listing MLS CV24011234 on Haven Avenue"], ids=["mls_doc"], location_id="LOC_A")
+    engine.add_texts(["Listing MLS CV24099999 on Haven Avenue"], ids=["other_tenant"], location_id="LOC_B")
+    engine.add_texts(["Global pool maintenance guide"], ids=["global_doc"], location_id="global")
+    return engine
+
+
+class TestKeywordIndex:
+    def test_bm25_prefers_rare_terms(self):
+        index = KeywordIndex()
+        index.add("a", "pool pool home", {})
+        index.add("b", "pool home with tennis court", {})
+        index.add("c", "condo near park", {})
+
+        hits = index.search("tennis pool", limit=3)
+        assert [doc_id for doc_id, _ in hits][:1] == ["b"]
+        assert "c" not in dict(hits)
+
+    def test_replace_and_remove_keep_stats_consistent(self):
+        index = KeywordIndex()
+        index.add("a", "haven avenue", {})
+        index.add("a", "archibald avenue", {})
+
+        assert index.search("haven", limit=5) == []
+        index.remove("a")
+        assert len(index) == 0
+        assert "avenue" not in index.postings
+
+    def test_where_filter(self):
+        index = KeywordIndex()
+        index.add("a", "pool home", {"neighborhood": "etiwanda"})
+        index.add("b", "pool home", {"neighborhood": "alta loma"})
+
+        hits = index.search("pool", limit=5, where={"neighborhood": {"$in": ["etiwanda", "all"]}})
+        assert [doc_id for doc_id, _ in hits] == ["a"]
+
+    def test_where_range_operators(self):
+        index = KeywordIndex()
+        index.add("a", "pool home", {"price": 450_000})
+        index.add("b", "pool home", {"price": 900_000})
+        index.add("c", "pool home", {})
+
+        hits = index.search("pool", limit=5, where={"price": {"$gte": 450_000, "$lt": 900_000}})
+        assert [doc_id for doc_id, _ in hits] == ["a"]
+        hits = index.search("pool", limit=5, where={"price": {"$gt": 450_000}})
+        assert [doc_id for doc_id, _ in hits] == ["b"]
+
+    def test_where_unknown_operator_raises(self):
+        with pytest.raises(ValueError):
+            _matches_where({"price": 1}, {"price": {"$contains": 1}})
+
+
+class TestHybridSearch:
+    def test_semantic_mode_misses_identifier(self, rag):
+        ids = [r.id for r in rag.search("pool listing CV24011234", n_results=4, location_id="LOC_A")]
+        assert "mls_doc" not in ids
+
+    def test_hybrid_mode_recovers_identifier(self, rag):
+        results = rag.search("pool listing CV24011234", n_results=4, location_id="LOC_A", mode="hybrid")
+        assert "mls_doc" in [r.id for r in results]
+        assert all(r.score is not None for r in results)
+        assert [r.score for r in results] == sorted((r.score for r in results), reverse=True)
+
+    def test_keyword_mode_is_location_scoped(self, rag):
+        ids = [r.id for r in rag.search("Haven Avenue pool", n_results=10, location_id="LOC_A", mode="keyword")]
+        assert "mls_doc" in ids
+        assert "global_doc" in ids
+        assert "other_tenant" not in ids
+
+    def test_index_built_lazily_from_existing_collection(self, rag):
+        restarted = RAGEngine(embedding_model=FakeEmbeddingModel())
+        restarted._collection = rag._collection
+
+        results = restarted.search("CV24011234", n_results=2, location_id="LOC_A", mode="keyword")
+        assert [r.id for r in results] == ["mls_doc"]
+
+    def test_failed_index_build_is_retried(self, rag):
+        restarted = RAGEngine(embedding_model=FakeEmbeddingModel())
+        restarted._collection = rag._collection
+        with patch.object(FakeCollection, "get", side_effect=RuntimeError("chroma unavailable")):
+            assert restarted.search("CV24011234", n_results=2, location_id="LOC_A", mode="keyword") == []
+        assert restarted._keyword_indexes is None
+
+        results = restarted.search("CV24011234", n_results=2, location_id="LOC_A", mode="keyword")
+        assert [r.id for r in results] == ["mls_doc"]
+
+    def test_location_and_global_scores_share_corpus_stats(self):
+        engine = RAGEngine(embedding_model=FakeEmbeddingModel())
+        engine._collection = FakeCollection()
+        engine.add_texts(["pool home"], ids=["local"], location_id="LOC_A")
+        engine.add_texts(["pool home"], ids=["shared"], location_id="global")
+        engine.add_texts([f"pool guide {i}" for i in range(5)], ids=[f"g{i}" for i in range(5)], location_id="global")
+
+        scores = dict(engine._keyword_search("pool home", 10, "LOC_A", None))
+        assert scores["local"] == pytest.approx(scores["shared"])
+
+
+class AsyncFakeEmbeddingModel(FakeEmbeddingModel):
+    """Fails on the blocking path so tests prove the async path is used."""
+
+    def __init__(self):
+        self.async_calls = []
+
+    def embed_query(self, query):
+        raise AssertionError("embed_query must not run on the event loop")
+
+    async def aembed_query(self, query):
+        self.async_calls.append(query)
+        return self._vector(query)
+
+
+class TestAsyncSearch:
+    def test_asearch_matches_search(self, rag):
+        expected = rag.search("pool listing CV24011234", n_results=4, location_id="LOC_A", mode="hybrid")
+
+        rag.embedding_model = AsyncFakeEmbeddingModel()
+        results = asyncio.run(rag.asearch("pool listing CV24011234", n_results=4, location_id="LOC_A", mode="hybrid"))
+
+        assert [r.id for r in results] == [r.id for r in expected]
+        assert rag.embedding_model.async_calls == ["pool listing CV24011234"]
+
+    def test_asearch_falls_back_to_thread_without_aembed_query(self, rag):
+        results = asyncio.run(rag.asearch("pool", n_results=2, location_id="LOC_A"))
+        assert len(results) == 2
+
+    def test_search_corrective_awaits_async_embedding(self, rag):
+        rag.embedding_model = AsyncFakeEmbeddingModel()
+
+        results = asyncio.run(
+            rag.search_corrective("pool home", n_results=2, location_id="LOC_A", neighborhood="Etiwanda")
+        )
+
+        assert results
+        assert rag.embedding_model.async_calls == ["Etiwanda pool home"]
+
+    def test_search_corrective_web_fallback_uses_async_search(self, rag):
+        rag.embedding_model = AsyncFakeEmbeddingModel()
+        researcher = MagicMock()
+        researcher.research_topic = AsyncMock(return_value="Fresh market data")
+
+        with (
+            patch(
+                "ghl_real_estate_ai.services.perplexity_researcher.get_perplexity_researcher",
+                return_value=researcher,
+            ),
+            patch.object(rag, "add_texts"),
+        ):
+            results = asyncio.run(
+                rag.search_corrective("kitchen remodel", n_results=2, location_id="LOC_A", threshold=0.0)
+            )
+
+        assert results[0].source == "perplexity"
+        assert rag.embedding_model.async_calls == ["kitchen remodel"]
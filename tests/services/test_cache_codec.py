@@ -0,0 +1,162 @@
+import pytest
+
+pytestmark = pytest.mark.unit
+
+"""
+Tests for the shared cache codec
+
+Covers:
+- Round trips for typed values (datetime, Decimal, UUID, set, tuple, numpy)
+- Namedtuples and builtin subclasses never decoding to something else
+- Versioned header and compression above the size threshold
+- Legacy raw-pickle payloads and the allow_pickle switch
+- Corrupt and future-version payloads
+"""
+
+import enum
+import pickle
+import uuid
+from collections import OrderedDict, namedtuple
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import numpy as np
+
+from ghl_real_estate_ai.services.cache_codec import (
+    CODEC_VERSION,
+    MAGIC,
+    CacheCodec,
+    CacheCodecError,
+)
+
+
+@pytest.fixture(params=["msgpack", "pickle"])
+def codec(request):
+    return CacheCodec(format=request.param, compression="zlib")
+
+
+def test_round_trip_typed_values(codec):
+    value = {
+        "lead_id": "lead-1",
+        "created": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        "closing": date(2026, 3, 1),
+        "budget": Decimal("725000.50"),
+        "trace": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "tags": {"buyer", "hot"},
+        "scores": [0.1, 0.2, None],
+    }
+
+    assert codec.decode(codec.encode(value)) == value
+
+
+def test_round_trip_numpy_array(codec):
+    array = np.arange(12, dtype=np.float32).reshape(3, 4)
+
+    decoded = codec.decode(codec.encode({"embedding": array}))
+
+    assert decoded["embedding"].dtype == np.float32
+    np.testing.assert_array_equal(decoded["embedding"], array)
+
+
+def test_header_is_versioned():
+    payload = CacheCodec(compression="none").encode({"a": 1})
+
+    assert payload[0] == MAGIC
+    assert payload[1] == CODEC_VERSION
+
+
+def test_large_payloads_are_compressed():
+    codec = CacheCodec(compression="zlib", compress_threshold=256)
+    value = {"history": ["I am looking for a 3 bedroom home in Alta Loma"] * 200}
+
+    small = codec.encode({"a": 1})
+    large = codec.encode(value)
+
+    assert small[2] >> 4 == 0
+    assert large[2] >> 4 != 0
+    assert len(large) < len(pickle.dumps(value))
+    assert codec.decode(large) == value
+
+
+def test_json_format_round_trip():
+    codec = CacheCodec(format="json", compression="none")
+
+    decoded = codec.decode(codec.encode({"price": Decimal("10.5"), "when": date(2026, 1, 1)}))
+
+    assert decoded == {"price": "10.5", "when": "2026-01-01"}
+
+
+def test_round_trip_tuples_and_tuple_keys(codec):
+    value = {(34.1, -117.6): "alta loma", "range": (500_000, (600_000, 700_000)), "ids": [("a", 1)]}
+
+    assert codec.decode(codec.encode(value)) == value
+
+
+Price = namedtuple("Price", "low high")
+
+
+class Stage(str, enum.Enum):
+    HOT = "hot"
+
+
+def test_namedtuple_falls_back_to_pickle():
+    codec = CacheCodec(compression="none")
+
+    payload = codec.encode({"price": Price(1, 2)})
+
+    assert payload[2] & 0x0F == 3
+    assert codec.decode(payload)["price"] == Price(1, 2)
+
+
+def test_namedtuple_without_pickle_raises_at_encode():
+    codec = CacheCodec(compression="none", allow_pickle=False)
+
+    with pytest.raises(CacheCodecError):
+        codec.encode(Price(1, 2))
+
+
+def test_builtin_subclasses_encode_as_plain_values():
+    codec = CacheCodec(compression="none")
+
+    decoded = codec.decode(codec.encode({"stage": Stage.HOT, "order": OrderedDict(a=1), "score": np.float64(0.5)}))
+
+    assert decoded == {"stage": "hot", "order": {"a": 1}, "score": 0.5}
+
+
+class Lead:
+    """Module-level so the pickle fallback can serialize it."""
+
+    def __eq__(self, other):
+        return isinstance(other, Lead)
+
+
+def test_unsupported_type_falls_back_to_pickle():
+    codec = CacheCodec(format="json", compression="none")
+
+    assert isinstance(codec.decode(codec.encode(Lead())), Lead)
+
+
+def test_unsupported_type_without_pickle_raises():
+    codec = CacheCodec(format="json", compression="none", allow_pickle=False)
+
+    with pytest.raises(CacheCodecError):
+        codec.encode(object())
+
+
+def test_legacy_pickle_payload_is_decoded():
+    legacy = pickle.dumps({"score": 87})
+
+    assert CacheCodec().decode(legacy) == {"score": 87}
+    with pytest.raises(CacheCodecError):
+        CacheCodec(format="json", allow_pickle=False).decode(legacy)
+
+
+def test_corrupt_and_future_payloads_raise():
+    codec = CacheCodec(compression="zlib")
+
+    with pytest.raises(CacheCodecError):
+        codec.decode(b"")
+    with pytest.raises(CacheCodecError):
+        codec.decode(bytes((MAGIC, CODEC_VERSION + 1, 1)) + b"\x80")
+    with pytest.raises(CacheCodecError):
+        codec.decode(bytes((MAGIC, CODEC_VERSION, (1 << 4) | 1)) + b"not zlib")
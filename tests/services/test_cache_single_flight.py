@@ -0,0 +1,223 @@
+import pytest
+
+pytestmark = pytest.mark.unit
+
+"""
+Tests for cache stampede protection
+
+Covers:
+- Concurrent misses sharing one computation, including failures
+- Stale-while-revalidate serving and single background refresh
+- Cross-pod lease: waiting for the holder instead of recomputing
+- CacheService.get_or_compute on the memory backend
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from ghl_real_estate_ai.services.cache_single_flight import (
+    RedisLease,
+    SingleFlight,
+    StampedeGuard,
+    make_entry,
+    unwrap_entry,
+)
+
+
+class DictCache:
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+        self.writes = 0
+
+    async def read(self, key: str) -> Optional[Any]:
+        return self.data.get(key)
+
+    async def write(self, key: str, value: Any, ttl: int) -> bool:
+        self.writes += 1
+        self.data[key] = value
+        return True
+
+
+class FakeLeaseRedis:
+    """Minimal async Redis supporting the calls RedisLease makes."""
+
+    def __init__(self):
+        self.store: Dict[str, str] = {}
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def eval(self, script, numkeys, key, token):
+        if self.store.get(key) == token:
+            del self.store[key]
+            return 1
+        return 0
+
+    async def exists(self, key):
+        return int(key in self.store)
+
+
+def counting_compute(result: Any = "value", delay: float = 0.02):
+    calls = {"count": 0}
+
+    async def compute():
+        calls["count"] += 1
+        await asyncio.sleep(delay)
+        return result
+
+    return compute, calls
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_computation(self):
+        flight = SingleFlight()
+        compute, calls = counting_compute()
+
+        results = await asyncio.gather(*(flight.run("k", compute) for _ in range(20)))
+
+        assert results == ["value"] * 20
+        assert calls["count"] == 1
+        assert flight.get_stats()["coalesced"] == 19
+        assert not flight.in_flight("k")
+
+    @pytest.mark.asyncio
+    async def test_failure_propagates_to_all_waiters(self):
+        flight = SingleFlight()
+
+        async def boom():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        results = await asyncio.gather(*(flight.run("k", boom) for _ in range(5)), return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert not flight.in_flight("k")
+
+    @pytest.mark.asyncio
+    async def test_cancelling_first_caller_keeps_computation_for_joined(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return "value"
+
+        owner = asyncio.create_task(flight.run("k", slow))
+        await asyncio.sleep(0)
+        joined = [asyncio.create_task(flight.run("k", slow)) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        owner.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*joined) == ["value"] * 3
+        assert owner.cancelled()
+        assert flight.get_stats()["computations"] == 1
+        assert not flight.in_flight("k")
+
+
+class TestStampedeGuard:
+    @pytest.mark.asyncio
+    async def test_miss_computes_once_and_caches(self):
+        cache = DictCache()
+        guard = StampedeGuard(cache.read, cache.write)
+        compute, calls = counting_compute({"kpi": 42})
+
+        results = await asyncio.gather(*(guard.get_or_compute("kpi", compute, ttl=60) for _ in range(25)))
+
+        assert all(r == {"kpi": 42} for r in results)
+        assert calls["count"] == 1
+        assert cache.writes == 1
+        assert await guard.get_or_compute("kpi", compute, ttl=60) == {"kpi": 42}
+        assert calls["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_none_results_are_not_cached(self):
+        cache = DictCache()
+        guard = StampedeGuard(cache.read, cache.write)
+
+        assert await guard.get_or_compute("k", lambda: None) is None
+        assert cache.writes == 0
+
+    @pytest.mark.asyncio
+    async def test_stale_value_served_while_refreshing(self):
+        cache = DictCache()
+        guard = StampedeGuard(cache.read, cache.write)
+        entry = make_entry("old", ttl=60)
+        entry["fresh_until"] = time.time() - 1
+        cache.data["kpi"] = entry
+        compute, calls = counting_compute("new")
+
+        results = await asyncio.gather(*(guard.get_or_compute("kpi", compute, ttl=60, stale_ttl=30) for _ in range(10)))
+        assert results == ["old"] * 10
+
+        await asyncio.sleep(0.05)
+        assert calls["count"] == 1
+        assert unwrap_entry(cache.data["kpi"]) == ("new", True)
+
+    @pytest.mark.asyncio
+    async def test_expired_value_without_stale_window_recomputes(self):
+        cache = DictCache()
+        guard = StampedeGuard(cache.read, cache.write)
+        entry = make_entry("old", ttl=60)
+        entry["fresh_until"] = time.time() - 1
+        cache.data["kpi"] = entry
+
+        assert await guard.get_or_compute("kpi", lambda: "new", ttl=60) == "new"
+
+    @pytest.mark.asyncio
+    async def test_waits_for_lease_holder_in_other_pod(self):
+        cache = DictCache()
+        redis = FakeLeaseRedis()
+        lease = RedisLease(redis, poll_interval=0.01, wait_timeout=1.0)
+        guard = StampedeGuard(cache.read, cache.write, lease_provider=lambda: lease)
+        compute, calls = counting_compute("local")
+
+        # Another pod holds the lease and writes the value shortly after
+        await redis.set("lease:kpi", "other-pod", nx=True)
+
+        async def other_pod():
+            await asyncio.sleep(0.03)
+            cache.data["kpi"] = make_entry("remote", ttl=60)
+            await redis.eval("", 1, "lease:kpi", "other-pod")
+
+        result, _ = await asyncio.gather(guard.get_or_compute("kpi", compute, ttl=60), other_pod())
+
+        assert result == "remote"
+        assert calls["count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_lease_is_released_after_compute(self):
+        cache = DictCache()
+        redis = FakeLeaseRedis()
+        guard = StampedeGuard(cache.read, cache.write, lease_provider=lambda: RedisLease(redis))
+
+        assert await guard.get_or_compute("kpi", lambda: 7, ttl=60) == 7
+        assert redis.store == {}
+
+
+class TestCacheServiceGetOrCompute:
+    @pytest.mark.asyncio
+    async def test_memory_backend_computes_once(self):
+        from ghl_real_estate_ai.services.cache_service import CacheService, MemoryCache, reset_cache_service
+
+        reset_cache_service()
+        service = CacheService()
+        service.backend = MemoryCache()
+        service.fallback_backend = None
+        compute, calls = counting_compute([1, 2, 3])
+
+        try:
+            results = await asyncio.gather(*(service.get_or_compute("leads", compute, ttl=60) for _ in range(10)))
+
+            assert results == [[1, 2, 3]] * 10
+            assert calls["count"] == 1
+            assert await service.get("leads") == [1, 2, 3]
+        finally:
+            reset_cache_service()
@@ -0,0 +1,314 @@
+import pytest
+
+pytestmark = pytest.mark.unit
+
+"""
+Tests for tag-based cache invalidation
+
+Covers:
+- RedisTagIndex tagging in a pipeline and deleting exactly the dependents
+  in one atomic script call
+- Tag set lifetime following the longest-lived member
+- MemoryCache and OptimizedCacheService invalidate_tags
+- Local tag indexes pruned on delete, eviction and expiry
+- GHL webhooks invalidating only the updated lead's dependents
+- Per-lead live data entries rebuilding real datetimes
+"""
+
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Set
+from unittest.mock import AsyncMock, MagicMock
+
+from ghl_real_estate_ai.services.cache_tags import LocalTagIndex, RedisTagIndex
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.commands: List[tuple] = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        return [getattr(self.redis, f"_{name}")(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis.asyncio commands the tag index uses."""
+
+    def __init__(self):
+        self.values: Dict[str, Any] = {}
+        self.sets: Dict[str, Set[str]] = {}
+        self.ttls: Dict[str, int] = {}
+        self.round_trips = 0
+        self.scripts_registered = 0
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def register_script(self, script: str):
+        self.scripts_registered += 1
+
+        async def run(keys=(), args=()):
+            # Mirrors the Lua invalidation script: read and delete in one atomic step
+            self.round_trips += 1
+            deleted = 0
+            for tag_key in keys:
+                deleted += self._delete(*self._smembers(tag_key)) if self.sets.get(tag_key) else 0
+                self._delete(tag_key)
+            return deleted
+
+        return run
+
+    async def smembers(self, key):
+        self.round_trips += 1
+        return self._smembers(key)
+
+    def _set(self, key, value, ex=None):
+        self.values[key] = value
+        return True
+
+    def _sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+        return len(members)
+
+    def _expire(self, key, ttl, nx=False, gt=False):
+        current = self.ttls.get(key)
+        if nx and current is not None:
+            return False
+        if gt and (current is None or ttl <= current):
+            return False
+        self.ttls[key] = ttl
+        return True
+
+    def _smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    def _delete(self, *keys):
+        deleted = 0
+        for key in keys:
+            if self.values.pop(key, None) is not None or self.sets.pop(key, None) is not None:
+                deleted += 1
+        return deleted
+
+
+class TestRedisTagIndex:
+    @pytest.mark.asyncio
+    async def test_invalidate_deletes_only_dependents(self):
+        redis = FakeRedis()
+        index = RedisTagIndex(redis)
+        pipeline = redis.pipeline()
+        for key in ("lead:1:score", "lead:1:profile", "lead:2:score"):
+            pipeline.set(key, b"x")
+        index.add_to_pipeline(pipeline, ["lead:1:score", "lead:1:profile"], ["lead:1", "location:a"], 300)
+        index.add_to_pipeline(pipeline, ["lead:2:score"], ["lead:2", "location:a"], 300)
+        await pipeline.execute()
+
+        deleted = await index.invalidate(["lead:1"])
+
+        assert deleted == 2
+        assert set(redis.values) == {"lead:2:score"}
+        assert "tag:lead:1" not in redis.sets
+        assert await index.members("location:a") == {"lead:1:score", "lead:1:profile", "lead:2:score"}
+
+    @pytest.mark.asyncio
+    async def test_invalidate_is_one_atomic_round_trip(self):
+        redis = FakeRedis()
+        index = RedisTagIndex(redis)
+        await index.add([f"k{i}" for i in range(50)], ["location:a"], 60)
+        for i in range(50):
+            redis.values[f"k{i}"] = b"x"
+        redis.round_trips = 0
+
+        assert await index.invalidate(["location:a", "location:b"]) == 50
+        assert await index.invalidate(["location:a"]) == 0
+        assert redis.round_trips == 2
+        assert redis.scripts_registered == 1
+
+    @pytest.mark.asyncio
+    async def test_tag_set_lives_as_long_as_longest_member(self):
+        redis = FakeRedis()
+        index = RedisTagIndex(redis)
+
+        await index.add(["short"], ["lead:1"], 60)
+        await index.add(["long"], ["lead:1"], 600)
+        await index.add(["medium"], ["lead:1"], 120)
+
+        assert redis.ttls["tag:lead:1"] == 600
+
+    @pytest.mark.asyncio
+    async def test_empty_invalidate_is_noop(self):
+        redis = FakeRedis()
+
+        assert await RedisTagIndex(redis).invalidate([]) == 0
+        assert redis.round_trips == 0
+
+
+def test_local_tag_index_pop():
+    index = LocalTagIndex()
+    index.add(["a", "b"], ["lead:1"])
+    index.add(["c"], ["lead:2"])
+
+    assert sorted(index.pop(["lead:1", "missing"])) == ["a", "b"]
+    assert index.members("lead:2") == {"c"}
+    assert len(index) == 1
+
+
+def test_local_tag_index_discard_drops_empty_tags():
+    index = LocalTagIndex()
+    index.add(["a"], ["lead:1", "location:a"])
+    index.add(["b"], ["location:a"])
+
+    index.discard("a")
+
+    assert index.members("location:a") == {"b"}
+    assert len(index) == 1
+    index.discard("b")
+    assert len(index) == 0
+
+
+class TestBackendInvalidateTags:
+    @pytest.mark.asyncio
+    async def test_memory_cache(self):
+        from ghl_real_estate_ai.services.cache_service import MemoryCache
+
+        cache = MemoryCache()
+        await cache.set("lead:1:score", 90, tags=["lead:1"])
+        await cache.set("lead:1:history", [1], tags=["lead:1", "location:a"])
+        await cache.set("lead:2:score", 70, tags=["lead:2"])
+
+        assert await cache.invalidate_tags(["lead:1"]) == 2
+        assert await cache.get("lead:1:score") is None
+        assert await cache.get("lead:2:score") == 70
+
+    @pytest.mark.asyncio
+    async def test_optimized_cache_service_l1(self):
+        from ghl_real_estate_ai.services.optimized_cache_service import OptimizedCacheService
+
+        cache = OptimizedCacheService()
+        await cache.set("dashboard:a", {"kpi": 1}, tags=["location:a"])
+        await cache.set_many({"lead:1": ("x", 60), "lead:2": ("y", 60)}, tags=["location:a"])
+        await cache.set("dashboard:b", {"kpi": 2}, tags=["location:b"])
+
+        assert await cache.invalidate_tags(["location:a"]) == 3
+        assert await cache.get("dashboard:a") is None
+        assert await cache.get("dashboard:b") == {"kpi": 2}
+
+
+class TestLocalTagPruning:
+    @pytest.mark.asyncio
+    async def test_memory_cache_prunes_on_delete_and_eviction(self):
+        from ghl_real_estate_ai.services.cache_service import MemoryCache
+
+        cache = MemoryCache(max_size=2)
+        await cache.set("a", 1, tags=["t:a"])
+        await cache.set("b", 2, tags=["t:b"])
+        await cache.set("c", 3, tags=["t:c"])  # evicts "a"
+        await cache.delete("b")
+
+        assert len(cache._tag_index) == 1
+        assert cache._tag_index.members("t:c") == {"c"}
+
+    @pytest.mark.asyncio
+    async def test_memory_cache_prunes_on_expiry(self):
+        from ghl_real_estate_ai.services.cache_service import MemoryCache
+
+        cache = MemoryCache()
+        await cache.set("a", 1, ttl=60, tags=["t"])
+        cache._expiry["a"] = time.time() - 1
+
+        assert await cache.get("a") is None
+        assert len(cache._tag_index) == 0
+
+    @pytest.mark.asyncio
+    async def test_l1_cache_prunes_on_eviction(self):
+        from ghl_real_estate_ai.services.optimized_cache_service import L1MemoryCache
+
+        cache = L1MemoryCache(max_size=10)
+        for i in range(100):
+            await cache.set(f"k{i}", i, tags=[f"lead:{i}"])
+
+        assert len(cache.tag_index) == 10
+        assert await cache.invalidate_tags(["lead:0", "lead:99"]) == 1
+
+
+class TestLiveDataLeadInvalidation:
+    @pytest.fixture
+    def service(self):
+        from ghl_real_estate_ai.services.ghl_live_data_service import GHLLiveDataService
+
+        service = GHLLiveDataService.__new__(GHLLiveDataService)
+        service.cache = AsyncMock()
+        service.lead_aggregates_tag = "live_lead_aggregates"
+        service.lead_lists_tag = "live_lead_lists"
+        return service
+
+    @pytest.mark.asyncio
+    async def test_update_invalidates_lead_and_aggregates_only(self, service):
+        await service._invalidate_lead_cache("c1")
+
+        service.cache.invalidate_tags.assert_awaited_once_with(["lead:c1", "live_lead_aggregates"])
+
+    @pytest.mark.asyncio
+    async def test_new_lead_also_invalidates_lead_lists(self, service):
+        await service._invalidate_lead_cache("c2", new_lead=True)
+
+        service.cache.invalidate_tags.assert_awaited_once_with(["lead:c2", "live_lead_aggregates", "live_lead_lists"])
+
+
+class DictCache:
+    """Minimal tagged cache that stores values as given."""
+
+    def __init__(self):
+        self.values: Dict[str, Any] = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=300, tags=None):
+        self.values[key] = value
+        return True
+
+
+class TestLiveDataPerLeadEntries:
+    @pytest.mark.asyncio
+    async def test_cached_leads_keep_datetimes_for_business_metrics(self):
+        from ghl_real_estate_ai.services.ghl_live_data_service import GHLLiveDataService
+
+        now = datetime.now()
+        service = GHLLiveDataService.__new__(GHLLiveDataService)
+        service.cache = DictCache()
+        service.lead_data_cache_ttl = 300
+        service.lead_lists_tag = "live_lead_lists"
+        service.last_sync_times = {}
+        service.lead_scorer = MagicMock()
+        service.ghl_service = MagicMock()
+        service.ghl_service.get_contacts = AsyncMock(
+            return_value={
+                "contacts": [
+                    {"id": "c1", "name": "Ana", "dateAdded": now.isoformat(), "dateUpdated": now.isoformat()},
+                ]
+            }
+        )
+        service._get_jorge_custom_field = AsyncMock(return_value=None)
+        service._get_conversation_summary = AsyncMock(return_value={})
+        service._get_closed_deals_mtd = AsyncMock(return_value=[])
+        service._get_bot_contribution_metrics = AsyncMock(return_value={})
+
+        # The limit=50 list writes the per-lead entry; the limit=200 list rebuilds from it
+        await service.get_live_leads_context(limit=50)
+        leads = await service.get_live_leads_context(limit=200)
+        assert isinstance(leads[0].created_at, datetime)
+        assert isinstance(leads[0].last_activity, datetime)
+
+        metrics = await service._calculate_business_intelligence()
+
+        assert metrics.active_leads_count == 1
+        assert metrics.conversion_rate == 0
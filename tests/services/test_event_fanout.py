@@ -0,0 +1,205 @@
+import pytest
+
+pytestmark = pytest.mark.unit
+
+"""
+Tests for EventPublisher fan-out lanes
+
+Covers:
+- EventLane overflow policies and coalescing above the watermark
+- Batched consumption with linger
+- LatencyHistogram percentiles and window rotation
+- EventPublisher routing events through per-lane consumers
+- Delivery latency of coalesced events measured from the first enqueue
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from ghl_real_estate_ai.services.event_fanout import COALESCED, DROPPED, QUEUED, EventLane, LatencyHistogram
+
+
+class TestEventLane:
+    @pytest.mark.asyncio
+    async def test_drop_oldest_evicts_head(self):
+        lane = EventLane("normal", maxsize=3, overflow="drop_oldest")
+        for i in range(5):
+            assert await lane.put(i) == QUEUED
+
+        assert lane.get_nowait_batch(10) == [2, 3, 4]
+        assert lane.dropped == 2
+
+    @pytest.mark.asyncio
+    async def test_drop_newest_rejects_incoming(self):
+        lane = EventLane("low", maxsize=2, overflow="drop_newest")
+        await lane.put("a")
+        await lane.put("b")
+
+        assert await lane.put("c") == DROPPED
+        assert lane.get_nowait_batch(10) == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_block_waits_for_consumer(self):
+        lane = EventLane("high", maxsize=1, overflow="block", put_timeout=1.0)
+        await lane.put("a")
+
+        async def consume():
+            await asyncio.sleep(0.02)
+            return lane.get_nowait_batch(1)
+
+        outcome, consumed = await asyncio.gather(lane.put("b"), consume())
+
+        assert outcome == QUEUED
+        assert consumed == ["a"]
+        assert lane.get_nowait_batch(1) == ["b"]
+
+    @pytest.mark.asyncio
+    async def test_block_drops_after_timeout(self):
+        lane = EventLane("high", maxsize=1, overflow="block", put_timeout=0.01)
+        await lane.put("a")
+
+        assert await lane.put("b") == DROPPED
+        assert len(lane) == 1
+
+    @pytest.mark.asyncio
+    async def test_coalesces_only_above_watermark(self):
+        lane = EventLane("normal", maxsize=4, coalesce_watermark=0.5)
+        await lane.put("dash-1", coalesce_key="dash")
+        await lane.put("dash-2", coalesce_key="dash")  # depth 1 < 2: still queued
+        await lane.put("other")
+
+        assert await lane.put("dash-3", coalesce_key="dash") == COALESCED
+        assert lane.get_nowait_batch(10) == ["dash-1", "dash-3", "other"]
+        assert lane.coalesced == 1
+
+    @pytest.mark.asyncio
+    async def test_get_batch_lingers_for_more_items(self):
+        lane = EventLane("normal")
+
+        async def produce():
+            await lane.put(1)
+            await asyncio.sleep(0.005)
+            await lane.put(2)
+
+        batch, _ = await asyncio.gather(lane.get_batch(10, linger=0.03), produce())
+
+        assert batch == [1, 2]
+        assert lane.get_stats()["depth"] == 0
+
+    def test_unknown_overflow_policy(self):
+        with pytest.raises(ValueError):
+            EventLane("x", overflow="spill")
+
+
+class TestLatencyHistogram:
+    def test_percentiles_within_bucket_error(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 101):
+            histogram.record(float(value))
+
+        assert histogram.count == 100
+        assert histogram.mean() == pytest.approx(50.5)
+        assert histogram.max() == 100.0
+        assert 50 <= histogram.percentile(50) <= 50 * 1.25
+        assert 95 <= histogram.percentile(95) <= 100
+        assert histogram.percentile(100) == 100.0
+
+    def test_old_windows_roll_off(self):
+        histogram = LatencyHistogram(window_seconds=60)
+        with patch("ghl_real_estate_ai.services.event_fanout.time.monotonic") as monotonic:
+            monotonic.return_value = histogram._window_start
+            histogram.record(500.0)
+
+            monotonic.return_value += 61
+            histogram.record(1.0)
+            assert histogram.count == 2
+
+            monotonic.return_value += 61
+            histogram.record(2.0)
+            assert histogram.count == 2
+            assert histogram.max() == 2.0
+
+            monotonic.return_value += 200
+            assert histogram.count == 0
+
+        assert histogram.total_count == 3
+
+
+class TestEventPublisherLanes:
+    @pytest.fixture
+    def publisher(self):
+        websocket_manager = MagicMock()
+        websocket_manager.publish_event = AsyncMock()
+        with (
+            patch("ghl_real_estate_ai.services.event_publisher.get_websocket_manager", return_value=websocket_manager),
+            patch("ghl_real_estate_ai.services.event_publisher.get_cache_service", return_value=MagicMock()),
+        ):
+            from ghl_real_estate_ai.services.event_publisher import EventPublisher
+
+            yield EventPublisher()
+
+    @staticmethod
+    def _event(event_type, priority="normal"):
+        from ghl_real_estate_ai.services.websocket_server import RealTimeEvent
+
+        return RealTimeEvent(
+            event_type=event_type,
+            data={},
+            timestamp=datetime.now(timezone.utc),
+            user_id=1,
+            location_id="loc",
+            priority=priority,
+        )
+
+    @pytest.mark.asyncio
+    async def test_events_are_delivered_by_lane_consumers(self, publisher):
+        from ghl_real_estate_ai.services.websocket_server import EventType
+
+        await publisher._publish_event(self._event(EventType.LEAD_UPDATE, priority="high"))
+        await publisher._publish_event(self._event(EventType.LEAD_UPDATE, priority="low"))
+        await asyncio.sleep(0.05)
+
+        assert publisher.websocket_manager.publish_event.await_count == 2
+        metrics = publisher.get_metrics()
+        assert metrics["batch_queue_size"] == 0
+        assert metrics["lanes"]["high"]["enqueued"] == 1
+        assert metrics["optimization_metrics"]["delivery_latency_by_lane"]["low"]["count"] == 1
+
+        for task in publisher._consumer_tasks.values():
+            task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_coalesced_event_keeps_first_enqueue_time(self, publisher):
+        from ghl_real_estate_ai.services.websocket_server import EventType
+
+        publisher._lanes["normal"].coalesce_depth = 1
+        first, latest = self._event(EventType.DASHBOARD_REFRESH), self._event(EventType.DASHBOARD_REFRESH)
+        await publisher._publish_event(first)
+        first_start = first.data["_processing_start"]
+        await publisher._publish_event(latest)
+
+        assert publisher._lanes["normal"].coalesced == 1
+        assert latest.data["_processing_start"] == first_start
+
+        await asyncio.sleep(0.05)
+        publisher.websocket_manager.publish_event.assert_awaited_once_with(latest)
+        assert publisher.get_metrics()["optimization_metrics"]["delivery_latency_by_lane"]["normal"]["count"] == 1
+
+        for task in publisher._consumer_tasks.values():
+            task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_flush_aggregates_dashboard_refreshes(self, publisher):
+        from ghl_real_estate_ai.services.websocket_server import EventType
+
+        lane = publisher._lanes["normal"]
+        for _ in range(3):
+            event = self._event(EventType.DASHBOARD_REFRESH)
+            await lane.put(event, publisher._coalesce_key(event))
+
+        await publisher.flush()
+
+        publisher.websocket_manager.publish_event.assert_awaited_once()
+        delivered = publisher.websocket_manager.publish_event.await_args.args[0]
+        assert delivered.data["aggregated_events"] == 3
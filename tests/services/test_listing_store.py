@@ -0,0 +1,172 @@
+import pytest
+
+pytestmark = pytest.mark.unit
+
+"""
+Tests for the columnar ListingStore
+
+Covers:
+- Buyer matches identical to the original per-listing loop
+- Basic strategy scoring identical to the list-based strategy
+- Price range index and neighborhood masks
+- Both listing formats (beds/neighborhood and bedrooms/address dict)
+"""
+
+import random
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ghl_real_estate_ai.services.listing_store import ListingStore, top_k_indices
+from ghl_real_estate_ai.services.property_matching_strategy import BasicFilteringStrategy
+
+NEIGHBORHOODS = ["Alta Loma", "Etiwanda", "Victoria Gardens", "Central Park", "North Rancho"]
+
+
+def make_listings(count: int = 400, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    listings = []
+    for i in range(count):
+        neighborhood = rng.choice(NEIGHBORHOODS)
+        price = rng.randrange(400_000, 1_400_000, 5_000)
+        if i % 2:
+            listings.append(
+                {
+                    "id": f"s-{i}",
+                    "price": price,
+                    "beds": rng.randint(1, 6),
+                    "baths": rng.randint(1, 4),
+                    "sqft": rng.randint(900, 4200),
+                    "neighborhood": neighborhood,
+                    "address": f"{i} Main St, {neighborhood}, Rancho Cucamonga",
+                }
+            )
+        else:
+            listings.append(
+                {
+                    "id": f"r-{i}",
+                    "price": price,
+                    "bedrooms": rng.randint(1, 6),
+                    "bathrooms": rng.randint(1, 4),
+                    "address": {
+                        "street": f"{i} Base Line Rd",
+                        "city": "Rancho Cucamonga",
+                        "neighborhood": neighborhood,
+                    },
+                }
+            )
+    return listings
+
+
+def reference_buyer_matches(
+    listings: List[Dict[str, Any]], budget: int, beds: Optional[int], neighborhood: Optional[str], limit: int
+) -> List[Dict[str, Any]]:
+    """The original PropertyMatcher.find_buyer_matches loop."""
+    scored = []
+    budget_min = int(budget * 0.8)
+    budget_max = int(budget * 1.2)
+    for prop in listings:
+        price = prop.get("price", 0)
+        if not (budget_min <= price <= budget_max):
+            continue
+        score = 1.0
+        prop_beds = prop.get("beds", prop.get("bedrooms", 0))
+        if beds and prop_beds >= beds:
+            score += 0.3
+        elif beds and prop_beds < beds:
+            continue
+        prop_neighborhood = prop.get("neighborhood", "")
+        if neighborhood and neighborhood.lower() in prop_neighborhood.lower():
+            score += 0.5
+        score += (1.0 - abs(price - budget) / budget) * 0.2
+        scored.append({**prop, "match_score": round(score, 2)})
+    scored.sort(key=lambda x: x["match_score"], reverse=True)
+    return scored[:limit]
+
+
+class TestBuyerMatches:
+    @pytest.mark.parametrize(
+        "budget,beds,neighborhood,limit",
+        [
+            (800_000, None, None, 3),
+            (800_000, 3, None, 5),
+            (650_000, 2, "alta", 3),
+            (1_000_000, 4, "Victoria Gardens", 10),
+            (500_000, 6, "park", 50),
+            (3_000_000, None, None, 3),
+        ],
+    )
+    def test_matches_original_loop(self, budget, beds, neighborhood, limit):
+        listings = make_listings()
+        store = ListingStore(listings)
+
+        expected = reference_buyer_matches(listings, budget, beds, neighborhood, limit)
+        assert store.buyer_matches(budget, beds, neighborhood, limit) == expected
+
+    def test_results_are_copies(self):
+        listings = make_listings(20)
+        store = ListingStore(listings)
+
+        matches = store.buyer_matches(800_000, limit=20)
+
+        assert matches
+        assert all("match_score" not in prop for prop in listings)
+
+
+class TestBasicScores:
+    @pytest.mark.parametrize(
+        "preferences",
+        [
+            {"budget": 750_000, "bedrooms": 3, "location": "rancho"},
+            {"budget": 600_000, "bedrooms": 4},
+            {"location": "base line"},
+            {},
+        ],
+    )
+    def test_matches_list_strategy(self, preferences):
+        listings = make_listings()
+        strategy = BasicFilteringStrategy()
+
+        expected = strategy.find_matches(listings, preferences, limit=25)
+        assert strategy.find_matches_in_store(ListingStore(listings), preferences, limit=25) == expected
+
+    def test_scores_match_per_listing(self):
+        listings = make_listings(50)
+        strategy = BasicFilteringStrategy()
+        preferences = {"budget": 900_000, "bedrooms": 3, "location": "etiwanda"}
+
+        scores = ListingStore(listings).basic_scores(preferences)
+
+        expected = [strategy._calculate_basic_score(prop, preferences) for prop in listings]
+        np.testing.assert_allclose(scores, expected)
+
+
+class TestIndexes:
+    def test_price_range_uses_listing_order(self):
+        listings = [{"price": p} for p in (500, 300, 400, 300, 900)]
+        store = ListingStore(listings)
+
+        assert store.price_range(300, 500).tolist() == [0, 1, 2, 3]
+        assert store.price_range(901, 1000).tolist() == []
+
+    def test_neighborhood_mask_is_substring_and_case_insensitive(self):
+        listings = [{"neighborhood": "Alta Loma"}, {"neighborhood": "Etiwanda"}, {}, {"neighborhood": "alta vista"}]
+        store = ListingStore(listings)
+
+        assert store.neighborhood_mask("ALTA").tolist() == [True, False, False, True]
+        assert store.neighborhood_mask("alta", np.array([1, 3])).tolist() == [False, True]
+
+    def test_top_k_breaks_ties_by_listing_order(self):
+        candidates = np.array([2, 5, 7, 9, 11])
+        scores = np.array([1.0, 1.5, 1.5, 0.5, 1.5])
+
+        assert top_k_indices(candidates, scores, 2).tolist() == [5, 7]
+        assert top_k_indices(candidates, scores, 10).tolist() == [5, 7, 11, 2, 9]
+
+    def test_missing_values_are_excluded(self):
+        listings = [{"price": None, "beds": 3}, {"price": 800_000}, {"price": 810_000, "beds": 3}]
+        store = ListingStore(listings)
+
+        matches = store.buyer_matches(800_000, beds=2)
+
+        assert [m["price"] for m in matches] == [810_000]
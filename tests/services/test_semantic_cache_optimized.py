@@ -0,0 +1,157 @@
+import pytest
+
+pytestmark = pytest.mark.integration
+
+"""
+Tests for SemanticResponseCacheOptimized semantic index
+
+Covers:
+- Semantic matches across the whole cache, not only the most recent keys
+- Context partitioning
+- Stale index entries when the L2 response has expired
+- Index reload, cross-instance merge, flush and clear
+"""
+
+import asyncio
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from ghl_real_estate_ai.services.semantic_cache_optimized import SemanticResponseCacheOptimized
+from ghl_real_estate_ai.services.semantic_vector_index import SemanticIndexStore
+
+
+class FakeEncoder:
+    """Embeds by topic word (last token) so paraphrases land close together."""
+
+    def encode(self, texts):
+        vectors = []
+        for text in texts:
+            topic = text.split()[-1].strip("?.!,")
+            base = np.random.default_rng(sum(map(ord, topic))).normal(size=16)
+            noise = np.random.default_rng(len(text)).normal(scale=0.01, size=16)
+            vectors.append(base + noise)
+        return np.array(vectors)
+
+
+class FakeCacheService:
+    def __init__(self):
+        self.store: Dict[str, Any] = {}
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.store.get(key)
+
+    async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
+        self.store[key] = value
+        return True
+
+    async def delete(self, key: str) -> bool:
+        return self.store.pop(key, None) is not None
+
+
+@pytest.fixture
+def cache_backend():
+    return FakeCacheService()
+
+
+@pytest.fixture
+def semantic_cache(cache_backend, monkeypatch):
+    monkeypatch.setattr("ghl_real_estate_ai.services.semantic_cache_optimized.get_cache_service", lambda: cache_backend)
+    cache = SemanticResponseCacheOptimized()
+    cache._embeddings_model = FakeEncoder()
+    cache.index_persist_interval = 0.0
+    return cache
+
+
+class TestSemanticIndexSearch:
+    @pytest.mark.asyncio
+    async def test_matches_beyond_most_recent_twenty(self, semantic_cache):
+        await semantic_cache.set("what is the price of topic0", {"content": "answer-0"})
+        for i in range(1, 40):
+            await semantic_cache.set(f"what is the price of topic{i}", {"content": f"answer-{i}"})
+
+        result = await semantic_cache._semantic_similarity_search("what's the price of topic0", 0.87)
+
+        assert result is not None
+        assert result["response"] == {"content": "answer-0"}
+        assert semantic_cache.get_cache_stats()["semantic_index_size"] == 40
+
+    @pytest.mark.asyncio
+    async def test_context_partitions_index(self, semantic_cache):
+        await semantic_cache.set("describe the neighborhood", {"content": "a"}, context="lead-1")
+
+        assert await semantic_cache._semantic_similarity_search("describe neighborhood", 0.87, "lead-2") is None
+        match = await semantic_cache._semantic_similarity_search("describe neighborhood", 0.87, "lead-1")
+        assert match["response"] == {"content": "a"}
+
+    @pytest.mark.asyncio
+    async def test_expired_response_is_dropped_from_index(self, semantic_cache, cache_backend):
+        await semantic_cache.set("list the schools", {"content": "a"})
+        for key in [k for k in cache_backend.store if k.startswith("semantic_query_")]:
+            del cache_backend.store[key]
+
+        assert await semantic_cache._semantic_similarity_search("list schools", 0.87) is None
+        assert semantic_cache.get_cache_stats()["semantic_index_size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_index_reload(self, semantic_cache):
+        await semantic_cache.set("estimate the commission", {"content": "6%"})
+
+        reloaded = SemanticResponseCacheOptimized()
+        reloaded._embeddings_model = FakeEncoder()
+        match = await reloaded._semantic_similarity_search("estimate commission", 0.87)
+
+        assert match["response"] == {"content": "6%"}
+
+
+class TestSemanticIndexPersistence:
+    @pytest.mark.asyncio
+    async def test_concurrent_first_use_loads_once(self, semantic_cache, monkeypatch):
+        loads = []
+        original = SemanticIndexStore.load
+
+        async def counting_load(store, key, index, now):
+            loads.append(key)
+            await asyncio.sleep(0)
+            return await original(store, key, index, now)
+
+        monkeypatch.setattr(SemanticIndexStore, "load", counting_load)
+        indexes = await asyncio.gather(*(semantic_cache._get_index("lead-1", 16) for _ in range(5)))
+
+        assert len(loads) == 1
+        assert all(index is indexes[0] for index in indexes)
+
+    @pytest.mark.asyncio
+    async def test_instances_merge_instead_of_overwriting(self, semantic_cache):
+        other = SemanticResponseCacheOptimized()
+        other._embeddings_model = FakeEncoder()
+        other.index_persist_interval = 0.0
+
+        await semantic_cache.set("estimate the commission", {"content": "6%"})
+        await other.set("list the schools", {"content": "a"})
+        await semantic_cache.set("describe the neighborhood", {"content": "b"})
+
+        assert (await other._semantic_similarity_search("estimate commission", 0.87))["response"] == {"content": "6%"}
+        match = await semantic_cache._semantic_similarity_search("list schools", 0.87)
+        assert match["response"] == {"content": "a"}
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_debounced_entries(self, semantic_cache, cache_backend):
+        semantic_cache.index_persist_interval = 3600
+        await semantic_cache.set("estimate the commission", {"content": "6%"})
+        await semantic_cache.set("list the schools", {"content": "a"})
+        assert len(cache_backend.store[semantic_cache._index_key("")]) == 1
+
+        await semantic_cache.flush()
+
+        assert len(cache_backend.store[semantic_cache._index_key("")]) == 2
+
+    @pytest.mark.asyncio
+    async def test_clear_deletes_stored_indexes(self, semantic_cache, cache_backend):
+        await semantic_cache.set("estimate the commission", {"content": "6%"}, context="lead-1")
+        assert semantic_cache._index_key("lead-1") in cache_backend.store
+
+        assert await semantic_cache.clear_semantic_cache() is True
+
+        assert semantic_cache._index_key("lead-1") not in cache_backend.store
+        assert semantic_cache.get_cache_stats()["semantic_index_size"] == 0
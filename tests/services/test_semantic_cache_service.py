@@ -0,0 +1,286 @@
+import pytest
+
+pytestmark = pytest.mark.integration
+
+"""
+Tests for SemanticCache - vectorised per-tenant index
+
+Covers:
+- Top-1 lookup against the normalised embedding matrix
+- Tenant isolation
+- TTL and LRU eviction
+- Per-entry persistence, cross-process merge and flush
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ghl_real_estate_ai.services.semantic_cache_service import SemanticCache
+from ghl_real_estate_ai.services.semantic_vector_index import flush_semantic_indexes, unpack_entry
+
+
+class FakeEmbeddingModel:
+    """Deterministic embeddings keyed by the first word of the query."""
+
+    def __init__(self, dim: int = 8):
+        self.dim = dim
+        self.calls = 0
+
+    def embed_query(self, query: str):
+        self.calls += 1
+        rng = np.random.default_rng(abs(hash(query.split()[0])) % (2**32))
+        base = rng.normal(size=self.dim)
+        # Small query-dependent perturbation keeps near-duplicates similar
+        noise = np.random.default_rng(len(query)).normal(scale=0.01, size=self.dim)
+        return (base + noise).tolist()
+
+
+class FakeCacheService:
+    def __init__(self):
+        self.store: Dict[str, Any] = {}
+        self.sets = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.store.get(key)
+
+    async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
+        self.sets += 1
+        self.store[key] = value
+        return True
+
+    async def delete(self, key: str) -> bool:
+        return self.store.pop(key, None) is not None
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.commands: List[tuple] = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        return [getattr(self.redis, f"_{name}")(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+class FakeRedis:
+    """Hash and sorted-set commands used by SemanticIndexStore, returning bytes like redis-py."""
+
+    def __init__(self):
+        self.hashes: Dict[str, Dict[bytes, bytes]] = {}
+        self.zsets: Dict[str, Dict[bytes, float]] = {}
+        self.hset_calls = 0
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hmget(self, key, fields):
+        stored = self.hashes.get(key, {})
+        return [stored.get(field.encode()) for field in fields]
+
+    async def zrangebyscore(self, key, low, high):
+        return [member for member, score in self.zsets.get(key, {}).items() if score >= low]
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.hashes.pop(key, None)
+            self.zsets.pop(key, None)
+
+    def _hset(self, key, mapping):
+        self.hset_calls += 1
+        self.hashes.setdefault(key, {}).update({field.encode(): value for field, value in mapping.items()})
+
+    def _hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field.encode(), None)
+
+    def _zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update({member.encode(): score for member, score in mapping.items()})
+
+    def _zrem(self, key, *members):
+        for member in members:
+            self.zsets.get(key, {}).pop(member.encode(), None)
+
+    def _zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        for member in [m for m, score in zset.items() if score <= high]:
+            del zset[member]
+
+    def _expire(self, key, ttl):
+        return True
+
+
+class FakeRedisBackend:
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.enabled = True
+
+
+@pytest.fixture
+def cache_backend():
+    return FakeCacheService()
+
+
+@pytest.fixture
+def redis_backend():
+    backend = FakeCacheService()
+    backend.backend = FakeRedisBackend(FakeRedis())
+    backend.circuit_breaker = {"open": False}
+    return backend
+
+
+def make_cache(backend, **kwargs) -> SemanticCache:
+    kwargs.setdefault("threshold", 0.95)
+    kwargs.setdefault("persist_interval", 0.0)
+    return SemanticCache(embedding_model=FakeEmbeddingModel(), cache_service=backend, **kwargs)
+
+
+@pytest.fixture
+def cache(cache_backend):
+    return SemanticCache(
+        threshold=0.95,
+        max_entries=4,
+        persist_interval=0.0,
+        embedding_model=FakeEmbeddingModel(),
+        cache_service=cache_backend,
+    )
+
+
+class TestSemanticCacheLookup:
+    @pytest.mark.asyncio
+    async def test_similar_query_hits(self, cache):
+        await cache.set("alpha listing in rancho cucamonga", {"answer": 1})
+        assert await cache.get("alpha listing in rancho cucamonga!") == {"answer": 1}
+
+    @pytest.mark.asyncio
+    async def test_dissimilar_query_misses(self, cache):
+        await cache.set("alpha listing", {"answer": 1})
+        assert await cache.get("beta listing") is None
+
+    @pytest.mark.asyncio
+    async def test_tenants_are_isolated(self, cache):
+        await cache.set("alpha listing", "tenant-a", tenant_id="a")
+        assert await cache.get("alpha listing", tenant_id="b") is None
+        assert await cache.get("alpha listing", tenant_id="a") == "tenant-a"
+
+    @pytest.mark.asyncio
+    async def test_zero_embedding_is_not_indexed(self, cache_backend):
+        model = FakeEmbeddingModel()
+        model.embed_query = lambda query: [0.0] * 8
+        cache = SemanticCache(embedding_model=model, cache_service=cache_backend)
+
+        await cache.set("anything", 1)
+        assert await cache.get("anything") is None
+        assert cache.get_stats()["tenants"] == 0
+
+
+class TestSemanticCacheEviction:
+    @pytest.mark.asyncio
+    async def test_lru_eviction_at_capacity(self, cache):
+        for word in ["alpha", "beta", "gamma", "delta"]:
+            await cache.set(f"{word} query", word)
+            time.sleep(0.001)
+
+        # Touch alpha so beta becomes least recently used
+        assert await cache.get("alpha query") == "alpha"
+        await cache.set("epsilon query", "epsilon")
+
+        assert cache.get_stats()["entries"]["default"] == 4
+        assert await cache.get("beta query") is None
+        assert await cache.get("alpha query") == "alpha"
+        assert await cache.get("epsilon query") == "epsilon"
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_skipped(self, cache):
+        cache.ttl = -1
+        await cache.set("alpha query", "stale")
+        assert await cache.get("alpha query") is None
+
+    @pytest.mark.asyncio
+    async def test_missing_backend_data_drops_entry(self, cache, cache_backend):
+        await cache.set("alpha query", "value")
+        cache_backend.store = {k: v for k, v in cache_backend.store.items() if "data" not in k}
+
+        assert await cache.get("alpha query") is None
+        assert cache.get_stats()["entries"]["default"] == 0
+
+
+class TestSemanticCachePersistence:
+    @pytest.mark.asyncio
+    async def test_entries_are_packed_and_reloaded(self, cache, cache_backend):
+        await cache.set("alpha query", "value")
+        records = cache_backend.store["semantic_cache:index:default"]
+        vector, expires_at = unpack_entry(next(iter(records.values())))
+        assert vector.shape == (8,)
+        assert expires_at > time.time()
+
+        reloaded = make_cache(cache_backend)
+        assert await reloaded.get("alpha query") == "value"
+
+    @pytest.mark.asyncio
+    async def test_persist_is_debounced_until_flush(self, cache_backend):
+        cache = make_cache(cache_backend, persist_interval=3600)
+        for word in ["alpha", "beta", "gamma"]:
+            await cache.set(f"{word} query", word)
+
+        assert len(cache_backend.store["semantic_cache:index:default"]) == 1
+
+        await cache.flush()
+        assert len(cache_backend.store["semantic_cache:index:default"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_shutdown_flush_persists_pending_entries(self, cache_backend):
+        cache = make_cache(cache_backend, persist_interval=3600)
+        await cache.set("alpha query", "alpha")
+        await cache.set("beta query", "beta")
+
+        await flush_semantic_indexes()
+
+        assert len(cache_backend.store["semantic_cache:index:default"]) == 2
+
+
+class TestSemanticCacheSharedRedis:
+    @pytest.mark.asyncio
+    async def test_set_writes_only_changed_entries(self, redis_backend):
+        cache = make_cache(redis_backend)
+        await cache.set("alpha query", "alpha")
+        await cache.set("beta query", "beta")
+
+        redis = redis_backend.backend.redis
+        assert len(redis.hashes["semantic_cache:index:default:entries"]) == 2
+        assert redis.hset_calls == 2
+        assert "semantic_cache:index:default" not in redis_backend.store
+
+    @pytest.mark.asyncio
+    async def test_processes_merge_instead_of_overwriting(self, redis_backend):
+        pod_a, pod_b = make_cache(redis_backend), make_cache(redis_backend)
+        await pod_a.set("alpha query", "alpha")
+        await pod_b.set("beta query", "beta")
+        await pod_a.set("gamma query", "gamma")
+
+        assert len(redis_backend.backend.redis.hashes["semantic_cache:index:default:entries"]) == 3
+        assert await pod_a.get("beta query") == "beta"
+        assert await pod_b.get("alpha query") == "alpha"
+        assert await pod_b.get("gamma query") == "gamma"
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_deleted_from_shared_index(self, redis_backend):
+        cache = make_cache(redis_backend)
+        await cache.set("alpha query", "value")
+        redis_backend.store = {k: v for k, v in redis_backend.store.items() if "data" not in k}
+
+        assert await cache.get("alpha query") is None
+        await cache.flush()
+
+        assert redis_backend.backend.redis.hashes["semantic_cache:index:default:entries"] == {}
+        assert await make_cache(redis_backend).get("alpha query") is None
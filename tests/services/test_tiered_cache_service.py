@@ -31,6 +31,7 @@ from ghl_real_estate_ai.services.tiered_cache_service import (
     CacheMetrics,
     LRUCache,
     RedisBackend,
+    ShardedLRUCache,
     TieredCacheContext,
     TieredCacheService,
     cache_clear,
@@ -423,6 +424,163 @@ class TestTieredCacheService:
         await cache_service.stop()
 
 
+class TestShardedLRUCache:
+    """Test ShardedLRUCache functionality."""
+
+    def test_sharded_basic_operations(self):
+        """Keys are spread over shards and behave like a single cache."""
+        # Room for every key in any one shard, since hash() placement is randomised per process
+        cache = ShardedLRUCache(max_size=320, default_ttl=300, shards=8)
+
+        for i in range(40):
+            cache.set(f"key_{i}", i)
+
+        assert len(cache) == 40
+        assert all(cache.get(f"key_{i}") == i for i in range(40))
+        assert sum(1 for shard in cache._shards if len(shard)) > 1
+
+        assert cache.delete("key_0")
+        assert cache.get("key_0") is None
+
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_sharded_stats(self):
+        """Stats aggregate across shards."""
+        cache = ShardedLRUCache(max_size=100, default_ttl=300, shards=4)
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+
+        stats = cache.get_stats()
+
+        assert stats["size"] == 2
+        assert stats["max_size"] == 100
+        assert stats["shards"] == 4
+        assert stats["utilization_percent"] == 2.0
+
+    def test_l2_access_counts(self):
+        """L2 read counts are tracked per key and reset on delete."""
+        cache = ShardedLRUCache(max_size=10, default_ttl=300, shards=2)
+
+        assert cache.record_l2_access("key1") == 1
+        assert cache.record_l2_access("key1") == 2
+        cache.delete("key1")
+        assert cache.record_l2_access("key1") == 1
+
+
+class FakeRedis:
+    """In-memory stand-in for redis.asyncio.Redis that counts round trips."""
+
+    def __init__(self):
+        self.data: Dict[str, bytes] = {}
+        self.calls: Dict[str, int] = {}
+
+    def _count(self, name: str):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    async def get(self, key):
+        self._count("get")
+        return self.data.get(key)
+
+    async def mget(self, keys):
+        self._count("mget")
+        return [self.data.get(key) for key in keys]
+
+    async def set(self, key, data, ex=None):
+        self._count("set")
+        self.data[key] = data
+        return True
+
+    async def delete(self, *keys):
+        self._count("delete")
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.ops = []
+
+    def set(self, key, data, ex=None):
+        self.ops.append((key, data))
+
+    async def execute(self):
+        self.redis._count("pipeline")
+        for key, data in self.ops:
+            self.redis.data[key] = data
+        return [True] * len(self.ops)
+
+
+class TestBatchOperations:
+    """Test get_many/set_many and L2 promotion without write-back."""
+
+    @pytest.fixture
+    def service_with_redis(self):
+        service = TieredCacheService()
+        service._initialized = False
+        service.__init__()
+        fake = FakeRedis()
+        service.l2_backend.redis = fake
+        service.l2_backend.enabled = True
+        return service, fake
+
+    @pytest.mark.asyncio
+    async def test_set_many_uses_one_pipeline(self, service_with_redis):
+        service, fake = service_with_redis
+
+        assert await service.set_many({f"key_{i}": i for i in range(20)}, ttl=300)
+
+        assert fake.calls == {"pipeline": 1}
+        assert len(fake.data) == 20
+        assert len(service.l1_cache) == 20
+
+    @pytest.mark.asyncio
+    async def test_get_many_fetches_l1_misses_in_one_round_trip(self, service_with_redis):
+        service, fake = service_with_redis
+        await service.set_many({f"key_{i}": i for i in range(10)}, ttl=300)
+
+        # Drop half of the keys from L1 only
+        for i in range(0, 10, 2):
+            service.l1_cache.delete(f"key_{i}")
+        fake.calls.clear()
+
+        results = await service.get_many([f"key_{i}" for i in range(10)] + ["missing"])
+
+        assert results == {f"key_{i}": i for i in range(10)}
+        assert fake.calls == {"mget": 1}
+
+    @pytest.mark.asyncio
+    async def test_l2_hits_do_not_write_back(self, service_with_redis):
+        service, fake = service_with_redis
+        await service.set("key1", "value1", 300)
+        service.l1_cache.delete("key1")
+        fake.calls.clear()
+
+        assert await service.get("key1") == "value1"
+        assert service.l1_cache.get("key1") is None  # First L2 read: not promoted yet
+
+        assert await service.get("key1") == "value1"
+        assert service.l1_cache.get("key1") == "value1"  # Promoted on second read
+
+        assert fake.calls == {"get": 2}
+        assert service.metrics.l2_promotions == 1
+
+    @pytest.mark.asyncio
+    async def test_get_many_drops_expired_l2_entries(self, service_with_redis):
+        service, fake = service_with_redis
+        now = time.time()
+        expired = CacheItem(value="old", created_at=now - 600, expires_at=now - 300)
+        fake.data["stale"] = pickle.dumps(expired)
+
+        results = await service.get_many(["stale"])
+
+        assert results == {}
+        assert "stale" not in fake.data
+
+
 class TestTieredCacheDecorator:
     """Test tiered_cache decorator functionality."""
 
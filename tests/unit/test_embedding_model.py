@@ -0,0 +1,154 @@
+"""Tests for EmbeddingModel async coalescing, worker-thread encoding and LRU cache."""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from ghl_real_estate_ai.core import embeddings as embeddings_module
+from ghl_real_estate_ai.core.embeddings import EmbeddingModel
+
+pytestmark = pytest.mark.unit
+
+
+class FakeSentenceTransformer:
+    """Records each encode call and the thread it ran on."""
+
+    def __init__(self):
+        self.calls = []
+        self.threads = set()
+
+    def encode(self, texts, convert_to_numpy=True, batch_size=32):
+        self.calls.append(list(texts))
+        self.threads.add(threading.current_thread().name)
+        return np.array([[float(len(t)), 1.0, 0.0] for t in texts])
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    monkeypatch.setattr(embeddings_module, "SENTENCE_TRANSFORMERS_AVAILABLE", True)
+    return FakeSentenceTransformer()
+
+
+def make_model(fake_model, **kwargs) -> EmbeddingModel:
+    model = EmbeddingModel(**kwargs)
+    model._model = fake_model
+    return model
+
+
+class TestEmbeddingModelSync:
+    def test_embed_query_uses_lru(self, fake_model):
+        model = make_model(fake_model)
+
+        first = model.embed_query("pool homes")
+        second = model.embed_query("pool homes")
+
+        assert first == second == [10.0, 1.0, 0.0]
+        assert len(fake_model.calls) == 1
+        assert model.get_stats()["cache_hits"] == 1
+
+    def test_cached_vector_is_not_shared_with_callers(self, fake_model):
+        model = make_model(fake_model)
+
+        first = model.embed_query("pool homes")
+        first[0] = -1.0
+
+        assert model.embed_query("pool homes") == [10.0, 1.0, 0.0]
+        assert model.embed_query("pool homes") is not model.embed_query("pool homes")
+
+    def test_lru_is_bounded(self, fake_model):
+        model = make_model(fake_model, cache_size=2)
+        for text in ["a", "bb", "ccc"]:
+            model.embed_query(text)
+
+        model.embed_query("a")
+        assert len(fake_model.calls) == 4
+        assert model.get_stats()["cache_size"] == 2
+
+
+class TestEmbeddingModelAsync:
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_coalesce_into_one_batch(self, fake_model):
+        model = make_model(fake_model, max_wait_ms=20)
+
+        texts = [f"query {i}" for i in range(10)]
+        results = await asyncio.gather(*(model.aembed_query(t) for t in texts))
+
+        assert results == [[float(len(t)), 1.0, 0.0] for t in texts]
+        assert fake_model.calls == [texts]
+        assert all(name.startswith("embedding") for name in fake_model.threads)
+        await model.close()
+
+    @pytest.mark.asyncio
+    async def test_batches_respect_max_batch_size(self, fake_model):
+        model = make_model(fake_model, max_batch_size=4, max_wait_ms=20)
+
+        await asyncio.gather(*(model.aembed_query(f"q{i}") for i in range(10)))
+
+        assert [len(c) for c in fake_model.calls] == [4, 4, 2]
+        await model.close()
+
+    @pytest.mark.asyncio
+    async def test_duplicate_in_flight_texts_share_result(self, fake_model):
+        model = make_model(fake_model, max_wait_ms=20)
+
+        a, b = await asyncio.gather(model.aembed_query("same"), model.aembed_query("same"))
+
+        assert a == b
+        assert a is not b
+        assert fake_model.calls == [["same"]]
+        assert model.get_stats()["coalesced"] == 1
+        await model.close()
+
+    @pytest.mark.asyncio
+    async def test_encode_failure_propagates_and_is_not_cached(self, fake_model):
+        model = make_model(fake_model, max_wait_ms=0)
+        fake_model.encode = lambda *args, **kwargs: (_ for _ in ()).throw(RuntimeError("cuda oom"))
+
+        with pytest.raises(RuntimeError):
+            await model.aembed_query("boom")
+
+        assert model.get_stats()["cache_size"] == 0
+        await model.close()
+
+    @pytest.mark.asyncio
+    async def test_close_fails_in_flight_batch(self, fake_model):
+        model = make_model(fake_model, max_wait_ms=0)
+        started, release = threading.Event(), threading.Event()
+        encode = fake_model.encode
+
+        def blocking_encode(*args, **kwargs):
+            started.set()
+            release.wait(timeout=5)
+            return encode(*args, **kwargs)
+
+        fake_model.encode = blocking_encode
+        request = asyncio.ensure_future(model.aembed_query("in flight"))
+        await asyncio.to_thread(started.wait, 5)
+
+        await model.close()
+        release.set()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            await asyncio.wait_for(request, timeout=1)
+        assert model._in_flight == {}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_drain_does_not_clear_its_replacement(self, fake_model):
+        model = make_model(fake_model, max_wait_ms=50)
+        first = asyncio.ensure_future(model.aembed_query("before close"))
+        await asyncio.sleep(0.01)  # let the drain task start waiting for its window
+        cancelled = model._flush_task
+
+        await model.close()
+        second = asyncio.ensure_future(model.aembed_query("after close"))
+        await asyncio.sleep(0)
+        replacement = model._flush_task
+        await asyncio.gather(cancelled, return_exceptions=True)
+
+        assert replacement is not None and model._flush_task is replacement
+        assert await asyncio.wait_for(second, timeout=1) == [11.0, 1.0, 0.0]
+        with pytest.raises(RuntimeError, match="closed"):
+            await first
+        await model.close()